@@ -0,0 +1,143 @@
+# streamlit_app/bench/admission.py
+"""
+LLM 입장 제어(utils/admission.py) 공정성 점검.
+
+사용자 한 명이 요청을 한꺼번에 잔뜩 넣는 동안(퀴즈 버튼 연타, 영상 계속 바꾸기)
+평범한 사용자들의 요청 지연(p95)이 얼마나 늘어나는지 정책별로 비교한다.
+모델은 sleep으로 흉내 냄 (작업 비용 × --time-scale 초).
+
+    none      무거운 사용자 없음 (기준)
+    fifo      무거운 사용자 있음, 도착 순서대로 실행 (입장 제어 전과 같은 순서)
+    wfq       무거운 사용자 있음, 사용자 간 가중 공정 대기열
+    wfq+rate  wfq + 사용자별 토큰 버킷 (APP_LLM_BURST / APP_LLM_RATE_PER_MIN 기본값)
+
+사용 예:
+    python -m bench.admission
+    python -m bench.admission --users 20 --heavy-jobs 60 --slots 2 --out admission.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench.pipeline import percentile  # noqa: E402
+from utils import admission  # noqa: E402
+
+SUMMARY_COST = admission.estimate_cost("가" * 4000, 500)
+QUIZ_COST = admission.estimate_cost("가" * 1500, 1024)
+
+SCENARIOS = {
+    "none": (admission.WFQ, False, False),
+    "fifo": (admission.FIFO, True, False),
+    "wfq": (admission.WFQ, True, False),
+    "wfq+rate": (admission.WFQ, True, True),
+}
+
+
+def run_scenario(name: str, args) -> dict:
+    policy, heavy, rate_limit = SCENARIOS[name]
+    unlimited = 1e9
+    controller = admission.AdmissionController(
+        args.slots,
+        policy=policy,
+        burst=admission.BURST if rate_limit else unlimited,
+        rate_per_min=admission.RATE_PER_MIN if rate_limit else unlimited,
+    )
+    lock = threading.Lock()
+    latencies = {"typical": [], "heavy": []}
+    rejected = {"typical": 0, "heavy": 0}
+
+    def job(user: str, kind: str, cost: float):
+        start = time.perf_counter()
+        try:
+            ticket = controller.acquire("summary", cost, user=user, tag="v1")
+        except admission.RateLimited:
+            with lock:
+                rejected[kind] += 1
+            return
+        try:
+            time.sleep(cost * args.time_scale)
+        finally:
+            controller.release(ticket)
+        with lock:
+            latencies[kind].append(time.perf_counter() - start)
+
+    def typical_user(i: int):
+        rng = random.Random(args.seed + i)
+        time.sleep(rng.uniform(0, args.think))
+        for n in range(args.jobs_per_user):
+            job(f"user{i}", "typical", SUMMARY_COST if n % 2 == 0 else QUIZ_COST)
+            time.sleep(rng.expovariate(1 / args.think))
+
+    threads = [threading.Thread(target=typical_user, args=(i,)) for i in range(args.users)]
+    if heavy:
+        # 무거운 사용자: 시작하자마자 요청을 한꺼번에 넣음
+        threads += [
+            threading.Thread(target=job, args=("heavy", "heavy", SUMMARY_COST))
+            for _ in range(args.heavy_jobs)
+        ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    def summarize(values: list) -> dict:
+        return {
+            "count": len(values),
+            "p50_s": round(percentile(values, 50), 3),
+            "p95_s": round(percentile(values, 95), 3),
+            "max_s": round(max(values), 3) if values else 0.0,
+        }
+
+    return {
+        "scenario": name,
+        "policy": policy,
+        "wall_s": round(wall, 2),
+        "typical": summarize(latencies["typical"]),
+        "heavy": dict(summarize(latencies["heavy"]), rate_limited=rejected["heavy"]),
+        "typical_rate_limited": rejected["typical"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LLM 입장 제어 공정성 벤치마크")
+    parser.add_argument("--users", type=int, default=8, help="평범한 사용자 수")
+    parser.add_argument("--jobs-per-user", type=int, default=3, help="평범한 사용자 1명의 요청 수")
+    parser.add_argument("--heavy-jobs", type=int, default=30, help="무거운 사용자가 한꺼번에 넣는 요청 수")
+    parser.add_argument("--slots", type=int, default=1, help="동시에 실행할 작업 수 (모델 수)")
+    parser.add_argument("--time-scale", type=float, default=2e-5, help="비용 1당 실행 시간 (초)")
+    parser.add_argument("--think", type=float, default=0.3, help="평범한 사용자의 요청 간 평균 간격 (초)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="실행할 시나리오 (기본: 전체)")
+    parser.add_argument("--out", default="", help="결과 JSON 파일 (기본: stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        print(f"[{name}] 실행 중...", file=sys.stderr)
+        results.append(run_scenario(name, args))
+
+    base = next((r for r in results if r["scenario"] == "none"), None)
+    if base and base["typical"]["p95_s"]:
+        for r in results:
+            r["typical_p95_vs_none"] = round(r["typical"]["p95_s"] / base["typical"]["p95_s"], 2)
+
+    text = json.dumps({"slots": args.slots, "results": results}, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
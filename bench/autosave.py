@@ -0,0 +1,177 @@
+# streamlit_app/bench/autosave.py
+"""
+메모 자동 저장(utils/autosave.py) 부하 / 정확성 점검.
+
+--users명이 --seconds초 동안 동시에 메모를 입력하는 상황을 흉내 냄 (키 입력마다 update() 한 번,
+대부분 커서 위치에 한 글자, 가끔 지우기 / 한 줄 붙여넣기 / 커서 이동).
+디바운스 시간은 --time-scale 배로 줄여서 짧게 돌린다.
+
+보고:
+- 키 입력 수 vs DB에 기록된 버전 수 / 트랜잭션 수 (초당)
+- 실제로 쓴 바이트 vs 키 입력마다 전체 문서를 썼다면 쓴 바이트
+- update() 지연 (요청 스레드가 기다리는 시간)
+- 새 프로세스처럼 DB만으로 다시 열었을 때 모든 문서가 마지막 입력과 같은지, 불러오기 지연
+- 버전 기록: 모든 버전이 실제로 입력 중에 있었던 내용인지, 되돌리기 / 시점 조회
+
+사용 예:
+    python -m bench.autosave
+    python -m bench.autosave --users 500 --seconds 10 --out autosave.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench.pipeline import percentile  # noqa: E402
+
+WORDS = ["극한", "미분", "적분", "행렬", "벡터", "정리", "증명", "예제", "시험", "범위", "중요", "복습",
+         "공식", "개념", "풀이", "그래프", "함수", "수렴", "정의", "성질"]
+
+
+class Typist:
+    """메모 하나를 편집하는 가짜 사용자."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.text = "".join(self.sentence() for _ in range(rng.randint(20, 80)))
+        self.cursor = rng.randint(0, len(self.text))
+
+    def keystroke(self) -> str:
+        r = self.rng.random()
+        if r < 0.05:
+            self.cursor = self.rng.randint(0, len(self.text))
+        elif r < 0.15 and self.cursor > 0:
+            self.text = self.text[: self.cursor - 1] + self.text[self.cursor :]
+            self.cursor -= 1
+        elif r < 0.17:
+            pasted = self.sentence()
+            self.text = self.text[: self.cursor] + pasted + self.text[self.cursor :]
+            self.cursor += len(pasted)
+        else:
+            ch = self.rng.choice(WORDS)[0] if self.rng.random() < 0.8 else " "
+            self.text = self.text[: self.cursor] + ch + self.text[self.cursor :]
+            self.cursor += 1
+        return self.text
+
+    def sentence(self) -> str:
+        return " ".join(self.rng.choices(WORDS, k=self.rng.randint(5, 12))) + ".\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="메모 자동 저장 부하 / 정확성 점검")
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--seconds", type=float, default=8.0)
+    parser.add_argument("--keys-per-sec", type=float, default=5.0, help="사용자당 초당 키 입력")
+    parser.add_argument("--time-scale", type=float, default=0.25, help="디바운스 / 최대 지연 / 저장 주기 배율")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default="", help="결과 JSON 파일 (기본: stdout)")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("APP_DATA_DIR", tempfile.mkdtemp(prefix="bench_autosave_"))
+    from utils import autosave
+
+    def make_saver():
+        return autosave.Autosaver(
+            "bench_autosave.db",
+            debounce=autosave.DEBOUNCE_SECONDS * args.time_scale,
+            max_delay=autosave.MAX_DELAY_SECONDS * args.time_scale,
+            flush_interval=autosave.FLUSH_INTERVAL * args.time_scale,
+        )
+
+    saver = make_saver()
+    rng = random.Random(args.seed)
+    typists = [Typist(rng) for _ in range(args.users)]
+    seen = [set() for _ in typists]  # 입력 중에 있었던 모든 내용 (버전 검증용)
+    for i, t in enumerate(typists):
+        saver.update(f"u{i}", "memo", "memo", t.text)
+        seen[i].add(t.text)
+    saver.flush()
+    base = saver.stats()  # 처음 내용(스냅샷)은 빼고 입력 구간만 보고
+
+    print(f"[typing] {args.users}명 × {args.seconds}s ...", file=sys.stderr)
+    update_us, keystrokes, full_bytes = [], 0, 0
+    rate = args.users * args.keys_per_sec
+    start = time.perf_counter()
+    mid_ts = None
+    while (elapsed := time.perf_counter() - start) < args.seconds:
+        if mid_ts is None and elapsed >= args.seconds / 2:
+            mid_ts = time.time()
+        target = int(elapsed * rate)
+        while keystrokes < target:
+            i = rng.randrange(args.users)
+            text = typists[i].keystroke()
+            seen[i].add(text)
+            t0 = time.perf_counter()
+            saver.update(f"u{i}", "memo", "memo", text)
+            update_us.append((time.perf_counter() - t0) * 1e6)
+            keystrokes += 1
+            full_bytes += len(text.encode("utf-8"))
+        time.sleep(0.005)
+    typing_s = time.perf_counter() - start
+    t0 = time.perf_counter()
+    saver.flush()
+    final_flush_ms = (time.perf_counter() - t0) * 1000
+    stats = {k: v - base[k] for k, v in saver.stats().items()}
+
+    print("[reload] DB만으로 다시 열기 ...", file=sys.stderr)
+    fresh = make_saver()
+    load_ms, mismatched = [], 0
+    for i, t in enumerate(typists):
+        t0 = time.perf_counter()
+        text = fresh.load(f"u{i}", "memo", "memo")
+        load_ms.append((time.perf_counter() - t0) * 1000)
+        mismatched += text != t.text
+
+    print("[history] 버전 검증 / 되돌리기 ...", file=sys.stderr)
+    checked = bad_versions = 0
+    for i in rng.sample(range(args.users), min(20, args.users)):
+        for v in fresh.history(f"u{i}", "memo", "memo", limit=1000):
+            checked += 1
+            bad_versions += fresh.text_at(f"u{i}", "memo", "memo", v["version"]) not in seen[i]
+    history = fresh.history("u0", "memo", "memo", limit=1000)
+    oldest = history[-1]["version"]
+    restored = fresh.restore("u0", "memo", "memo", oldest)
+    after = fresh.history("u0", "memo", "memo", limit=1)[0]
+    pit = fresh.version_at("u0", "memo", "memo", mid_ts)
+
+    result = {
+        "users": args.users,
+        "typing_s": round(typing_s, 2),
+        "keystrokes": keystrokes,
+        "keystrokes_per_s": round(keystrokes / typing_s),
+        "versions": stats["versions"],
+        "versions_per_s": round(stats["versions"] / typing_s, 1),
+        "transactions": stats["flushes"],
+        "transactions_per_s": round(stats["flushes"] / typing_s, 1),
+        "snapshots": stats["snapshots"],
+        "stored_kb": round(stats["stored_bytes"] / 1024, 1),
+        "full_per_version_kb": round(stats["full_bytes"] / 1024, 1),
+        "full_per_keystroke_kb": round(full_bytes / 1024, 1),
+        "update_p50_us": round(percentile(update_us, 50), 1),
+        "update_p99_us": round(percentile(update_us, 99), 1),
+        "final_flush_ms": round(final_flush_ms, 1),
+        "reload_mismatched": mismatched,
+        "reload_p95_ms": round(percentile(load_ms, 95), 2),
+        "history_versions_checked": checked,
+        "history_bad_versions": bad_versions,
+        "restore_ok": restored == fresh.load("u0", "memo", "memo") and after["version"] == history[0]["version"] + 1,
+        "point_in_time_version": pit,
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0 if not mismatched and not bad_versions and result["restore_ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
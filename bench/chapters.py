@@ -0,0 +1,172 @@
+# streamlit_app/bench/chapters.py
+"""
+챕터 나누기(utils/chapters.py) 정확도 / 속도 + 챕터별 증분 요약 점검.
+
+주제별 단어 묶음으로 만든 가짜 강의 자막(4초마다 한 줄, 챕터 길이 4~12분)에서
+- 정답 경계와 찾은 경계를 ±--tolerance초 안에서 맞춰 정밀도 / 재현율 / F1
+- 90분 강의 하나를 나누는 시간 (ms)
+- 증분 요약: 챕터를 모두 요약한 뒤 챕터 하나의 내용만 바꿔서 다시 나누고 요약 → 새로 요약한 챕터 수
+  (LLM은 bench/fakes.py의 가짜 모델)
+
+사용 예:
+    python -m bench.chapters
+    python -m bench.chapters --lectures 50 --minutes 90 --out chapters.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench import fakes  # noqa: E402
+from bench.pipeline import percentile  # noqa: E402
+
+TOPICS = [
+    ["극한", "수렴", "발산", "엡실론", "근방"],
+    ["편도함수", "편미분", "변수", "상수", "기울기"],
+    ["연쇄법칙", "합성함수", "매개변수", "도함수", "곱"],
+    ["치환적분", "부정적분", "원시함수", "치환", "적분상수"],
+    ["부분적분", "로그함수", "지수함수", "반복", "공식"],
+    ["정적분", "리만합", "구간", "넓이", "분할"],
+    ["급수", "수열", "판정법", "비율", "교대급수"],
+    ["테일러", "다항식", "근사", "오차", "매클로린"],
+    ["벡터", "내적", "외적", "단위벡터", "사영"],
+    ["행렬", "행렬식", "역행렬", "고유값", "대각화"],
+    ["극값", "임계점", "헤세", "안장점", "판정"],
+    ["이중적분", "영역", "극좌표", "야코비안", "부피"],
+]
+FILLER = ["그래서", "여기서", "이제", "보면", "우리가", "이렇게", "다음으로", "그러면", "예를", "들어서", "계산하면", "됩니다", "입니다", "있습니다"]
+
+
+def make_lecture(rng: random.Random, minutes: float) -> tuple:
+    """(자막 줄 [[시작 초, 텍스트]], 정답 경계 시각 목록)."""
+    segments, boundaries = [], []
+    t = 0.0
+    topics = rng.sample(TOPICS, len(TOPICS))
+    total = minutes * 60
+    for k, topic in enumerate(topics * 2):
+        if t >= total:
+            break
+        if k:
+            boundaries.append(t)
+        end = min(total, t + rng.uniform(4, 12) * 60)
+        while t < end:
+            words = rng.choices(topic, k=3) + rng.choices(FILLER, k=4)
+            rng.shuffle(words)
+            segments.append([t, " ".join(words)])
+            t += 4.0
+    return segments, boundaries
+
+
+def match(found: list, truth: list, tolerance: float) -> tuple:
+    """허용 오차 안에서 1:1로 맞춘 (맞은 수, 찾은 수, 정답 수)."""
+    used = set()
+    hits = 0
+    for b in found:
+        candidates = [(abs(b - t), i) for i, t in enumerate(truth) if i not in used and abs(b - t) <= tolerance]
+        if candidates:
+            used.add(min(candidates)[1])
+            hits += 1
+    return hits, len(found), len(truth)
+
+
+def run_accuracy(chapters_mod, args) -> dict:
+    rng = random.Random(args.seed)
+    hits = found = truth = 0
+    timings = []
+    for _ in range(args.lectures):
+        segments, boundaries = make_lecture(rng, args.minutes)
+        start = time.perf_counter()
+        chapters = chapters_mod.detect_chapters(segments)
+        timings.append((time.perf_counter() - start) * 1000)
+        h, f, t = match([c["start"] for c in chapters[1:]], boundaries, args.tolerance)
+        hits, found, truth = hits + h, found + f, truth + t
+
+    precision = hits / found if found else 0.0
+    recall = hits / truth if truth else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "lectures": args.lectures,
+        "minutes": args.minutes,
+        "true_boundaries": truth,
+        "found_boundaries": found,
+        "precision": round(precision, 3),
+        "recall": round(recall, 3),
+        "f1": round(f1, 3),
+        "detect_p50_ms": round(percentile(timings, 50), 1),
+        "detect_p95_ms": round(percentile(timings, 95), 1),
+    }
+
+
+def run_incremental(chapters_mod, args) -> dict:
+    rng = random.Random(args.seed + 1)
+    segments, boundaries = make_lecture(rng, args.minutes)
+
+    fakes.reset_calls()
+    chapters = chapters_mod.detect_chapters(segments)
+    start = time.perf_counter()
+    _, first = chapters_mod.summarize_chapters(chapters)
+    first_s = time.perf_counter() - start
+
+    # 가운데 챕터 하나만 다른 설명으로 바꿈 (예: 자막 교정)
+    lo = boundaries[len(boundaries) // 2 - 1]
+    hi = boundaries[len(boundaries) // 2]
+    edited = [
+        [t, text + " 다시 정리하면"] if lo <= t < hi else [t, text] for t, text in segments
+    ]
+    rechaptered = chapters_mod.detect_chapters(edited)
+    start = time.perf_counter()
+    _, second = chapters_mod.summarize_chapters(rechaptered)
+    second_s = time.perf_counter() - start
+
+    reopened = time.perf_counter()
+    _, third = chapters_mod.summarize_chapters(chapters_mod.detect_chapters(edited))
+    return {
+        "chapters": len(chapters),
+        "first_pass_summarized": first,
+        "first_pass_s": round(first_s, 2),
+        "after_edit_chapters": len(rechaptered),
+        "after_edit_summarized": second,
+        "after_edit_s": round(second_s, 2),
+        "reopen_summarized": third,
+        "reopen_ms": round((time.perf_counter() - reopened) * 1000, 1),
+        "llm_calls": fakes.CALLS["llm"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="챕터 나누기 정확도 / 증분 요약 벤치마크")
+    parser.add_argument("--lectures", type=int, default=30, help="가짜 강의 수")
+    parser.add_argument("--minutes", type=float, default=90, help="강의 길이 (분)")
+    parser.add_argument("--tolerance", type=float, default=40, help="경계 허용 오차 (초)")
+    parser.add_argument("--time-scale", type=float, default=0.01, help="가짜 모델 지연 배율")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default="", help="결과 JSON 파일 (기본: stdout)")
+    args = parser.parse_args(argv)
+
+    fakes.install(fakes.FakeConfig(time_scale=args.time_scale))
+    os.environ.setdefault("APP_DATA_DIR", tempfile.mkdtemp(prefix="bench_chapters_"))
+    from utils import chapters as chapters_mod
+
+    print("[accuracy] 실행 중...", file=sys.stderr)
+    accuracy = run_accuracy(chapters_mod, args)
+    print("[incremental] 실행 중...", file=sys.stderr)
+    incremental = run_incremental(chapters_mod, args)
+
+    text = json.dumps({"accuracy": accuracy, "incremental": incremental}, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# streamlit_app/bench/course_pack.py
+"""
+오프라인 코스팩(utils/course_pack.py, tools/build_course_pack.py) 점검.
+
+1) build        가짜 YouTube/LLM(bench/fakes.py)으로 과목 하나의 코스팩을 만듦
+2) rebuild      같은 설정으로 다시 만듦 → 검색 / 자막 / 모델 호출 0번, 조각은 모두 복사
+3) grow         주차별 영상 수를 늘려서 다시 만듦 → 새 영상만 가져오고 나머지는 재사용
+4) offline      새 프로세스에서 APP_COURSE_PACK만 지정하고 모든 네트워크 호출이 실패하도록 한 뒤
+                시간표 주차 검색 → 자막 → 요약 → 퀴즈 → 챕터를 차례로 열어 봄
+                → 네트워크 / 모델 호출 0번, 팩 크기 중 실제로 읽은 바이트 비율, 단계별 지연
+
+사용 예:
+    python -m bench.course_pack
+    python -m bench.course_pack --course 정보검색 --videos-per-week 2 --out pack.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench import fakes  # noqa: E402
+from bench.pipeline import percentile  # noqa: E402
+
+
+def _build_args(out: str, videos_per_week: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        out=out,
+        language="ko",
+        videos_per_week=videos_per_week,
+        questions=5,
+        no_llm=False,
+        no_thumbnails=True,
+        refresh_search=False,
+        force=False,
+    )
+
+
+def run_builds(args) -> tuple:
+    from tools.build_course_pack import build_course
+
+    out = tempfile.mkdtemp(prefix="bench_pack_out_")
+    results = {}
+    for phase, per_week in (("build", args.videos_per_week), ("rebuild", args.videos_per_week),
+                            ("grow", args.videos_per_week + 1)):
+        print(f"[{phase}] 실행 중...", file=sys.stderr)
+        fakes.reset_calls()
+        report = build_course(args.course, _build_args(out, per_week))
+        report["calls"] = dict(fakes.CALLS)
+        results[phase] = report
+    return results, results["grow"]["path"]
+
+
+def _network_down():
+    raise ConnectionError("오프라인 (주입한 장애)")
+
+
+def serve_offline(pack_path: str) -> dict:
+    """--serve 모드 (새 프로세스): 코스팩만으로 페이지 흐름을 따라가 봄."""
+    os.environ["APP_COURSE_PACK"] = pack_path
+    os.environ["APP_DATA_DIR"] = tempfile.mkdtemp(prefix="bench_pack_serve_")
+    fakes.install(fakes.FakeConfig(time_scale=0.01))
+    for name in ("search", "videos", "transcript_list", "transcript_fetch"):
+        fakes.FAULTS[name] = _network_down
+
+    from utils import course_pack
+
+    start = time.perf_counter()
+    (pack,) = course_pack.get_course_packs()
+    open_ms = (time.perf_counter() - start) * 1000
+
+    import llm
+    from utils.chapters import get_chapters
+    from utils.timetable_data import syllabus_weeks, week_query
+    from utils.transcript import fetch_transcript
+    from utils.youtube_api2 import search_youtube_videos
+
+    course = pack.meta["course"]
+    steps = {"search": [], "transcript": [], "summary": [], "quiz": [], "chapters": []}
+    failures = []
+
+    def timed(step, fn):
+        begin = time.perf_counter()
+        value = fn()
+        steps[step].append((time.perf_counter() - begin) * 1000)
+        return value
+
+    fakes.reset_calls()
+    for wk, goal, content in syllabus_weeks(course):
+        query = week_query(course, wk, goal, content)
+        try:
+            results = timed("search", lambda: search_youtube_videos(query, max_results=10, feature="timetable"))
+            video_id = results[0]["video_id"]
+            transcript = timed("transcript", lambda: fetch_transcript(video_id, language="ko"))
+            summary = timed("summary", lambda: llm.summarize_text(transcript, video_id))
+            quiz = timed("quiz", lambda: llm.generate_quiz(summary, 5, video_id))
+            timed("chapters", lambda: get_chapters(video_id, transcript))
+            if not quiz:
+                failures.append(f"{wk}: 퀴즈 없음")
+        except Exception as e:  # noqa: BLE001
+            failures.append(f"{wk}: {type(e).__name__}: {e}")
+
+    stats = pack.stats()
+    return {
+        "course": course,
+        "weeks": len(steps["search"]),
+        "failures": failures,
+        "network_calls": sum(v for k, v in fakes.CALLS.items() if k != "llm"),
+        "llm_calls": fakes.CALLS["llm"],
+        "open_ms": round(open_ms, 2),
+        "pack_bytes": stats["size_bytes"],
+        "bytes_read": stats["bytes_read"],
+        "read_fraction": round(stats["bytes_read"] / stats["size_bytes"], 3),
+        "step_p95_ms": {k: round(percentile(v, 95), 2) for k, v in steps.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 코스팩 증분 빌드 / 오프라인 서빙 점검")
+    parser.add_argument("--course", default="대학수학")
+    parser.add_argument("--videos-per-week", type=int, default=2)
+    parser.add_argument("--time-scale", type=float, default=0.01, help="가짜 YouTube/모델 지연 배율")
+    parser.add_argument("--serve", default="", help=argparse.SUPPRESS)  # 내부용: 오프라인 점검 프로세스
+    parser.add_argument("--out", default="", help="결과 JSON 파일 (기본: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        print(json.dumps(serve_offline(args.serve), ensure_ascii=False))
+        return 0
+
+    fakes.install(fakes.FakeConfig(time_scale=args.time_scale))
+    os.environ.setdefault("APP_DATA_DIR", tempfile.mkdtemp(prefix="bench_pack_"))
+    builds, pack_path = run_builds(args)
+
+    print("[offline] 실행 중...", file=sys.stderr)
+    env = {k: v for k, v in os.environ.items() if k not in ("APP_DATA_DIR", "YOUTUBE_API_KEY")}
+    proc = subprocess.run(
+        [sys.executable, "-m", "bench.course_pack", "--serve", pack_path],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    offline = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    result = {"builds": builds, "offline": offline}
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    ok = (
+        not offline["failures"]
+        and offline["network_calls"] == 0
+        and offline["llm_calls"] == 0
+        and builds["rebuild"]["written"] == 0
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+# streamlit_app/bench/fakes.py
+"""
+벤치마크용 가짜 외부 의존성 (YouTube Data API, 자막 API, llama_cpp).
+
+실제 앱 코드(utils/youtube_api2.py, utils/transcript.py, llm.py)를 그대로 돌리기 위해
+해당 모듈들이 import하는 라이브러리를 sys.modules에 가짜로 끼워 넣는다.
+반드시 앱 모듈을 import하기 전에 install()을 호출해야 한다.
+
+지연 시간은 FakeConfig로 조절 (time_scale=0.1이면 모든 대기가 1/10).
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+import types
+import zlib
+from dataclasses import dataclass
+
+SAMPLE_SENTENCES = [
+    "오늘은 다변수함수의 극한과 연속에 대해서 알아보겠습니다",
+    "편도함수는 한 변수만 변화시키고 나머지는 상수로 보고 미분한 것입니다",
+    "연쇄법칙을 이용하면 합성함수의 편미분을 쉽게 계산할 수 있습니다",
+    "방향도함수는 기울기 벡터와 단위벡터의 내적으로 구할 수 있습니다",
+    "극값을 찾을 때는 먼저 임계점을 구하고 이계도함수 판정법을 사용합니다",
+    "치환적분은 합성함수의 미분을 거꾸로 적용하는 방법입니다",
+    "부분적분은 곱의 미분법에서 나온 적분 기법입니다",
+    "삼각함수의 적분에서는 반각 공식과 항등식을 자주 사용합니다",
+    "정적분은 리만 합의 극한으로 정의됩니다",
+    "미적분의 기본정리는 미분과 적분이 서로 역연산임을 말해줍니다",
+]
+
+
+@dataclass
+class FakeConfig:
+    search_latency: float = 0.15  # search().list 1회
+    videos_latency: float = 0.05  # videos().list 1회
+    transcript_list_latency: float = 0.10  # 자막 목록 조회
+    transcript_fetch_latency: float = 0.25  # 자막 본문 다운로드
+    transcript_segments: int = 400  # 영상 1개당 자막 줄 수
+    tokens_per_sec: float = 40.0  # 가짜 모델 decode 속도
+    prefill_tokens_per_sec: float = 400.0  # 가짜 모델 prompt 처리 속도
+    summary_tokens: int = 120  # 요약 출력 토큰 수
+    quiz_tokens: int = 400  # 퀴즈 출력 토큰 수
+    time_scale: float = 1.0  # 모든 지연 배율
+    seed: int = 0
+
+
+CONFIG = FakeConfig()
+
+# 호출 횟수 (리포트용)
+CALLS = {"search": 0, "videos": 0, "transcript_list": 0, "transcript_fetch": 0, "llm": 0}
+_calls_lock = threading.Lock()
+
+# 장애 주입 (bench/resilience.py): 호출 이름 → 가짜 호출 직전에 실행할 함수 (예외를 던지거나 지연)
+FAULTS = {}
+
+
+def _count(name: str):
+    with _calls_lock:
+        CALLS[name] += 1
+    fault = FAULTS.get(name)
+    if fault is not None:
+        fault()
+
+
+def _sleep(seconds: float):
+    if seconds > 0:
+        time.sleep(seconds * CONFIG.time_scale)
+
+
+def _video_ids(query: str, n: int) -> list:
+    # 같은 검색어 → 같은 영상 (여러 세션이 겹치는 영상을 보게 됨)
+    rng = random.Random(f"{CONFIG.seed}:{query}")
+    return [f"vid{rng.randrange(200):04d}" for _ in range(n)]
+
+
+# ================================================================
+# googleapiclient.discovery
+# ================================================================
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self, *args, **kwargs):
+        return self._fn()
+
+
+class _Search:
+    def list(self, q="", maxResults=10, **kwargs):
+        def run():
+            _count("search")
+            _sleep(CONFIG.search_latency)
+            ids = _video_ids(q, maxResults)
+            return {"items": [{"id": {"videoId": vid}} for vid in ids]}
+
+        return _Request(run)
+
+
+class _Videos:
+    def list(self, id="", **kwargs):
+        def run():
+            _count("videos")
+            _sleep(CONFIG.videos_latency)
+            items = []
+            for vid in [v for v in id.split(",") if v]:
+                rng = random.Random(vid)
+                views = rng.randrange(1_000, 2_000_000)
+                items.append(
+                    {
+                        "id": vid,
+                        "snippet": {
+                            "title": f"강의 영상 {vid}",
+                            "channelTitle": "벤치마크 채널",
+                            "description": "대학수학 강의",
+                            "publishedAt": "2025-03-01T00:00:00Z",
+                            "thumbnails": {"default": {"url": f"https://i.ytimg.com/vi/{vid}/default.jpg"}},
+                        },
+                        "statistics": {
+                            "viewCount": str(views),
+                            "likeCount": str(views // rng.randrange(20, 200)),
+                            "commentCount": str(views // rng.randrange(200, 2000)),
+                        },
+                    }
+                )
+            return {"items": items}
+
+        return _Request(run)
+
+
+class _YouTubeClient:
+    def search(self):
+        return _Search()
+
+    def videos(self):
+        return _Videos()
+
+
+def fake_build(service_name, version, developerKey=None, **kwargs):
+    return _YouTubeClient()
+
+
+# ================================================================
+# youtube_transcript_api
+# ================================================================
+class FakeSnippet:
+    __slots__ = ("text", "start", "duration")
+
+    def __init__(self, text, start, duration):
+        self.text = text
+        self.start = start
+        self.duration = duration
+
+
+class _Transcript:
+    def __init__(self, video_id, language_code="ko"):
+        self.video_id = video_id
+        self.language_code = language_code
+
+    def fetch(self):
+        _count("transcript_fetch")
+        _sleep(CONFIG.transcript_fetch_latency)
+        rng = random.Random(self.video_id)
+        return [
+            FakeSnippet(rng.choice(SAMPLE_SENTENCES), i * 4.0, 4.0)
+            for i in range(CONFIG.transcript_segments)
+        ]
+
+
+class _TranscriptList:
+    def __init__(self, video_id):
+        self._transcripts = [_Transcript(video_id, "ko")]
+
+    def find_transcript(self, languages):
+        for t in self._transcripts:
+            if t.language_code in languages:
+                return t
+        raise LookupError(f"no transcript for {languages}")
+
+    def __iter__(self):
+        return iter(self._transcripts)
+
+
+class FakeYouTubeTranscriptApi:
+    def list(self, video_id):
+        _count("transcript_list")
+        _sleep(CONFIG.transcript_list_latency)
+        return _TranscriptList(video_id)
+
+
+# ================================================================
+# llama_cpp
+# ================================================================
+class FakeLlama:
+    """
+    CPU 하나를 쓰는 모델처럼 동작: 한 번에 한 요청만 처리 (Lock),
+    prompt 길이 / 출력 토큰 수에 비례해서 대기.
+    """
+
+    def __init__(self, model_path="", **kwargs):
+        self.model_path = model_path
+        self.kwargs = kwargs
+        self._lock = threading.Lock()
+
+    def tokenize(self, text: bytes, add_bos=True, special=False):
+        # 대략 글자 2개 = 토큰 1개
+        return list(range(max(1, len(text.decode("utf-8", "ignore")) // 2)))
+
+    def _run(self, prompt: str, max_tokens: int, out_tokens: int):
+        _count("llm")
+        n_prompt = len(self.tokenize(prompt.encode("utf-8")))
+        n_out = min(max_tokens, out_tokens)
+        with self._lock:
+            _sleep(n_prompt / CONFIG.prefill_tokens_per_sec)
+            _sleep(n_out / CONFIG.tokens_per_sec)
+        return n_prompt, n_out
+
+    def _stream(self, prompt: str, max_tokens: int, out_tokens: int, text: str, chat: bool):
+        """stream=True 흉내: prefill 대기 후 조각(chunk)마다 decode 대기."""
+        _count("llm")
+        n_prompt = len(self.tokenize(prompt.encode("utf-8")))
+        n_out = min(max_tokens, out_tokens)
+        pieces = 8
+        with self._lock:
+            _sleep(n_prompt / CONFIG.prefill_tokens_per_sec)
+            step = max(1, len(text) // pieces)
+            for i in range(0, len(text), step):
+                _sleep(n_out / pieces / CONFIG.tokens_per_sec)
+                piece = text[i : i + step]
+                if chat:
+                    yield {"choices": [{"delta": {"content": piece}, "finish_reason": None}]}
+                else:
+                    yield {"choices": [{"text": piece, "finish_reason": None}]}
+
+    def __call__(self, prompt="", max_tokens=16, stream=False, **kwargs):
+        # 영상(프롬프트)마다 다른 요약 → 퀴즈 캐시가 실제처럼 영상별로 갈림
+        k = zlib.crc32(prompt.encode("utf-8"))
+        picked = [SAMPLE_SENTENCES[(k + i * 3) % len(SAMPLE_SENTENCES)] for i in range(3)]
+        text = " ".join(picked) + f"\n난이도: 중 ({k % 1000})"
+        if stream:
+            return self._stream(prompt, max_tokens, CONFIG.summary_tokens, text, chat=False)
+        n_prompt, n_out = self._run(prompt, max_tokens, CONFIG.summary_tokens)
+        return {
+            "choices": [{"text": text, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": n_prompt, "completion_tokens": n_out},
+        }
+
+    def create_chat_completion(self, messages=(), max_tokens=16, stream=False, **kwargs):
+        prompt = "".join(m.get("content", "") for m in messages)
+        quizzes = [
+            {
+                "question": f"{s}에 대한 설명으로 옳은 것은?",
+                "options": ["보기1", "보기2", "보기3", "보기4"],
+                "answer_index": i % 4,
+                "explanation": s,
+            }
+            for i, s in enumerate(SAMPLE_SENTENCES[:5])
+        ]
+        content = json.dumps({"quizzes": quizzes}, ensure_ascii=False)
+        if stream:
+            return self._stream(prompt, max_tokens, CONFIG.quiz_tokens, content, chat=True)
+        n_prompt, n_out = self._run(prompt, max_tokens, CONFIG.quiz_tokens)
+        return {
+            "choices": [
+                {
+                    "message": {
+                        "role": "assistant",
+                        "content": content,
+                    },
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": n_prompt, "completion_tokens": n_out},
+        }
+
+
+# ================================================================
+# 설치
+# ================================================================
+def _module(name: str, **attrs) -> types.ModuleType:
+    mod = types.ModuleType(name)
+    mod.__dict__.update(attrs)
+    return mod
+
+
+def install(config: FakeConfig = None, fake_llm: bool = True, fake_youtube: bool = True):
+    """
+    가짜 라이브러리를 sys.modules에 등록. fake_llm=False면 실제 llama_cpp 사용.
+    fake_youtube=False면 YouTube / 자막 라이브러리는 건드리지 않음 (실제 API 또는 카세트 재생).
+    """
+    global CONFIG
+    if config is not None:
+        CONFIG = config
+
+    import os
+
+    sys.modules["dotenv"] = _module("dotenv", load_dotenv=lambda *a, **k: False)
+
+    if fake_youtube:
+        os.environ.setdefault("YOUTUBE_API_KEY", "bench-fake-key")
+
+        googleapiclient = _module("googleapiclient")
+        discovery = _module("googleapiclient.discovery", build=fake_build)
+        googleapiclient.discovery = discovery
+        sys.modules["googleapiclient"] = googleapiclient
+        sys.modules["googleapiclient.discovery"] = discovery
+        sys.modules["httplib2"] = _module("httplib2", Http=lambda timeout=None, **kwargs: None)
+
+        sys.modules["youtube_transcript_api"] = _module(
+            "youtube_transcript_api", YouTubeTranscriptApi=FakeYouTubeTranscriptApi
+        )
+
+    if fake_llm:
+        sys.modules["llama_cpp"] = _module("llama_cpp", Llama=FakeLlama)
+
+
+def reset_calls():
+    with _calls_lock:
+        for k in CALLS:
+            CALLS[k] = 0
@@ -0,0 +1,145 @@
+# streamlit_app/bench/model_pool.py
+"""
+모델 워커 풀(utils/model_pool.py) 워커 수별 처리량 측정.
+
+K = 1..N개 워커로 풀을 띄우고 tools/tune_corpus.json의 요약 + 퀴즈 요청을 한꺼번에 넣어서
+전체 초당 생성 토큰(aggregate tokens/sec)과 요청 지연을 비교한다.
+워커 k개는 물리 코어를 겹치지 않게 나눠 가진다 (워커당 코어 = 전체 / k).
+
+사용 예:
+    python -m bench.model_pool --model kanana-Q4_K_M.gguf             # K = 1..(물리 코어 / 4)
+    python -m bench.model_pool --model kanana-Q4_K_M.gguf --workers 1 2 4 8 --requests 32
+    python -m bench.model_pool --fake --workers 1 2 4                # 가짜 모델로 라우팅/재시작 흐름만 점검
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench.pipeline import percentile  # noqa: E402
+from llm_prompts import (  # noqa: E402
+    QUIZ_PARAMS,
+    QUIZ_SCHEMA,
+    SUMMARY_PARAMS,
+    format_quiz_messages,
+    format_summary_prompt,
+)
+from tools.tune_model import load_corpus  # noqa: E402
+from utils import model_pool  # noqa: E402
+from utils.model_profile import load_settings  # noqa: E402
+
+
+def _init_fake(time_scale: float):
+    """워커 프로세스에서 가짜 llama_cpp 등록 (spawn이라 부모의 sys.modules가 넘어가지 않음)."""
+    from bench import fakes
+
+    fakes.install(fakes.FakeConfig(time_scale=time_scale))
+
+
+def make_requests(corpus: list, count: int) -> list:
+    """(kind, payload, options) 목록: 요약과 퀴즈를 번갈아."""
+    requests = []
+    for i in range(count):
+        doc = corpus[(i // 2) % len(corpus)]
+        if i % 2 == 0:
+            requests.append(("complete", format_summary_prompt(doc["transcript"]), dict(SUMMARY_PARAMS)))
+        else:
+            # 요약 대신 자막 앞부분으로 퀴즈 (모델 출력에 따라 입력이 달라지지 않도록)
+            messages = format_quiz_messages(doc["transcript"][:1500], 5)
+            requests.append(("chat", messages, dict(QUIZ_PARAMS, schema=QUIZ_SCHEMA, num_items=5)))
+    return requests
+
+
+def run_k(k: int, args, model_path: str, llama_kwargs: dict, requests: list) -> dict:
+    initializer, initargs = (_init_fake, (args.time_scale,)) if args.fake else (None, ())
+    cores = model_pool.physical_cores()
+    if args.fake and k > len(cores):
+        # 가짜 모델은 CPU를 쓰지 않으므로 코어보다 많은 워커도 흐름 점검용으로 허용
+        cores = (cores * k)[:k]
+    start = time.perf_counter()
+    pool = model_pool.ModelPool(
+        k, model_path, llama_kwargs, cores=cores, initializer=initializer, initargs=initargs
+    )
+    startup_s = time.perf_counter() - start
+    try:
+        pool.ping()
+        latencies, tokens = [], 0
+        start = time.perf_counter()
+        submitted = [(time.perf_counter(), pool.submit(kind, payload, **options)) for kind, payload, options in requests]
+        for t0, future in submitted:
+            out = future.result()
+            latencies.append(time.perf_counter() - t0)
+            tokens += out.get("usage", {}).get("completion_tokens", 0)
+        wall = time.perf_counter() - start
+        health = pool.health()
+    finally:
+        pool.close()
+
+    return {
+        "workers": k,
+        "cores_per_worker": [len(w["cores"]) for w in health],
+        "startup_s": round(startup_s, 2),
+        "wall_s": round(wall, 3),
+        "requests": len(requests),
+        "completion_tokens": tokens,
+        "tokens_per_sec": round(tokens / wall, 2) if wall else 0.0,
+        "requests_per_min": round(len(requests) / wall * 60, 2) if wall else 0.0,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+        "served_per_worker": [w["served"] for w in health],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="모델 워커 풀 처리량 벤치마크")
+    parser.add_argument("--model", default="", help="GGUF 모델 (기본: 튜닝 프로필/LLM_MODEL_PATH)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[], help="측정할 워커 수 (기본: 1..물리코어/4)")
+    parser.add_argument("--requests", type=int, default=16, help="워커 수마다 넣을 요청 수 (요약/퀴즈 반반)")
+    parser.add_argument("--fake", action="store_true", help="가짜 모델(bench/fakes.py) 사용")
+    parser.add_argument("--time-scale", type=float, default=0.05, help="--fake 지연 배율")
+    parser.add_argument("--out", default="", help="결과 JSON 파일 (기본: stdout)")
+    args = parser.parse_args(argv)
+
+    model_path, llama_kwargs = load_settings(args.model or "")
+    model_path = args.model or model_path
+    if not args.fake and (not model_path or not os.path.exists(model_path)):
+        print(f"모델 파일이 없습니다: {model_path!r} (--model 로 지정하거나 --fake)", file=sys.stderr)
+        return 2
+
+    cores = model_pool.physical_cores()
+    counts = args.workers or list(range(1, max(1, len(cores) // model_pool.MIN_THREADS) + 1))
+    requests = make_requests(load_corpus(), args.requests)
+
+    results = []
+    for k in counts:
+        print(f"[워커 {k}개] 실행 중...", file=sys.stderr)
+        results.append(run_k(k, args, model_path, llama_kwargs, requests))
+
+    base = results[0]["tokens_per_sec"] or 1.0
+    for r in results:
+        r["speedup"] = round(r["tokens_per_sec"] / base, 3)
+
+    text = json.dumps(
+        {
+            "model": "fake" if args.fake else os.path.basename(model_path),
+            "physical_cores": len(cores),
+            "results": results,
+        },
+        ensure_ascii=False,
+        indent=2,
+    )
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+# streamlit_app/bench/pipeline.py
+"""
+검색 → 영상 선택 → 요약 → 퀴즈 전체 파이프라인 부하 테스트.
+
+사용 예:
+    python -m bench.pipeline --sessions 50 --concurrency 8 --time-scale 0.02
+    python -m bench.pipeline --out bench_result.json --baseline bench/baseline.json
+    python -m bench.pipeline --save-baseline bench/baseline.json
+
+YouTube / 자막 API는 기본적으로 bench/fakes.py의 가짜 구현을 사용한다.
+카세트(utils/transport.py)로 실제 응답을 기록해 두면 API 키 없이 같은 요청을 재생할 수 있다:
+    python -m bench.pipeline --record bench_cassette.db --live     # 실제 API 호출을 기록 (YOUTUBE_API_KEY 필요)
+    python -m bench.pipeline --replay bench_cassette.db            # 기록된 응답으로 실행 (네트워크 없음)
+--model 에 작은 GGUF 파일을 주면 실제 llama_cpp로, 아니면 가짜 모델로 돌린다.
+결과는 JSON으로 출력 (stdout 또는 --out 파일), 기준선과 비교해서 느려졌으면 종료 코드 1.
+
+기준선 비교 (compare):
+- 같은 실행 안에서 고정된 CPU 작업(control_ms)을 먼저 재서, 이번 기계가 기준선을 잰 기계보다 느리면
+  그 비율만큼 기준선을 늘려서 비교 (빠른 기계에서 기준을 더 조이지는 않음)
+- 허용치 = 기준 × 배율 × (1 + --tolerance) + --floor-ms: 몇 ms짜리 단계(검색 / 자막)의 꼬리 지연은
+  스레드 스케줄링만으로도 몇 ms씩 흔들리므로 비율만으로는 잡음과 회귀를 구분할 수 없음
+- 기본 세션 수 40 (단계마다 표본 40개, p95가 상위 2개 값에 좌우되지 않도록)
+"""
+
+import argparse
+import contextlib
+import importlib
+import json
+import math
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from bench import fakes
+
+ROOT = Path(__file__).resolve().parent.parent
+STAGES = ["search", "transcript", "summary", "quiz"]
+CONTROL_ROUNDS = 15  # control_ms: 고정 작업을 이만큼 재서 최솟값
+
+
+def percentile(values: list, pct: float) -> float:
+    """nearest-rank 백분위수."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def load_queries() -> list:
+    """강의계획서 json에서 검색어 목록 생성 (시간표 페이지와 같은 형식)."""
+    queries = []
+    for subject, filename in [
+        ("대학수학", "math.json"),
+        ("지식재산개론", "money.json"),
+        ("물리 및 실험", "mooli.json"),
+    ]:
+        path = ROOT / "pages" / filename
+        try:
+            syllabus = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            continue
+        for wk, data in syllabus.items():
+            content = (data.get("학습내용") or data.get("학습목표") or "").replace("\n", " ")
+            if content:
+                queries.append(f"{subject} {wk} {content}")
+    return queries or ["대학수학 5주 부분적분법"]
+
+
+def peak_rss_mb() -> float:
+    # 리눅스: KB 단위, macOS: byte 단위
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {s: [] for s in STAGES}
+        self.errors = {s: 0 for s in STAGES}
+
+    def timed(self, stage: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.errors[stage] += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.latencies[stage].append(elapsed)
+
+
+def run_session(app, recorder: Recorder, rng: random.Random, queries: list, hot: bool):
+    """
+    사용자 1명이 메인 페이지 → 퀴즈 페이지까지 가는 흐름.
+    hot=True면 '교수님이 올린 영상'처럼 모두 같은 검색어의 첫 번째 영상을 연다.
+    """
+    query = queries[0] if hot else rng.choice(queries)
+    results = recorder.timed("search", app["search"], query, max_results=10)
+    if not results:
+        return
+    video = results[0] if hot else rng.choice(results[:3])
+    transcript = recorder.timed("transcript", app["transcript"], video["video_id"], language="ko")
+    summary = recorder.timed("summary", app["summarize"], transcript)
+    recorder.timed("quiz", app["quiz"], summary, num_questions=5)
+
+
+def collect_cache_stats(modules: list) -> dict:
+    """앱 모듈이 cache_stats()를 제공하면 모아서 히트율 계산."""
+    stats = {}
+    for mod in modules:
+        fn = getattr(mod, "cache_stats", None)
+        if not callable(fn):
+            continue
+        for name, s in fn().items():
+            total = s.get("hits", 0) + s.get("misses", 0)
+            stats[name] = dict(s, hit_rate=(s.get("hits", 0) / total) if total else 0.0)
+    return stats
+
+
+def measure_control() -> float:
+    """
+    기계 속도 기준: 고정된 순수 Python 작업(JSON 왕복 + 정렬 + 문자열 처리) 한 번의 최솟값 (ms).
+    처음 몇 번은 CPU 클럭이 오르기 전이라 느리므로 중앙값 대신 최솟값.
+    """
+    rng = random.Random(1234)
+    docs = [
+        {"id": i, "title": "".join(rng.choice("가나다라마바사아자차카타파하") for _ in range(20)), "score": rng.random()}
+        for i in range(2000)
+    ]
+    times = []
+    for _ in range(CONTROL_ROUNDS):
+        start = time.perf_counter()
+        data = json.loads(json.dumps(docs, ensure_ascii=False))
+        data.sort(key=lambda d: (d["score"], d["title"]))
+        "".join(d["title"] for d in data).count("가")
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def run(args) -> dict:
+    config = fakes.FakeConfig(time_scale=args.time_scale, seed=args.seed)
+    fakes.install(config, fake_llm=not args.model, fake_youtube=not (args.live or args.replay))
+    # utils/transport.py는 import할 때 모드를 읽으므로 앱 모듈보다 먼저 설정
+    if args.record or args.replay:
+        os.environ["APP_TRANSPORT_MODE"] = "record" if args.record else "replay"
+        os.environ["APP_CASSETTE"] = str(Path(args.record or args.replay).resolve())
+    if args.model:
+        os.environ["LLM_MODEL_PATH"] = args.model
+    # videos().list 묶음 대기 시간도 다른 지연과 같은 배율로 줄임
+    os.environ.setdefault("YOUTUBE_BATCH_WINDOW", str(0.03 * args.time_scale))
+    # 영구 캐시(자막/요약/퀴즈)가 이전 실행 결과로 채워져 있으면 비교가 안 되므로 매번 빈 폴더 사용
+    os.environ.setdefault("APP_DATA_DIR", tempfile.mkdtemp(prefix="bench_data_"))
+
+    sys.path.insert(0, str(ROOT))
+    # llm.py의 로딩 메시지가 JSON 출력에 섞이지 않도록 stderr로 보냄
+    with contextlib.redirect_stdout(sys.stderr):
+        llm = importlib.import_module("llm")
+        # 모델은 첫 호출 때 로딩되므로, 측정에 섞이지 않게 미리 올림
+        llm.get_model()
+    youtube_api = importlib.import_module("utils.youtube_api2")
+    transcript = importlib.import_module("utils.transcript")
+    singleflight = importlib.import_module("utils.singleflight")
+    telemetry = importlib.import_module("utils.telemetry")
+    cache = importlib.import_module("utils.cache")
+    transport = importlib.import_module("utils.transport")
+
+    app = {
+        "search": youtube_api.search_youtube_videos,
+        "transcript": transcript.fetch_transcript,
+        "summarize": llm.summarize_text,
+        "quiz": llm.generate_quiz,
+    }
+
+    control_ms = measure_control()
+    queries = load_queries()
+    recorder = Recorder()
+    fakes.reset_calls()
+    failed_sessions = 0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        hot_rng = random.Random(args.seed)
+        futures = [
+            pool.submit(
+                run_session,
+                app,
+                recorder,
+                random.Random(args.seed + i),
+                queries,
+                hot_rng.random() < args.hot_ratio,
+            )
+            for i in range(args.sessions)
+        ]
+        for f in futures:
+            try:
+                f.result()
+            except Exception:
+                failed_sessions += 1
+    wall = time.perf_counter() - start
+
+    stages = {}
+    for stage in STAGES:
+        lat = recorder.latencies[stage]
+        stages[stage] = {
+            "count": len(lat),
+            "errors": recorder.errors[stage],
+            "mean_ms": round(sum(lat) / len(lat), 3) if lat else 0.0,
+            "p50_ms": round(percentile(lat, 50), 3),
+            "p95_ms": round(percentile(lat, 95), 3),
+            "p99_ms": round(percentile(lat, 99), 3),
+        }
+
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "concurrency": args.concurrency,
+            "time_scale": args.time_scale,
+            "seed": args.seed,
+            "hot_ratio": args.hot_ratio,
+            "model": args.model or "fake",
+            "transport": transport.MODE,
+        },
+        "control_ms": round(control_ms, 3),
+        "wall_time_s": round(wall, 3),
+        "throughput_sessions_per_s": round((args.sessions - failed_sessions) / wall, 3),
+        "failed_sessions": failed_sessions,
+        "stages": stages,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "cache": collect_cache_stats([cache, youtube_api, transcript, llm]),
+        "quota": youtube_api.quota_report(),
+        "singleflight": singleflight.stats(),
+        "upstream_calls": dict(fakes.CALLS),
+        "cassette": transport.get_cassette().counts() if transport.MODE != transport.PASSTHROUGH else {},
+        "telemetry": telemetry.snapshot() if telemetry.ENABLED else {},
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float, floor_ms: float = 0.0) -> list:
+    """기준선 대비 느려진 항목 목록 (비어 있으면 통과)."""
+    # 이번 기계가 느리면 그만큼 기준을 늘림 (control_ms가 없는 예전 기준선은 그대로)
+    scale = 1.0
+    if baseline.get("control_ms") and result.get("control_ms"):
+        scale = max(1.0, result["control_ms"] / baseline["control_ms"])
+
+    regressions = []
+    for stage, base in baseline.get("stages", {}).items():
+        cur = result["stages"].get(stage)
+        if not cur:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if not base.get(metric):
+                continue
+            allowed = base[metric] * scale * (1 + tolerance) + floor_ms
+            if cur[metric] > allowed:
+                regressions.append(
+                    f"{stage}.{metric}: {base[metric]:.1f} → {cur[metric]:.1f} (허용 {allowed:.1f})"
+                )
+
+    base_tp = baseline.get("throughput_sessions_per_s")
+    if base_tp and result["throughput_sessions_per_s"] * scale < base_tp * (1 - tolerance):
+        regressions.append(
+            f"throughput: {base_tp:.2f} → {result['throughput_sessions_per_s']:.2f} sessions/s"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="검색→요약→퀴즈 파이프라인 벤치마크")
+    parser.add_argument("--sessions", type=int, default=40, help="시뮬레이션할 세션 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 세션 수")
+    parser.add_argument("--time-scale", type=float, default=0.02, help="가짜 지연 배율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--hot-ratio", type=float, default=0.0, help="같은 영상을 여는 세션 비율 (0~1)"
+    )
+    parser.add_argument("--model", default="", help="실제 GGUF 모델 경로 (없으면 가짜 모델)")
+    parser.add_argument("--out", default="", help="결과 JSON 파일 (없으면 stdout)")
+    parser.add_argument("--baseline", default="", help="비교할 기준선 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 악화 비율")
+    parser.add_argument("--floor-ms", type=float, default=10.0, help="비율에 더하는 허용 지연 (ms, 짧은 단계의 잡음 흡수)")
+    parser.add_argument("--save-baseline", default="", help="이번 결과를 기준선으로 저장")
+    parser.add_argument("--record", default="", help="YouTube/자막 응답을 이 카세트 파일에 기록")
+    parser.add_argument("--replay", default="", help="이 카세트 파일의 응답으로만 실행")
+    parser.add_argument("--live", action="store_true", help="가짜 대신 실제 YouTube/자막 API 사용 (--record와 함께)")
+    args = parser.parse_args(argv)
+    if args.record and args.replay:
+        parser.error("--record와 --replay는 함께 쓸 수 없습니다.")
+
+    result = run(args)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            result["regressions"] = compare(result, json.load(f), args.tolerance, args.floor_ms)
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(text + "\n", encoding="utf-8")
+
+    if result.get("regressions"):
+        for r in result["regressions"]:
+            print(f"[REGRESSION] {r}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+# streamlit_app/bench/quiz_render.py
+"""
+퀴즈 페이지(pages/퀴즈.py) 렌더러 비교: 클릭 한 번에 다시 보내는 양과 재실행 지연.
+
+  classic  문제마다 제목 + 보기 버튼 4개 + 간격 div + expander, 클릭하면 st.rerun()으로 페이지 전체 재실행
+  board    문제 전체를 컴포넌트 하나로 (utils/quiz_board.py), 클릭하면 st.fragment 영역만 재실행
+
+브라우저 없이 Streamlit 스크립트 실행기(streamlit.testing의 LocalScriptRunner)로 실제 페이지를 돌린다.
+탭 하나처럼 세션 상태와 fragment 저장소를 계속 들고 있으면서, 클릭은 브라우저가 보내는 것과 같은
+위젯 상태(버튼 trigger / 컴포넌트 json 값)로 넣고, board는 실제 fragment 재실행 요청으로 실행.
+문제 수(--sizes)마다
+- 처음 열 때 / 클릭 한 번에 서버가 만드는 ForwardMsg 바이트와 요소 수, 재실행 지연 (p50 / p95)
+- 실제 전송 바이트 (추정): Streamlit 서버의 메시지 캐시 규칙(global.minCachedMessageSize 이상인
+  new_element는 이 탭에 이미 보냈으면 해시 참조만 보냄)을 공개 proto로 직접 흉내 내서 계산
+  (board는 fragment 재실행에서도 컴포넌트 인자가 그대로라 문제 목록을 다시 보내지 않음).
+  이 수치는 메시지 캐시가 켜져 있어야 성립함 — 설치된 Streamlit의 ForwardMsg에 ref_hash가 없으면
+  wire_bytes = bytes로 두고 결과의 message_cache를 false로 표시
+- 같은 보기를 골랐을 때 두 렌더러의 정답 수 / 풀이 기록(attempts) 수가 같은지
+
+Streamlit 필요. 스크립트 실행기(streamlit.testing.v1.local_script_runner), PagesManager, SessionState 등
+Streamlit 내부 모듈을 쓰므로 버전에 묶여 있음: TESTED_STREAMLIT 버전에서 확인했고,
+다른 버전이면 경고를 내고 실행하며, 필요한 내부 모듈이 없거나 fragment 재실행이 페이지 전체 실행으로
+바뀌면 (잘못된 수치를 내지 않도록) 이유를 출력하고 종료 코드 2로 끝냄.
+
+사용 예:
+    python -m bench.quiz_render
+    python -m bench.quiz_render --sizes 5,20,50,100 --clicks 10 --out quiz_render.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench.pipeline import percentile  # noqa: E402
+
+PAGE = ROOT / "pages" / "퀴즈.py"
+TESTED_STREAMLIT = ("1.40", "1.45", "1.50", "1.66")  # 이 벤치를 돌려 본 Streamlit (major.minor)
+RENDERERS = ("classic", "board")
+WORDS = ["극한", "미분", "적분", "행렬", "벡터", "정리", "증명", "함수", "수렴", "급수", "연속", "고유값"]
+
+
+def make_items(rng: random.Random, n: int) -> list:
+    """LLM이 만드는 것과 비슷한 길이의 4지선다 문제."""
+    items = []
+    for i in range(n):
+        items.append(
+            {
+                "question": f"{i + 1}번: " + " ".join(rng.choices(WORDS, k=12)) + "에 대한 설명으로 옳은 것은?",
+                "options": [" ".join(rng.choices(WORDS, k=4)) for _ in range(4)],
+                "answer_index": rng.randrange(4),
+                "explanation": " ".join(rng.choices(WORDS, k=25)) + ".",
+            }
+        )
+    return items
+
+
+class StreamlitUnsupported(RuntimeError):
+    """설치된 Streamlit에 벤치가 쓰는 내부 모듈이 없음."""
+
+
+def load_streamlit():
+    """벤치가 쓰는 Streamlit 내부 모듈을 한곳에서 가져옴. 없으면 StreamlitUnsupported."""
+    try:
+        import streamlit
+    except ImportError as exc:
+        raise StreamlitUnsupported(f"Streamlit을 가져올 수 없음 ({exc})") from exc
+    version = ".".join(streamlit.__version__.split(".")[:2])
+    try:
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState, WidgetStates
+        from streamlit.runtime.fragment import MemoryFragmentStorage
+        from streamlit.runtime.pages_manager import PagesManager
+        from streamlit.runtime.scriptrunner import RerunData
+        from streamlit.runtime.state import SafeSessionState, SessionState
+        from streamlit.testing.v1.local_script_runner import LocalScriptRunner, require_widgets_deltas
+    except ImportError as exc:
+        raise StreamlitUnsupported(
+            f"Streamlit {streamlit.__version__}에서 내부 모듈을 가져올 수 없음 ({exc}); "
+            f"확인한 버전: {', '.join(TESTED_STREAMLIT)}"
+        ) from exc
+    if version not in TESTED_STREAMLIT:
+        print(
+            f"경고: Streamlit {streamlit.__version__}은 확인하지 않은 버전 (확인: {', '.join(TESTED_STREAMLIT)})",
+            file=sys.stderr,
+        )
+    return {
+        "ForwardMsg": ForwardMsg,
+        "WidgetState": WidgetState,
+        "WidgetStates": WidgetStates,
+        "MemoryFragmentStorage": MemoryFragmentStorage,
+        "PagesManager": PagesManager,
+        "RerunData": RerunData,
+        "SafeSessionState": SafeSessionState,
+        "SessionState": SessionState,
+        "LocalScriptRunner": LocalScriptRunner,
+        "require_widgets_deltas": require_widgets_deltas,
+        "version": streamlit.__version__,
+        "message_cache": "ref_hash" in ForwardMsg.DESCRIPTOR.fields_by_name,
+    }
+
+
+class MessageCache:
+    """서버 메시지 캐시 흉내: 큰 new_element는 탭에 한 번만 보내고 그다음부터 해시 참조."""
+
+    def __init__(self, forward_msg_cls, enabled: bool):
+        from streamlit import config
+
+        self.forward_msg_cls = forward_msg_cls
+        self.enabled = enabled
+        self.min_size = config.get_option("global.minCachedMessageSize")
+        self.sent = set()  # 이 탭에 이미 보낸 메시지 해시
+
+    def wire_size(self, msg) -> int:
+        size = msg.ByteSize()
+        if not self.enabled or msg.WhichOneof("type") != "delta" or msg.delta.WhichOneof("type") != "new_element":
+            return size
+        body = self.forward_msg_cls()
+        body.CopyFrom(msg)
+        body.ClearField("metadata")  # 위치(delta_path)는 해시에서 뺌
+        body.ClearField("hash")  # 실행기가 이미 채워 둔 버전도 있음
+        serialized = body.SerializeToString(deterministic=True)
+        if len(serialized) < self.min_size:
+            return size
+        msg_hash = hashlib.md5(serialized).hexdigest()
+        if msg_hash not in self.sent:
+            self.sent.add(msg_hash)
+            return size
+        ref = self.forward_msg_cls(ref_hash=msg_hash)
+        ref.metadata.CopyFrom(msg.metadata)
+        return ref.ByteSize()
+
+
+class PageSession:
+    """브라우저 탭 하나: 같은 세션 상태 / fragment 저장소로 페이지를 여러 번 실행."""
+
+    def __init__(self, script: Path, st: dict):
+        self.st = st
+        self.script = str(script)
+        self.state = st["SafeSessionState"](st["SessionState"](), lambda: None)
+        self.fragments = st["MemoryFragmentStorage"]()
+        self.pages = st["PagesManager"](self.script, setup_watcher=False)
+        self.widgets = {}  # 브라우저가 매번 다시 보내는 위젯 값 (컴포넌트 값)
+        self.ids = {}  # 위젯 key → 위젯 id
+        self.fragment_ids = set()
+        self.cache = MessageCache(st["ForwardMsg"], st["message_cache"])
+
+    def run(self, clicks=(), fragment_id=None) -> dict:
+        """한 번 실행 (clicks: 이번에만 누른 버튼 id). 보낸 바이트 / 요소 수 / 지연 반환."""
+        st = self.st
+        states = st["WidgetStates"]()
+        states.widgets.extend(self.widgets.values())
+        for widget_id in clicks:
+            states.widgets.append(st["WidgetState"](id=widget_id, trigger_value=True))
+
+        runner = st["LocalScriptRunner"](self.script, self.state, self.pages)
+        runner._fragment_storage = self.fragments  # 실행기마다 새로 만들지 않고 탭 단위로 유지
+        # 1.66 등은 실행기를 만들 때 전체 재실행 요청을 미리 넣어 둬서, 아래 요청이 거기에 합쳐지면
+        # fragment 재실행이 전체 실행으로 바뀜 → 시작 전에 빈 요청 큐로 바꿔 이번 요청만 남김
+        runner._requests = type(runner._requests)()
+        rerun = st["RerunData"](
+            widget_states=states,
+            fragment_id_queue=[fragment_id] if fragment_id else [],
+            is_fragment_scoped_rerun=bool(fragment_id),
+        )
+        start = time.perf_counter()
+        runner.request_rerun(rerun)
+        runner.start()
+        st["require_widgets_deltas"](runner, timeout=60)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if fragment_id and not any(data.get("fragment_ids_this_run") for data in runner.event_data):
+            raise StreamlitUnsupported("fragment 재실행을 요청했는데 페이지 전체가 실행됨 (실행기 동작이 바뀐 버전)")
+
+        msgs = runner.forward_msgs()
+        raw = sum(m.ByteSize() for m in msgs)
+        wire = elements = 0
+        for msg in msgs:
+            wire += self.cache.wire_size(msg)
+            if msg.WhichOneof("type") != "delta":
+                continue
+            delta = msg.delta
+            kind = delta.WhichOneof("type")
+            if kind not in ("new_element", "add_block"):
+                continue
+            elements += 1
+            if delta.fragment_id:
+                self.fragment_ids.add(delta.fragment_id)
+            if kind == "new_element":
+                element = delta.new_element
+                which = element.WhichOneof("type")
+                if which == "button":
+                    self.ids[element.button.id.rsplit("-", 1)[-1]] = element.button.id
+                elif which == "component_instance":
+                    self.ids["component"] = element.component_instance.id
+                    self.component_fragment = delta.fragment_id
+        return {
+            "bytes": raw,
+            "wire_bytes": wire,
+            "elements": elements,
+            "ms": elapsed_ms,
+        }
+
+    def set_component_value(self, value: dict):
+        widget_id = self.ids["component"]
+        self.widgets[widget_id] = self.st["WidgetState"](id=widget_id, json_value=json.dumps(value))
+
+
+def install_runtime():
+    """AppTest와 같은 가짜 Runtime (미디어 / 캐시 / 컴포넌트 등록만 실제 구현)."""
+    from unittest.mock import MagicMock
+
+    from streamlit.components.lib.local_component_registry import LocalComponentRegistry
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.component_registry = LocalComponentRegistry()
+    Runtime._instance = runtime
+
+
+def run_quiz(st: dict, renderer: str, items: list, choices: list, tag: str) -> dict:
+    """한 렌더러로 퀴즈를 열고 choices 순서대로 풀어 봄."""
+    from utils import quiz_board
+    from utils.quiz_session import get_quiz_store, make_quiz_id
+
+    quiz_board.RENDERER = renderer
+    session = PageSession(PAGE, st)
+    summary = f"{tag} 벤치 요약"
+    quiz_id = make_quiz_id(summary, num_questions=5)
+    session.state["quiz_source_summary"] = summary
+    session.state["quiz_source_summary_snapshot"] = quiz_id
+    quiz_session = get_quiz_store(session.state).start(quiz_id, items)
+
+    first = session.run()
+    clicks, answers = [], {}
+    for idx, choice in choices:
+        if renderer == "classic":
+            button = session.ids[f"{quiz_id}_q{idx + 1}_btn_{choice}"]
+            clicks.append(session.run(clicks=[button]))
+        else:
+            answers[str(idx)] = choice
+            session.set_component_value({"quiz_id": quiz_id, "answers": dict(answers)})
+            clicks.append(session.run(fragment_id=session.component_fragment))
+    return {
+        "quiz_id": quiz_id,
+        "first": first,
+        "clicks": clicks,
+        "answered": quiz_session.answered_count,
+        "correct": quiz_session.correct_count,
+    }
+
+
+def count_attempts(quiz_id: str) -> int:
+    from utils.analytics import DB_FILE
+    from utils.storage import connect
+
+    conn = connect(DB_FILE)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM attempts WHERE quiz_id = ?", (quiz_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def summarize(run: dict) -> dict:
+    clicks = run["clicks"]
+    return {
+        "first_bytes": run["first"]["bytes"],
+        "first_elements": run["first"]["elements"],
+        "first_ms": round(run["first"]["ms"], 1),
+        "click_bytes_p50": round(percentile([c["bytes"] for c in clicks], 50)),
+        "click_bytes_max": max(c["bytes"] for c in clicks),
+        "click_wire_bytes_p50": round(percentile([c["wire_bytes"] for c in clicks], 50)),
+        "click_elements_p50": percentile([c["elements"] for c in clicks], 50),
+        "click_ms_p50": round(percentile([c["ms"] for c in clicks], 50), 1),
+        "click_ms_p95": round(percentile([c["ms"] for c in clicks], 95), 1),
+        "answered": run["answered"],
+        "correct": run["correct"],
+        "attempts": count_attempts(run["quiz_id"]),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="퀴즈 렌더러(classic / board) 전송량 · 재실행 지연 비교")
+    parser.add_argument("--sizes", default="5,20,50", help="문제 수 목록 (쉼표로 구분)")
+    parser.add_argument("--clicks", type=int, default=10, help="문제 수별 클릭 수 (문제 수보다 많으면 문제 수)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default="", help="결과 JSON 파일 (기본: stdout)")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("APP_DATA_DIR", tempfile.mkdtemp(prefix="bench_quiz_render_"))
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")  # 실행기 로그 / 세션 상태 경고 숨김
+    try:
+        st = load_streamlit()
+        install_runtime()
+    except (StreamlitUnsupported, ImportError) as exc:
+        print(f"bench.quiz_render를 실행할 수 없음: {exc}", file=sys.stderr)
+        return 2
+
+    rng = random.Random(args.seed)
+    result, ok = {"streamlit": st["version"], "message_cache": st["message_cache"], "sizes": {}}, True
+    for n in (int(s) for s in args.sizes.split(",") if s.strip()):
+        items = make_items(rng, n)
+        order = rng.sample(range(n), min(args.clicks, n))
+        choices = [(idx, rng.randrange(4)) for idx in order]
+        print(f"[{n}문제] 클릭 {len(choices)}번 ...", file=sys.stderr)
+
+        try:
+            size = {r: summarize(run_quiz(st, r, items, choices, f"{r}-{n}")) for r in RENDERERS}
+        except StreamlitUnsupported as exc:
+            print(f"bench.quiz_render를 실행할 수 없음: {exc}", file=sys.stderr)
+            return 2
+        classic, board = size["classic"], size["board"]
+        size["click_bytes_ratio"] = round(board["click_bytes_p50"] / classic["click_bytes_p50"], 3)
+        size["click_wire_bytes_ratio"] = round(board["click_wire_bytes_p50"] / classic["click_wire_bytes_p50"], 3)
+        size["click_ms_ratio"] = round(board["click_ms_p50"] / classic["click_ms_p50"], 3)
+        size["same_result"] = (
+            classic["answered"] == board["answered"] == len(choices)
+            and classic["correct"] == board["correct"]
+            and classic["attempts"] == board["attempts"] == len(choices)
+        )
+        ok = ok and size["same_result"]
+        result["sizes"][str(n)] = size
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+# streamlit_app/bench/resilience.py
+"""
+외부 호출 정책(utils/resilience.py) 장애 주입 점검.
+
+로컬 스텁(FaultyUpstream)과 bench/fakes.py의 장애 주입(fakes.FAULTS)으로
+느린 응답, 일시적 오류, 4xx, 연속 장애를 만들어서 다음을 확인한다.
+
+    deadline        응답이 없으면 마감 시간 안에 UpstreamTimeout
+    retry           일시적 오류는 지터 백오프로 재시도해서 성공
+    no_retry_4xx    404 같은 요청 오류는 재시도하지 않음
+    hedge           첫 요청이 느리면 두 번째 요청의 응답을 사용
+    breaker         연속 실패 → 서킷 열림(호출 안 함, fallback 반환) → 시험 호출로 복구
+    transcript      자막 없음 / 네트워크 오류가 문자열이 아니라 TranscriptError로 나옴, 캐시도 오염 안 됨
+    transcript_hedge 자막 목록 조회가 느리면 헤징으로 꼬리 지연을 자름
+    search_stale    YouTube 검색 장애 시 만료된 캐시 결과를 대신 반환
+
+사용 예:
+    python -m bench.resilience            # 모두 통과하면 종료 코드 0
+    python -m bench.resilience --only breaker --only hedge
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from bench import fakes
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHECKS = {}
+APP_CHECKS = {"transcript", "transcript_hedge", "search_stale"}  # 앱 정책 + 시간 배율 사용
+
+
+def check(fn):
+    CHECKS[fn.__name__.removeprefix("check_")] = fn
+    return fn
+
+
+class FaultyUpstream:
+    """호출 횟수를 세고, 앞의 fail_first번은 실패, slow_calls번째 호출은 느리게 응답하는 로컬 스텁."""
+
+    def __init__(self, fail_first=0, error=None, latency=0.0, slow_calls=(), slow_latency=0.0, result="ok"):
+        self.fail_first = fail_first
+        self.error = error or (lambda: ConnectionError("연결이 끊어졌습니다 (주입한 장애)"))
+        self.latency = latency
+        self.slow_calls = set(slow_calls)
+        self.slow_latency = slow_latency
+        self.result = result
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        time.sleep(self.slow_latency if n in self.slow_calls else self.latency)
+        if n <= self.fail_first:
+            raise self.error()
+        return self.result
+
+
+class FakeHttpError(Exception):
+    """googleapiclient.errors.HttpError 흉내 (resp.status)."""
+
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.resp = SimpleNamespace(status=status)
+
+
+def _expect_raises(exc_type, fn):
+    try:
+        fn()
+    except exc_type as e:
+        return e
+    except Exception as e:  # noqa: BLE001
+        raise AssertionError(f"{exc_type.__name__} 대신 {type(e).__name__}: {e}") from e
+    raise AssertionError(f"{exc_type.__name__}가 나지 않음")
+
+
+# ================================================================
+# 정책 단위 점검 (로컬 스텁)
+# ================================================================
+@check
+def check_deadline(resilience):
+    resilience.POLICIES["stub.deadline"] = resilience.Policy(timeout=0.5, attempt_timeout=0.2, attempts=3)
+    stub = FaultyUpstream(latency=2.0)
+    start = time.perf_counter()
+    _expect_raises(resilience.UpstreamTimeout, lambda: resilience.call("stub.deadline", stub))
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.8, f"마감 0.5초인데 {elapsed:.2f}초 기다림"
+    return f"{elapsed:.2f}s 만에 UpstreamTimeout, 시도 {stub.calls}번"
+
+
+@check
+def check_retry(resilience):
+    resilience.POLICIES["stub.retry"] = resilience.Policy(
+        timeout=5, attempt_timeout=1, attempts=4, backoff=0.05, max_backoff=0.2
+    )
+    stub = FaultyUpstream(fail_first=2)
+    assert resilience.call("stub.retry", stub) == "ok"
+    assert stub.calls == 3, f"호출 {stub.calls}번 (3번 예상)"
+    return "오류 2번 뒤 3번째 시도에서 성공"
+
+
+@check
+def check_no_retry_4xx(resilience):
+    resilience.POLICIES["stub.4xx"] = resilience.Policy(timeout=5, attempt_timeout=1, attempts=4, backoff=0.01)
+    stub = FaultyUpstream(fail_first=99, error=lambda: FakeHttpError(404))
+    _expect_raises(FakeHttpError, lambda: resilience.call("stub.4xx", stub))
+    assert stub.calls == 1, f"404인데 {stub.calls}번 호출"
+
+    stub = FaultyUpstream(fail_first=1, error=lambda: FakeHttpError(503))
+    assert resilience.call("stub.4xx", stub) == "ok"
+    assert stub.calls == 2, f"503 뒤 재시도 안 함 (호출 {stub.calls}번)"
+    return "404는 1번만, 503은 재시도"
+
+
+@check
+def check_hedge(resilience):
+    resilience.POLICIES["stub.hedge"] = resilience.Policy(
+        timeout=5, attempt_timeout=3, attempts=1, hedge_after=0.1
+    )
+    stub = FaultyUpstream(latency=0.02, slow_calls={1}, slow_latency=1.5)
+    start = time.perf_counter()
+    assert resilience.call("stub.hedge", stub) == "ok"
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.5, f"헤징했는데 {elapsed:.2f}초"
+    assert stub.calls == 2, f"호출 {stub.calls}번 (2번 예상)"
+    return f"느린 첫 요청(1.5s) 대신 헤징 요청으로 {elapsed:.2f}s"
+
+
+@check
+def check_breaker(resilience):
+    resilience.POLICIES["stub.breaker"] = resilience.Policy(
+        timeout=1, attempt_timeout=0.5, attempts=1, failure_threshold=3, reset_after=0.3
+    )
+    stub = FaultyUpstream(fail_first=3)
+    for _ in range(3):
+        _expect_raises(resilience.UpstreamError, lambda: resilience.call("stub.breaker", stub))
+    breaker = resilience.get_breaker("stub.breaker")
+    assert breaker.is_open(), f"연속 3번 실패 후 상태 {breaker.state}"
+
+    _expect_raises(resilience.CircuitOpen, lambda: resilience.call("stub.breaker", stub))
+    cached = resilience.call("stub.breaker", stub, fallback=lambda: "cached")
+    assert cached == "cached", f"fallback 대신 {cached!r}"
+    assert stub.calls == 3, f"서킷이 열렸는데 호출함 ({stub.calls}번)"
+
+    time.sleep(0.35)
+    assert resilience.call("stub.breaker", stub) == "ok"
+    assert breaker.state == resilience.CLOSED, f"시험 호출 성공 후 상태 {breaker.state}"
+    return "3번 실패 → 열림(호출 없이 fallback) → 0.3s 뒤 시험 호출 성공 → 닫힘"
+
+
+# ================================================================
+# 앱 코드 점검 (bench/fakes.py 장애 주입)
+# ================================================================
+@check
+def check_transcript(resilience):
+    from utils.content_cache import get_content_cache
+    from utils.transcript import TranscriptFetchFailed, TranscriptUnavailable, fetch_transcript
+
+    class NoTranscriptFound(Exception):
+        """youtube_transcript_api.NoTranscriptFound와 같은 이름."""
+
+    def no_transcript():
+        raise NoTranscriptFound("자막 없음 (주입한 장애)")
+
+    fakes.reset_calls()
+    fakes.FAULTS["transcript_list"] = no_transcript
+    try:
+        _expect_raises(TranscriptUnavailable, lambda: fetch_transcript("faultvid01"))
+    finally:
+        fakes.FAULTS.clear()
+    assert fakes.CALLS["transcript_list"] == 1, f"자막 없음인데 {fakes.CALLS['transcript_list']}번 조회"
+
+    def network_down():
+        raise ConnectionError("연결이 끊어졌습니다 (주입한 장애)")
+
+    fakes.reset_calls()
+    fakes.FAULTS["transcript_list"] = network_down
+    try:
+        error = _expect_raises(TranscriptFetchFailed, lambda: fetch_transcript("faultvid02"))
+    finally:
+        fakes.FAULTS.clear()
+    attempts = resilience.get_policy("transcript").attempts
+    assert fakes.CALLS["transcript_list"] == attempts, f"조회 {fakes.CALLS['transcript_list']}번"
+    assert get_content_cache().get_transcript("faultvid02", "ko") is None, "실패 결과가 캐시에 저장됨"
+
+    # 같은 영상의 실패는 잠깐(singleflight.ERROR_TTL) 공유되므로 다른 영상으로 복구 확인
+    text = fetch_transcript("faultvid04")
+    assert text.startswith("[ko] "), f"장애가 끝난 뒤 자막 {text[:20]!r}"
+    return f"자막 없음 → TranscriptUnavailable(1번), 네트워크 오류 → TranscriptFetchFailed({attempts}번): {error}"
+
+
+@check
+def check_transcript_hedge(resilience):
+    from utils.transcript import fetch_transcript
+
+    policy = resilience.get_policy("transcript")
+    slow = policy.hedge_after * resilience.TIMEOUT_SCALE * 10
+    first = threading.Event()
+
+    def slow_first():
+        if not first.is_set():
+            first.set()
+            time.sleep(slow)
+
+    fakes.FAULTS["transcript_list"] = slow_first
+    try:
+        start = time.perf_counter()
+        fetch_transcript("faultvid03")
+        elapsed = time.perf_counter() - start
+    finally:
+        fakes.FAULTS.clear()
+    assert elapsed < slow * 0.6, f"첫 조회가 {slow:.2f}s 걸리는데 {elapsed:.2f}s 기다림"
+    return f"첫 자막 조회 {slow:.2f}s 지연 → 헤징으로 {elapsed:.2f}s"
+
+
+@check
+def check_search_stale(resilience):
+    from utils import youtube_api2
+
+    fresh = youtube_api2.search_youtube_videos("극한 개념", max_results=5)
+    assert fresh, "검색 결과 없음"
+
+    def search_down():
+        raise ConnectionError("YouTube 연결 실패 (주입한 장애)")
+
+    ttl = youtube_api2.SEARCH_CACHE.ttl
+    youtube_api2.SEARCH_CACHE.ttl = 0  # 방금 결과도 만료된 것으로 취급
+    fakes.FAULTS["search"] = search_down
+    try:
+        stale = youtube_api2.search_youtube_videos("극한 개념", max_results=5)
+    finally:
+        fakes.FAULTS.clear()
+        youtube_api2.SEARCH_CACHE.ttl = ttl
+    assert stale == fresh, "장애 중에 예전 결과를 돌려주지 않음"
+    return f"검색 장애 중 만료된 캐시 결과 {len(stale)}개 반환"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="외부 호출 정책 장애 주입 점검")
+    parser.add_argument("--only", action="append", choices=list(CHECKS), help="실행할 점검 (기본: 전체)")
+    parser.add_argument("--time-scale", type=float, default=0.05, help="앱 정책(utils/resilience.py)의 시간 배율")
+    args = parser.parse_args(argv)
+
+    fakes.install(fakes.FakeConfig(time_scale=0.01))
+    os.environ.setdefault("APP_DATA_DIR", tempfile.mkdtemp(prefix="bench_resilience_"))
+    sys.path.insert(0, str(ROOT))
+    from utils import resilience
+
+    failures = 0
+    for name in args.only or list(CHECKS):
+        # 스텁 점검은 정책에 적은 시간 그대로, 앱 점검은 --time-scale 배율로
+        resilience.TIMEOUT_SCALE = args.time_scale if name in APP_CHECKS else 1.0
+        start = time.perf_counter()
+        try:
+            detail = CHECKS[name](resilience)
+            status = "PASS"
+        except Exception as e:  # noqa: BLE001
+            detail, status = f"{type(e).__name__}: {e}", "FAIL"
+            failures += 1
+        print(f"[{status}] {name:<17} {time.perf_counter() - start:6.2f}s  {detail}")
+
+    print(f"\n{len(args.only or CHECKS) - failures}/{len(args.only or CHECKS)} 통과")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
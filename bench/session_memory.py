@@ -0,0 +1,107 @@
+# streamlit_app/bench/session_memory.py
+"""
+동시 접속 세션 수에 따른 session_state 메모리 비교.
+
+사용 예:
+    python -m bench.session_memory --sessions 10 50 200 --videos 20
+
+세션마다 인기 영상(Zipf 분포) 하나를 골라 자막/요약/검색 결과를 session_state에 넣는다.
+- raw: 예전처럼 값을 session_state에 그대로 (자막은 매번 새 문자열로 받아 옴)
+- store: utils.content_store로 공유 저장소에 넣고 Handle만 보관
+tracemalloc으로 잰 증가량을 JSON으로 출력. store 쪽은 영상 수에 비례하고 세션 수에는 거의 비례하지 않아야 한다.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import tracemalloc
+
+from bench import fakes
+
+
+def make_transcript(video_idx: int, segments: int) -> str:
+    rng = random.Random(video_idx)
+    lines = [rng.choice(fakes.SAMPLE_SENTENCES) for _ in range(segments)]
+    # SQLite/네트워크에서 받아 온 것처럼 매번 새 문자열 객체
+    return "[ko] " + " ".join(lines)
+
+
+def make_results(query_idx: int) -> list:
+    return [
+        {
+            "video_id": f"v{query_idx:03d}{i:02d}",
+            "title": f"강의 {query_idx}-{i} " + fakes.SAMPLE_SENTENCES[i % len(fakes.SAMPLE_SENTENCES)],
+            "channel_title": "동아대학교",
+            "thumbnail": f"https://i.ytimg.com/vi/v{query_idx:03d}{i:02d}/default.jpg",
+            "view_count": 1000 * i,
+            "like_count": 10 * i,
+            "comment_count": i,
+            "published_at": "2025-03-01T00:00:00Z",
+        }
+        for i in range(10)
+    ]
+
+
+def pick_video(rng: random.Random, num_videos: int) -> int:
+    # 인기 강의에 몰리는 Zipf 비슷한 분포
+    weights = [1.0 / (i + 1) for i in range(num_videos)]
+    return rng.choices(range(num_videos), weights=weights)[0]
+
+
+def run(num_sessions: int, num_videos: int, segments: int, use_store: bool) -> int:
+    from utils import content_store
+
+    content_store._store = content_store.ContentStore()
+    rng = random.Random(num_sessions)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = []
+    for _ in range(num_sessions):
+        state = {}
+        vid = pick_video(rng, num_videos)
+        values = {
+            "search_results": make_results(vid % 5),
+            "video_transcript": make_transcript(vid, segments),
+            "ai_summary": make_transcript(vid, 3),
+            "quiz_source_summary": make_transcript(vid, 3),
+        }
+        for slot, value in values.items():
+            if use_store:
+                content_store.put(state, slot, value)
+            else:
+                state[slot] = value
+        sessions.append(state)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="session_state 메모리 벤치마크")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--segments", type=int, default=fakes.CONFIG.transcript_segments)
+    args = parser.parse_args()
+
+    os.environ.setdefault("APP_DATA_DIR", tempfile.mkdtemp(prefix="bench_mem_"))
+
+    report = []
+    for n in args.sessions:
+        raw = run(n, args.videos, args.segments, use_store=False)
+        shared = run(n, args.videos, args.segments, use_store=True)
+        report.append(
+            {
+                "sessions": n,
+                "raw_mb": round(raw / (1024 * 1024), 2),
+                "store_mb": round(shared / (1024 * 1024), 2),
+                "ratio": round(shared / raw, 3) if raw else None,
+            }
+        )
+    print(json.dumps({"videos": args.videos, "runs": report}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
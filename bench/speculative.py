@@ -0,0 +1,134 @@
+# streamlit_app/bench/speculative.py
+"""
+추측 디코딩(speculative decoding) vs 일반 디코딩 비교.
+
+tools/tune_corpus.json의 자막으로 요약 + 퀴즈(JSON Schema)를 모드별로 돌려서
+요청 시간, 초당 토큰, 초안 수락률, 퀴즈 JSON 성공률을 비교한다. 실제 llama_cpp와 GGUF 모델이 필요.
+
+사용 예:
+    python -m bench.speculative --model kanana-Q4_K_M.gguf
+    python -m bench.speculative --model kanana-Q4_K_M.gguf --draft-model small-Q4_K_M.gguf \\
+        --modes off lookup draft --repeat 2 --out spec_result.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from llm_prompts import (  # noqa: E402
+    QUIZ_PARAMS,
+    QUIZ_SCHEMA,
+    SUMMARY_PARAMS,
+    format_quiz_messages,
+    format_summary_prompt,
+)
+from tools.tune_model import load_corpus  # noqa: E402
+from utils import speculative  # noqa: E402
+from utils.model_profile import load_settings  # noqa: E402
+
+
+def run_mode(mode: str, args, llama_kwargs: dict, corpus: list) -> dict:
+    from llama_cpp import Llama
+
+    draft = None
+    if mode != "off":
+        draft = speculative.make_draft_model(
+            mode, args.draft_model, n_ctx=llama_kwargs.get("n_ctx"),
+            n_threads=llama_kwargs.get("n_threads"),
+        )
+    llm = Llama(model_path=args.model, verbose=False, draft_model=draft, **llama_kwargs)
+
+    tasks = {"summary": [], "quiz": []}
+    tokens = {"summary": 0, "quiz": 0}
+    json_ok = 0
+    outputs = []
+    for _ in range(args.repeat):
+        for doc in corpus:
+            t0 = time.perf_counter()
+            out = llm(prompt=format_summary_prompt(doc["transcript"]), **SUMMARY_PARAMS)
+            tasks["summary"].append(time.perf_counter() - t0)
+            tokens["summary"] += out["usage"]["completion_tokens"]
+            outputs.append(out["choices"][0]["text"])
+
+            t0 = time.perf_counter()
+            resp = llm.create_chat_completion(
+                messages=format_quiz_messages(doc["summary"], 5),
+                response_format={"type": "json_object", "schema": QUIZ_SCHEMA},
+                **QUIZ_PARAMS,
+            )
+            tasks["quiz"].append(time.perf_counter() - t0)
+            tokens["quiz"] += resp["usage"]["completion_tokens"]
+            content = resp["choices"][0]["message"]["content"]
+            outputs.append(content)
+            try:
+                json_ok += isinstance(json.loads(content).get("quizzes"), list)
+            except (ValueError, AttributeError):
+                pass
+
+    result = {"mode": mode}
+    for task, times in tasks.items():
+        total = sum(times)
+        result[task] = {
+            "mean_s": round(total / len(times), 3),
+            "tokens_per_s": round(tokens[task] / total, 2) if total else 0.0,
+        }
+    result["json_ok_ratio"] = round(json_ok / (len(corpus) * args.repeat), 3)
+    result["draft"] = draft.stats() if draft is not None else {}
+    result["_outputs"] = outputs
+
+    del llm, draft
+    gc.collect()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="추측 디코딩 벤치마크")
+    parser.add_argument("--model", default="", help="본 모델 GGUF (기본: 튜닝 프로필/LLM_MODEL_PATH)")
+    parser.add_argument("--draft-model", default=speculative.DRAFT_MODEL_PATH, help="draft 모드용 작은 GGUF")
+    parser.add_argument("--modes", nargs="+", default=["off", "lookup"], choices=["off", "lookup", "draft"])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--out", default="", help="결과 JSON 파일 (기본: stdout)")
+    args = parser.parse_args(argv)
+
+    model_path, llama_kwargs = load_settings(args.model or "")
+    args.model = args.model or model_path
+    if not args.model or not os.path.exists(args.model):
+        print(f"모델 파일이 없습니다: {args.model!r} (--model 로 지정)", file=sys.stderr)
+        return 2
+
+    corpus = load_corpus()
+    results = []
+    for mode in args.modes:
+        print(f"[{mode}] 실행 중...", file=sys.stderr)
+        results.append(run_mode(mode, args, llama_kwargs, corpus))
+
+    # 온도 0이 아니라 출력이 매번 같지는 않으므로 참고용으로만 표시
+    base = results[0]
+    for r in results:
+        r["same_output_as_" + base["mode"]] = r["_outputs"] == base["_outputs"]
+        r["summary"]["speedup"] = round(base["summary"]["mean_s"] / r["summary"]["mean_s"], 3)
+        r["quiz"]["speedup"] = round(base["quiz"]["mean_s"] / r["quiz"]["mean_s"], 3)
+    for r in results:
+        del r["_outputs"]
+
+    text = json.dumps(
+        {"model": os.path.basename(args.model), "corpus": len(corpus), "results": results},
+        ensure_ascii=False,
+        indent=2,
+    )
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# streamlit_app/bench/suggest.py
+"""
+검색어 추천(utils/suggest.py) 응답 시간 + 미리 불러오기 효과 측정.
+
+1) latency   가짜 검색 기록 --queries개를 넣은 색인에서 입력 앞부분(1글자 ~ 전체, 초성 포함)으로 추천
+             → p50 / p99 응답 시간, 색인 만드는 시간 (p99가 --budget-ms를 넘으면 종료 코드 1)
+2) prefetch  사용자가 앞부분을 입력 → 추천 목록을 보고 --think초 뒤 추천 검색어를 누름.
+             미리 불러오기 끔 / 켬을 비교해서 사용자가 기다린 검색 시간과 캐시 적중률을 본다.
+             YouTube는 bench/fakes.py의 가짜 클라이언트 (지연 시간만 흉내 냄)
+
+사용 예:
+    python -m bench.suggest
+    python -m bench.suggest --queries 50000 --budget-ms 5 --out suggest.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench import fakes  # noqa: E402
+from bench.pipeline import percentile  # noqa: E402
+
+WORDS = [
+    "미분", "적분", "극한", "연속", "편도함수", "테일러", "급수", "벡터", "행렬", "고유값",
+    "선형", "변환", "확률", "분포", "통계", "회귀", "자료구조", "알고리즘", "정렬", "그래프",
+    "트리", "해시", "스택", "큐", "재귀", "동적", "프로그래밍", "파이썬", "자바", "포인터",
+    "운영체제", "프로세스", "스레드", "메모리", "네트워크", "데이터베이스", "sql", "정규화",
+    "회로", "전자기", "역학", "열역학", "화학", "결합", "반응", "유기", "미시", "거시", "경제",
+    "개념", "정리", "예제", "풀이", "기초", "심화", "강의", "요약", "문제", "증명",
+]
+
+
+def synthetic_queries(n: int, seed: int) -> list:
+    """2~4단어 검색어 n개와 검색 횟수 (지프 분포: 소수 검색어가 대부분의 검색)."""
+    rng = random.Random(seed)
+    queries = set()
+    while len(queries) < n:
+        queries.add(" ".join(rng.sample(WORDS, rng.randint(2, 4))))
+    return [(q, max(1, int(1000 / (rank + 1) ** 1.1))) for rank, q in enumerate(sorted(queries))]
+
+
+def _with_initial(text: str) -> str:
+    """마지막 글자를 초성으로 바꿈 ('미분' → '미ㅂ')."""
+    from utils.suggest import _initial
+
+    return text[:-1] + _initial(text[-1])
+
+
+def run_latency(suggest_mod, args) -> dict:
+    from utils.storage import connect
+
+    conn = connect("suggest.db")
+    conn.executescript(suggest_mod.SCHEMA)
+    now = time.time()
+    conn.executemany(
+        "INSERT OR REPLACE INTO query_log (query, display, count, last_used) VALUES (?, ?, ?, ?)",
+        [(q, q, count, now) for q, count in synthetic_queries(args.queries, args.seed)],
+    )
+
+    suggester = suggest_mod.Suggester()
+    rng = random.Random(args.seed)
+    entries = suggester._index[2]
+    prefixes = []
+    for _ in range(args.samples):
+        norm = rng.choice(entries)[0]
+        start = rng.choice(suggest_mod._word_starts(norm))
+        text = norm[start : start + rng.randint(1, len(norm) - start)].strip() or norm
+        prefixes.append(_with_initial(text) if rng.random() < 0.2 else text)
+
+    saved_titles = [f"{rng.choice(WORDS)} {rng.choice(WORDS)} 강의 {i}강" for i in range(30)]
+    timings = []
+    empty = 0
+    for prefix in prefixes:
+        start = time.perf_counter()
+        results = suggester.suggest(prefix, limit=5, extra=saved_titles)
+        timings.append(time.perf_counter() - start)
+        empty += not results
+
+    ms = [t * 1000 for t in timings]
+    return {
+        **suggester.stats(),
+        "samples": len(ms),
+        "no_suggestion": empty,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(max(ms), 3),
+    }
+
+
+def run_prefetch(suggest_mod, args, enabled: bool) -> dict:
+    from utils import youtube_api2
+
+    youtube_api2.SEARCH_CACHE._data.clear()
+    fakes.CONFIG.seed = args.seed + int(enabled)  # 영상 정보 캐시도 서로 겹치지 않게
+    fakes.reset_calls()
+    suggest_mod.PREFETCH_ENABLED = enabled
+    suggester = suggest_mod.Suggester()
+
+    # 강의계획서 주차 검색어 중 일부를 많이 찾는다고 가정
+    rng = random.Random(args.seed)
+    popular = [display for _, display, _, source in suggester._index[2] if source == "syllabus"]
+    rng.shuffle(popular)
+    popular = popular[: args.popular]
+
+    lock = threading.Lock()
+    waits, hits = [], 0
+
+    def user(i: int):
+        nonlocal hits
+        urng = random.Random(args.seed * 1000 + i)
+        for _ in range(args.searches_per_user):
+            target = popular[min(int(urng.paretovariate(1.2)) - 1, len(popular) - 1)]
+            typed = target[: urng.randint(2, max(2, len(target) // 2))]
+            suggestions = suggester.suggest(typed, limit=5, prefetch=True)
+            time.sleep(args.think)
+            picked = next((s["query"] for s in suggestions if s["query"] == target), target)
+            cached = youtube_api2.is_search_cached(picked)
+            start = time.perf_counter()
+            youtube_api2.search_youtube_videos(picked, max_results=suggest_mod.SEARCH_MAX_RESULTS)
+            with lock:
+                waits.append(time.perf_counter() - start)
+                hits += cached
+            suggester.record(picked)
+            time.sleep(urng.expovariate(1 / args.think))
+
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(args.users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if suggester._executor is not None:
+        suggester._executor.shutdown(wait=True)
+
+    ms = [w * 1000 for w in waits]
+    return {
+        "prefetch": enabled,
+        "searches": len(ms),
+        "cache_hit_rate": round(hits / len(ms), 3) if ms else 0.0,
+        "wait_p50_ms": round(percentile(ms, 50), 1),
+        "wait_p95_ms": round(percentile(ms, 95), 1),
+        "search_calls": fakes.CALLS["search"],
+        "prefetched": suggester.prefetched,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="검색어 추천 응답 시간 / 미리 불러오기 벤치마크")
+    parser.add_argument("--queries", type=int, default=20000, help="가짜 검색 기록 수")
+    parser.add_argument("--samples", type=int, default=5000, help="추천 요청 수")
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="추천 p99 목표 (ms)")
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--searches-per-user", type=int, default=6)
+    parser.add_argument("--popular", type=int, default=40, help="자주 찾는 검색어 수")
+    parser.add_argument("--think", type=float, default=0.4, help="추천을 보고 누르기까지 (초)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default="", help="결과 JSON 파일 (기본: stdout)")
+    args = parser.parse_args(argv)
+
+    fakes.install(fakes.FakeConfig())
+    os.environ.setdefault("APP_DATA_DIR", tempfile.mkdtemp(prefix="bench_suggest_"))
+    os.environ.setdefault("YOUTUBE_DAILY_QUOTA", "1000000")
+    from utils import suggest as suggest_mod
+
+    print("[latency] 실행 중...", file=sys.stderr)
+    latency = run_latency(suggest_mod, args)
+
+    # 미리 불러오기 비교는 검색 기록 없이 시작 (강의계획서 주차만으로 추천)
+    from utils import storage
+
+    prefetch = []
+    for enabled in (False, True):
+        print(f"[prefetch={'on' if enabled else 'off'}] 실행 중...", file=sys.stderr)
+        storage.DATA_DIR = Path(tempfile.mkdtemp(prefix="bench_suggest_prefetch_"))
+        prefetch.append(run_prefetch(suggest_mod, args, enabled))
+
+    text = json.dumps({"latency": latency, "prefetch": prefetch}, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0 if latency["p99_ms"] <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
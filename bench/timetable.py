@@ -0,0 +1,226 @@
+# streamlit_app/bench/timetable.py
+"""
+시간표 가져오기 / 구간 색인(utils/timetable_import.py) 속도와 정확성 점검.
+
+가짜 학과 시간표(분반 --sections개, 강의실 --rooms개, 50~180분 수업, 월~토)를 CSV와 ICS로 만들어서
+- 가져오기: 형식별 읽기 시간 (행/초), 저장 포함 import_bytes 시간
+- 색인: 만드는 시간, 칸 하나 조회(화면 그리기) / 강의실 충돌 / 빈 시간 찾기 지연
+- 정확성: 모든 결과를 전체를 훑는 단순 계산과 비교
+- 화면 한 장: 요일 × 교시 칸을 모두 조회하는 시간 (색인 vs 전체 훑기)
+
+사용 예:
+    python -m bench.timetable
+    python -m bench.timetable --sections 5000 --rooms 120 --out timetable.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench.pipeline import percentile  # noqa: E402
+
+SUBJECTS = ["대학수학", "물리 및 실험", "정보검색", "자연언어처리", "빅데이터분석", "뉴럴네트워크",
+            "임베디드시스템", "자료구조", "알고리즘", "운영체제", "데이터베이스", "컴퓨터구조"]
+ICS_DAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+
+def make_department(rng: random.Random, sections: int, rooms: int) -> list:
+    rows = []
+    for i in range(sections):
+        length = rng.choice([50, 75, 75, 100, 110, 150, 180])
+        start = rng.randrange(9 * 60, 21 * 60 - length + 1, 15)
+        rows.append(
+            {
+                "subject": rng.choice(SUBJECTS),
+                "section": f"{i:04d}",
+                "day": rng.choice([0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5]),
+                "start": start,
+                "end": start + length,
+                "room": f"S{rng.randrange(rooms):03d}",
+            }
+        )
+    return rows
+
+
+def to_csv(rows: list) -> bytes:
+    from utils.timetable_import import WEEK_DAYS, format_minutes
+
+    lines = ["과목명,분반,요일,시작시간,종료시간,강의실"]
+    for r in rows:
+        lines.append(
+            f"{r['subject']},{r['section']},{WEEK_DAYS[r['day']]},"
+            f"{format_minutes(r['start'])},{format_minutes(r['end'])},{r['room']}"
+        )
+    return "\n".join(lines).encode("utf-8")
+
+
+def to_ics(rows: list) -> bytes:
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0"]
+    for r in rows:
+        day = 3 + r["day"]  # 2025-03-03은 월요일
+        lines += [
+            "BEGIN:VEVENT",
+            f"SUMMARY:{r['subject']}",
+            f"DTSTART;TZID=Asia/Seoul:202503{day:02d}T{r['start'] // 60:02d}{r['start'] % 60:02d}00",
+            f"DTEND;TZID=Asia/Seoul:202503{day:02d}T{r['end'] // 60:02d}{r['end'] % 60:02d}00",
+            f"RRULE:FREQ=WEEKLY;BYDAY={ICS_DAYS[r['day']]};COUNT=15",
+            f"LOCATION:{r['room']}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines).encode("utf-8")
+
+
+def _week(s: dict) -> tuple:
+    return s["day"] * 1440 + s["start"], s["day"] * 1440 + s["end"]
+
+
+def naive_overlapping(sessions: list, start: int, end: int) -> list:
+    return [s for s in sessions if _week(s)[0] < end and _week(s)[1] > start]
+
+
+def naive_room_conflicts(sessions: list) -> set:
+    pairs = set()
+    for i, a in enumerate(sessions):
+        for b in sessions[i + 1 :]:
+            if a["room"] == b["room"] and _week(a)[0] < _week(b)[1] and _week(b)[0] < _week(a)[1]:
+                pairs.add(frozenset((a["section"], b["section"])))
+    return pairs
+
+
+def naive_free(sessions: list, minutes: int, after: int) -> list:
+    """분 단위로 칠해서 찾는 빈 시간 (정답 확인용)."""
+    busy = bytearray(7 * 1440)
+    for s in sessions:
+        a, b = _week(s)
+        busy[a:b] = b"\x01" * (b - a)
+    slots = []
+    for day in range(7):
+        lo, hi = max(day * 1440 + 9 * 60, after), day * 1440 + 22 * 60
+        t = lo
+        while t < hi:
+            if busy[t]:
+                t += 1
+                continue
+            u = t
+            while u < hi and not busy[u]:
+                u += 1
+            if u - t >= minutes:
+                slots.append((t, u))
+            t = u
+    return slots
+
+
+def timed_ms(fn, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        value = fn()
+    return value, (time.perf_counter() - start) * 1000 / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시간표 가져오기 / 구간 색인 벤치마크")
+    parser.add_argument("--sections", type=int, default=3000, help="학과 전체 분반(수업) 수")
+    parser.add_argument("--rooms", type=int, default=80)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default="", help="결과 JSON 파일 (기본: stdout)")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("APP_DATA_DIR", tempfile.mkdtemp(prefix="bench_timetable_"))
+    from utils import timetable_import as ti
+    from utils.timetable_data import period_range
+
+    rng = random.Random(args.seed)
+    rows = make_department(rng, args.sections, args.rooms)
+    csv_data, ics_data = to_csv(rows), to_ics(rows)
+
+    print("[import] CSV / ICS ...", file=sys.stderr)
+    (csv_sessions, _), csv_ms = timed_ms(lambda: ti.parse_timetable("dept.csv", csv_data))
+    (ics_sessions, _), ics_ms = timed_ms(lambda: ti.parse_timetable("dept.ics", ics_data))
+    store = ti.TimetableStore("bench_timetables.db")
+    _, import_ms = timed_ms(lambda: store.import_bytes("dept.csv", csv_data, "학과"))
+
+    print("[index] 조회 / 충돌 / 빈 시간 ...", file=sys.stderr)
+    sessions = store.sessions("학과")
+    index, build_ms = timed_ms(lambda: ti.IntervalIndex(sessions), repeat=5)
+
+    # 칸 조회: 색인 vs 전체 훑기 (결과 비교)
+    query_us, naive_us, mismatched = [], [], 0
+    for _ in range(args.queries):
+        day, period = rng.randrange(6), rng.randint(1, 13)
+        a, b = period_range(period)
+        t0 = time.perf_counter()
+        got = index.at(day, a, b)
+        query_us.append((time.perf_counter() - t0) * 1e6)
+        t0 = time.perf_counter()
+        want = naive_overlapping(sessions, day * 1440 + a, day * 1440 + b)
+        naive_us.append((time.perf_counter() - t0) * 1e6)
+        mismatched += {s["section"] for s in got} != {s["section"] for s in want}
+
+    days, periods = ti.grid_rows(index)
+    _, grid_ms = timed_ms(lambda: [index.at(d, *period_range(p)) for d in days for p in periods], repeat=5)
+    _, grid_naive_ms = timed_ms(
+        lambda: [naive_overlapping(sessions, d * 1440 + period_range(p)[0], d * 1440 + period_range(p)[1])
+                 for d in days for p in periods]
+    )
+
+    # 색인은 충돌 목록을 기억하므로 새 색인으로 (만드는 시간 포함)
+    room_pairs, conflicts_ms = timed_ms(lambda: ti.IntervalIndex(sessions).conflicts("room"), repeat=3)
+    subset = rng.sample(sessions, min(2000, len(sessions)))
+    naive_pairs, naive_conflicts_ms = timed_ms(lambda: naive_room_conflicts(subset))
+    subset_pairs = {frozenset((a["section"], b["section"])) for a, b in ti.IntervalIndex(subset).conflicts("room")}
+
+    # 학생 한 명 시간표 (학과 시간표에서 분반 8개) → 빈 시간
+    free_ms, free_bad = [], 0
+    for _ in range(200):
+        mine = rng.sample(sessions, 8)
+        student = ti.IntervalIndex(mine)
+        minutes, after = rng.choice([60, 90, 120, 180]), rng.randrange(7 * 1440)
+        slots, ms = timed_ms(lambda: student.free_slots(minutes, after=after))
+        free_ms.append(ms)
+        free_bad += slots != naive_free(mine, minutes, after)
+
+    result = {
+        "sections": len(sessions),
+        "rooms": args.rooms,
+        "csv_parse_ms": round(csv_ms, 1),
+        "csv_rows_per_s": round(len(csv_sessions) / csv_ms * 1000),
+        "ics_parse_ms": round(ics_ms, 1),
+        "ics_events_per_s": round(len(ics_sessions) / ics_ms * 1000),
+        "ics_sessions_match_csv": len(ics_sessions) == len(csv_sessions),
+        "import_with_store_ms": round(import_ms, 1),
+        "index_build_ms": round(build_ms, 2),
+        "cell_query_p50_us": round(percentile(query_us, 50), 1),
+        "cell_query_p95_us": round(percentile(query_us, 95), 1),
+        "cell_scan_p95_us": round(percentile(naive_us, 95), 1),
+        "cell_mismatched": mismatched,
+        "grid_cells": len(days) * len(periods),
+        "grid_render_lookup_ms": round(grid_ms, 2),
+        "grid_render_scan_ms": round(grid_naive_ms, 2),
+        "room_conflicts": len(room_pairs),
+        "room_conflicts_with_build_ms": round(conflicts_ms, 2),
+        "room_conflicts_subset_match": subset_pairs == naive_pairs,
+        "room_conflicts_subset_naive_ms": round(naive_conflicts_ms, 1),
+        "free_slots_p95_ms": round(percentile(free_ms, 95), 3),
+        "free_slots_mismatched": free_bad,
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    ok = not mismatched and not free_bad and result["room_conflicts_subset_match"]
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
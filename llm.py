@@ -1,100 +1,291 @@
 # kanana.py (Colab에서 실행되는 실제 LLM 추론 모듈)
 
 import json
-from llama_cpp import Llama
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from llm_prompts import (  # noqa: F401  (기존 import 경로 유지)
+    QUIZ_PARAMS,
+    QUIZ_SCHEMA,
+    SUMMARY_PARAMS,
+    SYSTEM_PROMPT_QUIZ,
+    SYSTEM_PROMPT_SUMMARY,
+    format_quiz_messages,
+    format_quiz_user_prompt,
+    format_summary_prompt,
+)
+from utils import admission, grammar_cache, model_pool, singleflight, speculative, telemetry
+from utils.content_cache import get_content_cache
+from utils.search_index import get_search_index
+from utils.model_profile import autotune_if_stale, load_settings
 
 # ================================================================
-# 1) 모델 로드 (Colab에서 처음에 1번만 실행됨)
+# 1) 모델 로드 (처음 요약/퀴즈를 만들 때 1번만 실행됨)
 # ================================================================
-MODEL_PATH = r"C:\Users\user\Desktop\JH\kanana-1.5-2.1b-instruct-2505-Q4_K_M.gguf"
-
-print("모델 로딩 중...")
-model = Llama(
-    model_path=MODEL_PATH,
-    n_ctx=8192,
-    n_gpu_layers=0,
-    n_batch=512,
-    verbose=False,
-    # 필요하면 chat_format 지정 가능 (모델 포맷에 따라 조정)
-    # chat_format="chatml",
-)
-print("LLM 모델 로딩 완료!")
+# 기본 모델 경로. 실제 사용 경로/설정은 튜닝 프로필(utils/model_profile.py)과
+# LLM_MODEL_PATH 환경변수에 따라 결정됨 (벤치마크용 작은 모델 등)
+DEFAULT_MODEL_PATH = r"C:\Users\user\Desktop\JH\kanana-1.5-2.1b-instruct-2505-Q4_K_M.gguf"
+MODEL_PATH, LLAMA_KWARGS = load_settings(DEFAULT_MODEL_PATH)
+
+# 예전에는 import 시점에 모델을 올려서, 메모/시간표만 쓰는 사용자도 첫 화면까지 모델 로딩을 기다렸다.
+# 이제 llama_cpp import와 모델 로딩은 get_model()을 처음 부를 때 (또는 preload_model()로 미리) 한다.
+model = None
+DRAFT_MODEL = None
+_model_lock = threading.Lock()
+_autotune_checked = False
+_settings_lock = threading.Lock()
+
+
+def _refresh_settings():
+    """LLM_AUTOTUNE=1이면 모델을 처음 올리기 전에 한 번 튜닝하고 새 프로필로 설정을 다시 읽음."""
+    global MODEL_PATH, LLAMA_KWARGS, _autotune_checked
+    if _autotune_checked:
+        return
+    with _settings_lock:
+        if not _autotune_checked:
+            if autotune_if_stale():
+                MODEL_PATH, LLAMA_KWARGS = load_settings(DEFAULT_MODEL_PATH)
+            _autotune_checked = True
+
+
+def get_model():
+    """llama_cpp 모델 (처음 호출할 때 로딩, 이후에는 같은 객체)."""
+    global model
+    if model is None:
+        with _model_lock:
+            if model is None:
+                model = _load_model()
+    return model
+
+
+def _load_model():
+    global DRAFT_MODEL
+    from llama_cpp import Llama
+
+    _refresh_settings()
+    print("모델 로딩 중...")
+    with telemetry.span("llm.model_load", model=MODEL_PATH.replace("\\", "/").rsplit("/", 1)[-1]):
+        # LLM_SPECULATIVE=lookup|draft 이면 추측 디코딩 사용 (utils/speculative.py)
+        DRAFT_MODEL = speculative.make_draft_model(
+            n_ctx=LLAMA_KWARGS.get("n_ctx"), n_threads=LLAMA_KWARGS.get("n_threads")
+        )
+        loaded = Llama(
+            model_path=MODEL_PATH,
+            verbose=False,
+            # 필요하면 chat_format 지정 가능 (모델 포맷에 따라 조정)
+            # chat_format="chatml",
+            draft_model=DRAFT_MODEL,
+            **LLAMA_KWARGS,
+        )
+    print("LLM 모델 로딩 완료!")
+
+    # LLM_PRECOMPILE_GRAMMARS="5" 등으로 지정한 문항 수의 퀴즈 문법을 미리 변환
+    if grammar_cache.PRECOMPILE_COUNTS:
+        try:
+            grammar_cache.precompile(QUIZ_SCHEMA)
+        except (ImportError, AttributeError):
+            pass
+    return loaded
+
+
+def get_pool():
+    """LLM_POOL_WORKERS가 2 이상이면 워커 풀 (utils/model_pool.py), 아니면 None (이 프로세스의 모델 사용)."""
+    _refresh_settings()
+    return model_pool.get_model_pool(MODEL_PATH, LLAMA_KWARGS)
+
+
+def preload_model():
+    """백그라운드 스레드에서 모델을 미리 올림 (영상을 고르는 순간 호출 → 자막 받는 동안 로딩)."""
+    if model is None:
+        target = get_pool if model_pool.planned_workers() >= 2 else get_model
+        threading.Thread(target=target, name="llm-preload", daemon=True).start()
 
 
 # ================================================================
-# 2) 프롬프트 템플릿
+# 1-1) 대기 중인 LLM 작업 수 (load shedding)
 # ================================================================
-SYSTEM_PROMPT_SUMMARY = (
-    "You are a professional assistant skilled at summarizing long texts "
-    "clearly and concisely."
-)
+# 실행 중 + 대기 중인 작업이 이 값 이상이면 요약은 추출 요약(utils/extractive.py)으로 대신함
+# (0이면 사용 안 함)
+SHED_THRESHOLD = int(os.getenv("LLM_SHED_THRESHOLD", "4"))
 
-SYSTEM_PROMPT_QUIZ = (
-    "You are an AI tutor that creates high-quality multiple-choice quiz "
-    "questions in Korean, based on the given study summary. "
-    "You must always respond in valid JSON only."
-)
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+@contextmanager
+def _track_pending(task: str):
+    global _pending
+    with _pending_lock:
+        _pending += 1
+        telemetry.observe("llm_pending_jobs", _pending, task=task)
+    try:
+        yield
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+def pending_jobs() -> int:
+    return _pending
+
+
+def should_shed() -> bool:
+    """LLM이 밀려 있어서 새 요약 요청은 추출 요약으로 대신해야 하면 True.
+    (실행 중인 작업 + 입장 대기열(utils/admission.py)에서 기다리는 작업)"""
+    return SHED_THRESHOLD > 0 and _pending + admission.get_admission().queued() >= SHED_THRESHOLD
+
+
+# ================================================================
+# 1-2) 모델 호출 + 구간별 시간 측정
+# ================================================================
+def _count_tokens(text: str, task: str) -> int:
+    with telemetry.span("llm.tokenize", task=task) as sp:
+        n = len(get_model().tokenize(text.encode("utf-8"), add_bos=True))
+        sp.set(tokens=n)
+    return n
+
+
+def _run_streamed(task: str, prompt_text: str, stream_fn, chunk_text) -> str:
+    """
+    stream=True로 호출해서 첫 토큰까지(prefill)와 나머지(decode)를 나눠 측정.
+    telemetry가 켜져 있을 때만 사용한다.
+    """
+    n_prompt = _count_tokens(prompt_text, task)
+
+    prefill = telemetry.start_span("llm.prefill", task=task, prompt_tokens=n_prompt)
+    decode = None
+    pieces = []
+    start = time.perf_counter()
+    decode_start = start
+    for chunk in stream_fn():
+        if decode is None:
+            prefill.end()
+            decode = telemetry.start_span("llm.decode", task=task)
+            decode_start = time.perf_counter()
+        pieces.append(chunk_text(chunk))
+
+    if decode is None:
+        prefill.end()
+    else:
+        decode.set(chunks=len(pieces))
+        decode.end()
+        # 스트림 조각 1개 = 토큰 1개 (추측 디코딩 on/off 비교용)
+        decode_s = time.perf_counter() - decode_start
+        if decode_s > 0 and len(pieces) > 1:
+            telemetry.observe(
+                "llm_decode_tokens_per_sec",
+                (len(pieces) - 1) / decode_s,
+                task=task,
+                speculative=speculative.MODE or "off",
+            )
+
+    telemetry.observe("llm_request_seconds", time.perf_counter() - start, task=task)
+    return "".join(pieces)
+
+
+def _complete_once(task: str, prompt: str, **kwargs) -> str:
+    """model(prompt) 호출 후 생성 텍스트 반환."""
+    with _track_pending(task):
+        pool = get_pool()
+        if pool is not None:
+            with telemetry.span("llm.pool", task=task):
+                return pool.complete(prompt, **kwargs)["choices"][0]["text"]
+
+        if not telemetry.ENABLED:
+            return get_model()(prompt=prompt, **kwargs)["choices"][0]["text"]
+
+        return _run_streamed(
+            task,
+            prompt,
+            lambda: get_model()(prompt=prompt, stream=True, **kwargs),
+            lambda chunk: chunk["choices"][0].get("text") or "",
+        )
+
+
+def _schema_kwargs(schema: dict, num_items: int) -> dict:
+    """
+    JSON Schema → grammar= 인자. 변환 결과는 utils/grammar_cache.py에 캐시됨.
+    llama_cpp에 LlamaGrammar가 없으면 (구버전/벤치마크용 가짜 모듈) response_format으로 대체.
+    """
+    start = time.perf_counter()
+    try:
+        return {"grammar": grammar_cache.get_grammar(schema, num_items)}
+    except (ImportError, AttributeError):
+        if num_items:
+            schema = grammar_cache.exact_quiz_schema(schema, num_items)
+        return {"response_format": {"type": "json_object", "schema": schema}}
+    finally:
+        telemetry.observe("llm_grammar_setup_seconds", time.perf_counter() - start)
+
+
+def _chat_once(task: str, messages: list, schema: dict = None, num_items: int = None, **kwargs) -> str:
+    """
+    model.create_chat_completion 호출 후 assistant 응답 텍스트 반환.
+    schema를 주면 캐시된 문법(grammar)으로 출력을 제한 (num_items: 정확한 문항 수).
+    """
+    pool = get_pool()
+    if pool is not None:
+        # 워커 풀: grammar는 워커 프로세스에서 만들도록 스키마를 그대로 넘김
+        with _track_pending(task), telemetry.span("llm.pool", task=task):
+            response = pool.chat(messages, schema=schema, num_items=num_items, **kwargs)
+        return response["choices"][0]["message"]["content"]
+
+    if schema is not None:
+        kwargs.update(_schema_kwargs(schema, num_items))
 
+    with _track_pending(task):
+        if not telemetry.ENABLED:
+            response = get_model().create_chat_completion(messages=messages, **kwargs)
+            return response["choices"][0]["message"]["content"]
 
-def format_summary_prompt(script_content: str) -> str:
-    user_request = f"""
-다음은 사용자가 제공한 텍스트입니다.
----
-[텍스트 본문]
-{script_content}
----
-[요청]
-위 텍스트 본문의 핵심 주제와 주요 내용을 3줄로 간결하게 요약해 주고 난이도를 알려주세요.
-"""
-    return f"<system>{SYSTEM_PROMPT_SUMMARY}</system><user>{user_request}</user><assistant>"
-
-
-def format_quiz_user_prompt(summary_content: str, num_questions: int = 5) -> str:
-    # response_format으로 JSON Schema를 강제하므로,
-    # 여기서는 "이런 구조로 만들어라" 정도만 설명해도 충분.
-    return f"""
-다음은 어떤 강의/영상의 요약 내용입니다.
----
-[요약 본문]
-{summary_content}
----
-[요청]
-위 요약 내용을 바탕으로 한국어로 {num_questions}개의 객관식 퀴즈를 만들어 주세요.
-
-각 퀴즈는:
-- 하나의 개념/포인트를 명확히 묻는 문제
-- 보기 4개를 가지는 객관식
-- 정답은 보기 중 하나
-- 간단한 해설 포함
-
-반드시 시스템이 지정한 JSON Schema 형식에 맞춰서만 출력하세요.
-"""
+        return _run_streamed(
+            task,
+            "".join(m["content"] for m in messages),
+            lambda: get_model().create_chat_completion(messages=messages, stream=True, **kwargs),
+            lambda chunk: chunk["choices"][0].get("delta", {}).get("content") or "",
+        )
 
 
 # ================================================================
-# 3) 외부에서 호출하는 요약 함수
+# 2) 외부에서 호출하는 요약 함수
 # ================================================================
-def summarize_text(text: str) -> str:
-    """Streamlit에서 transcript 문자열을 받아 요약 생성"""
+def summarize_text(text: str, video_id: str = "") -> str:
+    """Streamlit에서 transcript 문자열을 받아 요약 생성 (같은 자막의 요약은 캐시에서)"""
+
+    cache = get_content_cache()
+    cached = cache.get_summary(text)
+    if cached is not None:
+        return cached
 
     prompt = format_summary_prompt(text)
+    cost = admission.estimate_cost(prompt, SUMMARY_PARAMS.get("max_tokens"))
 
-    output = model(
-        prompt=prompt,
-        max_tokens=500,
-        temperature=0.2,
-        top_p=0.9,
-        stop=["<", "user>", "system>"],
-    )
+    def produce():
+        # 사용자별 속도 제한 + 공정 대기열 (RateLimited / JobCancelled가 날 수 있음)
+        with admission.admit("summary", cost):
+            # 기다리는 동안 다른 프로세스가 같은 요약을 만들었을 수 있음
+            cached = cache.get_summary(text)
+            if cached is not None:
+                return cached
+            result = _complete_once("summary", prompt, **SUMMARY_PARAMS).strip()
+        if result:
+            cache.put_summary(text, result, video_id)
+            if video_id:
+                get_search_index().index_summary(video_id, result, cache.video_title(video_id))
+        return result
 
-    result = output["choices"][0]["text"].strip()
-    return result
+    # 같은 자막의 동시 요청은 한 번만 실행 (대기열도 실행하는 세션만 거침).
+    # 실행하던 세션이 속도 제한 / 취소로 못 들어가면 기다리던 세션이 각자 다시 시도
+    key = singleflight.make_key(prompt, SUMMARY_PARAMS)
+    return singleflight.do("summary", key, produce, unshared=(admission.AdmissionError,))
 
 
 # ================================================================
-# 4) 외부에서 호출하는 퀴즈 생성 함수 (JSON Schema 강제)
+# 3) 외부에서 호출하는 퀴즈 생성 함수 (JSON Schema 강제)
 # ================================================================
-def generate_quiz(summary_text: str, num_questions: int = 5):
+def generate_quiz(summary_text: str, num_questions: int = 5, video_id: str = ""):
     """
     요약 텍스트를 받아 퀴즈 리스트를 JSON 형태로 반환.
 
@@ -119,69 +310,50 @@ def generate_quiz(summary_text: str, num_questions: int = 5):
     ]
     """
 
-    # JSON Schema 정의
-    quiz_schema = {
-        "type": "object",
-        "properties": {
-            "quizzes": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "question": {"type": "string"},
-                        "options": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "minItems": 4,
-                            "maxItems": 4,
-                        },
-                        "answer_index": {"type": "integer"},
-                        "explanation": {"type": "string"},
-                    },
-                    "required": [
-                        "question",
-                        "options",
-                        "answer_index",
-                        "explanation",
-                    ],
-                },
-                "minItems": 1,
-            }
-        },
-        "required": ["quizzes"],
-    }
+    cache = get_content_cache()
+    cached = cache.get_quiz(summary_text, num_questions)
+    if cached is not None:
+        return cached
 
-    messages = [
-        {
-            "role": "system",
-            "content": SYSTEM_PROMPT_QUIZ,
-        },
-        {
-            "role": "user",
-            "content": format_quiz_user_prompt(summary_text, num_questions),
-        },
-    ]
+    messages = format_quiz_messages(summary_text, num_questions)
 
-    response = model.create_chat_completion(
-        messages=messages,
-        temperature=0.4,
-        top_p=0.9,
-        max_tokens=1024,
-        response_format={
-            "type": "json_object",
-            "schema": quiz_schema,
-        },
+    cost = admission.estimate_cost(
+        "".join(m["content"] for m in messages), QUIZ_PARAMS.get("max_tokens")
     )
 
-    content = response["choices"][0]["message"]["content"]
+    def produce():
+        with admission.admit("quiz", cost):
+            cached = cache.get_quiz(summary_text, num_questions)
+            if cached is not None:
+                return cached
+            content = _chat_once(
+                "quiz",
+                messages,
+                schema=QUIZ_SCHEMA,
+                num_items=num_questions,
+                **QUIZ_PARAMS,
+            )
 
-    try:
-        data = json.loads(content)
-        quizzes = data.get("quizzes", [])
-        # 최소한의 형식 검증
-        if isinstance(quizzes, list):
-            return quizzes
-        return []
-    except Exception:
-        # 만약 JSON 파싱 실패하면 빈 리스트 반환
-        return []
+        try:
+            data = json.loads(content)
+            quizzes = data.get("quizzes", [])
+            # 최소한의 형식 검증
+            if isinstance(quizzes, list):
+                if quizzes:
+                    cache.put_quiz(summary_text, num_questions, quizzes, video_id)
+                return quizzes
+            telemetry.incr("llm_json_failures", reason="not_list")
+            return []
+        except Exception:
+            # 만약 JSON 파싱 실패하면 빈 리스트 반환
+            telemetry.incr("llm_json_failures", reason="parse_error")
+            return []
+
+    # 메시지 + 옵션 + 스키마가 같은 동시 요청은 한 번만 실행 (summarize_text와 같음)
+    key = singleflight.make_key(messages, QUIZ_PARAMS, grammar_cache.schema_hash(QUIZ_SCHEMA), num_questions)
+    return singleflight.do("quiz", key, produce, unshared=(admission.AdmissionError,))
+
+
+def speculative_stats() -> dict:
+    """추측 디코딩 제안/수락 토큰 수 (사용 안 하면 빈 딕셔너리)."""
+    return DRAFT_MODEL.stats() if DRAFT_MODEL is not None else {}
@@ -0,0 +1,117 @@
+# streamlit_app/llm_prompts.py
+"""
+LLM 프롬프트 / JSON Schema / 생성 옵션.
+
+llm.py를 import하면 튜닝 프로필을 읽고 캐시 / 대기열 / 워커 풀 모듈까지 함께 불러오므로
+(모델 자체는 처음 요약/퀴즈를 만들 때 올라감), 프롬프트만 필요한 곳(튜닝 스크립트 등)은 이 모듈을 직접 사용한다.
+"""
+
+# ================================================================
+# 1) 프롬프트 템플릿
+# ================================================================
+SYSTEM_PROMPT_SUMMARY = (
+    "You are a professional assistant skilled at summarizing long texts "
+    "clearly and concisely."
+)
+
+SYSTEM_PROMPT_QUIZ = (
+    "You are an AI tutor that creates high-quality multiple-choice quiz "
+    "questions in Korean, based on the given study summary. "
+    "You must always respond in valid JSON only."
+)
+
+
+def format_summary_prompt(script_content: str) -> str:
+    user_request = f"""
+다음은 사용자가 제공한 텍스트입니다.
+---
+[텍스트 본문]
+{script_content}
+---
+[요청]
+위 텍스트 본문의 핵심 주제와 주요 내용을 3줄로 간결하게 요약해 주고 난이도를 알려주세요.
+"""
+    return f"<system>{SYSTEM_PROMPT_SUMMARY}</system><user>{user_request}</user><assistant>"
+
+
+def format_quiz_user_prompt(summary_content: str, num_questions: int = 5) -> str:
+    # response_format으로 JSON Schema를 강제하므로,
+    # 여기서는 "이런 구조로 만들어라" 정도만 설명해도 충분.
+    return f"""
+다음은 어떤 강의/영상의 요약 내용입니다.
+---
+[요약 본문]
+{summary_content}
+---
+[요청]
+위 요약 내용을 바탕으로 한국어로 {num_questions}개의 객관식 퀴즈를 만들어 주세요.
+
+각 퀴즈는:
+- 하나의 개념/포인트를 명확히 묻는 문제
+- 보기 4개를 가지는 객관식
+- 정답은 보기 중 하나
+- 간단한 해설 포함
+
+반드시 시스템이 지정한 JSON Schema 형식에 맞춰서만 출력하세요.
+"""
+
+
+def format_quiz_messages(summary_content: str, num_questions: int = 5) -> list:
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT_QUIZ,
+        },
+        {
+            "role": "user",
+            "content": format_quiz_user_prompt(summary_content, num_questions),
+        },
+    ]
+
+
+# ================================================================
+# 2) 생성 옵션 / 퀴즈 JSON Schema
+# ================================================================
+SUMMARY_PARAMS = {
+    "max_tokens": 500,
+    "temperature": 0.2,
+    "top_p": 0.9,
+    "stop": ["<", "user>", "system>"],
+}
+
+QUIZ_PARAMS = {
+    "temperature": 0.4,
+    "top_p": 0.9,
+    "max_tokens": 1024,
+}
+
+QUIZ_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "quizzes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "question": {"type": "string"},
+                    "options": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "minItems": 4,
+                        "maxItems": 4,
+                    },
+                    "answer_index": {"type": "integer"},
+                    "explanation": {"type": "string"},
+                },
+                "required": [
+                    "question",
+                    "options",
+                    "answer_index",
+                    "explanation",
+                ],
+            },
+            "minItems": 1,
+        }
+    },
+    "required": ["quizzes"],
+}
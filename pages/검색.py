@@ -0,0 +1,88 @@
+# streamlit_app/pages/검색.py
+
+import streamlit as st
+
+from utils import content_store, telemetry
+from utils.content_cache import get_content_cache
+from utils.search_index import KIND_LABELS, search
+from utils.storage import get_student_id
+
+st.set_page_config(page_title="내 자료 검색", page_icon="🔎", layout="wide")
+
+# 페이지 렌더링 시간 측정 (파일 끝에서 end)
+_render_span = telemetry.start_span("page.render", page="검색")
+
+st.title("🔎 내 자료 검색")
+st.caption("지금까지 본 영상의 자막, AI 요약, 학습 메모, 저장한 영상 제목에서 찾습니다. (YouTube 할당량을 쓰지 않아요)")
+
+if "saved_videos" not in st.session_state:
+    st.session_state.saved_videos = []
+
+
+def video_for(video_id: str, title: str) -> dict:
+    """메인 페이지에서 쓰는 영상 딕셔너리 (저장 목록 → 캐시된 영상 정보 → 최소 정보 순)."""
+    for v in st.session_state.saved_videos:
+        if v["video_id"] == video_id:
+            return v
+    item = get_content_cache().get_videos([video_id]).get(video_id) or {}
+    snippet = item.get("snippet", {})
+    stats = item.get("statistics", {})
+    return {
+        "video_id": video_id,
+        "title": snippet.get("title") or title or video_id,
+        "channel_title": snippet.get("channelTitle") or "",
+        "thumbnail": snippet.get("thumbnails", {}).get("default", {}).get("url"),
+        "view_count": int(stats.get("viewCount", 0)),
+        "like_count": int(stats.get("likeCount", 0)),
+        "comment_count": int(stats.get("commentCount", 0)),
+        "published_at": snippet.get("publishedAt"),
+    }
+
+
+def open_video(hit: dict):
+    video = video_for(hit["video_id"], hit["title"])
+    st.session_state.selected_video = video
+    st.session_state.selected_video_id = video["video_id"]
+    st.session_state.selected_video_title = video["title"]
+    content_store.reset(
+        st.session_state, video_transcript=None, ai_summary="", quiz_source_summary=""
+    )
+    st.session_state.video_start = (video["video_id"], hit["start"] or 0)
+    st.switch_page("메인.py")
+
+
+query_col, kind_col = st.columns([3, 2])
+with query_col:
+    query = st.text_input(
+        "검색어",
+        key="note_search_page_query",
+        value=st.session_state.get("note_search_query", ""),
+        placeholder="예: 부분적분, 운동량 보존, 선출원주의",
+    )
+with kind_col:
+    kinds = st.multiselect(
+        "검색 대상",
+        options=list(KIND_LABELS),
+        default=list(KIND_LABELS),
+        format_func=lambda k: KIND_LABELS[k],
+    )
+
+if query.strip():
+    hits = search(query, get_student_id(st.session_state), kinds=kinds or None, limit=30)
+    st.write(f"검색 결과 **{len(hits)}개**")
+    st.markdown("---")
+
+    for idx, hit in enumerate(hits):
+        label = KIND_LABELS.get(hit["kind"], hit["kind"])
+        info_col, btn_col = st.columns([5, 1])
+        with info_col:
+            where = f" · ⏱ {hit['time']}" if hit["time"] else ""
+            st.markdown(f"**{hit['title'] or label}**  `{label}{where}`")
+            st.markdown(hit["snippet"])
+        with btn_col:
+            if hit["video_id"] and st.button("▶ 열기", key=f"note_hit_{idx}"):
+                open_video(hit)
+else:
+    st.info("검색어를 입력하세요. 두 글자 이상이면 더 정확하게 찾습니다.")
+
+_render_span.end()
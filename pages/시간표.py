@@ -1,17 +1,42 @@
 # streamlit_app/pages/3_timetable.py
 
-import json
-from pathlib import Path
-
 import streamlit as st
-from utils.youtube_api import search_youtube_videos
-
+from utils import content_store, course_pack, telemetry
+from utils.suggest import get_suggester
+from utils.youtube_api2 import search_youtube_videos
+# 강의계획서(json)는 검색어 추천(utils/suggest.py)도 쓰므로 utils/timetable_data.py에서 로드
+from utils.timetable_data import (
+    SYLLABUS_MAP,
+    period_range,
+    semester_names,
+    subject_emoji,
+    syllabus_weeks,
+    week_query,
+)
+# CSV/ICS/JSON 시간표 가져오기 + 구간 색인 (충돌 / 빈 시간 / 칸 조회)
+from utils.timetable_import import (
+    WEEK_DAYS,
+    TimetableImportError,
+    format_minutes,
+    format_slot,
+    get_timetable_store,
+    grid_rows,
+    overlap_slot,
+    week_minute,
+)
+from utils.storage import get_student_id
+
+
+# 페이지 렌더링 시간 측정 (파일 끝에서 end)
+_render_span = telemetry.start_span("page.render", page="시간표")
 
 # ---------------- Session state 초기값 ----------------
 if "tt_panel_open" not in st.session_state:
     st.session_state.tt_panel_open = False
 if "tt_panel_info" not in st.session_state:
     st.session_state.tt_panel_info = {}
+if "tt_import_open" not in st.session_state:
+    st.session_state.tt_import_open = False
 
 # app.py 쪽에서 사용하는 상태값이 없으면 기본값 넣어두기
 if "search_query" not in st.session_state:
@@ -27,82 +52,6 @@ if "selected_video_id" not in st.session_state:
 if "video_transcript" not in st.session_state:
     st.session_state.video_transcript = None
 
-# ---------------- 시간표 기본 데이터 ----------------
-DAYS = ["월", "화", "수", "목", "금"]
-PERIODS = [1, 2, 3, 4, 5, 6, 7]
-
-# 과목별 이모지 (같은 과목 = 같은 색 이모지)
-SUBJECT_EMOJI = {
-    "대학수학": "🟦",
-    "물리 및 실험": "🟧",
-    "정보검색": "🟨",
-    "지식재산개론": "🟥",
-    "자기이해와봉사": "🟩",
-    "실증적AI개발프로젝트I": "🟪",
-    "뉴럴네트워크": "🟫",
-    "임베디드시스템": "⬛",
-    "자연언어처리": "⬜",
-    "빅데이터분석": "🟩",
-    "실증적AI개발프로젝트II": "🟪",
-}
-
-# 각 학기별 시간표 (예시는 너가 쓰던 것 그대로 유지)
-TIMETABLES = {
-    "2025년 1학기": [
-        {"subject": "대학수학", "day": "화", "period": 2, "room": "S06-0603"},
-        {"subject": "대학수학", "day": "화", "period": 3, "room": "S06-0603"},
-        {"subject": "정보검색", "day": "목", "period": 3, "room": "S06-0602"},
-        {"subject": "지식재산개론", "day": "금", "period": 3, "room": "S06-0604"},
-        {"subject": "물리 및 실험", "day": "월", "period": 5, "room": "S06-0606"},
-        {"subject": "물리 및 실험", "day": "수", "period": 5, "room": "S06-0606"},
-        {"subject": "정보검색", "day": "월", "period": 6, "room": "S06-0602"},
-        {"subject": "자기이해와봉사", "day": "목", "period": 6, "room": "S01-0603"},
-        {"subject": "실증적AI개발프로젝트I", "day": "금", "period": 7, "room": "S06-0602"},
-    ],
-    "2025년 2학기": [
-        {"subject": "뉴럴네트워크", "day": "목", "period": 2, "room": "S06-0606"},
-        {"subject": "임베디드시스템", "day": "금", "period": 2, "room": "S06-0603"},
-        {"subject": "임베디드시스템", "day": "금", "period": 3, "room": "S06-0603"},
-        {"subject": "자연언어처리", "day": "수", "period": 3, "room": "S06-0603"},
-        {"subject": "자연언어처리", "day": "목", "period": 4, "room": "S06-0603"},
-        {"subject": "빅데이터분석", "day": "수", "period": 5, "room": "S06-0609"},
-        {"subject": "빅데이터분석", "day": "목", "period": 5, "room": "S06-0609"},
-        {"subject": "뉴럴네트워크", "day": "월", "period": 5, "room": "S06-0606"},
-        {"subject": "실증적AI개발프로젝트II", "day": "금", "period": 7, "room": "S06-0602"},
-    ],
-}
-
-
-def build_grid(semester_key: str):
-    """(day, period) -> item 매핑 생성"""
-    grid = {(day, p): None for day in DAYS for p in PERIODS}
-    for item in TIMETABLES.get(semester_key, []):
-        grid[(item["day"], item["period"])] = item
-    return grid
-
-
-# ---------------- 강의계획서(json) 로드 ----------------
-HERE = Path(__file__).resolve().parent  # 3_timetable.py가 있는 폴더
-
-def load_json(filename: str):
-    path = HERE / filename
-    try:
-        with open(path, encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-
-# math = 대학수학, money = 지식재산개론, mooli = 물리 및 실험
-MATH_PLAN = load_json("math.json")
-MONEY_PLAN = load_json("money.json")
-MOOLI_PLAN = load_json("mooli.json")
-
-SYLLABUS_MAP = {
-    "대학수학": MATH_PLAN,
-    "지식재산개론": MONEY_PLAN,
-    "물리 및 실험": MOOLI_PLAN,
-}
-
 
 # ---------------- CSS (시간표 전용 스타일) ----------------
 css = """
@@ -172,10 +121,18 @@ st.markdown("### 시간표")
 
 top_left, top_spacer, top_right = st.columns([2, 4, 2])
 
+store = get_timetable_store()
+# 가져온 시간표는 사용자별 (공용 시간표는 읽기만)
+owner = get_student_id(st.session_state)
+
+# 방금 가져온 시간표로 바꾸기 (selectbox를 만들기 전에만 값을 바꿀 수 있음)
+if "tt_semester_next" in st.session_state:
+    st.session_state.tt_semester = st.session_state.pop("tt_semester_next")
+
 with top_left:
     semester = st.selectbox(
         "시간표 선택",
-        ["2025년 1학기", "2025년 2학기"],
+        semester_names(owner),
         index=0,
         key="tt_semester",
     )
@@ -185,31 +142,86 @@ with top_spacer:
 
 with top_right:
     if st.button("시간표 추가하기", key="add_timetable", use_container_width=True):
-        st.toast("시간표 추가 기능은 추후 구현될 예정입니다.", icon="ℹ️")
+        st.session_state.tt_import_open = not st.session_state.tt_import_open
+
+# ---------------- 시간표 가져오기 (CSV / ICS / JSON) ----------------
+if st.session_state.tt_import_open:
+    with st.container(border=True):
+        st.markdown("#### 시간표 가져오기")
+        st.caption(
+            "CSV(과목, 요일, 시작, 종료 또는 교시, 강의실 …), 캘린더 ICS, JSON 파일을 올리세요. "
+            "학기 열이 있으면 학기별로 나눠서 저장하고, 강의계획서가 있는 과목은 자동으로 연결합니다."
+        )
+        uploaded = st.file_uploader("시간표 파일", type=["csv", "ics", "json"], key="tt_upload")
+        import_name = st.text_input("시간표 이름 (비우면 파일 이름)", key="tt_import_name")
+        if st.button("가져오기", key="tt_import", disabled=uploaded is None):
+            try:
+                reports = store.import_bytes(
+                    uploaded.name, uploaded.getvalue(), import_name.strip(), owner=owner
+                )
+            except (TimetableImportError, ValueError) as e:
+                st.error(f"시간표를 가져오지 못했습니다: {e}")
+            else:
+                st.session_state.tt_import_report = reports
+                st.session_state.tt_semester_next = reports[0]["name"]
+                st.session_state.tt_import_open = False
+                st.rerun()
+
+        if store.owned(semester, owner) and st.button(f"'{semester}' 시간표 삭제", key="tt_delete"):
+            store.delete(semester, owner)
+            st.session_state.tt_semester_next = semester_names(owner)[0]
+            st.session_state.tt_panel_open = False
+            st.rerun()
+
+# 가져오기 결과 (한 번만 표시)
+for report in st.session_state.pop("tt_import_report", []):
+    st.success(
+        f"'{report['name']}' 시간표를 가져왔습니다: 수업 {report['sessions']}개"
+        + (f", 시간이 겹치는 수업 {report['conflicts']}쌍" if report["conflicts"] else "")
+    )
+    if report["renamed_from"]:
+        st.caption(f"기본 시간표 '{report['renamed_from']}'와 이름이 같아서 '{report['name']}'(으)로 저장했습니다.")
+    if report["linked"]:
+        st.caption("📘 강의계획서 연결: " + ", ".join(report["linked"]))
+    if report["warnings"]:
+        with st.expander(f"건너뛴 행 {len(report['warnings'])}개"):
+            st.write("\n".join(f"- {w}" for w in report["warnings"][:50]))
 
 st.markdown("---")
 
 # ---------------- 선택한 학기의 시간표 렌더링 ----------------
-grid = build_grid(semester)
+index = store.index(semester, owner)
+days, periods = grid_rows(index)
 
 st.write(f"#### {semester} 시간표")
 
+conflicts = index.conflicts()
+if conflicts:
+    st.warning(
+        f"⚠️ 시간이 겹치는 수업 {len(conflicts)}쌍: "
+        + ", ".join(
+            f"{a['subject']} ↔ {b['subject']} ({format_slot(*overlap_slot(a, b))})"
+            for a, b in conflicts[:5]
+        )
+        + (" …" if len(conflicts) > 5 else "")
+    )
+
 st.markdown('<div class="tt-grid">', unsafe_allow_html=True)
 
 # 헤더 (요일)
-header_cols = st.columns(len(DAYS) + 1)
+header_cols = st.columns(len(days) + 1)
 with header_cols[0]:
     st.markdown('<div class="tt-header"></div>', unsafe_allow_html=True)
-for i, day in enumerate(DAYS):
+for i, day_no in enumerate(days):
     with header_cols[i + 1]:
         st.markdown(
-            f'<div class="tt-header">{day}</div>',
+            f'<div class="tt-header">{WEEK_DAYS[day_no]}</div>',
             unsafe_allow_html=True,
         )
 
 # 각 교시별 행
-for period in PERIODS:
-    row_cols = st.columns(len(DAYS) + 1)
+for period in periods:
+    row_cols = st.columns(len(days) + 1)
 
     # 첫 번째 열: 교시 번호
     with row_cols[0]:
@@ -218,23 +230,27 @@ for period in PERIODS:
             unsafe_allow_html=True,
         )
 
-    # 요일별 칸
-    for j, day in enumerate(DAYS):
-        cell = grid.get((day, period))
+    # 요일별 칸 (이 교시와 겹치는 수업을 색인에서 조회, 여러 개면 첫 수업 + 개수)
+    for j, day_no in enumerate(days):
+        day = WEEK_DAYS[day_no]
+        cells = index.at(day_no, *period_range(period))
         col = row_cols[j + 1]
 
         with col:
-            if cell is None:
+            if not cells:
                 # 빈 칸
                 st.markdown(
                     '<div class="tt-cell-empty"></div>',
                     unsafe_allow_html=True,
                 )
             else:
+                cell = cells[0]
                 subj = cell["subject"]
                 room = cell["room"]
-                emoji = SUBJECT_EMOJI.get(subj, "⬜️")
+                emoji = subject_emoji(subj)
                 label = f"{emoji} {subj}\n{room}"
+                if len(cells) > 1:
+                    label += f"\n⚠️ 외 {len(cells) - 1}개"
 
                 if st.button(
                     label,
@@ -245,12 +261,26 @@ for period in PERIODS:
                         "subject": subj,
                         "day": day,
                         "period": period,
+                        "time": f"{format_minutes(cell['start'])}–{format_minutes(cell['end'])}",
                         "room": room,
+                        "others": [c["subject"] for c in cells[1:]],
                     }
                     st.session_state.tt_panel_open = True
 
 st.markdown("</div>", unsafe_allow_html=True)
 
+# ---------------- 빈 시간 찾기 ----------------
+with st.expander("⏱ 이번 주 빈 시간 찾기"):
+    hours = st.number_input("필요한 시간 (시간)", min_value=0.5, max_value=8.0, value=2.0, step=0.5, key="tt_free_hours")
+    minutes = int(hours * 60)
+    now = week_minute()
+    upcoming = index.free_slots(minutes, after=now)
+    if upcoming:
+        st.write(f"**다음 빈 {hours:g}시간:** {format_slot(*upcoming[0])}")
+        st.caption("이번 주 남은 빈 시간: " + " · ".join(format_slot(*s) for s in upcoming[1:6]))
+    else:
+        st.write("이번 주에는 남은 빈 시간이 없습니다 (09:00–22:00 기준).")
+
 # ---------------- 과목 클릭 시: 아래쪽 정보 패널 ----------------
 if st.session_state.tt_panel_open and st.session_state.tt_panel_info:
     info = st.session_state.tt_panel_info
@@ -263,42 +293,38 @@ if st.session_state.tt_panel_open and st.session_state.tt_panel_info:
 
         st.write(f"**과목명:** {subject}")
         st.write(f"**학기:** {info['semester']}")
-        st.write(f"**요일 / 교시:** {info['day']}요일 {info['period']}교시")
+        st.write(f"**요일 / 교시:** {info['day']}요일 {info['period']}교시 ({info.get('time', '')})")
         st.write(f"**강의실:** {info['room']}")
+        if info.get("others"):
+            st.write(f"**같은 시간 수업:** {', '.join(info['others'])}")
 
         # ===== 15주차 강의계획서 → app.py 검색 연동 =====
         if subject in SYLLABUS_MAP and SYLLABUS_MAP[subject]:
-            syllabus = SYLLABUS_MAP[subject]
-
             st.markdown("#### 15주차 강의 계획")
+            if any(pack.meta.get("course") == subject for pack in course_pack.get_course_packs()):
+                st.caption("📦 오프라인 코스팩: 주차별 영상 / 자막 / 요약 / 퀴즈를 네트워크 없이 볼 수 있어요")
 
-            # '1주', '2주', ..., '15주' 형식의 키만 뽑아서 정렬
-            week_keys = [k for k in syllabus.keys() if k.endswith("주")]
-            week_keys.sort(key=lambda x: int(x.replace("주", "")))
-
-            for wk in week_keys:
-                week_data = syllabus[wk]
-                goal = (week_data.get("학습목표") or "").replace("\n", " ")
-                content = (week_data.get("학습내용") or "").replace("\n", " ")
-
-                # 내용이 완전 비어 있으면 버튼 안 만들기
-                if not goal and not content:
-                    continue
-
+            # '1주', '2주', ..., '15주' 순서 (내용이 완전 비어 있는 주차는 빠져 있음)
+            for wk, goal, content in syllabus_weeks(subject):
                 btn_label = f"{wk} | {goal}" if goal else f"{wk} | {content}"
 
                 if st.button(btn_label, key=f"{subject}_{wk}"):
                     # 검색어: 과목명 + 주차 + 학습내용/목표
-                    query = f"{subject} {wk} {content or goal}"
+                    query = week_query(subject, wk, goal, content)
+                    get_suggester().record(query)
 
                     st.session_state.search_query = query
+                    # 퀴즈 풀이 기록에 남길 과목/주차 정보
+                    st.session_state.study_context = {"course": subject, "week": wk}
                     try:
-                        results = search_youtube_videos(query, max_results=10)
-                        st.session_state.search_results = results
+                        results = search_youtube_videos(
+                            query, max_results=10, feature="timetable"
+                        )
+                        content_store.put(st.session_state, "search_results", results)
                         st.session_state.search_performed = True
                         st.session_state.selected_video = None
                         st.session_state.selected_video_id = None
-                        st.session_state.video_transcript = None
+                        content_store.put(st.session_state, "video_transcript", None)
                     except Exception as e:
                         st.error(f"영상 검색 중 오류가 발생했습니다: {e}")
                     else:
@@ -312,3 +338,5 @@ if st.session_state.tt_panel_open and st.session_state.tt_panel_info:
         # 패널 닫기
         if st.button("창 닫기", key="close_tt_panel"):
             st.session_state.tt_panel_open = False
+
+_render_span.end()
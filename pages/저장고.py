@@ -2,8 +2,15 @@
 
 import streamlit as st
 
+from utils import content_store, course_pack, telemetry
+from utils.search_index import get_search_index
+from utils.storage import get_student_id
+
 st.set_page_config(page_title="저장한 영상", page_icon="🔖", layout="wide")
 
+# 페이지 렌더링 시간 측정 (파일 끝에서 end)
+_render_span = telemetry.start_span("page.render", page="저장고")
+
 st.title("🔖 저장한 영상들")
 
 # 세션 상태 기본값
@@ -39,7 +46,7 @@ else:
             #        바로 아래에 '이 영상 열기' 버튼을 두는 방식으로 구현할게)
             with col_thumb:
                 if video.get("thumbnail"):
-                    st.image(video["thumbnail"], width=80)
+                    st.image(course_pack.thumbnail(video), width=80)
 
             # 제목 + "열기" 버튼
             with col_info:
@@ -54,13 +61,18 @@ else:
                 if st.button("▶ 이 영상 열기", key=f"open_{idx}"):
                     st.session_state.selected_video = video
                     st.session_state.selected_video_id = video["video_id"]
-                    st.session_state.video_transcript = None  # 새 영상이니까 자막 다시 로드
+                    content_store.put(st.session_state, "video_transcript", None)  # 새 영상이니까 자막 다시 로드
                     st.switch_page("메인.py")
 
             # 삭제 버튼
             with col_delete:
                 if st.button("🗑 삭제", key=f"delete_{idx}"):
-                    st.session_state.saved_videos.pop(idx)
+                    removed = st.session_state.saved_videos.pop(idx)
+                    get_search_index().remove_saved_video(
+                        get_student_id(st.session_state), removed["video_id"]
+                    )
                     st.experimental_rerun()
 
         st.markdown("---")
+
+_render_span.end()
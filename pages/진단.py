@@ -0,0 +1,159 @@
+# streamlit_app/pages/진단.py
+
+import streamlit as st
+
+from utils import admission, content_store, course_pack, telemetry
+from utils.content_store import get_content_store
+
+st.set_page_config(page_title="메모리 진단", page_icon="🩺", layout="wide")
+
+# 페이지 렌더링 시간 측정 (파일 끝에서 end)
+_render_span = telemetry.start_span("page.render", page="진단")
+
+st.title("🩺 세션 메모리 진단")
+st.caption(
+    "자막/요약/검색 결과는 세션 간 공유 저장소에 한 번만 보관하고, "
+    "각 세션의 session_state에는 참조(Handle)만 둡니다."
+)
+
+store = get_content_store()
+
+
+def mb(n: float) -> str:
+    return f"{n / (1024 * 1024):,.2f} MB"
+
+
+stats = store.stats()
+saved = stats["logical_bytes"] - stats["bytes"]
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("프로세스 RSS", f"{content_store.process_rss_mb():,.1f} MB")
+c2.metric("공유 저장소", mb(stats["bytes"]), f"한도 {mb(stats['max_bytes'])}", delta_color="off")
+c3.metric("공유로 아낀 메모리", mb(max(0, saved)))
+c4.metric("추적 중인 세션", stats["sessions"])
+
+st.caption(
+    f"항목 {stats['items']}개 · 여러 세션이 공유 {stats['shared_items']}개 · "
+    f"참조 없음 {stats['unreferenced_items']}개 · 재사용 {stats['intern_hits']}회 · "
+    f"크기 제한으로 제거 {stats['evictions']}회 · "
+    f"{store.idle_seconds / 60:.0f}분 동안 접근이 없는 세션은 참조를 해제합니다."
+)
+
+if st.button("유휴 세션 지금 정리"):
+    released = store.sweep_idle()
+    st.toast(f"세션 {released}개의 참조를 해제했습니다.")
+
+st.markdown("---")
+left, right = st.columns(2)
+
+with left:
+    st.subheader("키별 사용량")
+    slot_rows = store.slot_stats()
+    if slot_rows:
+        st.dataframe(
+            [
+                {
+                    "키": r["slot"],
+                    "세션 수": r["sessions"],
+                    "서로 다른 값": r["unique_items"],
+                    "실제 (KB)": round(r["bytes"] / 1024, 1),
+                    "세션마다 복사했다면 (KB)": round(r["logical_bytes"] / 1024, 1),
+                }
+                for r in slot_rows
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+    else:
+        st.info("아직 공유 저장소를 쓰는 세션이 없습니다.")
+
+with right:
+    st.subheader("세션별 사용량")
+    session_rows = store.session_stats()
+    if session_rows:
+        st.dataframe(
+            [
+                {
+                    "세션": r["session"],
+                    "키 수": r["slots"],
+                    "참조 크기 (KB)": round(r["bytes"] / 1024, 1),
+                    "공유분 나눈 몫 (KB)": round(r["attributed_bytes"] / 1024, 1),
+                    "유휴 (초)": r["idle_sec"],
+                }
+                for r in session_rows[:200]
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+    else:
+        st.info("추적 중인 세션이 없습니다.")
+
+st.markdown("---")
+st.subheader("현재 세션의 session_state")
+st.dataframe(
+    [
+        {
+            "키": r["key"],
+            "타입": r["type"],
+            "세션 안 크기 (KB)": round(r["bytes"] / 1024, 2),
+            "공유 저장소 크기 (KB)": round(r["store_bytes"] / 1024, 1),
+        }
+        for r in content_store.state_sizes(st.session_state)
+    ],
+    use_container_width=True,
+    hide_index=True,
+)
+
+st.markdown("---")
+st.subheader("LLM 작업 대기열")
+queue = admission.get_admission()
+queue_stats = queue.stats()
+q1, q2, q3 = st.columns(3)
+q1.metric("실행 중", f"{queue_stats['running']} / {queue_stats['slots']}")
+q2.metric("대기 중", queue_stats["queued"])
+q3.metric("정책", queue_stats["policy"].upper())
+st.caption(
+    f"사용자별로 연속 {admission.BURST:.0f}개, 이후 분당 {admission.RATE_PER_MIN:.0f}개까지 요청할 수 있고, "
+    "대기열은 사용자별 누적 사용량이 적은 작업부터 실행합니다."
+)
+waiting = queue.queue_snapshot()
+if waiting:
+    st.dataframe(waiting, use_container_width=True, hide_index=True)
+if queue_stats["users"]:
+    st.dataframe(
+        [
+            {
+                "사용자": user,
+                "실행": c["admitted"],
+                "한도 초과": c["rate_limited"],
+                "취소": c["cancelled"],
+                "평균 대기 (초)": round(c["wait_s"] / c["admitted"], 2) if c["admitted"] else 0.0,
+            }
+            for user, c in queue_stats["users"].items()
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+packs = course_pack.get_course_packs()
+if packs:
+    st.markdown("---")
+    st.subheader("오프라인 코스팩")
+    st.dataframe(
+        [
+            {
+                "과목": p["course"],
+                "판": p["revision"],
+                "조각": p["entries"],
+                "크기 (KB)": round(p["size_bytes"] / 1024, 1),
+                "읽은 조각": p["reads"],
+                "읽은 바이트 (KB)": round(p["bytes_read"] / 1024, 1),
+                "파일": p["path"],
+            }
+            for p in (pack.stats() for pack in packs)
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+_render_span.end()
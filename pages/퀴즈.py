@@ -2,18 +2,30 @@
 
 import streamlit as st
 from llm import generate_quiz
+from utils import admission, content_store, quiz_board, telemetry
+from utils.analytics import get_analytics_store
+from utils.extractive import extractive_summary
+from utils.quiz_session import get_quiz_store, make_quiz_id, question_id
+from utils.review_scheduler import get_review_scheduler
+from utils.storage import get_student_id
 
 st.set_page_config(page_title="관련 퀴즈", page_icon="❓", layout="wide")
 
+# 페이지 렌더링 시간 측정 (파일 끝에서 end)
+_render_span = telemetry.start_span("page.render", page="퀴즈")
+
 st.title("관련 퀴즈 풀기")
 
 # 메인 페이지에서 넘어온 정보들
 video_title = st.session_state.get("selected_video_title")
-summary_text = st.session_state.get("quiz_source_summary", "")
+summary_text = content_store.get(st.session_state, "quiz_source_summary", "")
+
+# AI 요약 없이 바로 들어온 경우: 자막이 있으면 추출 요약으로 퀴즈 생성
+if not summary_text:
+    summary_text = extractive_summary(content_store.get(st.session_state, "video_transcript") or "")
 
 # 세션 초기화
-if "quiz_items" not in st.session_state:
-    st.session_state.quiz_items = []
+quiz_store = get_quiz_store(st.session_state)
 
 if "quiz_source_summary_snapshot" not in st.session_state:
     st.session_state.quiz_source_summary_snapshot = ""
@@ -21,58 +33,210 @@ if "quiz_source_summary_snapshot" not in st.session_state:
 if "quiz_correct_count" not in st.session_state:
     st.session_state.quiz_correct_count = 0
 
-# 공통 스타일
-st.markdown(
+def record_answer(quiz_session, q_idx: int, choice: int):
+    """선택 반영 + 학습 통계(attempt 로그) 기록."""
+    # 직전 풀이(또는 퀴즈 생성) 이후 걸린 시간
+    last = max(
+        [t for t in quiz_session.answered_at if t] + [quiz_session.created_at]
+    )
+    correct = quiz_session.answer(q_idx, choice)
+    latency_ms = int((quiz_session.answered_at[q_idx] - last) * 1000)
+
+    context = st.session_state.get("study_context") or {}
+    quiz = quiz_session.items[q_idx]
+    try:
+        get_analytics_store().record_attempt(
+            student_id=get_student_id(st.session_state),
+            question_id=question_id(quiz),
+            question=quiz.get("question", ""),
+            selected=choice,
+            correct=correct,
+            latency_ms=latency_ms,
+            course=context.get("course", ""),
+            week=context.get("week", ""),
+            video_id=st.session_state.get("selected_video_id") or "",
+            quiz_id=quiz_session.quiz_id,
+        )
+        # 복습 스케줄(간격 반복) 갱신
+        get_review_scheduler().record_result(
+            student_id=get_student_id(st.session_state),
+            question_id=question_id(quiz),
+            correct=correct,
+            latency_ms=latency_ms,
+            course=context.get("course", ""),
+            week=context.get("week", ""),
+            question=quiz.get("question", ""),
+        )
+    except Exception as e:
+        # 통계 저장 실패로 퀴즈 풀이가 막히면 안 됨
+        st.toast(f"풀이 기록 저장 실패: {e}", icon="⚠️")
+
+
+def classic_style():
+    """예전 렌더러(APP_QUIZ_RENDERER=classic)용 공통 스타일."""
+    st.markdown(
+        """
+        <style>
+        /* 문제 카드 박스 */
+        .question-card {
+            padding: 1.4rem 1.6rem;
+            border-radius: 0.9rem;
+            border: 1px solid #e5e7eb;
+            background-color: #f9fafb;
+            margin-bottom: 1.8rem;
+            box-shadow: 0 4px 10px rgba(15, 23, 42, 0.04);
+        }
+
+        /* 문제 텍스트 */
+        .question-title {
+            font-size: 1.1rem;
+            line-height: 1.5;
+            margin-bottom: 0.75rem;
+        }
+
+        .question-label {
+            font-weight: 700;
+            color: #2563eb; /* 파란색 */
+            margin-right: 0.25rem;
+        }
+
+        /* 기본 선택지 버튼 (클릭 가능한 st.button) */
+        div.stButton > button {
+            border-radius: 10px;
+            width: 100% !important;
+            display: block;
+            padding: 0.7rem 0.9rem;
+            font-weight: 500;
+            border: 1px solid #d1d5db;
+            text-align: center;
+            justify-content: center;
+        }
+
+        /* 선택 후 보여주는 고정 박스 버튼 */
+        .option-pill {
+            border-radius: 10px;
+            padding: 0.7rem 0.9rem;
+            font-weight: 500;
+            width: 100%;
+            border: none;
+            text-align: center;
+        }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+def show_progress(quiz_session, target=st):
+    """정답 수 진행률 바 (답할 때마다 QuizSession이 갱신한 값 사용)."""
+    num_questions = quiz_session.num_questions
+    correct = quiz_session.correct_count
+    st.session_state.quiz_correct_count = correct
+    target.progress(
+        correct / num_questions,
+        text=f"정답률: {correct}/{num_questions} 문제 정답",
+    )
+
+
+@st.fragment
+def render_board(quiz_session, args: dict):
     """
-    <style>
-    /* 문제 카드 박스 */
-    .question-card {
-        padding: 1.4rem 1.6rem;
-        border-radius: 0.9rem;
-        border: 1px solid #e5e7eb;
-        background-color: #f9fafb;
-        margin-bottom: 1.8rem;
-        box-shadow: 0 4px 10px rgba(15, 23, 42, 0.04);
-    }
-
-    /* 문제 텍스트 */
-    .question-title {
-        font-size: 1.1rem;
-        line-height: 1.5;
-        margin-bottom: 0.75rem;
-    }
-
-    .question-label {
-        font-weight: 700;
-        color: #2563eb; /* 파란색 */
-        margin-right: 0.25rem;
-    }
-
-    /* 기본 선택지 버튼 (클릭 가능한 st.button) */
-    div.stButton > button {
-        border-radius: 10px;
-        width: 100% !important;
-        display: block;
-        padding: 0.7rem 0.9rem;
-        font-weight: 500;
-        border: 1px solid #d1d5db;
-        text-align: center;
-        justify-content: center;
-    }
-
-    /* 선택 후 보여주는 고정 박스 버튼 */
-    .option-pill {
-        border-radius: 10px;
-        padding: 0.7rem 0.9rem;
-        font-weight: 500;
-        width: 100%;
-        border: none;
-        text-align: center;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+    문제 전체를 컴포넌트 하나로 그림 (utils/quiz_board.py).
+    보기를 누르면 이 함수만 다시 실행되고, 새로 답한 문제만 기록한다.
+    """
+    # 진행률은 답을 반영한 뒤에 채우도록 자리만 먼저 잡아 둠
+    progress = st.empty()
+    st.markdown("---")
+
+    value = quiz_board.quiz_board(args, key=f"quiz_board_{quiz_session.quiz_id}")
+    for idx, choice in quiz_board.new_answers(quiz_session, value):
+        record_answer(quiz_session, idx, choice)
+
+    show_progress(quiz_session, progress)
+
+
+def render_classic(quiz_session):
+    """예전 방식: 문제마다 보기 버튼을 만들고 클릭하면 페이지 전체를 다시 실행 (비교용)."""
+    classic_style()
+    show_progress(quiz_session)
+    st.markdown("---")
+
+    # 문제 렌더링
+    for idx, quiz in enumerate(quiz_session.items, start=1):
+        question = quiz.get("question", "")
+        options = quiz.get("options", [])
+        answer_index = quiz.get("answer_index", 0)
+        explanation = quiz.get("explanation", "")
+
+        selected = quiz_session.selected(idx - 1)
+
+        # 문제 텍스트 (문제 N. 부분 파란색 + bold, 전체 글자 크기 키움)
+        st.markdown(
+            f"""
+            <p class="question-title">
+                <span class="question-label">문제 {idx}.</span>{question}
+            </p>
+            """,
+            unsafe_allow_html=True,
+        )
+
+        # 보기 세로 배치
+        if isinstance(options, list) and options:
+            # 아직 선택 전: 실제 버튼
+            if selected is None:
+                for i, opt in enumerate(options):
+                    label = f"{chr(65+i)}. {opt}"
+
+                    if st.button(label, key=f"{quiz_session.quiz_id}_q{idx}_btn_{i}"):
+                        record_answer(quiz_session, idx - 1, i)
+                        st.rerun()
+
+                    # 보기 간 간격 작게
+                    st.markdown(
+                        "<div style='height:6px;'></div>", unsafe_allow_html=True
+                    )
+            else:
+                # 이미 선택된 후: 색상 고정 박스 렌더링
+                is_correct = quiz_session.is_correct(idx - 1)
+
+                for i, opt in enumerate(options):
+                    label = f"{chr(65+i)}. {opt}"
+
+                    bg = "#e5e7eb"
+                    color = "#111827"
+
+                    if i == selected:
+                        if is_correct:
+                            bg = "#22c55e"  # 초록 (정답)
+                            color = "#ffffff"
+                        else:
+                            bg = "#ef4444"  # 빨강 (오답)
+                            color = "#ffffff"
+
+                    pill_html = f"""
+                    <button class="option-pill" style="background:{bg}; color:{color};">
+                        {label}
+                    </button>
+                    """
+                    st.markdown(pill_html, unsafe_allow_html=True)
+                    st.markdown(
+                        "<div style='height:6px;'></div>", unsafe_allow_html=True
+                    )
+
+        # 정답 및 해설
+        with st.expander("정답 및 해설 보기"):
+            if isinstance(options, list) and 0 <= answer_index < len(options):
+                st.markdown(
+                    f"**정답:** {chr(65 + answer_index)}. {options[answer_index]}"
+                )
+            else:
+                st.markdown("정답 정보를 제대로 불러오지 못했습니다.")
+
+            if explanation:
+                st.markdown(f"**해설:** {explanation}")
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
 
 # 상단 정보 표시
 if video_title:
@@ -85,123 +249,52 @@ if not summary_text:
     st.warning("메인 페이지에서 AI 요약을 생성한 후 '퀴즈 풀기' 버튼을 눌러 들어와야 합니다.")
 else:
     # 요약이 변경되면 새 퀴즈 생성
-    if summary_text != st.session_state.quiz_source_summary_snapshot:
-        with st.spinner("요약 내용을 기반으로 퀴즈를 생성하는 중입니다..."):
-            quiz_items = generate_quiz(summary_text, num_questions=5)
-            st.session_state.quiz_items = quiz_items
-            st.session_state.quiz_source_summary_snapshot = summary_text
-
-            # 기존 선택 상태 초기화
-            for k in list(st.session_state.keys()):
-                if "_selected" in k or "_is_correct" in k:
-                    del st.session_state[k]
-
-            st.session_state.quiz_correct_count = 0
-
-    quiz_items = st.session_state.quiz_items
+    quiz_id = make_quiz_id(summary_text, num_questions=5)
+    # 스냅샷에는 요약 전문 대신 퀴즈 ID(요약 해시)만 보관
+    if quiz_id != st.session_state.quiz_source_summary_snapshot:
+        # 예전에 풀던 같은 요약의 퀴즈가 있으면 그대로 이어서 풀기
+        refused = False
+        if quiz_store.activate(quiz_id) is None:
+            queue_note = st.empty()
+
+            def show_queue_position(position):
+                if position > 0:
+                    queue_note.caption(f"⏳ 퀴즈 생성 대기 중 · 내 앞에 {position - 1}개의 요청이 있어요.")
+
+            with st.spinner("요약 내용을 기반으로 퀴즈를 생성하는 중입니다..."):
+                video_id = st.session_state.get("selected_video_id") or ""
+                try:
+                    # 사용자별 속도 제한 + 공정 대기열 (utils/admission.py)
+                    with admission.user_context(
+                        get_student_id(st.session_state), tag=video_id, on_wait=show_queue_position
+                    ):
+                        quiz_items = generate_quiz(summary_text, num_questions=5, video_id=video_id)
+                except admission.AdmissionError as e:
+                    # 속도 제한(RateLimited) 또는 다른 영상을 골라서 취소됨(JobCancelled)
+                    telemetry.incr("llm_admission_refused", task="quiz", reason=type(e).__name__)
+                    st.warning(str(e))
+                    quiz_items, refused = [], True
+                finally:
+                    queue_note.empty()
+                if quiz_items:
+                    # 같은 퀴즈를 푸는 세션들은 문제 목록 객체 하나를 공유
+                    quiz_items = content_store.share(st.session_state, "quiz_items", quiz_items)
+                    quiz_store.start(quiz_id, quiz_items)
+        if not refused:
+            # 한도 초과 / 취소였으면 스냅샷을 남기지 않아서 다음 실행 때 다시 시도
+            st.session_state.quiz_source_summary_snapshot = quiz_id
+
+    quiz_session = quiz_store.get(quiz_id)
+    quiz_items = quiz_session.items if quiz_session else []
 
     if not quiz_items:
         st.markdown("---")
         st.error("퀴즈를 생성하지 못했습니다. 다시 시도해 주세요.")
     else:
-        num_questions = len(quiz_items)
-
-        # 현재까지 맞은 문제 수 계산
-        correct = sum(
-            1
-            for idx in range(1, num_questions + 1)
-            if st.session_state.get(f"q{idx}_is_correct")
-        )
-        st.session_state.quiz_correct_count = correct
-
-        # 진행률 바
-        st.progress(
-            correct / num_questions,
-            text=f"정답률: {correct}/{num_questions} 문제 정답",
-        )
-
-        st.markdown("---")
-
-        # 문제 렌더링
-        for idx, quiz in enumerate(quiz_items, start=1):
-            question = quiz.get("question", "")
-            options = quiz.get("options", [])
-            answer_index = quiz.get("answer_index", 0)
-            explanation = quiz.get("explanation", "")
-
-            selected_key = f"q{idx}_selected"
-            correct_key = f"q{idx}_is_correct"
-
-            # 초기 상태 설정
-            st.session_state.setdefault(selected_key, None)
-            st.session_state.setdefault(correct_key, False)
-
-
-            # 문제 텍스트 (문제 N. 부분 파란색 + bold, 전체 글자 크기 키움)
-            st.markdown(
-                f"""
-                <p class="question-title">
-                    <span class="question-label">문제 {idx}.</span>{question}
-                </p>
-                """,
-                unsafe_allow_html=True,
-            )
-
-            # 보기 세로 배치
-            if isinstance(options, list) and options:
-                # 아직 선택 전: 실제 버튼
-                if st.session_state[selected_key] is None:
-                    for i, opt in enumerate(options):
-                        label = f"{chr(65+i)}. {opt}"
-
-                        if st.button(label, key=f"q{idx}_btn_{i}"):
-                            st.session_state[selected_key] = i
-                            st.session_state[correct_key] = (i == answer_index)
-                            st.rerun()
-
-                        # 보기 간 간격 작게
-                        st.markdown(
-                            "<div style='height:6px;'></div>", unsafe_allow_html=True
-                        )
-                else:
-                    # 이미 선택된 후: 색상 고정 박스 렌더링
-                    selected = st.session_state[selected_key]
-                    is_correct = st.session_state[correct_key]
-
-                    for i, opt in enumerate(options):
-                        label = f"{chr(65+i)}. {opt}"
-
-                        bg = "#e5e7eb"
-                        color = "#111827"
-
-                        if i == selected:
-                            if is_correct:
-                                bg = "#22c55e"  # 초록 (정답)
-                                color = "#ffffff"
-                            else:
-                                bg = "#ef4444"  # 빨강 (오답)
-                                color = "#ffffff"
-
-                        pill_html = f"""
-                        <button class="option-pill" style="background:{bg}; color:{color};">
-                            {label}
-                        </button>
-                        """
-                        st.markdown(pill_html, unsafe_allow_html=True)
-                        st.markdown(
-                            "<div style='height:6px;'></div>", unsafe_allow_html=True
-                        )
-
-            # 정답 및 해설
-            with st.expander("정답 및 해설 보기"):
-                if isinstance(options, list) and 0 <= answer_index < len(options):
-                    st.markdown(
-                        f"**정답:** {chr(65 + answer_index)}. {options[answer_index]}"
-                    )
-                else:
-                    st.markdown("정답 정보를 제대로 불러오지 못했습니다.")
-
-                if explanation:
-                    st.markdown(f"**해설:** {explanation}")
+        if quiz_board.RENDERER == "classic":
+            render_classic(quiz_session)
+        else:
+            # 인자는 이번 페이지 실행 때 만든 값을 fragment 재실행에서도 그대로 씀
+            render_board(quiz_session, quiz_board.board_args(quiz_session))
 
-            st.markdown("</div>", unsafe_allow_html=True)
+_render_span.end()
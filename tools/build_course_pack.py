@@ -0,0 +1,282 @@
+# streamlit_app/tools/build_course_pack.py
+"""
+오프라인 코스팩 만들기 (utils/course_pack.py).
+
+과목마다 강의계획서 주차 검색어(utils/timetable_data.week_query)로 검색한 결과와,
+주차별 상위 영상의 영상 정보 / 자막(시간 정보 포함) / 요약 / 퀴즈 / 챕터 요약 / 썸네일을 파일 하나로 묶는다.
+
+사용 예:
+    python -m tools.build_course_pack 대학수학                   # → data/packs/대학수학.pack
+    python -m tools.build_course_pack --all --videos-per-week 2
+    python -m tools.build_course_pack 정보검색 --no-llm           # 이미 만든 요약/퀴즈만 넣음 (모델 로딩 안 함)
+    python -m tools.build_course_pack 대학수학 --fake             # 가짜 YouTube/LLM(bench/fakes.py)으로 흐름만 점검
+
+앱에서 쓰려면:  APP_COURSE_PACK=data/packs/대학수학.pack streamlit run 메인.py
+
+- 증분: 같은 이름의 팩이 있으면 그 안의 검색 결과 / 자막 / 요약 / 퀴즈 / 썸네일을 먼저 쓰고
+  (할당량, 모델 시간을 쓰지 않음) 없는 것만 가져오거나 생성한다. 바뀌지 않은 조각은 압축된 바이트를 그대로 복사.
+  --refresh-search 면 검색 결과만 다시 가져오고, --force 면 이전 팩을 무시한다.
+- 요약/퀴즈는 이 프로세스에서 하나씩 만든다. 영상이 많으면 먼저 tools/ingest_course.py로
+  캐시(data/content.db)를 채운 뒤 --no-llm으로 묶는 편이 빠르다.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils import course_pack  # noqa: E402
+from utils.storage import data_path  # noqa: E402
+
+SEARCH_RESULTS = 10  # 사이드바 검색 결과 수와 같게
+TRANSCRIPT_THREADS = 4
+THUMBNAIL_TIMEOUT = 10
+
+
+def _open_previous(path: Path):
+    if not path.exists():
+        return None
+    try:
+        return course_pack.CoursePack(path)
+    except (OSError, course_pack.PackError, ValueError) as e:
+        print(f"이전 팩을 열 수 없어 새로 만듭니다 ({path.name}): {e}")
+        return None
+
+
+def _download(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=THUMBNAIL_TIMEOUT) as resp:
+            return resp.read()
+    except Exception as e:  # noqa: BLE001
+        print(f"  썸네일 다운로드 실패 ({url}): {e}")
+        return None
+
+
+def build_course(course: str, args) -> dict:
+    from utils import youtube_api2
+    from utils.chapters import detect_chapters
+    from utils.content_cache import get_content_cache
+    from utils.extractive import split_sentences
+    from utils.timetable_data import syllabus_weeks, week_query
+    from utils.transcript import TranscriptError, fetch_transcript
+
+    path = Path(args.out) / f"{course}.pack"
+    previous = None if args.force else _open_previous(path)
+    cache = get_content_cache()
+    counts = Counter()
+
+    def stored(kind: str, name: str, loader, as_json: bool = False):
+        """이전 팩 → 로더(캐시, 네트워크, 모델) 순으로 찾고, 어디서 왔는지 센다."""
+        if previous is not None and name in previous:
+            counts[f"{kind}_reused"] += 1
+            return previous.get_json(name) if as_json else previous.get_text(name)
+        value = loader()
+        if value is not None:
+            counts[f"{kind}_new"] += 1
+        return value
+
+    writer = course_pack.PackWriter(
+        path,
+        {"course": course, "language": args.language, "videos_per_week": args.videos_per_week},
+        previous,
+    )
+    start = time.perf_counter()
+    try:
+        # 1) 주차 → 검색 결과 (사이드바에 그대로 보여줄 목록) → 주차별 상위 영상
+        weeks, search_results = [], []
+        for wk, goal, content in syllabus_weeks(course):
+            query = week_query(course, wk, goal, content)
+            name = course_pack.search_name(query)
+
+            def search(query=query):
+                return youtube_api2.search_youtube_videos(query, max_results=SEARCH_RESULTS, feature="pack")
+
+            if args.refresh_search and previous is not None and name in previous:
+                results = search()
+                counts["search_new"] += 1
+            else:
+                results = stored("search", name, search, as_json=True)
+            writer.add_json(name, results)
+            search_results.append(results)
+            weeks.append(
+                {
+                    "week": wk,
+                    "goal": goal,
+                    "content": content,
+                    "query": query,
+                    "video_ids": [r["video_id"] for r in results[: args.videos_per_week]],
+                }
+            )
+        writer.add_json("weeks", weeks)
+        video_ids = list(dict.fromkeys(vid for w in weeks for vid in w["video_ids"]))
+
+        # 2) 영상 정보 (50개씩 묶어서 1 unit)
+        missing = [v for v in video_ids if previous is None or course_pack.video_name(v) not in previous]
+        details = youtube_api2.get_video_details(missing, feature="pack") if missing else {}
+        for vid in video_ids:
+            item = stored("video", course_pack.video_name(vid), lambda vid=vid: details.get(vid), as_json=True)
+            if item is not None:
+                writer.add_json(course_pack.video_name(vid), item)
+
+        # 3) 자막 (스레드로 동시에, 캐시에 있으면 네트워크 안 씀)
+        def transcript_of(vid):
+            def fetch():
+                try:
+                    return fetch_transcript(vid, args.language)
+                except TranscriptError as e:
+                    print(f"  자막 없음 {vid}: {e}")
+                    return None
+
+            return stored("transcript", course_pack.transcript_name(vid, args.language), fetch)
+
+        with ThreadPoolExecutor(max_workers=TRANSCRIPT_THREADS) as pool:
+            transcripts = dict(zip(video_ids, pool.map(transcript_of, video_ids)))
+
+        for vid in video_ids:
+            transcript = transcripts.get(vid)
+            if not transcript:
+                counts["no_transcript"] += 1
+                continue
+            writer.add_text(course_pack.transcript_name(vid, args.language), transcript)
+            segments = stored(
+                "segments",
+                course_pack.segments_name(vid, args.language),
+                lambda vid=vid: cache.get_segments(vid, args.language),
+                as_json=True,
+            )
+            if segments:
+                writer.add_json(course_pack.segments_name(vid, args.language), segments)
+
+            # 4) 요약 / 퀴즈 (없으면 모델로 생성, --no-llm이면 캐시에 있는 것만)
+            def summarize(transcript=transcript, vid=vid):
+                summary = cache.get_summary(transcript)
+                if summary is None and not args.no_llm:
+                    import llm
+
+                    summary = llm.summarize_text(transcript, vid) or None
+                return summary
+
+            summary = stored("summary", course_pack.summary_name(transcript), summarize)
+            if summary:
+                writer.add_text(course_pack.summary_name(transcript), summary)
+
+                def make_quiz(summary=summary, vid=vid):
+                    quiz = cache.get_quiz(summary, args.questions)
+                    if quiz is None and not args.no_llm:
+                        import llm
+
+                        quiz = llm.generate_quiz(summary, args.questions, vid) or None
+                    return quiz
+
+                quiz_name = course_pack.quiz_name(summary, args.questions)
+                quiz = stored("quiz", quiz_name, make_quiz, as_json=True)
+                if quiz:
+                    writer.add_json(quiz_name, quiz)
+
+            # 챕터 요약은 이미 만든 것만 (챕터마다 모델을 돌리면 너무 오래 걸림)
+            chapters = detect_chapters(segments or [(None, s) for s in split_sentences(transcript)])
+            for chapter in chapters if len(chapters) > 1 else []:
+                name = course_pack.summary_name(chapter["text"])
+                chapter_summary = stored(
+                    "chapter_summary", name, lambda text=chapter["text"]: cache.get_summary(text)
+                )
+                if chapter_summary:
+                    writer.add_text(name, chapter_summary)
+
+        # 5) 썸네일 (사이드바 검색 결과 전체, 이미 압축된 이미지라 그대로 저장)
+        if not args.no_thumbnails:
+            thumbs = {}
+            for results in search_results:
+                for r in results:
+                    if r.get("thumbnail"):
+                        thumbs.setdefault(r["video_id"], r["thumbnail"])
+            for vid, url in thumbs.items():
+                name = course_pack.thumb_name(vid)
+                if previous is not None and name in previous:
+                    data = previous.get_bytes(name)
+                    counts["thumbnail_reused"] += 1
+                else:
+                    data = _download(url)
+                    counts["thumbnail_new" if data else "thumbnail_failed"] += 1
+                if data:
+                    writer.add(name, data, compress=False)
+
+        stats = writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+    stats.update(
+        course=course,
+        weeks=len(weeks),
+        videos=len(video_ids),
+        elapsed_s=round(time.perf_counter() - start, 2),
+        counts=dict(sorted(counts.items())),
+    )
+    return stats
+
+
+def main(argv=None):
+    from utils.timetable_data import SYLLABUS_MAP
+
+    parser = argparse.ArgumentParser(description="오프라인 코스팩 만들기")
+    parser.add_argument("courses", nargs="*", help="과목명 (강의계획서가 있는 과목)")
+    parser.add_argument("--all", action="store_true", help="강의계획서가 있는 모든 과목")
+    parser.add_argument("--out", default="", help="출력 폴더 (기본: data/packs)")
+    parser.add_argument("--language", default="ko", help="자막 언어 (기본 ko)")
+    parser.add_argument("--videos-per-week", type=int, default=3, help="주차마다 자막/요약/퀴즈를 넣을 영상 수")
+    parser.add_argument("--questions", type=int, default=5, help="퀴즈 문항 수 (앱 기본 5)")
+    parser.add_argument("--no-llm", action="store_true", help="요약/퀴즈를 새로 만들지 않음 (캐시에 있는 것만)")
+    parser.add_argument("--no-thumbnails", action="store_true", help="썸네일을 넣지 않음")
+    parser.add_argument("--refresh-search", action="store_true", help="이전 팩의 검색 결과 대신 다시 검색")
+    parser.add_argument("--force", action="store_true", help="이전 팩을 무시하고 처음부터")
+    parser.add_argument("--fake", action="store_true", help="가짜 YouTube/LLM(bench/fakes.py)으로 흐름만 점검")
+    args = parser.parse_args(argv)
+
+    if args.fake:
+        from bench import fakes
+        from utils import storage
+
+        fakes.install(fakes.FakeConfig(time_scale=0.01))
+        # 가짜 결과가 실제 캐시에 섞이지 않도록 임시 폴더 사용
+        os.environ["APP_DATA_DIR"] = tempfile.mkdtemp(prefix="pack_fake_")
+        storage.DATA_DIR = Path(os.environ["APP_DATA_DIR"])
+        args.no_thumbnails = True
+        print(f"--fake: 임시 폴더 사용 {storage.DATA_DIR}")
+    args.out = args.out or str(data_path("packs"))
+
+    courses = [c for c in SYLLABUS_MAP if SYLLABUS_MAP[c]] if args.all else args.courses
+    unknown = [c for c in courses if not SYLLABUS_MAP.get(c)]
+    if not courses or unknown:
+        raise SystemExit(
+            f"강의계획서가 있는 과목을 지정하세요: {', '.join(c for c in SYLLABUS_MAP if SYLLABUS_MAP[c])}"
+        )
+
+    reports = []
+    for course in courses:
+        print(f"[{course}] 코스팩 만드는 중...")
+        report = build_course(course, args)
+        reports.append(report)
+        print(
+            f"[{course}] {report['path']} · r{report['revision']} · 조각 {report['entries']}개 "
+            f"(재사용 {report['reused']}, 새로 압축 {report['written']}) · "
+            f"{report['size_bytes'] / 1024:.0f} KB · {report['elapsed_s']}s"
+        )
+
+    print(json.dumps(reports, ensure_ascii=False, indent=2))
+    paths = os.pathsep.join(r["path"] for r in reports)
+    print(f"\n앱에서 사용: APP_COURSE_PACK={paths}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# streamlit_app/tools/import_profile.py
+"""
+페이지별 시작(import) 시간 측정 + 예산 점검.
+
+각 페이지(메인.py, pages/*.py)의 최상위 import 문만 모아서 새 파이썬 프로세스에서
+`python -X importtime`으로 실행한다 (페이지를 처음 여는 사용자가 기다리는 import 비용).
+함수 안에서 불러오는 무거운 모듈(llama_cpp, googleapiclient, docx, numpy ...)은
+실제로 쓸 때만 로딩되므로 여기 포함되지 않는 것이 정상이다.
+
+사용 예:
+    python -m tools.import_profile                  # 페이지별 요약 + 느린 모듈 상위 10개
+    python -m tools.import_profile --page 메인.py --top 30
+    python -m tools.import_profile --check --budget-ms 1500   # 예산 초과 시 종료 코드 1
+    python -m tools.import_profile --json --out import_profile.json
+
+설치되지 않은 패키지(예: 개발 PC에 streamlit 없음)는 missing으로 표시하고 측정에서 빠진다.
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 1500.0
+MARKER = "--import-profile-start--"
+
+# 페이지가 직접 import하면 안 되는 무거운 모듈 (함수 안에서 불러야 함)
+HEAVY_MODULES = ("llama_cpp", "googleapiclient", "youtube_transcript_api", "docx", "numpy")
+
+
+def page_files() -> list:
+    return [ROOT / "메인.py"] + sorted((ROOT / "pages").glob("*.py"))
+
+
+def top_level_imports(path: Path) -> list:
+    """모듈 최상위의 import 문 (함수/클래스 안 import는 제외)."""
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def build_script(imports: list) -> str:
+    """import 문을 하나씩 실행하고 (wall ms, 없는 모듈 목록)을 JSON으로 stdout에 출력하는 스크립트."""
+    lines = [
+        "import json, sys, time",
+        f"sys.stderr.write({MARKER!r} + '\\n')",
+        "missing = []",
+        "start = time.perf_counter()",
+    ]
+    for stmt in imports:
+        lines += [
+            "try:",
+            f"    {stmt}",
+            "except ImportError as e:",
+            "    missing.append(e.name or str(e))",
+        ]
+    lines.append(
+        "print(json.dumps({'wall_ms': (time.perf_counter() - start) * 1000, 'missing': missing}))"
+    )
+    return "\n".join(lines)
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    -X importtime 출력 → [{"module", "self_ms", "cumulative_ms", "depth"}]
+    형식: "import time:       self [us] |  cumulative | imported package"
+    """
+    rows = []
+    started = False
+    for line in stderr.splitlines():
+        if line.strip() == MARKER:
+            started = True
+            continue
+        if not started or not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 헤더 줄
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        rows.append(
+            {
+                "module": stripped,
+                "self_ms": int(parts[0]) / 1000,
+                "cumulative_ms": int(parts[1]) / 1000,
+                "depth": (len(name) - len(stripped) - 1) // 2,
+            }
+        )
+    return rows
+
+
+def profile_page(path: Path, repeat: int = 3) -> dict:
+    """새 프로세스에서 repeat번 측정해서 가장 빠른 실행 결과를 사용 (디스크 캐시 영향 줄이기)."""
+    script = build_script(top_level_imports(path))
+    env = dict(os.environ, PYTHONPATH=str(ROOT) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    best = None
+    for _ in range(max(1, repeat)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            return {"page": path.name, "error": proc.stderr.strip().splitlines()[-1:]}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result["wall_ms"] < best[0]["wall_ms"]:
+            best = (result, proc.stderr)
+
+    result, stderr = best
+    modules = parse_importtime(stderr)
+    loaded = {m["module"].split(".")[0] for m in modules}
+    return {
+        "page": path.relative_to(ROOT).as_posix(),
+        "wall_ms": round(result["wall_ms"], 1),
+        "modules": len(modules),
+        "missing": sorted(set(result["missing"])),
+        "heavy_loaded": [m for m in HEAVY_MODULES if m in loaded],
+        "top_self": sorted(modules, key=lambda m: m["self_ms"], reverse=True),
+        "top_cumulative": sorted(
+            (m for m in modules if m["depth"] == 0),
+            key=lambda m: m["cumulative_ms"],
+            reverse=True,
+        ),
+    }
+
+
+def print_report(reports: list, top: int, budget_ms: float):
+    for r in reports:
+        if "error" in r:
+            print(f"\n[{r['page']}] 측정 실패: {' '.join(r['error'])}")
+            continue
+        status = "OK" if r["wall_ms"] <= budget_ms else "예산 초과"
+        print(f"\n[{r['page']}] {r['wall_ms']:.1f} ms (예산 {budget_ms:.0f} ms, {status}) · 모듈 {r['modules']}개")
+        if r["missing"]:
+            print(f"  설치 안 됨 (측정 제외): {', '.join(r['missing'])}")
+        if r["heavy_loaded"]:
+            print(f"  ⚠ 시작 시 무거운 모듈 로딩: {', '.join(r['heavy_loaded'])}")
+        print("  최상위 import (누적 ms):")
+        for m in r["top_cumulative"][:top]:
+            print(f"    {m['cumulative_ms']:9.1f}  {m['module']}")
+        print("  모듈 자체 시간 (self ms):")
+        for m in r["top_self"][:top]:
+            print(f"    {m['self_ms']:9.1f}  {m['module']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지별 import 시간 측정")
+    parser.add_argument("--page", action="append", default=[], help="측정할 페이지 (기본: 전체)")
+    parser.add_argument("--repeat", type=int, default=3, help="페이지당 측정 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--top", type=int, default=10, help="출력할 모듈 수")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="페이지당 import 시간 예산")
+    parser.add_argument("--check", action="store_true", help="예산 초과나 무거운 모듈 로딩이 있으면 종료 코드 1")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    parser.add_argument("--out", help="JSON 리포트 저장 경로")
+    args = parser.parse_args(argv)
+
+    pages = page_files()
+    if args.page:
+        wanted = set(args.page)
+        pages = [p for p in pages if p.name in wanted or p.relative_to(ROOT).as_posix() in wanted]
+
+    reports = [profile_page(p, args.repeat) for p in pages]
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(reports, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    else:
+        print_report(reports, args.top, args.budget_ms)
+
+    failures = [
+        r["page"]
+        for r in reports
+        if "error" in r or r["wall_ms"] > args.budget_ms or r["heavy_loaded"]
+    ]
+    if args.check and failures:
+        print(f"\n예산 점검 실패: {', '.join(failures)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
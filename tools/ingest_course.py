@@ -0,0 +1,324 @@
+# streamlit_app/tools/ingest_course.py
+"""
+강의 영상 일괄 처리 (학기 시작 전에 재생목록/영상 목록을 미리 요약 + 퀴즈 생성).
+
+영상 정보(utils/youtube_api2.py)와 자막(utils/transcript.py)은 메인 프로세스에서 스레드로 받고,
+요약 / 퀴즈 생성은 모델을 하나씩 올린 워커 프로세스들이 나눠서 처리한다.
+결과는 앱이 읽는 영구 캐시(data/content.db)에 저장되므로, 학생이 같은 영상을 열면 바로 보인다.
+
+사용 예:
+    python -m tools.ingest_course --playlist PLxxxx --name calculus
+    python -m tools.ingest_course dQw4w9WgXcQ https://youtu.be/abc123 videos.txt
+    python -m tools.ingest_course videos.txt --workers 2 --questions 5
+
+- 입력: video_id, 유튜브 URL, 파일(.txt 한 줄에 하나 / .json 목록), --playlist
+- 체크포인트: data/ingest/<name>.checkpoint.jsonl (다시 실행하면 끝난 영상은 건너뜀)
+- 리포트: data/ingest/<name>.report.json (처리량 videos/hour 포함)
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils.model_profile import hardware_info, load_settings  # noqa: E402
+from utils.storage import data_path  # noqa: E402
+
+MIN_THREADS_PER_WORKER = 4  # llama.cpp는 스레드가 너무 적으면 오히려 비효율
+MEMORY_HEADROOM = 0.8  # 사용 가능한 메모리 중 모델에 쓸 비율
+DEFAULT_MODEL_BYTES = 1.6 * 1024**3  # 모델 파일을 못 찾을 때 가정하는 크기 (2.1B Q4_K_M)
+TRANSCRIPT_THREADS = 4
+
+
+# ================================================================
+# 입력 목록 / 체크포인트
+# ================================================================
+def read_sources(sources: list) -> list:
+    """video_id / URL / 파일 경로 목록 → video_id 목록 (순서 유지, 중복 제거)."""
+    from utils.transcript import extract_video_id
+
+    ids = []
+    for src in sources:
+        path = Path(src)
+        if path.is_file():
+            if path.suffix == ".json":
+                data = json.loads(path.read_text(encoding="utf-8"))
+                items = data.get("videos", []) if isinstance(data, dict) else data
+                ids.extend(
+                    extract_video_id(v["video_id"] if isinstance(v, dict) else v) for v in items
+                )
+            else:
+                for line in path.read_text(encoding="utf-8").splitlines():
+                    line = line.split("#", 1)[0].strip()
+                    if line:
+                        ids.append(extract_video_id(line))
+        else:
+            ids.append(extract_video_id(src))
+    return list(dict.fromkeys(i for i in ids if i))
+
+
+def load_checkpoint(path: Path) -> dict:
+    """video_id → 마지막 처리 결과."""
+    done = {}
+    if path.exists():
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # 중간에 끊겨서 반만 쓰인 줄
+            done[record["video_id"]] = record
+    return done
+
+
+def append_checkpoint(path: Path, record: dict):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# ================================================================
+# 워커 수 결정
+# ================================================================
+def _available_memory_bytes() -> float:
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return hardware_info()["memory_gb"] * 1024**3
+
+
+def plan_workers(requested: int, num_videos: int) -> tuple:
+    """(워커 수, 워커당 스레드 수). 코어 수와 모델 메모리 중 작은 쪽에 맞춤."""
+    cpus = hardware_info()["usable_cpus"]
+    model_path, _ = load_settings("")
+    try:
+        model_bytes = os.path.getsize(model_path)
+    except OSError:
+        model_bytes = DEFAULT_MODEL_BYTES
+
+    by_cpu = max(1, cpus // MIN_THREADS_PER_WORKER)
+    # 모델 파일 + KV 캐시/버퍼 여유분 20%
+    by_memory = max(1, int(_available_memory_bytes() * MEMORY_HEADROOM // (model_bytes * 1.2)))
+    workers = requested or min(by_cpu, by_memory)
+    workers = max(1, min(workers, num_videos or 1))
+    return workers, max(1, cpus // workers)
+
+
+# ================================================================
+# 워커 프로세스 (모델 1개씩)
+# ================================================================
+def _init_worker(n_threads: int, fake: bool):
+    os.environ["LLM_N_THREADS"] = str(n_threads)
+    if fake:
+        from bench import fakes
+
+        fakes.install(fakes.FakeConfig(time_scale=0.01))
+    # 모델 로딩 메시지가 진행 상황 출력에 섞이지 않도록
+    with contextlib.redirect_stdout(sys.stderr):
+        import llm
+
+        llm.get_model()
+
+
+def _generate(video_id: str, transcript: str, num_questions: int) -> dict:
+    import llm
+
+    start = time.perf_counter()
+    summary = llm.summarize_text(transcript, video_id)
+    summary_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    quizzes = llm.generate_quiz(summary, num_questions, video_id) if summary else []
+    quiz_s = time.perf_counter() - start
+
+    return {
+        "summary_s": round(summary_s, 2),
+        "quiz_s": round(quiz_s, 2),
+        "questions": len(quizzes),
+        "ok": bool(summary) and bool(quizzes),
+        "error": "" if summary and quizzes else ("요약 실패" if not summary else "퀴즈 생성 실패"),
+    }
+
+
+def _fetch(video_id: str, language: str) -> tuple:
+    from utils.transcript import TranscriptError, fetch_transcript
+
+    start = time.perf_counter()
+    try:
+        text = fetch_transcript(video_id, language)
+    except TranscriptError as e:
+        return None, str(e), round(time.perf_counter() - start, 2)
+    return text, "", round(time.perf_counter() - start, 2)
+
+
+# ================================================================
+# 실행
+# ================================================================
+def _format_duration(seconds: float) -> str:
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    return f"{h}h {m:02d}m {s:02d}s" if h else f"{m}m {s:02d}s"
+
+
+def run(args) -> dict:
+    if args.fake:
+        from bench import fakes
+        from utils import storage
+
+        fakes.install(fakes.FakeConfig(time_scale=0.01))
+        # 가짜 결과가 실제 캐시에 섞이지 않도록 임시 폴더 사용 (워커 프로세스도 환경변수로 따라감)
+        os.environ["APP_DATA_DIR"] = tempfile.mkdtemp(prefix="ingest_fake_")
+        storage.DATA_DIR = Path(os.environ["APP_DATA_DIR"])
+        print(f"--fake: 임시 폴더 사용 {storage.DATA_DIR}")
+
+    from utils import youtube_api2
+
+    video_ids = read_sources(args.sources)
+    for playlist_id in args.playlist:
+        video_ids.extend(youtube_api2.fetch_playlist_video_ids(playlist_id))
+    video_ids = list(dict.fromkeys(video_ids))
+    if not video_ids:
+        raise SystemExit("처리할 영상이 없습니다. video_id / URL / 파일 / --playlist 를 지정하세요.")
+
+    checkpoint_path = data_path("ingest", f"{args.name}.checkpoint.jsonl")
+    done = {} if args.force else load_checkpoint(checkpoint_path)
+    todo = [v for v in video_ids if not done.get(v, {}).get("ok")]
+    skipped = len(video_ids) - len(todo)
+
+    workers, n_threads = plan_workers(args.workers, len(todo))
+    print(
+        f"영상 {len(video_ids)}개 (완료 {skipped}개 건너뜀, 처리 {len(todo)}개) · "
+        f"워커 {workers}개 × 스레드 {n_threads}개"
+    )
+
+    # 영상 제목/통계 (50개씩 묶어서 1 unit) → 영구 캐시
+    titles = {}
+    if todo:
+        try:
+            details = youtube_api2.get_video_details(todo, feature="ingest")
+            titles = {vid: item.get("snippet", {}).get("title", "") for vid, item in details.items()}
+        except Exception as e:
+            print(f"영상 정보 조회 실패 (계속 진행): {e}")
+
+    results = []
+    start = time.perf_counter()
+    ctx = multiprocessing.get_context("spawn")  # 모델/스레드가 있는 프로세스를 fork하지 않음
+    with ThreadPoolExecutor(max_workers=TRANSCRIPT_THREADS) as io_pool, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(n_threads, args.fake),
+    ) as model_pool:
+        # 자막 받기 → 받는 대로 모델 워커에 넘김 (다운로드와 생성이 겹쳐서 진행)
+        fetches = {io_pool.submit(_fetch, vid, args.language): vid for vid in todo}
+        jobs = {}
+        for fut in as_completed(fetches):
+            vid = fetches[fut]
+            transcript, error, transcript_s = fut.result()
+            if transcript is None:
+                record = {"video_id": vid, "ok": False, "error": error, "transcript_s": transcript_s}
+                results.append(record)
+                append_checkpoint(checkpoint_path, record)
+                _progress(record, len(results), len(todo), start, titles)
+                continue
+            job = model_pool.submit(_generate, vid, transcript, args.questions)
+            jobs[job] = (vid, transcript_s)
+
+        for fut in as_completed(jobs):
+            vid, transcript_s = jobs[fut]
+            try:
+                record = fut.result()
+            except Exception as e:
+                record = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            record = dict(record, video_id=vid, transcript_s=transcript_s, title=titles.get(vid, ""))
+            results.append(record)
+            append_checkpoint(checkpoint_path, record)
+            _progress(record, len(results), len(todo), start, titles)
+
+    elapsed = time.perf_counter() - start
+    ok = [r for r in results if r.get("ok")]
+
+    # 자막 검색 색인(백그라운드)이 끝난 뒤 종료
+    from utils.search_index import get_search_index
+
+    get_search_index().flush()
+
+    def mean(key):
+        values = [r[key] for r in ok if key in r]
+        return round(sum(values) / len(values), 2) if values else 0.0
+
+    report = {
+        "name": args.name,
+        "videos": len(video_ids),
+        "processed": len(results),
+        "succeeded": len(ok),
+        "failed": [{"video_id": r["video_id"], "error": r.get("error", "")} for r in results if not r.get("ok")],
+        "skipped_from_checkpoint": skipped,
+        "workers": workers,
+        "threads_per_worker": n_threads,
+        "elapsed_s": round(elapsed, 1),
+        "videos_per_hour": round(len(ok) / elapsed * 3600, 1) if elapsed > 0 else 0.0,
+        "mean_s": {
+            "transcript": mean("transcript_s"),
+            "summary": mean("summary_s"),
+            "quiz": mean("quiz_s"),
+        },
+    }
+    report_path = data_path("ingest", f"{args.name}.report.json")
+    report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return report
+
+
+def _progress(record: dict, n: int, total: int, start: float, titles: dict):
+    elapsed = time.perf_counter() - start
+    eta = elapsed / n * (total - n) if n else 0.0
+    title = (titles.get(record["video_id"]) or "")[:30]
+    if record.get("ok"):
+        detail = f"✓ 요약 {record['summary_s']}s · 퀴즈 {record['quiz_s']}s ({record['questions']}문항)"
+    else:
+        detail = f"✗ {record.get('error', '')[:60]}"
+    print(
+        f"[{n:>{len(str(total))}}/{total}] {record['video_id']} {title} {detail} | "
+        f"경과 {_format_duration(elapsed)}, 남은 예상 {_format_duration(eta)}",
+        flush=True,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="강의 영상 일괄 요약 / 퀴즈 생성")
+    parser.add_argument("sources", nargs="*", help="video_id, 유튜브 URL, 또는 목록 파일(.txt/.json)")
+    parser.add_argument("--playlist", action="append", default=[], help="유튜브 재생목록 ID (여러 번 가능)")
+    parser.add_argument("--name", default="ingest", help="체크포인트/리포트 파일 이름")
+    parser.add_argument("--language", default="ko", help="자막 언어 (기본 ko)")
+    parser.add_argument("--questions", type=int, default=5, help="영상당 퀴즈 문항 수 (앱 기본 5)")
+    parser.add_argument("--workers", type=int, default=0, help="모델 워커 수 (기본: 코어/메모리로 자동)")
+    parser.add_argument("--force", action="store_true", help="체크포인트를 무시하고 전부 다시 처리")
+    parser.add_argument("--fake", action="store_true", help="가짜 YouTube/LLM(bench/fakes.py)으로 흐름만 점검")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print()
+    print(
+        f"완료: {report['succeeded']}/{report['processed']}개 성공, "
+        f"{report['elapsed_s']}초, {report['videos_per_hour']} videos/hour"
+    )
+    if report["failed"]:
+        print(f"실패 {len(report['failed'])}개 (다시 실행하면 실패한 영상만 재시도)")
+    return 0 if not report["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+# streamlit_app/tools/tune_model.py
+"""
+CPU 추론 설정 자동 튜닝.
+
+이 컴퓨터에서 사용 가능한 GGUF 모델(양자화 버전)과 Llama() 설정
+(n_threads, n_batch, n_ctx, use_mmap/use_mlock)을 고정된 자막 코퍼스로 직접 돌려보고,
+가장 빠른 조합을 data/model_profile.json에 저장한다. llm.py는 시작할 때 이 파일을 읽는다.
+퀴즈는 앱과 같은 경로(캐시된 grammar=, utils/grammar_cache.py)로 생성해서 측정한다.
+
+사용 예:
+    python -m tools.tune_model                       # LLM_MODEL_PATH 폴더의 *.gguf 전부
+    python -m tools.tune_model --models a.gguf b.gguf --objective throughput
+    python -m tools.tune_model --if-stale            # 하드웨어가 바뀐 경우에만 실행
+    python -m tools.tune_model --quick               # 후보/코퍼스를 줄여서 빠르게
+
+모든 조합을 다 돌리면 너무 오래 걸리므로, 설정 하나씩 바꿔 가며 더 좋은 값만 남기는
+좌표 탐색(coordinate descent)으로 찾는다.
+"""
+
+import argparse
+import gc
+import glob
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from llm_prompts import (  # noqa: E402
+    QUIZ_PARAMS,
+    QUIZ_SCHEMA,
+    SUMMARY_PARAMS,
+    format_quiz_messages,
+    format_summary_prompt,
+)
+from utils import grammar_cache  # noqa: E402
+from utils.model_profile import (  # noqa: E402
+    DEFAULT_LLAMA_KWARGS,
+    PROFILE_PATH,
+    hardware_info,
+    is_stale,
+    read_profile,
+    save_profile,
+)
+
+CORPUS_PATH = Path(__file__).resolve().parent / "tune_corpus.json"
+DEFAULT_MODEL_PATH = r"C:\Users\user\Desktop\JH\kanana-1.5-2.1b-instruct-2505-Q4_K_M.gguf"
+
+
+def load_corpus(limit: int = None) -> list:
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+    return corpus[:limit] if limit else corpus
+
+
+def find_models(args) -> list:
+    if args.models:
+        return args.models
+    base = os.getenv("LLM_MODEL_PATH") or (read_profile() or {}).get("model_path") or DEFAULT_MODEL_PATH
+    model_dir = args.model_dir or os.path.dirname(base)
+    found = sorted(glob.glob(os.path.join(model_dir, "*.gguf")))
+    return found or [base]
+
+
+def thread_candidates(quick: bool) -> list:
+    cpus = hardware_info()["usable_cpus"]
+    values = {max(1, cpus // 2), cpus}
+    if not quick:
+        values |= {max(1, cpus // 4), max(1, cpus - 1), min(cpus, 8)}
+    return sorted(values)
+
+
+def search_space(quick: bool) -> list:
+    """(설정 이름, 후보값 목록) 순서대로 한 축씩 탐색."""
+    space = [
+        ("n_threads", thread_candidates(quick)),
+        ("n_batch", [256, 512] if quick else [128, 256, 512, 1024]),
+        ("n_ctx", [4096, 8192]),
+    ]
+    if not quick:
+        space.append(
+            (
+                ("use_mmap", "use_mlock"),
+                [(True, False), (True, True), (False, False)],
+            )
+        )
+    return space
+
+
+# ================================================================
+# 한 가지 설정으로 측정
+# ================================================================
+def quiz_constraint(num_items: int = 5) -> dict:
+    """
+    앱(llm._schema_kwargs)과 같은 출력 제한: 캐시된 LlamaGrammar.
+    LlamaGrammar가 없는 llama_cpp면 response_format으로 대체.
+    """
+    try:
+        return {"grammar": grammar_cache.get_grammar(QUIZ_SCHEMA, num_items)}
+    except (ImportError, AttributeError):
+        schema = grammar_cache.exact_quiz_schema(QUIZ_SCHEMA, num_items)
+        return {"response_format": {"type": "json_object", "schema": schema}}
+
+
+def run_trial(model_path: str, kwargs: dict, corpus: list) -> dict:
+    """모델을 올리고 코퍼스 전체에 대해 요약 + 퀴즈를 돌려서 지표 반환."""
+    from llama_cpp import Llama
+
+    start = time.perf_counter()
+    try:
+        llm = Llama(model_path=model_path, verbose=False, **kwargs)
+    except Exception as e:
+        return {"ok": False, "error": f"load: {e}"}
+    load_s = time.perf_counter() - start
+
+    summary_s, quiz_s, out_tokens, decode_s, json_ok = [], [], 0, 0.0, 0
+    constraint = quiz_constraint(5)
+    try:
+        for doc in corpus:
+            t0 = time.perf_counter()
+            out = llm(prompt=format_summary_prompt(doc["transcript"]), **SUMMARY_PARAMS)
+            elapsed = time.perf_counter() - t0
+            summary_s.append(elapsed)
+            out_tokens += out["usage"]["completion_tokens"]
+            decode_s += elapsed
+
+            t0 = time.perf_counter()
+            resp = llm.create_chat_completion(
+                messages=format_quiz_messages(doc["summary"], 5),
+                **constraint,
+                **QUIZ_PARAMS,
+            )
+            elapsed = time.perf_counter() - t0
+            quiz_s.append(elapsed)
+            out_tokens += resp["usage"]["completion_tokens"]
+            decode_s += elapsed
+            try:
+                quizzes = json.loads(resp["choices"][0]["message"]["content"]).get("quizzes")
+                json_ok += isinstance(quizzes, list) and len(quizzes) > 0
+            except (ValueError, AttributeError):
+                pass
+    except Exception as e:
+        return {"ok": False, "error": f"run: {e}"}
+    finally:
+        del llm
+        gc.collect()
+
+    return {
+        "ok": True,
+        "load_s": round(load_s, 3),
+        "summary_mean_s": round(sum(summary_s) / len(summary_s), 3),
+        "quiz_mean_s": round(sum(quiz_s) / len(quiz_s), 3),
+        "tokens_per_s": round(out_tokens / decode_s, 2) if decode_s else 0.0,
+        "json_ok_ratio": json_ok / len(corpus),
+    }
+
+
+def score(metrics: dict, objective: str) -> float:
+    """클수록 좋은 점수. 퀴즈 JSON이 깨지는 설정은 크게 감점."""
+    if not metrics.get("ok"):
+        return float("-inf")
+    penalty = (1.0 - metrics["json_ok_ratio"]) * 1000
+    if objective == "throughput":
+        return metrics["tokens_per_s"] - penalty
+    return -(metrics["summary_mean_s"] + metrics["quiz_mean_s"]) - penalty
+
+
+def tune_model(model_path: str, corpus: list, objective: str, quick: bool, log) -> tuple:
+    best_kwargs = dict(DEFAULT_LLAMA_KWARGS)
+    best_kwargs["n_threads"] = hardware_info()["usable_cpus"]
+    best_metrics = run_trial(model_path, best_kwargs, corpus)
+    log(model_path, best_kwargs, best_metrics)
+
+    for key, values in search_space(quick):
+        for value in values:
+            trial = dict(best_kwargs)
+            if isinstance(key, tuple):
+                trial.update(zip(key, value))
+            else:
+                trial[key] = value
+            if trial == best_kwargs:
+                continue
+            if trial.get("n_threads"):
+                trial["n_threads_batch"] = trial["n_threads"]
+
+            metrics = run_trial(model_path, trial, corpus)
+            log(model_path, trial, metrics)
+            if score(metrics, objective) > score(best_metrics, objective):
+                best_kwargs, best_metrics = trial, metrics
+
+    return best_kwargs, best_metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GGUF 모델 / llama.cpp 설정 자동 튜닝")
+    parser.add_argument("--models", nargs="*", help="비교할 GGUF 파일들")
+    parser.add_argument("--model-dir", default="", help="*.gguf를 찾을 폴더")
+    parser.add_argument(
+        "--objective", choices=["latency", "throughput"], default="latency",
+        help="latency: 요청당 시간 최소화 / throughput: 초당 토큰 최대화",
+    )
+    parser.add_argument("--quick", action="store_true", help="후보와 코퍼스를 줄여서 빠르게")
+    parser.add_argument("--if-stale", action="store_true", help="현재 하드웨어용 프로필이 있으면 건너뜀")
+    parser.add_argument("--out", default=PROFILE_PATH, help="프로필 저장 경로")
+    args = parser.parse_args(argv)
+
+    if args.if_stale and not is_stale(read_profile(args.out)):
+        print(f"현재 하드웨어용 프로필이 이미 있습니다: {args.out}")
+        return 0
+
+    corpus = load_corpus(1 if args.quick else None)
+    models = find_models(args)
+    print(f"하드웨어: {hardware_info()}")
+    print(f"후보 모델 {len(models)}개, 코퍼스 {len(corpus)}개, 목표: {args.objective}")
+
+    def log(model_path, kwargs, metrics):
+        name = os.path.basename(model_path)
+        if metrics.get("ok"):
+            print(
+                f"  {name} {kwargs} → 요약 {metrics['summary_mean_s']}s, "
+                f"퀴즈 {metrics['quiz_mean_s']}s, {metrics['tokens_per_s']} tok/s, "
+                f"JSON {metrics['json_ok_ratio']:.0%}"
+            )
+        else:
+            print(f"  {name} {kwargs} → 실패 ({metrics.get('error')})")
+
+    best = None
+    for model_path in models:
+        kwargs, metrics = tune_model(model_path, corpus, args.objective, args.quick, log)
+        if best is None or score(metrics, args.objective) > score(best[2], args.objective):
+            best = (model_path, kwargs, metrics)
+
+    if best is None or not best[2].get("ok"):
+        print("사용 가능한 설정을 찾지 못했습니다.")
+        return 1
+
+    model_path, kwargs, metrics = best
+    save_profile(model_path, kwargs, dict(metrics, objective=args.objective), path=args.out)
+    print(f"\n최적 설정: {os.path.basename(model_path)} {kwargs}")
+    print(f"프로필 저장: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,375 @@
+# streamlit_app/utils/admission.py
+"""
+LLM 작업 입장 제어 (사용자별 속도 제한 + 사용자 간 가중 공정 대기열).
+
+CPU 모델 하나를 모든 세션이 나눠 쓰기 때문에, 한 사용자가 '퀴즈 풀기'를 연타하거나
+영상을 계속 바꾸면 요약/퀴즈 작업이 줄줄이 쌓여서 다른 사용자가 모두 그 뒤에서 기다리게 된다.
+
+- 사용자별 토큰 버킷: 연속으로 BURST개까지, 그 뒤로는 분당 RATE_PER_MIN개 (넘으면 RateLimited)
+- 가중 공정 대기열(WFQ): 작업마다 '예상 비용(토큰 수) / 가중치'로 가상 종료 시각을 매겨서
+  가장 작은 작업부터 실행. 작업을 많이 넣은 사용자는 자기 작업끼리 뒤로 밀리고,
+  가끔 하나 넣는 사용자는 대기열 앞쪽으로 들어간다.
+- 여러 호출을 한 번에 요청하는 작업(챕터 일괄 요약 등)은 user_context(batch=True)로 감싸면
+  버킷 토큰은 첫 호출에서 한 번만 쓰고, 각 호출은 그대로 대기열을 거쳐 다른 사용자와 번갈아 실행된다.
+- 같은 사용자가 다른 영상을 고르면 이전 영상의 대기 중인 작업은 취소 (JobCancelled).
+  이미 실행 중인 작업은 끝까지 돌리고 결과는 영구 캐시에 남긴다.
+- 기다리는 동안 on_wait(대기 순서)를 주기적으로 호출 → 화면에 대기 순서 표시.
+  Streamlit에서는 이 화면 갱신 때 새 실행(rerun) 요청이 있으면 예외가 나면서 대기가 자동으로 취소된다.
+
+환경변수:
+    APP_LLM_ADMISSION=wfq      wfq / fifo(도착 순서, 비교용) / off
+    APP_LLM_CONCURRENCY=0      동시에 실행할 LLM 작업 수 (0이면 모델 워커 수, 최소 1)
+    APP_LLM_BURST=4            사용자별 연속 요청 허용 개수
+    APP_LLM_RATE_PER_MIN=6     사용자별 분당 요청 수 (버킷이 다시 채워지는 속도)
+
+사용자 정보 없이 들어온 호출(일괄 처리 CLI, 벤치마크)은 속도 제한 없이 대기열만 거친다.
+"""
+
+import contextvars
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from utils import model_pool, telemetry
+from utils.quota_scheduler import TokenBucket
+from utils.storage import public_id
+
+WFQ = "wfq"
+FIFO = "fifo"
+OFF = "off"
+
+POLICY = os.getenv("APP_LLM_ADMISSION", WFQ).strip().lower() or WFQ
+CONCURRENCY = int(os.getenv("APP_LLM_CONCURRENCY", "0"))
+BURST = float(os.getenv("APP_LLM_BURST", "4"))
+RATE_PER_MIN = float(os.getenv("APP_LLM_RATE_PER_MIN", "6"))
+
+WAIT_POLL = 0.5  # 대기 중 on_wait 호출 간격 (초)
+CHARS_PER_TOKEN = 2.0  # 한국어 프롬프트 길이 → 토큰 수 대략 환산
+PRUNE_USERS = 512  # 사용자별 상태가 이보다 많아지면 한가한 사용자 정리
+
+QUEUED = "queued"
+RUNNING = "running"
+CANCELLED = "cancelled"
+DONE = "done"
+
+
+class AdmissionError(RuntimeError):
+    """LLM 작업이 실행되지 않음."""
+
+
+class RateLimited(AdmissionError):
+    """사용자별 요청 한도 초과 (retry_after초 뒤에 다시 가능)."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"요청이 너무 많습니다. {max(1, round(retry_after))}초 후 다시 시도해 주세요.")
+        self.retry_after = retry_after
+
+
+class JobCancelled(AdmissionError):
+    """같은 사용자가 다른 영상을 골라서 대기 중이던 작업이 취소됨."""
+
+
+def estimate_cost(prompt_text: str, max_tokens: int = 0) -> float:
+    """작업 비용 = 프롬프트 토큰(대략) + 최대 생성 토큰. WFQ 순서를 정하는 데만 쓰인다."""
+    return len(prompt_text) / CHARS_PER_TOKEN + (max_tokens or 0)
+
+
+class _Ticket:
+    __slots__ = (
+        "seq", "user", "task", "tag", "cost", "start_tag", "finish_tag",
+        "enqueued_at", "state", "event",
+    )
+
+    def __init__(self, seq, user, task, tag, cost, start_tag, finish_tag):
+        self.seq = seq
+        self.user = user
+        self.task = task
+        self.tag = tag
+        self.cost = cost
+        self.start_tag = start_tag
+        self.finish_tag = finish_tag
+        self.enqueued_at = time.monotonic()
+        self.state = QUEUED
+        self.event = threading.Event()
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        slots: int = 1,
+        policy: str = POLICY,
+        burst: float = BURST,
+        rate_per_min: float = RATE_PER_MIN,
+    ):
+        self.slots = max(1, slots)
+        self.policy = policy
+        self.burst = burst
+        self.rate_per_min = rate_per_min
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._queue = []  # 대기 중인 _Ticket (길어야 수십 개라 리스트로 충분)
+        self._running = 0
+        self._virtual_time = 0.0
+        self._last_finish = {}  # user -> 마지막으로 넣은 작업의 가상 종료 시각
+        self._buckets = {}  # user -> TokenBucket
+        self._users = {}  # user -> 집계
+
+    # ------------------------------------------------------------
+    # 대기열
+    # ------------------------------------------------------------
+    def _order(self, ticket: _Ticket):
+        if self.policy == FIFO:
+            return (ticket.seq,)
+        return (ticket.finish_tag, ticket.seq)
+
+    def _counters(self, user: str) -> dict:
+        counters = self._users.get(user)
+        if counters is None:
+            counters = self._users[user] = {
+                "admitted": 0, "rate_limited": 0, "cancelled": 0, "wait_s": 0.0,
+            }
+        return counters
+
+    def _take_token_locked(self, user: str):
+        bucket = self._buckets.get(user)
+        if bucket is None:
+            bucket = self._buckets[user] = TokenBucket(self.burst, self.rate_per_min / 60)
+        if not bucket.try_take(1):
+            self._counters(user)["rate_limited"] += 1
+            raise RateLimited((1 - bucket.level) / bucket.refill_per_sec)
+
+    def _cancel_locked(self, ticket: _Ticket):
+        self._queue.remove(ticket)
+        ticket.state = CANCELLED
+        ticket.event.set()
+        self._counters(ticket.user)["cancelled"] += 1
+        telemetry.incr("llm_admission_cancelled", task=ticket.task)
+        # 취소된 작업 몫만큼 뒤로 밀리지 않도록 남은 작업 기준으로 되돌림
+        remaining = [t.finish_tag for t in self._queue if t.user == ticket.user]
+        self._last_finish[ticket.user] = max(remaining, default=self._virtual_time)
+
+    def _dispatch_locked(self):
+        while self._running < self.slots and self._queue:
+            ticket = min(self._queue, key=self._order)
+            self._queue.remove(ticket)
+            # 가상 시각 = 지금 실행을 시작한 작업의 시작 태그 (start-time fair queuing)
+            self._virtual_time = max(self._virtual_time, ticket.start_tag)
+            ticket.state = RUNNING
+            self._running += 1
+            ticket.event.set()
+
+    def _prune_locked(self):
+        """대기 중인 작업이 없고 버킷도 가득 찬 사용자의 상태 정리."""
+        if len(self._last_finish) <= PRUNE_USERS:
+            return
+        busy = {t.user for t in self._queue}
+        for user in list(self._last_finish):
+            bucket = self._buckets.get(user)
+            if user in busy or (bucket is not None and bucket.level < bucket.capacity):
+                continue
+            self._last_finish.pop(user, None)
+            self._buckets.pop(user, None)
+
+    def _enqueue(self, user: str, task: str, cost: float, tag: str, weight: float, charge: bool) -> _Ticket:
+        with self._lock:
+            if user:
+                if charge:
+                    self._take_token_locked(user)
+                if tag:
+                    # 새 영상 요청 → 같은 사용자의 다른 영상 작업은 더 기다릴 필요 없음
+                    for old in [t for t in self._queue if t.user == user and t.tag != tag]:
+                        self._cancel_locked(old)
+            start_tag = max(self._virtual_time, self._last_finish.get(user, 0.0))
+            finish_tag = start_tag + cost / max(weight, 1e-6)
+            self._last_finish[user] = finish_tag
+            ticket = _Ticket(next(self._seq), user, task, tag, cost, start_tag, finish_tag)
+            self._queue.append(ticket)
+            self._dispatch_locked()
+            self._prune_locked()
+        return ticket
+
+    def _position_locked(self, ticket: _Ticket) -> int:
+        if ticket.state != QUEUED:
+            return 0
+        key = self._order(ticket)
+        return 1 + sum(1 for t in self._queue if self._order(t) < key)
+
+    def position(self, ticket: _Ticket) -> int:
+        """대기 순서 (1 = 다음 차례, 0 = 실행 중이거나 끝남)."""
+        with self._lock:
+            return self._position_locked(ticket)
+
+    def _withdraw(self, ticket: _Ticket):
+        """대기 중에 호출한 쪽이 빠져나감 (rerun 등): 대기 중이면 취소, 이미 차례가 왔으면 반납."""
+        with self._lock:
+            if ticket.state == QUEUED:
+                self._cancel_locked(ticket)
+                return
+        if ticket.state == RUNNING:
+            self.release(ticket)
+
+    def acquire(
+        self,
+        task: str,
+        cost: float,
+        user: str = "",
+        tag: str = "",
+        weight: float = 1.0,
+        on_wait=None,
+        charge: bool = True,
+    ) -> _Ticket:
+        """
+        차례가 올 때까지 기다림. 끝나면 반드시 release(ticket).
+        charge=False면 사용자별 버킷 토큰을 쓰지 않음 (이미 토큰을 낸 일괄 작업의 후속 호출).
+        """
+        ticket = self._enqueue(user, task, cost, tag, weight, charge)
+        try:
+            if on_wait is not None and ticket.state == QUEUED:
+                on_wait(self.position(ticket))
+            while not ticket.event.wait(WAIT_POLL if on_wait is not None else None):
+                on_wait(self.position(ticket))
+        except BaseException:
+            self._withdraw(ticket)
+            raise
+
+        if ticket.state == CANCELLED:
+            raise JobCancelled("다른 영상을 선택해서 이전 요청을 취소했습니다.")
+
+        waited = time.monotonic() - ticket.enqueued_at
+        with self._lock:
+            counters = self._counters(user)
+            counters["admitted"] += 1
+            counters["wait_s"] += waited
+        telemetry.observe("llm_admission_wait_seconds", waited, task=task)
+        return ticket
+
+    def release(self, ticket: _Ticket):
+        with self._lock:
+            if ticket.state != RUNNING:
+                return
+            ticket.state = DONE
+            self._running -= 1
+            self._dispatch_locked()
+
+    def cancel_user(self, user: str, keep_tag: str = "") -> int:
+        """user의 대기 중인 작업 취소 (keep_tag 작업은 남김). 취소한 개수 반환."""
+        with self._lock:
+            victims = [t for t in self._queue if t.user == user and (not keep_tag or t.tag != keep_tag)]
+            for ticket in victims:
+                self._cancel_locked(ticket)
+        return len(victims)
+
+    # ------------------------------------------------------------
+    # 상태
+    # ------------------------------------------------------------
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def running(self) -> int:
+        return self._running
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "policy": self.policy,
+                "slots": self.slots,
+                "running": self._running,
+                "queued": len(self._queue),
+                "virtual_time": round(self._virtual_time, 1),
+                # 사용자 ID는 그대로 내보내지 않음 (진단 페이지 등 공개 화면용)
+                "users": {
+                    _label(user): dict(c, wait_s=round(c["wait_s"], 2)) for user, c in self._users.items()
+                },
+            }
+
+    def queue_snapshot(self) -> list:
+        """대기 중인 작업 (실행될 순서대로)."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "position": i + 1,
+                    "user": _label(t.user),
+                    "task": t.task,
+                    "cost": round(t.cost),
+                    "finish_tag": round(t.finish_tag, 1),
+                    "waiting_s": round(now - t.enqueued_at, 1),
+                }
+                for i, t in enumerate(sorted(self._queue, key=self._order))
+            ]
+
+
+def _label(user: str) -> str:
+    return public_id(user) if user else "(system)"
+
+
+_admission = None
+_admission_lock = threading.Lock()
+
+
+def get_admission() -> AdmissionController:
+    global _admission
+    if _admission is None:
+        with _admission_lock:
+            if _admission is None:
+                slots = CONCURRENCY or max(1, model_pool.planned_workers())
+                _admission = AdmissionController(slots)
+    return _admission
+
+
+# ================================================================
+# 호출한 세션 정보 (페이지 → llm.py)
+# ================================================================
+class _Caller:
+    __slots__ = ("user", "tag", "on_wait", "weight", "batch", "charged")
+
+    def __init__(self, user, tag, on_wait, weight, batch):
+        self.user = user
+        self.tag = tag
+        self.on_wait = on_wait
+        self.weight = weight
+        self.batch = batch
+        self.charged = False  # batch: 첫 호출에서 토큰을 냈는지
+
+
+_caller = contextvars.ContextVar("llm_admission_caller", default=None)
+
+
+@contextmanager
+def user_context(user: str, tag: str = "", on_wait=None, weight: float = 1.0, batch: bool = False):
+    """
+    이 블록 안의 LLM 호출을 user의 작업으로 처리.
+    tag: 작업 묶음 (영상 ID). 같은 사용자가 다른 tag로 요청하면 이전 tag의 대기 작업은 취소.
+    on_wait(position): 기다리는 동안 WAIT_POLL초마다 호출.
+    batch: 블록 안의 호출 전체를 요청 하나로 셈 (버킷 토큰은 첫 호출에서만).
+    """
+    token = _caller.set(_Caller(user, tag, on_wait, weight, batch))
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+@contextmanager
+def admit(task: str, cost: float):
+    """llm.py에서 모델을 쓰는 구간을 감쌈 (APP_LLM_ADMISSION=off면 그대로 통과)."""
+    if POLICY == OFF:
+        yield
+        return
+    caller = _caller.get()
+    controller = get_admission()
+    if caller is None:
+        ticket = controller.acquire(task, cost)
+    else:
+        ticket = controller.acquire(
+            task, cost, caller.user, caller.tag, caller.weight, caller.on_wait,
+            charge=not (caller.batch and caller.charged),
+        )
+        if caller.batch:
+            caller.charged = True
+    try:
+        yield
+    finally:
+        controller.release(ticket)
@@ -0,0 +1,264 @@
+# streamlit_app/utils/analytics.py
+"""
+퀴즈 풀이 기록(attempt) 저장 + 학습 통계 조회.
+
+- attempts: 한 문제를 풀 때마다 한 줄씩 쌓이는 append-only 로그
+- rollup_*: 기록을 넣을 때 같은 트랜잭션 안에서 바로 갱신되는 집계 테이블
+조회 API는 집계 테이블만 읽기 때문에 기록이 수십만 건이어도 바로 응답한다.
+"""
+
+import threading
+import time
+
+from utils.storage import connect
+
+DB_FILE = "analytics.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id          INTEGER PRIMARY KEY,
+    ts          REAL    NOT NULL,
+    student_id  TEXT    NOT NULL,
+    course      TEXT    NOT NULL DEFAULT '',
+    week        TEXT    NOT NULL DEFAULT '',
+    video_id    TEXT    NOT NULL DEFAULT '',
+    quiz_id     TEXT    NOT NULL DEFAULT '',
+    question_id TEXT    NOT NULL,
+    selected    INTEGER NOT NULL,
+    correct     INTEGER NOT NULL,
+    latency_ms  INTEGER NOT NULL DEFAULT 0
+);
+
+-- 학생 × 과목 × 주차 집계
+CREATE TABLE IF NOT EXISTS rollup_student_week (
+    student_id  TEXT    NOT NULL,
+    course      TEXT    NOT NULL,
+    week        TEXT    NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    correct     INTEGER NOT NULL DEFAULT 0,
+    latency_ms  INTEGER NOT NULL DEFAULT 0,
+    last_ts     REAL    NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id, course, week)
+) WITHOUT ROWID;
+
+-- 과목 × 문항 집계 (문항 난이도)
+CREATE TABLE IF NOT EXISTS rollup_question (
+    course      TEXT    NOT NULL,
+    question_id TEXT    NOT NULL,
+    question    TEXT    NOT NULL DEFAULT '',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    correct     INTEGER NOT NULL DEFAULT 0,
+    latency_ms  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (course, question_id)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_STUDENT_WEEK = """
+INSERT INTO rollup_student_week
+    (student_id, course, week, attempts, correct, latency_ms, last_ts)
+VALUES (?, ?, ?, 1, ?, ?, ?)
+ON CONFLICT (student_id, course, week) DO UPDATE SET
+    attempts   = attempts + 1,
+    correct    = correct + excluded.correct,
+    latency_ms = latency_ms + excluded.latency_ms,
+    last_ts    = MAX(last_ts, excluded.last_ts)
+"""
+
+_UPSERT_QUESTION = """
+INSERT INTO rollup_question
+    (course, question_id, question, attempts, correct, latency_ms)
+VALUES (?, ?, ?, 1, ?, ?)
+ON CONFLICT (course, question_id) DO UPDATE SET
+    attempts   = attempts + 1,
+    correct    = correct + excluded.correct,
+    latency_ms = latency_ms + excluded.latency_ms,
+    question   = CASE WHEN question = '' THEN excluded.question ELSE question END
+"""
+
+
+class AnalyticsStore:
+    """attempt 로그 + 집계 테이블을 가진 SQLite 저장소."""
+
+    def __init__(self, filename: str = DB_FILE):
+        self._lock = threading.Lock()
+        self._conn = connect(filename)
+        self._conn.executescript(SCHEMA)
+
+    # ------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------
+    def record_attempt(
+        self,
+        student_id: str,
+        question_id: str,
+        selected: int,
+        correct: bool,
+        latency_ms: int = 0,
+        course: str = "",
+        week: str = "",
+        video_id: str = "",
+        quiz_id: str = "",
+        question: str = "",
+        ts: float = None,
+    ):
+        """문제 1개 풀이 기록."""
+        self.record_many(
+            [
+                {
+                    "ts": ts,
+                    "student_id": student_id,
+                    "course": course,
+                    "week": week,
+                    "video_id": video_id,
+                    "quiz_id": quiz_id,
+                    "question_id": question_id,
+                    "question": question,
+                    "selected": selected,
+                    "correct": correct,
+                    "latency_ms": latency_ms,
+                }
+            ]
+        )
+
+    def record_many(self, attempts: list):
+        """여러 기록을 트랜잭션 하나로 저장 (로그 + 집계 동시 갱신)."""
+        now = time.time()
+        log_rows, week_rows, question_rows = [], [], []
+        for a in attempts:
+            ts = a.get("ts") or now
+            course = a.get("course") or ""
+            week = a.get("week") or ""
+            correct = 1 if a.get("correct") else 0
+            latency = int(a.get("latency_ms") or 0)
+
+            log_rows.append(
+                (
+                    ts,
+                    a["student_id"],
+                    course,
+                    week,
+                    a.get("video_id") or "",
+                    a.get("quiz_id") or "",
+                    a["question_id"],
+                    int(a["selected"]),
+                    correct,
+                    latency,
+                )
+            )
+            week_rows.append((a["student_id"], course, week, correct, latency, ts))
+            question_rows.append(
+                (course, a["question_id"], a.get("question") or "", correct, latency)
+            )
+
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                cur.executemany(
+                    "INSERT INTO attempts (ts, student_id, course, week, video_id, "
+                    "quiz_id, question_id, selected, correct, latency_ms) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    log_rows,
+                )
+                cur.executemany(_UPSERT_STUDENT_WEEK, week_rows)
+                cur.executemany(_UPSERT_QUESTION, question_rows)
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    def rebuild_rollups(self):
+        """집계 테이블을 attempts 로그로부터 다시 계산 (스키마 변경/복구용)."""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                cur.execute("DELETE FROM rollup_student_week")
+                cur.execute("DELETE FROM rollup_question")
+                cur.execute(
+                    "INSERT INTO rollup_student_week "
+                    "SELECT student_id, course, week, COUNT(*), SUM(correct), "
+                    "SUM(latency_ms), MAX(ts) FROM attempts "
+                    "GROUP BY student_id, course, week"
+                )
+                cur.execute(
+                    "INSERT INTO rollup_question "
+                    "SELECT course, question_id, '', COUNT(*), SUM(correct), "
+                    "SUM(latency_ms) FROM attempts GROUP BY course, question_id"
+                )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+    def _query(self, sql: str, params=()) -> list:
+        with self._lock:
+            cur = self._conn.execute(sql, params)
+            cols = [c[0] for c in cur.description]
+            return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+    def weakest_weeks(
+        self, student_id: str, course: str = None, limit: int = 5, min_attempts: int = 1
+    ) -> list:
+        """학생의 정답률이 낮은 주차 순 (과목 지정 가능)."""
+        sql = (
+            "SELECT course, week, attempts, correct, "
+            "CAST(correct AS REAL) / attempts AS accuracy, "
+            "latency_ms / attempts AS avg_latency_ms "
+            "FROM rollup_student_week WHERE student_id = ? AND attempts >= ?"
+        )
+        params = [student_id, min_attempts]
+        if course is not None:
+            sql += " AND course = ?"
+            params.append(course)
+        sql += " ORDER BY accuracy ASC, attempts DESC LIMIT ?"
+        params.append(limit)
+        return self._query(sql, params)
+
+    def hardest_questions(self, course: str, limit: int = 10, min_attempts: int = 3) -> list:
+        """과목 전체에서 정답률이 낮은 문항 순."""
+        return self._query(
+            "SELECT question_id, question, attempts, correct, "
+            "CAST(correct AS REAL) / attempts AS accuracy, "
+            "latency_ms / attempts AS avg_latency_ms "
+            "FROM rollup_question WHERE course = ? AND attempts >= ? "
+            "ORDER BY accuracy ASC, attempts DESC LIMIT ?",
+            (course, min_attempts, limit),
+        )
+
+    def course_mastery(self, student_id: str) -> list:
+        """학생의 과목별 정답률."""
+        return self._query(
+            "SELECT course, SUM(attempts) AS attempts, SUM(correct) AS correct, "
+            "CAST(SUM(correct) AS REAL) / SUM(attempts) AS accuracy "
+            "FROM rollup_student_week WHERE student_id = ? "
+            "GROUP BY course ORDER BY accuracy ASC",
+            (student_id,),
+        )
+
+    def week_mastery(self, course: str) -> list:
+        """과목의 주차별 전체 학생 정답률."""
+        return self._query(
+            "SELECT week, COUNT(*) AS students, SUM(attempts) AS attempts, "
+            "CAST(SUM(correct) AS REAL) / SUM(attempts) AS accuracy "
+            "FROM rollup_student_week WHERE course = ? "
+            "GROUP BY week ORDER BY accuracy ASC",
+            (course,),
+        )
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_analytics_store() -> AnalyticsStore:
+    """프로세스 전체에서 공유하는 저장소 (Streamlit 세션들이 같이 사용)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AnalyticsStore()
+    return _store
@@ -0,0 +1,441 @@
+# streamlit_app/utils/autosave.py
+"""
+학습 메모 / 체크리스트 자동 저장 + 버전 기록 (SQLite).
+
+메모와 체크리스트는 session_state에만 있어서 새로고침하거나 서버가 다시 뜨면 사라졌다.
+여기서는 사용자 ID(utils.storage.get_student_id, 주소의 ?sid= 토큰에서 만든 값)별로 DB에 저장하므로
+같은 주소로 다시 열면 이어서 볼 수 있다 (토큰 없는 기본 주소로 열면 새 사용자).
+편집할 때마다 문서 전체를 DB에 쓰면 사용자 수백 명이 동시에 입력할 때 초당 수백 번의 전체 쓰기가 생기므로:
+
+- 디바운스: update()는 메모리의 대기 목록만 갱신하고 바로 돌아온다. 마지막 편집 후 DEBOUNCE_SECONDS 동안
+  조용하거나, 첫 편집 후 MAX_DELAY_SECONDS가 지나면(계속 입력 중이어도) 저장 대상이 됨
+  → 그 사이의 편집은 버전 하나로 합쳐짐
+- 일괄 저장: 백그라운드 스레드가 FLUSH_INTERVAL마다 저장할 문서를 모두 모아 트랜잭션 하나로 기록
+- 델타: 직전에 저장한 내용과 비교해서 바뀐 부분만 기록
+      [유지 글자 수, -삭제 글자 수, "삽입 문자열", ...]
+  공통 앞/뒤를 잘라낸 뒤 남은 부분은 줄 단위 difflib, 바뀐 줄 묶음 안에서 다시 앞/뒤를 잘라 글자 단위로
+  (글자 단위 difflib은 커서를 옮겨 가며 여러 곳을 고친 메모에서 수십 ms가 걸림 → bench/autosave.py)
+  SNAPSHOT_EVERY 버전마다, 또는 델타가 전체보다 크면 전체 내용(스냅샷)을 저장
+  → 어떤 버전이든 가장 가까운 스냅샷 + 델타 SNAPSHOT_EVERY개 이하로 복원
+- 버전 기록: history()로 목록, text_at()으로 그 시점 내용, restore()는 이전 내용을 새 버전으로 저장
+  (되돌린 것도 기록에 남으므로 다시 되돌릴 수 있음). 문서마다 최근 스냅샷 KEEP_SNAPSHOTS개 이전 버전은 정리
+
+문서는 (사용자, 종류, 이름)으로 구분: ("memo", "memo"), ("checklist", "2025-06-01") 등.
+내용은 문자열 (체크리스트는 utils.autosave.dump_rows로 JSON 문자열로 바꿔서 저장).
+
+환경변수:
+    APP_AUTOSAVE_DEBOUNCE_SEC=2     마지막 편집 후 이 시간 동안 조용하면 저장
+    APP_AUTOSAVE_MAX_DELAY_SEC=10   계속 입력 중이어도 이 시간이 지나면 저장
+"""
+
+import atexit
+import difflib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from utils import telemetry
+from utils.storage import connect
+
+DB_FILE = "autosave.db"
+DEBOUNCE_SECONDS = float(os.getenv("APP_AUTOSAVE_DEBOUNCE_SEC", "2"))
+MAX_DELAY_SECONDS = float(os.getenv("APP_AUTOSAVE_MAX_DELAY_SEC", "10"))
+FLUSH_INTERVAL = 0.5  # 저장할 문서가 있는지 확인하는 간격 (초)
+SNAPSHOT_EVERY = 25  # 이 버전 수마다 전체 내용 저장
+KEEP_SNAPSHOTS = 20  # 문서마다 남기는 스냅샷 수 (그 이전 버전은 삭제)
+DIFF_LIMIT = 1_000_000  # 바뀐 구간의 줄 수 곱이 이보다 크면 difflib 대신 구간 전체 교체
+SAVED_ITEMS = 2000  # 마지막으로 저장한 내용을 메모리에 들고 있는 문서 수 (넘치면 DB에서 다시 읽음)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_key    TEXT    PRIMARY KEY,
+    owner      TEXT    NOT NULL,
+    kind       TEXT    NOT NULL,
+    name       TEXT    NOT NULL,
+    head       INTEGER NOT NULL,
+    updated_at REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_owner ON docs (owner, kind);
+
+-- snapshot = 1이면 data는 전체 내용, 0이면 직전 버전에 대한 델타 (JSON)
+CREATE TABLE IF NOT EXISTS versions (
+    doc_key  TEXT    NOT NULL,
+    version  INTEGER NOT NULL,
+    ts       REAL    NOT NULL,
+    snapshot INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    data     TEXT    NOT NULL,
+    PRIMARY KEY (doc_key, version)
+) WITHOUT ROWID;
+"""
+
+
+def doc_key(owner: str, kind: str, name: str) -> str:
+    return f"{owner}/{kind}/{name}"
+
+
+def dump_rows(rows: list) -> str:
+    """체크리스트 행 목록 → 저장할 문자열 (같은 내용이면 같은 문자열, 줄 단위 델타가 되도록 항목마다 줄바꿈)."""
+    return json.dumps(rows, ensure_ascii=False, sort_keys=True, indent=0)
+
+
+def load_rows(text: str) -> list:
+    return json.loads(text) if text else []
+
+
+# ================================================================
+# 델타
+# ================================================================
+def _common_prefix(a: str, b: str) -> int:
+    """공통 앞부분 길이 (슬라이스 비교로 이분 탐색: 글자마다 파이썬 루프를 돌지 않음)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid :] == b[len(b) - mid :]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _replace_ops(old: str, new: str) -> list:
+    """old 구간을 new로 바꾸는 연산 (공통 앞/뒤는 유지)."""
+    prefix = _common_prefix(old, new)
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+    return [prefix, -(len(old) - prefix - suffix), new[prefix : len(new) - suffix], suffix]
+
+
+def make_delta(old: str, new: str) -> list:
+    """old → new 델타: 양수 = 유지할 글자 수, 음수 = 삭제할 글자 수, 문자열 = 삽입."""
+    prefix = _common_prefix(old, new)
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+    old_mid = old[prefix : len(old) - suffix]
+    new_mid = new[prefix : len(new) - suffix]
+
+    ops = [prefix]
+    old_lines = old_mid.splitlines(keepends=True)
+    new_lines = new_mid.splitlines(keepends=True)
+    if len(old_lines) > 1 and len(new_lines) > 1 and len(old_lines) * len(new_lines) <= DIFF_LIMIT:
+        # 여러 곳을 고친 경우: 바뀐 줄 묶음만 찾고, 그 안에서는 다시 앞/뒤를 잘라 글자 단위로
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                ops.append(sum(map(len, old_lines[i1:i2])))
+            else:
+                ops.extend(_replace_ops("".join(old_lines[i1:i2]), "".join(new_lines[j1:j2])))
+    else:
+        # 입력 중인 편집은 대부분 한 군데라 여기까지 오는 구간은 짧다
+        ops.extend([-len(old_mid), new_mid])
+    ops.append(suffix)
+
+    # 0 제거, 같은 종류끼리 합치기
+    merged = []
+    for op in ops:
+        if op == 0 or op == "":
+            continue
+        if merged and type(op) is type(merged[-1]) and (isinstance(op, str) or (op > 0) == (merged[-1] > 0)):
+            merged[-1] += op
+        else:
+            merged.append(op)
+    return merged
+
+
+def apply_delta(old: str, delta: list) -> str:
+    out, pos = [], 0
+    for op in delta:
+        if isinstance(op, str):
+            out.append(op)
+        elif op > 0:
+            out.append(old[pos : pos + op])
+            pos += op
+        else:
+            pos -= op
+    if pos != len(old):
+        raise ValueError(f"델타가 원본 길이와 맞지 않습니다 ({pos} != {len(old)})")
+    return "".join(out)
+
+
+# ================================================================
+# 자동 저장
+# ================================================================
+class Autosaver:
+    def __init__(
+        self,
+        filename: str = DB_FILE,
+        debounce: float = DEBOUNCE_SECONDS,
+        max_delay: float = MAX_DELAY_SECONDS,
+        flush_interval: float = FLUSH_INTERVAL,
+    ):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()  # 대기 목록 (update는 이것만 잡음)
+        self._db_lock = threading.Lock()  # DB + _saved (저장은 한 번에 하나씩, 같은 문서 순서 보장)
+        self._conn = connect(filename)
+        self._conn.executescript(SCHEMA)
+        self._pending = {}  # doc_key → {"owner", "kind", "name", "text", "first", "last"}
+        self._saved = OrderedDict()  # doc_key → {"version", "text", "since_snapshot"}
+        self._wake = threading.Event()
+        self._worker = None
+        self._counts = {
+            "updates": 0,
+            "coalesced": 0,
+            "flushes": 0,
+            "versions": 0,
+            "snapshots": 0,
+            "unchanged": 0,
+            "errors": 0,
+            "stored_bytes": 0,
+            "full_bytes": 0,  # 매번 전체 내용을 썼다면 쓴 양 (비교용)
+        }
+
+    # ------------------------------------------------------------
+    # 편집
+    # ------------------------------------------------------------
+    def update(self, owner: str, kind: str, name: str, text: str):
+        """편집한 내용을 대기 목록에 올림 (DB에는 디바운스 후 백그라운드에서 저장)."""
+        key = doc_key(owner, kind, name)
+        now = time.monotonic()
+        with self._lock:
+            self._counts["updates"] += 1
+            pending = self._pending.get(key)
+            if pending is not None:
+                if pending["text"] != text:
+                    pending["text"] = text
+                    pending["last"] = now
+                self._counts["coalesced"] += 1
+                return
+            saved = self._saved.get(key)
+            if saved is not None and saved["text"] == text:
+                return
+            self._pending[key] = {
+                "owner": owner,
+                "kind": kind,
+                "name": name,
+                "text": text,
+                "first": now,
+                "last": now,
+            }
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="autosave", daemon=True)
+                    self._worker.start()
+                    # 서버를 끌 때 디바운스 중이던 편집도 저장
+                    atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._flush(force=False)
+            except Exception as e:
+                telemetry.incr("autosave_errors", error=type(e).__name__)
+
+    def flush(self, owner: str = None, kind: str = None, name: str = None):
+        """대기 중인 편집을 지금 저장 (인자를 주면 그 문서만). 저장 버튼 / 종료 / 벤치마크용."""
+        keys = None if owner is None else [doc_key(owner, kind, name)]
+        self._flush(force=True, keys=keys)
+
+    def _flush(self, force: bool, keys: list = None):
+        with self._db_lock:
+            now = time.monotonic()
+            with self._lock:
+                ready = [
+                    key
+                    for key, p in self._pending.items()
+                    if (keys is None or key in keys)
+                    and (force or now - p["last"] >= self.debounce or now - p["first"] >= self.max_delay)
+                ]
+                batch = {key: self._pending.pop(key) for key in ready}
+            if not batch:
+                return
+            try:
+                self._write(batch)
+            except Exception:
+                with self._lock:
+                    self._counts["errors"] += 1
+                    # 실패한 편집은 다시 대기 목록으로 (그 사이에 더 새로운 편집이 들어왔으면 그것을 둠)
+                    for key, p in batch.items():
+                        self._pending.setdefault(key, p)
+                raise
+
+    def _saved_state(self, key: str) -> dict:
+        """마지막으로 저장한 버전 (메모리에 없으면 DB에서 복원). 저장된 적 없으면 version 0."""
+        saved = self._saved.get(key)
+        if saved is not None:
+            self._saved.move_to_end(key)
+            return saved
+        row = self._conn.execute("SELECT head FROM docs WHERE doc_key = ?", (key,)).fetchone()
+        if row is None:
+            saved = {"version": 0, "text": "", "since_snapshot": 0}
+        else:
+            text, since = self._reconstruct(key, row[0])
+            saved = {"version": row[0], "text": text, "since_snapshot": since}
+        self._saved[key] = saved
+        while len(self._saved) > SAVED_ITEMS:
+            self._saved.popitem(last=False)
+        return saved
+
+    def _write(self, batch: dict):
+        start = time.perf_counter()
+        wall = time.time()
+        rows, heads, pruned, updated = [], [], [], {}
+        counts = {"versions": 0, "snapshots": 0, "unchanged": 0, "stored_bytes": 0, "full_bytes": 0}
+        for key, p in batch.items():
+            saved = self._saved_state(key)
+            text = p["text"]
+            if saved["version"] and text == saved["text"]:
+                counts["unchanged"] += 1
+                continue
+            version = saved["version"] + 1
+            data = json.dumps(make_delta(saved["text"], text), ensure_ascii=False, separators=(",", ":"))
+            since = saved["since_snapshot"] + 1
+            snapshot = saved["version"] == 0 or since >= SNAPSHOT_EVERY or len(data) >= len(text)
+            if snapshot:
+                data, since = text, 0
+                counts["snapshots"] += 1
+                pruned.append((key, key, KEEP_SNAPSHOTS - 1))
+            rows.append((key, version, wall, int(snapshot), len(text), data))
+            heads.append((key, p["owner"], p["kind"], p["name"], version, wall))
+            updated[key] = {"version": version, "text": text, "since_snapshot": since}
+            counts["versions"] += 1
+            counts["stored_bytes"] += len(data.encode("utf-8"))
+            counts["full_bytes"] += len(text.encode("utf-8"))
+
+        if rows:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                cur.executemany("INSERT INTO versions VALUES (?, ?, ?, ?, ?, ?)", rows)
+                cur.executemany(
+                    "INSERT INTO docs (doc_key, owner, kind, name, head, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (doc_key) DO UPDATE SET head = excluded.head, updated_at = excluded.updated_at",
+                    heads,
+                )
+                # 최근 스냅샷 KEEP_SNAPSHOTS개보다 오래된 버전 정리 (스냅샷이 그만큼 없으면 NULL → 아무것도 안 지움)
+                cur.executemany(
+                    "DELETE FROM versions WHERE doc_key = ? AND version < ("
+                    "SELECT version FROM versions WHERE doc_key = ? AND snapshot = 1 "
+                    "ORDER BY version DESC LIMIT 1 OFFSET ?)",
+                    pruned,
+                )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                # 메모리의 '마지막 저장 내용'이 DB와 어긋나지 않게 이 문서들은 다음에 DB에서 다시 읽음
+                for key in batch:
+                    self._saved.pop(key, None)
+                raise
+            for key, saved in updated.items():
+                self._saved[key] = saved
+
+        with self._lock:
+            self._counts["flushes"] += 1 if rows else 0
+            for name, value in counts.items():
+                self._counts[name] += value
+        telemetry.observe("autosave_flush", time.perf_counter() - start)
+        telemetry.incr("autosave_versions", counts["versions"])
+
+    # ------------------------------------------------------------
+    # 읽기 / 버전 기록
+    # ------------------------------------------------------------
+    def _reconstruct(self, key: str, version: int) -> tuple:
+        """(version 시점 내용, 그 앞 스냅샷 이후 델타 수). version 이하에서 가장 가까운 스냅샷부터 델타 적용."""
+        rows = self._conn.execute(
+            "SELECT snapshot, data FROM versions WHERE doc_key = ? AND version <= ? AND version >= ("
+            "SELECT MAX(version) FROM versions WHERE doc_key = ? AND snapshot = 1 AND version <= ?) "
+            "ORDER BY version",
+            (key, version, key, version),
+        ).fetchall()
+        if not rows or not rows[0][0]:
+            raise KeyError(f"{key} v{version}: 남아 있지 않은 버전입니다.")
+        text = rows[0][1]
+        for _, data in rows[1:]:
+            text = apply_delta(text, json.loads(data))
+        return text, len(rows) - 1
+
+    def load(self, owner: str, kind: str, name: str):
+        """가장 최근 내용 (저장 대기 중인 편집 포함). 저장된 적 없으면 None."""
+        key = doc_key(owner, kind, name)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending["text"]
+        with self._db_lock:
+            saved = self._saved_state(key)
+        return saved["text"] if saved["version"] else None
+
+    def names(self, owner: str, kind: str) -> list:
+        """사용자의 저장된 문서 이름 (최근 수정 순). 예: 체크리스트가 있는 날짜."""
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT name FROM docs WHERE owner = ? AND kind = ? ORDER BY updated_at DESC",
+                (owner, kind),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def history(self, owner: str, kind: str, name: str, limit: int = 30) -> list:
+        """[{"version", "ts", "size", "snapshot"}] 최신 순."""
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT version, ts, size, snapshot FROM versions WHERE doc_key = ? "
+                "ORDER BY version DESC LIMIT ?",
+                (doc_key(owner, kind, name), limit),
+            ).fetchall()
+        return [{"version": v, "ts": ts, "size": size, "snapshot": bool(snap)} for v, ts, size, snap in rows]
+
+    def version_at(self, owner: str, kind: str, name: str, ts: float):
+        """ts(유닉스 시각) 시점에 최신이던 버전 번호 (없으면 None)."""
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT MAX(version) FROM versions WHERE doc_key = ? AND ts <= ?",
+                (doc_key(owner, kind, name), ts),
+            ).fetchone()
+        return row[0] if row else None
+
+    def text_at(self, owner: str, kind: str, name: str, version: int) -> str:
+        with self._db_lock:
+            return self._reconstruct(doc_key(owner, kind, name), version)[0]
+
+    def restore(self, owner: str, kind: str, name: str, version: int) -> str:
+        """version 시점 내용을 새 버전으로 저장하고 그 내용을 반환 (되돌리기도 기록에 남음)."""
+        text = self.text_at(owner, kind, name, version)
+        self.update(owner, kind, name, text)
+        self.flush(owner, kind, name)
+        telemetry.incr("autosave_restores", kind=kind)
+        return text
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counts, "pending": len(self._pending), "cached_docs": len(self._saved)}
+
+
+_autosaver = None
+_autosaver_lock = threading.Lock()
+
+
+def get_autosaver() -> Autosaver:
+    global _autosaver
+    if _autosaver is None:
+        with _autosaver_lock:
+            if _autosaver is None:
+                _autosaver = Autosaver()
+    return _autosaver
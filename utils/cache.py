@@ -0,0 +1,94 @@
+# streamlit_app/utils/cache.py
+"""
+프로세스 공용 TTL 캐시.
+
+- 만료(ttl)가 지나도 바로 지우지 않고 'stale' 값으로 남겨 둬서,
+  API 할당량이 부족하거나 외부 서비스가 죽었을 때 예전 결과라도 보여줄 수 있게 한다.
+- 캐시마다 hit / miss / stale 횟수를 세고, cache_stats()로 한꺼번에 조회 (벤치마크 리포트용).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from utils import telemetry
+
+_registry = {}  # name -> TTLCache
+_registry_lock = threading.Lock()
+
+
+class TTLCache:
+    def __init__(self, name: str, ttl: float, max_items: int = 1000, stale_ttl: float = None):
+        """
+        ttl: 이 시간(초) 안이면 fresh
+        stale_ttl: 이 시간(초)까지는 stale로라도 보관 (None이면 무기한, 개수 제한만 적용)
+        """
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_items = max_items
+        self._data = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+        with _registry_lock:
+            _registry[name] = self
+
+    def get(self, key, allow_stale: bool = False):
+        """fresh 값이 있으면 반환. allow_stale=True면 만료된 값도 반환. 없으면 None."""
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                age = now - stored_at
+                if self.stale_ttl is not None and age > self.stale_ttl:
+                    del self._data[key]
+                elif age <= self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    telemetry.incr("cache_hits", cache=self.name)
+                    return value
+                elif allow_stale:
+                    self.stale_hits += 1
+                    telemetry.incr("cache_stale_hits", cache=self.name)
+                    return value
+            self.misses += 1
+        telemetry.incr("cache_misses", cache=self.name)
+        return None
+
+    def peek(self, key):
+        """통계에 영향을 주지 않고 (stored_at, value) 조회."""
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "size": len(self._data),
+        }
+
+
+def cache_stats() -> dict:
+    """등록된 모든 캐시의 통계."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {c.name: c.stats() for c in caches}
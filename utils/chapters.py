@@ -0,0 +1,201 @@
+# streamlit_app/utils/chapters.py
+"""
+자막을 주제가 바뀌는 곳에서 챕터로 나누기 (TextTiling, NumPy) + 챕터별 요약.
+
+90분짜리 강의를 3줄 요약 하나로 끝내면 내용이 거의 남지 않고, 더 잘게 보고 싶으면 전체를 다시 요약해야 했다.
+챕터로 나눠서 챕터마다 따로 요약하면:
+- 메인 화면에서 챕터 목록을 보고 원하는 위치로 바로 이동 (mm:ss)
+- 요약은 챕터 텍스트 해시로 캐시 (utils/content_cache.py의 summaries) → 다시 열거나 경계가 일부만 바뀌어도
+  텍스트가 같은 챕터는 그대로 쓰고, 새로 생기거나 바뀐 챕터만 요약
+- 퀴즈는 필요한 챕터만 그 챕터 요약으로 생성 (퀴즈 캐시도 요약 해시 기준)
+
+나누는 방법 (Hearst의 TextTiling):
+1. 자막 줄을 BLOCK_SECONDS 단위 블록으로 묶고, 블록마다 글자 2-gram TF-IDF 벡터 (utils/extractive.py와 같은 특징)
+2. 블록 사이 틈마다 왼쪽 WINDOW개 블록 합 vs 오른쪽 WINDOW개 블록 합의 코사인 유사도 (누적합으로 한 번에 계산)
+3. 깊이 점수 = (왼쪽 최고점 - 유사도) + (오른쪽 최고점 - 유사도): 골이 깊을수록 주제가 바뀐 곳
+4. 깊이가 평균보다 큰 틈을 깊은 순서로 고르되, 챕터가 MIN_CHAPTER_SECONDS보다 짧아지면 건너뜀
+
+시간 정보 없이 저장된 예전 자막은 문장 단위로 나눠서 같은 방법을 쓰고, 챕터에 시간은 표시하지 않는다.
+"""
+
+from utils.cache import TTLCache
+from utils.content_cache import get_content_cache, text_hash
+from utils.extractive import extractive_summary, split_sentences, tfidf_matrix
+from utils.search_index import chunk_segments, format_time
+
+BLOCK_SECONDS = 20.0
+UNTIMED_BLOCK_SENTENCES = 3  # 시간 정보가 없을 때 한 블록으로 묶을 문장 수
+WINDOW = 4  # 틈 양쪽으로 비교할 블록 수
+MIN_CHAPTER_SECONDS = 180.0
+MAX_CHAPTERS = 15
+TITLE_CHARS = 40
+
+_cache = TTLCache("chapters", ttl=3600, max_items=200)
+
+
+# ================================================================
+# 경계 찾기
+# ================================================================
+def gap_scores(x: "np.ndarray", window: int = WINDOW) -> "np.ndarray":
+    """블록 i와 i+1 사이 틈마다 양쪽 window개 블록 합의 코사인 유사도 (길이 n-1)."""
+    import numpy as np
+
+    n = x.shape[0]
+    csum = np.vstack([np.zeros((1, x.shape[1]), dtype=x.dtype), np.cumsum(x, axis=0)])
+    gaps = np.arange(1, n)
+    left = csum[gaps] - csum[np.maximum(gaps - window, 0)]
+    right = csum[np.minimum(gaps + window, n)] - csum[gaps]
+    dot = np.einsum("ij,ij->i", left, right)
+    norm = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+    return dot / np.maximum(norm, 1e-9)
+
+
+def depth_scores(scores: "np.ndarray", window: int = WINDOW) -> "np.ndarray":
+    """틈마다 (양쪽 window 안의 최고 유사도 - 이 틈의 유사도) 합."""
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    padded = np.pad(scores, window, mode="edge")
+    peaks = sliding_window_view(padded, window + 1)  # peaks[k] = padded[k : k + window + 1]
+    left_peak = peaks[: len(scores)].max(axis=1)
+    right_peak = peaks[window : window + len(scores)].max(axis=1)
+    return (left_peak - scores) + (right_peak - scores)
+
+
+def find_boundaries(x: "np.ndarray", min_blocks: int, max_chapters: int = MAX_CHAPTERS) -> list:
+    """블록 TF-IDF 행렬 → 챕터가 시작하는 블록 번호 (0 제외, 오름차순)."""
+    import numpy as np
+
+    n = x.shape[0]
+    if n < 2 * min_blocks:
+        return []
+    scores = gap_scores(x)
+    if len(scores) >= 3:
+        # 블록 하나짜리 잡음으로 골이 생기지 않게 살짝 평활화
+        scores = np.convolve(np.pad(scores, 1, mode="edge"), np.ones(3) / 3, mode="valid")
+    depth = depth_scores(scores)
+    cutoff = depth.mean()  # Hearst의 평균 - 표준편차/2는 경계가 너무 많음 (bench/chapters.py 정밀도 0.74)
+
+    chosen = []
+    for gap in np.argsort(-depth, kind="stable").tolist():
+        if depth[gap] <= cutoff or len(chosen) + 1 >= max_chapters:
+            break
+        start = gap + 1  # 틈 뒤 블록부터 새 챕터
+        if start < min_blocks or n - start < min_blocks:
+            continue
+        if any(abs(start - b) < min_blocks for b in chosen):
+            continue
+        chosen.append(start)
+    return sorted(chosen)
+
+
+# ================================================================
+# 챕터 만들기
+# ================================================================
+def _blocks(segments: list) -> tuple:
+    """자막 줄 → ([(시작 초 또는 None, 텍스트)], 시간 정보 있음 여부)."""
+    timed = bool(segments) and all(start is not None for start, _ in segments)
+    if timed:
+        return chunk_segments(segments, BLOCK_SECONDS), True
+    texts = [text for _, text in segments]
+    step = UNTIMED_BLOCK_SENTENCES
+    return [(None, " ".join(texts[i : i + step])) for i in range(0, len(texts), step)], False
+
+
+def _title(text: str) -> str:
+    """챕터 제목: 챕터에서 가장 중심이 되는 문장 (TextRank 1문장), 길면 자름."""
+    title = extractive_summary(text, 1).strip()
+    return title if len(title) <= TITLE_CHARS else title[: TITLE_CHARS - 1].rstrip() + "…"
+
+
+def detect_chapters(
+    segments: list,
+    min_seconds: float = MIN_CHAPTER_SECONDS,
+    max_chapters: int = MAX_CHAPTERS,
+) -> list:
+    """
+    자막 줄 [[시작 초 또는 None, 텍스트], ...] → 챕터 목록:
+    [{"index", "start", "end", "label", "title", "text", "key"}]
+    start/end는 초 (시간 정보가 없으면 None), key는 챕터 텍스트 해시 (요약 캐시 / 위젯 키용)
+    """
+    blocks, timed = _blocks([(start, text) for start, text in segments if text and text.strip()])
+    if not blocks:
+        return []
+
+    min_blocks = max(1, round(min_seconds / BLOCK_SECONDS))
+    starts = find_boundaries(tfidf_matrix([text for _, text in blocks]), min_blocks, max_chapters)
+    bounds = [0] + starts + [len(blocks)]
+
+    chapters = []
+    for i, (lo, hi) in enumerate(zip(bounds, bounds[1:])):
+        text = " ".join(t for _, t in blocks[lo:hi])
+        start = blocks[lo][0] if timed else None
+        end = blocks[hi][0] if timed and hi < len(blocks) else None
+        if timed and end is None:
+            end = float(segments[-1][0])
+        chapters.append(
+            {
+                "index": i,
+                "start": start,
+                "end": end,
+                "label": format_time(start) if timed else f"{i + 1}장",
+                "title": _title(text),
+                "text": text,
+                "key": text_hash(text)[:16],
+            }
+        )
+    return chapters
+
+
+def get_chapters(video_id: str, transcript: str, language: str = "ko") -> list:
+    """
+    영상의 챕터 목록. 시간 정보가 있는 자막 줄(content_cache.get_segments)을 우선 쓰고,
+    없으면 자막 텍스트를 문장으로 나눠서 사용.
+    """
+    if not transcript or not transcript.strip():
+        return []
+    key = (video_id, language, text_hash(transcript))
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    segments = get_content_cache().get_segments(video_id, language)
+    if not segments:
+        segments = [(None, sentence) for sentence in split_sentences(transcript)]
+    chapters = detect_chapters(segments)
+    _cache.set(key, chapters)
+    return chapters
+
+
+# ================================================================
+# 챕터 요약
+# ================================================================
+def cached_summary(chapter: dict):
+    """이미 만든 챕터 요약 (없으면 None). LLM을 부르지 않음."""
+    return get_content_cache().get_summary(chapter["text"])
+
+
+def summarize_chapter(chapter: dict) -> str:
+    """챕터 하나 요약 (캐시에 있으면 바로). 사용자별 대기열(utils/admission.py)은 summarize_text 안에서."""
+    # 모델 모듈은 실제로 요약할 때 불러옴
+    from llm import summarize_text
+
+    # video_id를 넘기지 않음: 넘기면 내 자료 검색의 영상 전체 요약 문서를 챕터 요약으로 덮어씀
+    return summarize_text(chapter["text"])
+
+
+def summarize_chapters(chapters: list, on_done=None) -> tuple:
+    """
+    챕터를 차례로 요약. (요약 목록, 새로 요약한 챕터 수) 반환.
+    on_done(chapter, summary): 챕터 하나가 끝날 때마다 (화면 갱신용)
+    """
+    summaries, generated = [], 0
+    for chapter in chapters:
+        summary = cached_summary(chapter)
+        if summary is None:
+            summary = summarize_chapter(chapter)
+            generated += 1
+        summaries.append(summary)
+        if on_done is not None:
+            on_done(chapter, summary)
+    return summaries, generated
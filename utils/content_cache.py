@@ -0,0 +1,233 @@
+# streamlit_app/utils/content_cache.py
+"""
+영상 메타데이터 / 자막 / 요약 / 퀴즈 영구 캐시 (SQLite).
+
+tools/ingest_course.py로 학기 전에 미리 채워 두면, 앱에서는 같은 영상을 열 때
+자막 다운로드와 LLM 요약/퀴즈 생성을 건너뛰고 바로 보여준다.
+앱에서 새로 만든 결과도 같은 곳에 저장되므로 다음 사용자는 기다리지 않는다.
+여기에 없으면 오프라인 코스팩(utils/course_pack.py, APP_COURSE_PACK)에서 찾는다 (코스팩은 읽기 전용).
+
+- 자막: (영상, 언어) → 텍스트 + 시간 정보가 있는 자막 줄 (챕터 나누기용, utils/chapters.py)
+- 요약: 자막 텍스트 해시 → 요약 (summarize_text 입력 기준, 챕터 요약도 챕터 텍스트 기준으로 같은 곳에)
+- 퀴즈: (요약 해시, 문항 수) → 퀴즈 목록 (generate_quiz 입력 기준)
+"""
+
+import hashlib
+import json
+import threading
+import time
+
+from utils import course_pack, telemetry
+from utils.storage import connect
+
+DB_FILE = "content.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id    TEXT PRIMARY KEY,
+    title       TEXT NOT NULL DEFAULT '',
+    item        TEXT NOT NULL,          -- videos().list item (JSON)
+    updated_at  REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id    TEXT NOT NULL,
+    language    TEXT NOT NULL,
+    text        TEXT NOT NULL,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (video_id, language)
+) WITHOUT ROWID;
+
+-- 자막 줄 [[시작 초, 텍스트], ...] (이 테이블이 생기기 전에 받은 자막은 없을 수 있음)
+CREATE TABLE IF NOT EXISTS transcript_segments (
+    video_id    TEXT NOT NULL,
+    language    TEXT NOT NULL,
+    segments    TEXT NOT NULL,          -- JSON
+    PRIMARY KEY (video_id, language)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS summaries (
+    text_hash   TEXT PRIMARY KEY,
+    video_id    TEXT NOT NULL DEFAULT '',
+    summary     TEXT NOT NULL,
+    updated_at  REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS quizzes (
+    summary_hash  TEXT    NOT NULL,
+    num_questions INTEGER NOT NULL,
+    video_id      TEXT    NOT NULL DEFAULT '',
+    items         TEXT    NOT NULL,     -- 퀴즈 목록 (JSON)
+    updated_at    REAL    NOT NULL,
+    PRIMARY KEY (summary_hash, num_questions)
+) WITHOUT ROWID;
+"""
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ContentCache:
+    def __init__(self, filename: str = DB_FILE):
+        self._lock = threading.Lock()
+        self._conn = connect(filename)
+        self._conn.executescript(SCHEMA)
+
+    def _one(self, sql: str, params: tuple, kind: str):
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        telemetry.incr("content_cache", kind=kind, result="hit" if row else "miss")
+        return row[0] if row else None
+
+    # ------------------------------------------------------------
+    # 영상 메타데이터
+    # ------------------------------------------------------------
+    def get_videos(self, video_ids: list) -> dict:
+        if not video_ids:
+            return {}
+        marks = ",".join("?" * len(video_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT video_id, item FROM videos WHERE video_id IN ({marks})",
+                list(video_ids),
+            ).fetchall()
+        found = {vid: json.loads(item) for vid, item in rows}
+        for vid in video_ids:
+            if vid not in found:
+                item = course_pack.find_json(course_pack.video_name(vid))
+                if item is not None:
+                    found[vid] = item
+        return found
+
+    def put_videos(self, items: list):
+        now = time.time()
+        rows = [
+            (
+                item["id"],
+                item.get("snippet", {}).get("title") or "",
+                json.dumps(item, ensure_ascii=False),
+                now,
+            )
+            for item in items
+            if item.get("id")
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO videos (video_id, title, item, updated_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def video_title(self, video_id: str) -> str:
+        item = self.get_videos([video_id]).get(video_id) or {}
+        return item.get("snippet", {}).get("title") or ""
+
+    # ------------------------------------------------------------
+    # 자막
+    # ------------------------------------------------------------
+    def get_transcript(self, video_id: str, language: str):
+        text = self._one(
+            "SELECT text FROM transcripts WHERE video_id = ? AND language = ?",
+            (video_id, language),
+            "transcript",
+        )
+        if text is None:
+            text = course_pack.find_text(course_pack.transcript_name(video_id, language))
+        return text
+
+    def put_transcript(self, video_id: str, language: str, text: str, segments: list = None):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO transcripts (video_id, language, text, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (video_id, language, text, time.time()),
+                )
+                if segments is not None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO transcript_segments (video_id, language, segments) "
+                        "VALUES (?, ?, ?)",
+                        (video_id, language, json.dumps(segments, ensure_ascii=False)),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_segments(self, video_id: str, language: str):
+        """[[시작 초, 텍스트], ...] 또는 None (시간 정보 없이 저장된 자막)."""
+        segments = self._one(
+            "SELECT segments FROM transcript_segments WHERE video_id = ? AND language = ?",
+            (video_id, language),
+            "segments",
+        )
+        if segments is None:
+            return course_pack.find_json(course_pack.segments_name(video_id, language))
+        return json.loads(segments)
+
+    # ------------------------------------------------------------
+    # 요약 / 퀴즈
+    # ------------------------------------------------------------
+    def get_summary(self, transcript: str):
+        summary = self._one(
+            "SELECT summary FROM summaries WHERE text_hash = ?",
+            (text_hash(transcript),),
+            "summary",
+        )
+        if summary is None:
+            summary = course_pack.find_text(course_pack.summary_name(transcript))
+        return summary
+
+    def put_summary(self, transcript: str, summary: str, video_id: str = ""):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (text_hash, video_id, summary, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (text_hash(transcript), video_id, summary, time.time()),
+            )
+
+    def get_quiz(self, summary: str, num_questions: int):
+        items = self._one(
+            "SELECT items FROM quizzes WHERE summary_hash = ? AND num_questions = ?",
+            (text_hash(summary), num_questions),
+            "quiz",
+        )
+        if items is None:
+            return course_pack.find_json(course_pack.quiz_name(summary, num_questions))
+        return json.loads(items)
+
+    def put_quiz(self, summary: str, num_questions: int, items: list, video_id: str = ""):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO quizzes "
+                "(summary_hash, num_questions, video_id, items, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    text_hash(summary),
+                    num_questions,
+                    video_id,
+                    json.dumps(items, ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+
+    def counts(self) -> dict:
+        with self._lock:
+            return {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("videos", "transcripts", "summaries", "quizzes")
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_content_cache() -> ContentCache:
+    """프로세스 전체에서 공유하는 캐시 (Streamlit 세션들 + 일괄 처리 워커)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ContentCache()
+    return _cache
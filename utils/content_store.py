@@ -0,0 +1,396 @@
+# streamlit_app/utils/content_store.py
+"""
+세션 간에 공유하는 내용 저장소 (내용 해시로 중복 제거 + 전체 크기 제한).
+
+st.session_state에 자막 전문, 요약, 검색 결과를 그대로 넣으면
+접속한 사용자 수만큼 같은 자막이 서버 메모리에 복사된다.
+여기서는 값 자체는 프로세스 공용 저장소에 한 번만 두고(내용 해시로 intern),
+session_state에는 작은 Handle만 넣는다.
+
+    content_store.put(st.session_state, "video_transcript", text)
+    text = content_store.get(st.session_state, "video_transcript")
+
+- 같은 내용은 세션이 몇 개든 하나의 객체를 공유 (참조 수만 증가)
+- 전체 크기가 MAX_BYTES를 넘으면 아무 세션도 참조하지 않는 항목부터 LRU로 제거,
+  그래도 넘치면 참조 중인 항목도 제거한다. 이때 get()은 default를 돌려주므로
+  페이지는 '아직 안 불러온 상태'로 보고 다시 가져온다 (자막/요약은 content_cache에서 바로 나옴).
+- 세션별로 어떤 키(slot)가 어떤 항목을 잡고 있는지 기록해서 메모리 사용량을 계산하고,
+  IDLE_SECONDS 동안 접근이 없는 세션의 참조는 풀어 준다 (브라우저 탭을 닫은 세션 등).
+- 짧은 값(INLINE_BYTES 미만)과 None은 저장소를 거치지 않고 session_state에 그대로 둔다.
+
+환경변수:
+    APP_CONTENT_STORE_MB=256      저장소 전체 크기 제한
+    APP_SESSION_IDLE_SEC=1800     이 시간 동안 접근이 없으면 세션 참조 해제
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from utils import telemetry
+from utils.storage import get_session_id
+
+MAX_BYTES = int(float(os.getenv("APP_CONTENT_STORE_MB", "256")) * 1024 * 1024)
+IDLE_SECONDS = float(os.getenv("APP_SESSION_IDLE_SEC", "1800"))
+SWEEP_INTERVAL = 60.0  # 유휴 세션 정리 최소 간격 (초)
+INLINE_BYTES = 256
+
+
+# ================================================================
+# 크기 / 해시
+# ================================================================
+def deep_size(value, _seen=None) -> int:
+    """객체가 실제로 차지하는 메모리(byte) 추정 (컨테이너 안쪽까지, 같은 객체는 한 번만)."""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += deep_size(k, _seen) + deep_size(v, _seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += deep_size(item, _seen)
+    elif hasattr(value, "__dict__"):
+        size += deep_size(vars(value), _seen)
+    elif hasattr(value, "__slots__"):
+        for name in value.__slots__:
+            if hasattr(value, name):
+                size += deep_size(getattr(value, name), _seen)
+    return size
+
+
+def content_key(value) -> str:
+    if isinstance(value, str):
+        raw = value.encode("utf-8")
+    else:
+        raw = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+class Handle:
+    """session_state에 대신 들어가는 참조 (내용 해시 + 크기)."""
+
+    __slots__ = ("key", "size")
+
+    def __init__(self, key: str, size: int):
+        self.key = key
+        self.size = size
+
+    def __eq__(self, other):
+        return isinstance(other, Handle) and other.key == self.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"Handle({self.key[:10]}, {self.size:,}B)"
+
+
+# ================================================================
+# 저장소
+# ================================================================
+class ContentStore:
+    def __init__(self, max_bytes: int = MAX_BYTES, idle_seconds: float = IDLE_SECONDS):
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> [value, size, refs] (LRU 순서)
+        self._sessions = {}  # session_id -> {"last_seen": t, "slots": {slot: key}}
+        self.total_bytes = 0
+        self.evictions = 0
+        self.intern_hits = 0
+        self._last_sweep = time.time()
+
+    # ------------------------------------------------------------
+    # 값 저장 / 조회
+    # ------------------------------------------------------------
+    def intern(self, value):
+        """값을 저장소에 넣고 (key, 공유 객체, 크기)를 반환. 같은 내용이 있으면 그 객체를 공유."""
+        key = content_key(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.intern_hits += 1
+                telemetry.incr("content_store", result="shared")
+                return key, entry[0], entry[1]
+
+            size = deep_size(value)
+            self._entries[key] = [value, size, 0]
+            self.total_bytes += size
+            self._evict_locked(keep=key)
+        telemetry.incr("content_store", result="new")
+        return key, value, size
+
+    def resolve(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    # ------------------------------------------------------------
+    # 세션 참조
+    # ------------------------------------------------------------
+    def bind(self, session_id: str, slot: str, key):
+        """session_id의 slot이 key 항목을 잡도록 기록 (key=None이면 해제)."""
+        now = time.time()
+        with self._lock:
+            session = self._sessions.setdefault(session_id, {"last_seen": now, "slots": {}})
+            session["last_seen"] = now
+            old = session["slots"].get(slot)
+            if old == key:
+                return
+            if old is not None:
+                self._decref_locked(old)
+                del session["slots"][slot]
+            if key is not None and key in self._entries:
+                self._entries[key][2] += 1
+                session["slots"][slot] = key
+        self.maybe_sweep(now)
+
+    def release_session(self, session_id: str):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                for key in session["slots"].values():
+                    self._decref_locked(key)
+
+    def maybe_sweep(self, now: float = None):
+        now = now or time.time()
+        if now - self._last_sweep < SWEEP_INTERVAL:
+            return
+        self.sweep_idle(now)
+
+    def sweep_idle(self, now: float = None) -> int:
+        """오래 접근이 없는 세션의 참조를 모두 해제. 해제한 세션 수를 반환."""
+        now = now or time.time()
+        with self._lock:
+            self._last_sweep = now
+            idle = [
+                sid
+                for sid, session in self._sessions.items()
+                if now - session["last_seen"] > self.idle_seconds
+            ]
+        for sid in idle:
+            self.release_session(sid)
+        if idle:
+            telemetry.incr("content_store_idle_sessions", len(idle))
+        return len(idle)
+
+    # ------------------------------------------------------------
+    # 내부: 참조 감소 / 제거
+    # ------------------------------------------------------------
+    def _decref_locked(self, key: str):
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] > 0:
+            entry[2] -= 1
+
+    def _drop_locked(self, key: str):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry[1]
+        self.evictions += 1
+        telemetry.incr("content_store", result="evicted")
+
+    def _evict_locked(self, keep: str):
+        """크기 제한을 넘으면 제거 (방금 넣은 keep 항목은 남김)."""
+        if self.total_bytes <= self.max_bytes:
+            return
+        # 1) 아무도 안 쓰는 항목부터 (오래된 순)
+        for key in [k for k, e in self._entries.items() if e[2] == 0 and k != keep]:
+            if self.total_bytes <= self.max_bytes:
+                return
+            self._drop_locked(key)
+        # 2) 그래도 넘치면 참조 중인 항목도 오래된 순으로
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            for session in self._sessions.values():
+                for slot, k in list(session["slots"].items()):
+                    if k == key:
+                        del session["slots"][slot]
+            self._drop_locked(key)
+
+    # ------------------------------------------------------------
+    # 진단
+    # ------------------------------------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            shared = sum(1 for e in self._entries.values() if e[2] > 1)
+            unreferenced = sum(1 for e in self._entries.values() if e[2] == 0)
+            # 세션마다 따로 들고 있었다면 필요했을 크기
+            logical = sum(e[1] * max(1, e[2]) for e in self._entries.values())
+            return {
+                "items": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "logical_bytes": logical,
+                "shared_items": shared,
+                "unreferenced_items": unreferenced,
+                "sessions": len(self._sessions),
+                "intern_hits": self.intern_hits,
+                "evictions": self.evictions,
+            }
+
+    def session_stats(self) -> list:
+        """
+        세션별 메모리 사용량.
+        bytes: 세션이 잡고 있는 항목 크기 합, attributed_bytes: 공유 항목은 참조 수로 나눈 몫.
+        """
+        now = time.time()
+        rows = []
+        with self._lock:
+            for sid, session in self._sessions.items():
+                total = attributed = 0
+                for key in session["slots"].values():
+                    entry = self._entries.get(key)
+                    if entry is None:
+                        continue
+                    total += entry[1]
+                    attributed += entry[1] / max(1, entry[2])
+                rows.append(
+                    {
+                        "session": sid,
+                        "slots": len(session["slots"]),
+                        "bytes": total,
+                        "attributed_bytes": int(attributed),
+                        "idle_sec": round(now - session["last_seen"], 1),
+                    }
+                )
+        rows.sort(key=lambda r: r["attributed_bytes"], reverse=True)
+        return rows
+
+    def slot_stats(self) -> list:
+        """키(slot)별 메모리 사용량: 세션 수, 서로 다른 항목 수, 실제 크기 / 복사했다면 크기."""
+        per_slot = {}
+        with self._lock:
+            for session in self._sessions.values():
+                for slot, key in session["slots"].items():
+                    entry = self._entries.get(key)
+                    if entry is None:
+                        continue
+                    row = per_slot.setdefault(slot, {"sessions": 0, "keys": {}, "logical_bytes": 0})
+                    row["sessions"] += 1
+                    row["keys"][key] = entry[1]
+                    row["logical_bytes"] += entry[1]
+        rows = [
+            {
+                "slot": slot,
+                "sessions": row["sessions"],
+                "unique_items": len(row["keys"]),
+                "bytes": sum(row["keys"].values()),
+                "logical_bytes": row["logical_bytes"],
+            }
+            for slot, row in per_slot.items()
+        ]
+        rows.sort(key=lambda r: r["bytes"], reverse=True)
+        return rows
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_content_store() -> ContentStore:
+    """프로세스 전체에서 공유하는 저장소 (모든 Streamlit 세션)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ContentStore()
+    return _store
+
+
+# ================================================================
+# session_state 헬퍼
+# ================================================================
+def put(state, slot: str, value):
+    """state[slot]에 값을 저장 (큰 값은 공용 저장소에 넣고 Handle만 보관)."""
+    store = get_content_store()
+    session_id = get_session_id(state)
+    if value is None or deep_size(value) < INLINE_BYTES:
+        store.bind(session_id, slot, None)
+        state[slot] = value
+        return
+    key, _, size = store.intern(value)
+    store.bind(session_id, slot, key)
+    state[slot] = Handle(key, size)
+
+
+def reset(state, **values):
+    """여러 키를 한 번에 초기화. 예: reset(state, video_transcript=None, ai_summary="")"""
+    for slot, value in values.items():
+        put(state, slot, value)
+
+
+def get(state, slot: str, default=None):
+    """state[slot] 값. Handle이면 저장소에서 꺼내고, 이미 제거됐으면 default."""
+    raw = state.get(slot, default)
+    if not isinstance(raw, Handle):
+        return raw
+
+    store = get_content_store()
+    session_id = get_session_id(state)
+    value = store.resolve(raw.key)
+    if value is None:
+        # 크기 제한으로 제거됨 → 호출하는 쪽에서 다시 불러옴
+        store.bind(session_id, slot, None)
+        state[slot] = default
+        telemetry.incr("content_store", result="expired")
+        return default
+    # 유휴 정리로 참조가 풀렸던 세션이 돌아온 경우 다시 잡음
+    store.bind(session_id, slot, raw.key)
+    return value
+
+
+def share(state, slot: str, value):
+    """
+    session_state 밖(예: QuizStore)에 들고 있을 값을 공유 객체로 바꿔서 반환.
+    같은 퀴즈를 푸는 세션들이 문제 목록 하나를 같이 쓰게 된다.
+    """
+    if value is None:
+        return value
+    store = get_content_store()
+    key, shared, _ = store.intern(value)
+    store.bind(get_session_id(state), slot, key)
+    return shared
+
+
+def state_sizes(state) -> list:
+    """현재 세션의 session_state 키별 크기 (Handle은 가리키는 항목 크기도 함께)."""
+    rows = []
+    for key in list(state.keys()):
+        value = state[key]
+        rows.append(
+            {
+                "key": key,
+                "type": type(value).__name__,
+                "bytes": deep_size(value),
+                "store_bytes": value.size if isinstance(value, Handle) else 0,
+            }
+        )
+    rows.sort(key=lambda r: r["bytes"] + r["store_bytes"], reverse=True)
+    return rows
+
+
+def process_rss_mb() -> float:
+    """현재 프로세스 RSS (MB). /proc가 없으면 최대 RSS로 대신."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        import resource
+
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
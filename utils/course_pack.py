@@ -0,0 +1,287 @@
+# streamlit_app/utils/course_pack.py
+"""
+오프라인 코스팩: 과목 하나의 주차별 영상 / 영상 정보 / 자막 / 요약 / 퀴즈 / 썸네일을 파일 하나로 묶음.
+
+시험 기간에는 학교 Wi-Fi와 YouTube 할당량이 먼저 바닥난다. 코스팩을 미리 만들어 두고
+APP_COURSE_PACK으로 지정하면 시간표 주차 버튼 → 검색 결과 → 자막 / 요약 / 퀴즈가 네트워크 없이 나온다.
+
+- 파일 형식 (버전 FORMAT_VERSION):
+      [헤더: MAGIC, 형식 버전, 색인 위치, 색인 길이] [조각 ...] [색인 (zlib JSON)]
+  조각은 zlib 압축 (썸네일처럼 이미 압축된 것은 그대로), 색인에는 이름 → (위치, 길이, 원래 크기, sha1, 압축 방식)
+- 읽기: mmap으로 열고 헤더와 색인만 읽음. 조각은 페이지가 실제로 요청할 때 그 부분만 풀어서 반환
+- 조각 이름: search/<검색어>, video/<id>, transcript/<id>/<언어>, segments/<id>/<언어>,
+  summary/<텍스트 해시>, quiz/<요약 해시>/<문항 수>, thumb/<id>, weeks
+- 앱 연결: utils/content_cache.py (자막/요약/퀴즈/영상 정보)와 utils/youtube_api2.py (검색)가
+  자기 캐시에 없으면 여기를 먼저 찾는다
+- 만들기: tools/build_course_pack.py (이전 팩에 sha1이 같은 조각이 있으면 압축된 바이트를 그대로 복사,
+  새 파일은 임시 파일에 쓴 뒤 교체)
+
+환경변수:
+    APP_COURSE_PACK=data/packs/대학수학.pack   여러 개는 경로 구분자(: 또는 ;)로
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from utils import telemetry
+
+PACK_PATHS = [p for p in os.getenv("APP_COURSE_PACK", "").split(os.pathsep) if p.strip()]
+
+MAGIC = b"CPACK\x00"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<6sHQQ")  # magic, 형식 버전, 색인 위치, 색인 길이
+ZLIB = "z"
+RAW = "raw"
+COMPRESS_LEVEL = 6
+
+
+class PackError(RuntimeError):
+    """코스팩 파일이 아니거나 지원하지 않는 형식 버전."""
+
+
+def text_hash(text: str) -> str:
+    # utils/content_cache.text_hash와 같은 값 (요약 / 퀴즈 조각 이름)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
+
+# 조각 이름
+def search_name(query: str) -> str:
+    return f"search/{normalize_query(query)}"
+
+
+def video_name(video_id: str) -> str:
+    return f"video/{video_id}"
+
+
+def transcript_name(video_id: str, language: str) -> str:
+    return f"transcript/{video_id}/{language}"
+
+
+def segments_name(video_id: str, language: str) -> str:
+    return f"segments/{video_id}/{language}"
+
+
+def summary_name(text: str) -> str:
+    return f"summary/{text_hash(text)}"
+
+
+def quiz_name(summary: str, num_questions: int) -> str:
+    return f"quiz/{text_hash(summary)}/{num_questions}"
+
+
+def thumb_name(video_id: str) -> str:
+    return f"thumb/{video_id}"
+
+
+# ================================================================
+# 읽기
+# ================================================================
+class CoursePack:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._mm) < _HEADER.size:
+                raise PackError(f"{self.path.name}: 코스팩 파일이 아닙니다.")
+            magic, version, offset, length = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise PackError(f"{self.path.name}: 코스팩 파일이 아닙니다.")
+            if version != FORMAT_VERSION:
+                raise PackError(f"{self.path.name}: 지원하지 않는 코스팩 형식 v{version}")
+            index = json.loads(zlib.decompress(self._mm[offset : offset + length]))
+        except Exception:
+            self.close()
+            raise
+        self._entries = index.pop("entries")
+        self.meta = index  # course, language, revision, built_at ...
+        self.reads = 0
+        self.bytes_read = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def names(self, prefix: str = "") -> list:
+        return [n for n in self._entries if n.startswith(prefix)]
+
+    def sha1(self, name: str):
+        entry = self._entries.get(name)
+        return entry[3] if entry else None
+
+    def raw(self, name: str):
+        """(저장된 바이트, 압축 방식) — 다시 만들 때 압축을 풀지 않고 복사하는 용도."""
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        offset, length, _, _, codec = entry
+        return self._mm[offset : offset + length], codec
+
+    def get_bytes(self, name: str):
+        stored = self.raw(name)
+        if stored is None:
+            return None
+        data, codec = stored
+        self.reads += 1
+        self.bytes_read += len(data)
+        return zlib.decompress(data) if codec == ZLIB else data
+
+    def get_text(self, name: str):
+        data = self.get_bytes(name)
+        return data.decode("utf-8") if data is not None else None
+
+    def get_json(self, name: str):
+        data = self.get_bytes(name)
+        return json.loads(data) if data is not None else None
+
+    def stats(self) -> dict:
+        return {
+            "path": str(self.path),
+            **self.meta,
+            "entries": len(self._entries),
+            "size_bytes": len(self._mm),
+            "reads": self.reads,
+            "bytes_read": self.bytes_read,
+        }
+
+    def close(self):
+        mm = getattr(self, "_mm", None)
+        if mm is not None:
+            mm.close()
+        self._file.close()
+
+
+# ================================================================
+# 쓰기
+# ================================================================
+class PackWriter:
+    """
+    새 코스팩 파일 쓰기. previous(이전 CoursePack)에 sha1이 같은 조각이 있으면 압축된 바이트를 그대로 복사.
+    finish() 전까지는 임시 파일(<path>.tmp)에 쓰므로, 중간에 실패해도 기존 팩은 그대로 남는다.
+    """
+
+    def __init__(self, path, meta: dict, previous: CoursePack = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.meta = dict(meta)
+        self.previous = previous
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._file = open(self._tmp, "wb")
+        self._file.write(b"\x00" * _HEADER.size)  # 헤더는 finish()에서 채움
+        self._entries = {}
+        self.reused = 0
+        self.written = 0
+
+    def add(self, name: str, data: bytes, compress: bool = True):
+        if name in self._entries:
+            return
+        sha = hashlib.sha1(data).hexdigest()
+        stored = None
+        if self.previous is not None and self.previous.sha1(name) == sha:
+            stored = self.previous.raw(name)
+            self.reused += 1
+        if stored is None:
+            packed = zlib.compress(data, COMPRESS_LEVEL) if compress else data
+            stored = (packed, ZLIB) if len(packed) < len(data) else (data, RAW)
+            self.written += 1
+        blob, codec = stored
+        offset = self._file.tell()
+        self._file.write(blob)
+        self._entries[name] = [offset, len(blob), len(data), sha, codec]
+
+    def add_text(self, name: str, text: str):
+        self.add(name, text.encode("utf-8"))
+
+    def add_json(self, name: str, value):
+        self.add(name, json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+
+    def finish(self) -> dict:
+        revision = (self.previous.meta.get("revision", 0) if self.previous is not None else 0) + 1
+        index = dict(self.meta, format=FORMAT_VERSION, revision=revision, built_at=time.time())
+        index["entries"] = self._entries
+        packed = zlib.compress(json.dumps(index, ensure_ascii=False).encode("utf-8"), COMPRESS_LEVEL)
+        offset = self._file.tell()
+        self._file.write(packed)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, offset, len(packed)))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        if self.previous is not None:
+            # Windows는 mmap으로 열려 있는 파일을 교체할 수 없음
+            self.previous.close()
+        os.replace(self._tmp, self.path)
+        return {
+            "path": str(self.path),
+            "revision": revision,
+            "entries": len(self._entries),
+            "reused": self.reused,
+            "written": self.written,
+            "size_bytes": self.path.stat().st_size,
+        }
+
+    def abort(self):
+        self._file.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+# ================================================================
+# 앱에서 찾기
+# ================================================================
+_packs = None
+_packs_lock = threading.Lock()
+
+
+def get_course_packs() -> list:
+    """APP_COURSE_PACK에 지정한 코스팩 (열 수 없는 파일은 건너뜀)."""
+    global _packs
+    if _packs is None:
+        with _packs_lock:
+            if _packs is None:
+                packs = []
+                for path in PACK_PATHS:
+                    try:
+                        packs.append(CoursePack(path.strip()))
+                    except (OSError, PackError, ValueError) as e:
+                        telemetry.incr("course_pack_errors", error=type(e).__name__)
+                        print(f"코스팩을 열 수 없습니다 ({path}): {e}")
+                _packs = packs
+    return _packs
+
+
+def find_bytes(name: str):
+    for pack in get_course_packs():
+        data = pack.get_bytes(name)
+        if data is not None:
+            telemetry.incr("course_pack", kind=name.split("/", 1)[0], result="hit")
+            return data
+    return None
+
+
+def find_text(name: str):
+    data = find_bytes(name)
+    return data.decode("utf-8") if data is not None else None
+
+
+def find_json(name: str):
+    data = find_bytes(name)
+    return json.loads(data) if data is not None else None
+
+
+def thumbnail(video: dict):
+    """썸네일: 코스팩에 있으면 이미지 바이트, 없으면 URL (st.image에 그대로 넘김)."""
+    if get_course_packs():
+        data = find_bytes(thumb_name(video.get("video_id", "")))
+        if data is not None:
+            return data
+    return video.get("thumbnail")
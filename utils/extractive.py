@@ -0,0 +1,131 @@
+# streamlit_app/utils/extractive.py
+"""
+모델 없이 바로 만드는 추출 요약 (TF-IDF + TextRank, NumPy).
+
+LLM 요약은 수 초 ~ 수십 초가 걸리므로, 자막을 받자마자 이 요약(수 ms)을 먼저 보여주고
+LLM 요약이 끝나면 바꿔 끼운다. LLM이 밀려 있을 때(load shedding)는 이 요약만 제공한다.
+
+- 문장 나누기: 문장부호 + 한국어 종결 어미 기준. 자동 자막처럼 문장부호가 거의 없으면 단어 묶음으로 자름
+- 특징: 단어 안의 글자 2-gram (조사/어미가 붙어도 같은 어근끼리 겹치도록)
+- 문장 간 코사인 유사도 그래프에서 PageRank 점수가 높은 문장을 원래 순서대로 반환
+"""
+
+import hashlib
+import math
+import re
+
+from utils.cache import TTLCache
+
+NUM_SENTENCES = 3
+MAX_SENTENCES = 400  # 유사도 행렬 크기 제한 (n x n)
+MIN_SENTENCE_CHARS = 12
+FALLBACK_WORDS = 25  # 문장부호가 없을 때 한 '문장'으로 볼 단어 수
+DAMPING = 0.85
+
+# 문장부호 또는 "~다 / ~요 / ~죠"로 끝나는 어절 뒤에서 자름
+_SENTENCE_END = re.compile(r"(?<=[.?!。다요죠])\s+")
+_LANG_TAG = re.compile(r"^(?:\[[\w-]+\]\s*)+")  # fetch_transcript가 붙이는 "[ko] "
+_WORD = re.compile(r"\w+")
+
+_cache = TTLCache("extractive_summary", ttl=3600, max_items=500)
+
+
+def split_sentences(text: str) -> list:
+    text = _LANG_TAG.sub("", text.strip())
+    sentences = [s.strip() for s in _SENTENCE_END.split(text) if s and s.strip()]
+
+    # 문장부호 없는 자동 자막: 한 문장이 너무 길면 단어 단위로 다시 자름
+    if len(sentences) < 4 or max(len(s) for s in sentences) > 400:
+        words = text.split()
+        sentences = [
+            " ".join(words[i : i + FALLBACK_WORDS]) for i in range(0, len(words), FALLBACK_WORDS)
+        ]
+
+    # 너무 많으면 이웃 문장끼리 합쳐서 MAX_SENTENCES 이하로
+    if len(sentences) > MAX_SENTENCES:
+        group = math.ceil(len(sentences) / MAX_SENTENCES)
+        sentences = [
+            " ".join(sentences[i : i + group]) for i in range(0, len(sentences), group)
+        ]
+    return sentences
+
+
+def _features(sentence: str) -> list:
+    feats = []
+    for word in _WORD.findall(sentence.lower()):
+        if len(word) == 1:
+            feats.append(word)
+        else:
+            feats.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return feats
+
+
+def tfidf_matrix(sentences: list) -> "np.ndarray":
+    """문장 x 특징 TF-IDF 행렬 (행마다 L2 정규화)."""
+    import numpy as np
+
+    vocab = {}
+    rows, cols = [], []
+    for r, sentence in enumerate(sentences):
+        for feat in _features(sentence):
+            rows.append(r)
+            cols.append(vocab.setdefault(feat, len(vocab)))
+
+    tf = np.zeros((len(sentences), max(1, len(vocab))), dtype=np.float32)
+    if rows:
+        np.add.at(tf, (np.asarray(rows), np.asarray(cols)), 1.0)
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log((1.0 + len(sentences)) / (1.0 + df)) + 1.0
+    x = np.log1p(tf) * idf
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-9)
+
+
+def textrank(x: "np.ndarray", iterations: int = 50, tol: float = 1e-6) -> "np.ndarray":
+    """코사인 유사도 그래프 위의 PageRank 점수."""
+    import numpy as np
+
+    n = x.shape[0]
+    sim = x @ x.T
+    np.fill_diagonal(sim, 0.0)
+    row_sum = sim.sum(axis=1, keepdims=True)
+    # 다른 문장과 전혀 안 겹치는 문장은 모든 문장으로 균등하게 연결
+    trans = np.where(row_sum > 0, sim / np.maximum(row_sum, 1e-9), 1.0 / n)
+
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(iterations):
+        new = (1.0 - DAMPING) / n + DAMPING * (trans.T @ scores)
+        if np.abs(new - scores).sum() < tol:
+            scores = new
+            break
+        scores = new
+    return scores
+
+
+def extractive_summary(text: str, num_sentences: int = NUM_SENTENCES) -> str:
+    """핵심 문장 num_sentences개를 원래 순서대로 한 줄씩."""
+    if not text or not text.strip():
+        return ""
+
+    key = (hashlib.sha1(text.encode("utf-8")).hexdigest(), num_sentences)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    # NumPy는 첫 요약 때 불러옴 (메모/시간표만 쓰는 사용자는 로딩하지 않음)
+    import numpy as np
+
+    sentences = split_sentences(text)
+    if len(sentences) <= num_sentences:
+        summary = "\n".join(sentences)
+    else:
+        scores = textrank(tfidf_matrix(sentences))
+        # 너무 짧은 문장("네", "자 그럼")은 뽑지 않음
+        lengths = np.fromiter((len(s) for s in sentences), dtype=np.int32, count=len(sentences))
+        scores = np.where(lengths >= MIN_SENTENCE_CHARS, scores, -1.0)
+        top = np.argsort(-scores, kind="stable")[:num_sentences]
+        summary = "\n".join(sentences[i] for i in sorted(top.tolist()))
+
+    _cache.set(key, summary)
+    return summary
@@ -0,0 +1,93 @@
+# streamlit_app/utils/grammar_cache.py
+"""
+JSON Schema → llama.cpp 샘플링 문법(GBNF) 변환 결과 캐시.
+
+create_chat_completion(response_format={"schema": ...})는 호출할 때마다 스키마를 문법으로
+다시 변환한다. 퀴즈 스키마는 항상 같으므로 (스키마 해시, 문항 수)별로 한 번만 변환해서
+LlamaGrammar 객체를 grammar= 인자로 재사용한다. (llama-cpp-python 0.3부터 LlamaGrammar는
+문법 문자열만 들고 있고 샘플러는 호출마다 새로 만들어지므로 여러 스레드에서 같이 써도 된다.)
+
+환경변수:
+    LLM_PRECOMPILE_GRAMMARS="5,10"   시작할 때 미리 변환해 둘 문항 수 목록 (기본: 없음)
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+
+from utils import telemetry
+
+PRECOMPILE_COUNTS = [
+    int(n) for n in os.getenv("LLM_PRECOMPILE_GRAMMARS", "").replace(" ", "").split(",") if n
+]
+
+_cache = {}  # (schema_hash, num_items) -> LlamaGrammar
+_locks = {}  # 같은 키를 두 스레드가 동시에 변환하지 않도록
+_lock = threading.Lock()
+
+
+def schema_hash(schema: dict) -> str:
+    raw = json.dumps(schema, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def exact_quiz_schema(schema: dict, num_items: int) -> dict:
+    """퀴즈 스키마 변형: 문항이 정확히 num_items개, answer_index는 0~3 중 하나."""
+    schema = copy.deepcopy(schema)
+    quizzes = schema["properties"]["quizzes"]
+    quizzes["minItems"] = num_items
+    quizzes["maxItems"] = num_items
+    item = quizzes["items"]
+    n_options = item["properties"]["options"].get("maxItems", 4)
+    item["properties"]["answer_index"] = {"type": "integer", "enum": list(range(n_options))}
+    return schema
+
+
+def _compile(schema: dict):
+    from llama_cpp import LlamaGrammar
+
+    return LlamaGrammar.from_json_schema(json.dumps(schema, ensure_ascii=False), verbose=False)
+
+
+def get_grammar(schema: dict, num_items: int = None):
+    """
+    캐시된 LlamaGrammar 반환 (없으면 변환해서 저장).
+    num_items를 주면 exact_quiz_schema 변형으로 변환한다.
+    """
+    key = (schema_hash(schema), num_items)
+    grammar = _cache.get(key)
+    if grammar is not None:
+        telemetry.incr("llm_grammar_cache", result="hit")
+        return grammar
+
+    with _lock:
+        key_lock = _locks.setdefault(key, threading.Lock())
+    with key_lock:
+        grammar = _cache.get(key)
+        if grammar is not None:
+            telemetry.incr("llm_grammar_cache", result="hit")
+            return grammar
+
+        target = exact_quiz_schema(schema, num_items) if num_items else schema
+        start = time.perf_counter()
+        with telemetry.span("llm.grammar_compile", num_items=num_items or 0):
+            grammar = _compile(target)
+        telemetry.observe("llm_grammar_compile_seconds", time.perf_counter() - start)
+        telemetry.incr("llm_grammar_cache", result="miss")
+        _cache[key] = grammar
+        return grammar
+
+
+def precompile(schema: dict, counts=None) -> int:
+    """시작할 때 미리 변환. 변환한 개수 반환."""
+    counts = PRECOMPILE_COUNTS if counts is None else counts
+    for n in counts:
+        get_grammar(schema, n)
+    return len(counts)
+
+
+def cached_keys() -> list:
+    return list(_cache)
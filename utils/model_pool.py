@@ -0,0 +1,393 @@
+# streamlit_app/utils/model_pool.py
+"""
+모델 워커 풀 (프로세스 K개 × 모델 1개씩, 코어 고정 + 가장 한가한 워커로 분배).
+
+llama.cpp 요청 하나는 스레드를 8개 넘게 줘도 거의 빨라지지 않고, Llama 객체 하나는
+요청을 한 번에 하나씩만 처리한다. 32코어 서버에서 모델 1개로는 코어 대부분이 논다.
+여기서는 코어를 겹치지 않게 K묶음으로 나눠 워커 프로세스마다 모델을 하나씩 올린다.
+GGUF는 mmap으로 열기 때문에 가중치 페이지는 워커들이 공유하고, 워커마다 늘어나는 건
+KV 캐시와 계산 버퍼 정도다.
+
+- 분배: 처리 중 + 대기 중인 요청 수가 가장 적은 워커 (같으면 번호 순서대로 돌아가며)
+- 상태 점검: 워커 프로세스가 죽으면 응답 파이프가 끊기는 것으로 바로 감지하고,
+  처리 중이던 요청은 다른 워커로 한 번 재시도, 죽은 워커는 같은 코어로 다시 띄움
+- 코어 묶음: 하이퍼스레딩 형제 코어는 한 묶음에 넣지 않음 (물리 코어 1개 = 스레드 1개)
+
+환경변수:
+    LLM_POOL_WORKERS=0      0/1이면 풀 없이 llm.py 안에서 모델 1개 (기존 방식), auto면 코어 수로 결정
+    LLM_POOL_MIN_THREADS=4  워커당 최소 스레드 수 (auto일 때)
+    LLM_POOL_TIMEOUT_SEC=600  요청 하나를 기다리는 최대 시간 (넘으면 PoolTimeout)
+"""
+
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from utils import telemetry
+
+POOL_WORKERS = os.getenv("LLM_POOL_WORKERS", "0").strip().lower()
+MIN_THREADS = int(os.getenv("LLM_POOL_MIN_THREADS", "4"))
+REQUEST_TIMEOUT = float(os.getenv("LLM_POOL_TIMEOUT_SEC", "600"))
+MAX_RETRIES = 1  # 워커가 죽었을 때 다른 워커로 재시도하는 횟수
+RESTART_BACKOFF = 1.0  # 같은 워커가 계속 죽을 때 재시작 간격 (초, 2배씩 최대 30초)
+
+
+class WorkerCrashed(RuntimeError):
+    """요청을 처리하던 워커 프로세스가 죽음."""
+
+
+class PoolTimeout(RuntimeError):
+    """요청이 REQUEST_TIMEOUT 안에 끝나지 않음."""
+
+
+# ================================================================
+# 코어 묶음
+# ================================================================
+def physical_cores() -> list:
+    """사용 가능한 논리 CPU 중 물리 코어마다 하나씩 (하이퍼스레딩 형제 제외)."""
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+    seen, cores = set(), []
+    for cpu in cpus:
+        path = f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list"
+        try:
+            with open(path) as f:
+                siblings = f.read().strip()
+        except OSError:
+            siblings = str(cpu)
+        if siblings not in seen:
+            seen.add(siblings)
+            cores.append(cpu)
+    return cores
+
+
+def core_sets(num_workers: int, cores: list = None) -> list:
+    """코어 목록을 겹치지 않는 num_workers개 묶음으로 (앞쪽 묶음이 1개씩 더 가질 수 있음)."""
+    cores = cores if cores is not None else physical_cores()
+    num_workers = max(1, min(num_workers, len(cores)))
+    size, extra = divmod(len(cores), num_workers)
+    sets, start = [], 0
+    for i in range(num_workers):
+        end = start + size + (1 if i < extra else 0)
+        sets.append(cores[start:end])
+        start = end
+    return sets
+
+
+def planned_workers(setting: str = POOL_WORKERS) -> int:
+    """LLM_POOL_WORKERS 값 → 워커 수 (auto: 물리 코어 / MIN_THREADS)."""
+    if setting == "auto":
+        return max(1, len(physical_cores()) // MIN_THREADS)
+    try:
+        return max(0, int(setting))
+    except ValueError:
+        return 0
+
+
+# ================================================================
+# 워커 프로세스
+# ================================================================
+def _worker_main(conn, cores: list, model_path: str, llama_kwargs: dict, initializer, initargs):
+    """워커 프로세스 본체: 요청을 하나씩 받아 처리하고 (request_id, ok, 결과)를 돌려보냄."""
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cores)
+        except OSError:
+            pass
+    if initializer is not None:
+        initializer(*initargs)
+
+    from llama_cpp import Llama
+
+    from utils import grammar_cache, speculative
+
+    kwargs = dict(llama_kwargs, n_threads=len(cores), n_threads_batch=len(cores), use_mmap=True)
+    draft = speculative.make_draft_model(n_ctx=kwargs.get("n_ctx"), n_threads=len(cores))
+    model = Llama(model_path=model_path, verbose=False, draft_model=draft, **kwargs)
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            return
+        if msg is None:
+            return
+        request_id, kind, payload, options = msg
+        try:
+            if kind == "ping":
+                result = "pong"
+            elif kind == "complete":
+                result = model(prompt=payload, **options)
+            else:  # chat
+                schema, num_items = options.pop("schema", None), options.pop("num_items", None)
+                if schema is not None:
+                    # LlamaGrammar는 프로세스 사이로 보낼 수 없으므로 워커에서 (캐시해서) 만듦
+                    try:
+                        options["grammar"] = grammar_cache.get_grammar(schema, num_items)
+                    except (ImportError, AttributeError):
+                        if num_items:
+                            schema = grammar_cache.exact_quiz_schema(schema, num_items)
+                        options["response_format"] = {"type": "json_object", "schema": schema}
+                result = model.create_chat_completion(messages=payload, **options)
+            conn.send((request_id, True, result))
+        except Exception as e:
+            conn.send((request_id, False, f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, index: int, cores: list):
+        self.index = index
+        self.cores = cores
+        self.process = None
+        self.conn = None
+        self.pid = None
+        self.send_lock = threading.Lock()
+        self.in_flight = {}  # request_id -> (future, kind, payload, options, attempt)
+        self.served = 0
+        self.restarts = 0
+        self.started_at = 0.0
+        self.alive = False
+
+
+class ModelPool:
+    def __init__(
+        self,
+        num_workers: int,
+        model_path: str,
+        llama_kwargs: dict,
+        cores: list = None,
+        initializer=None,
+        initargs=(),
+        start_timeout: float = 300.0,
+    ):
+        self.model_path = model_path
+        self.llama_kwargs = {k: v for k, v in llama_kwargs.items() if k not in ("n_threads", "n_threads_batch")}
+        self.initializer = initializer
+        self.initargs = initargs
+        self.start_timeout = start_timeout
+        self._ctx = multiprocessing.get_context("spawn")  # 모델/스레드 상태를 fork로 복사하지 않도록
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._rr = itertools.count()
+        self._closed = False
+        self.workers = [_Worker(i, c) for i, c in enumerate(core_sets(num_workers, cores))]
+        for worker in self.workers:
+            self._start(worker)
+
+    # ------------------------------------------------------------
+    # 워커 시작 / 재시작
+    # ------------------------------------------------------------
+    def _start(self, worker: _Worker):
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, worker.cores, self.model_path, self.llama_kwargs, self.initializer, self.initargs),
+            name=f"llm-worker-{worker.index}",
+            daemon=True,
+        )
+        with telemetry.span("llm.pool.worker_start", worker=worker.index, cores=len(worker.cores)):
+            process.start()
+            child_conn.close()
+            if not parent_conn.poll(self.start_timeout):
+                process.kill()
+                raise RuntimeError(f"모델 워커 {worker.index}가 {self.start_timeout:.0f}초 안에 뜨지 않았습니다.")
+            try:
+                _, pid = parent_conn.recv()
+            except EOFError:
+                process.join(1)
+                raise RuntimeError(f"모델 워커 {worker.index}가 시작하다 종료됐습니다 (exit {process.exitcode}).")
+
+        worker.process, worker.conn, worker.pid = process, parent_conn, pid
+        worker.started_at = time.time()
+        worker.alive = True
+        threading.Thread(
+            target=self._receive, args=(worker, parent_conn), name=f"llm-pool-recv-{worker.index}", daemon=True
+        ).start()
+
+    def _receive(self, worker: _Worker, conn):
+        """워커 응답을 받아서 Future를 완료. 파이프가 끊기면 워커가 죽은 것."""
+        while True:
+            try:
+                request_id, ok, result = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                entry = worker.in_flight.pop(request_id, None)
+            if entry is None:
+                continue
+            if entry[1] != "ping":
+                worker.served += 1
+            future = entry[0]
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(result))
+        self._on_crash(worker, conn)
+
+    def _on_crash(self, worker: _Worker, conn):
+        with self._lock:
+            if worker.conn is not conn:
+                return  # 이미 재시작된 워커의 예전 연결
+            worker.alive = False
+            orphaned = list(worker.in_flight.values())
+            worker.in_flight.clear()
+            closed = self._closed
+        if closed:
+            return
+
+        telemetry.incr("llm_pool_worker_crashes", worker=worker.index)
+        # 재시작을 먼저 걸어 둠 (아래 재시도가 실패해도 풀이 계속 죽어 있지 않도록)
+        threading.Thread(target=self._restart, args=(worker,), name=f"llm-pool-restart-{worker.index}", daemon=True).start()
+
+        # 처리 중이던 요청은 다른 워커로 재시도, 못 하면 요청마다 예외로 끝냄
+        for future, kind, payload, options, attempt in orphaned:
+            if attempt >= MAX_RETRIES:
+                future.set_exception(WorkerCrashed(f"모델 워커 {worker.index}가 종료됐습니다."))
+                continue
+            try:
+                self._dispatch(future, kind, payload, options, attempt + 1)
+            except WorkerCrashed as e:
+                future.set_exception(e)
+
+    def _restart(self, worker: _Worker):
+        delay = RESTART_BACKOFF
+        while not self._closed:
+            worker.restarts += 1
+            try:
+                if worker.process is not None:
+                    worker.process.join(1)
+                self._start(worker)
+                return
+            except Exception as e:
+                # 시작 시간 초과뿐 아니라 OSError / 피클 오류 등도 계속 재시도
+                telemetry.incr("llm_pool_restart_failed", worker=worker.index, error=type(e).__name__)
+                time.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    # ------------------------------------------------------------
+    # 요청 분배
+    # ------------------------------------------------------------
+    def _pick(self) -> _Worker:
+        """대기 중인 요청이 가장 적은 살아 있는 워커 (같으면 돌아가며)."""
+        alive = [w for w in self.workers if w.alive]
+        if not alive:
+            raise WorkerCrashed("살아 있는 모델 워커가 없습니다.")
+        offset = next(self._rr)
+        n = len(alive)
+        return min(
+            (alive[(offset + i) % n] for i in range(n)),
+            key=lambda w: len(w.in_flight),
+        )
+
+    def _dispatch(self, future: Future, kind: str, payload, options: dict, attempt: int = 0):
+        request_id = next(self._ids)
+        with self._lock:
+            worker = self._pick()
+            worker.in_flight[request_id] = (future, kind, payload, dict(options), attempt)
+        try:
+            with worker.send_lock:
+                worker.conn.send((request_id, kind, payload, dict(options)))
+        except (OSError, ValueError, BrokenPipeError):
+            # 보내는 사이에 죽음 → 수신 스레드가 _on_crash에서 재시도 처리
+            pass
+        telemetry.incr("llm_pool_requests", worker=worker.index, kind=kind)
+
+    def submit(self, kind: str, payload, **options) -> Future:
+        future = Future()
+        self._dispatch(future, kind, payload, options)
+        return future
+
+    @staticmethod
+    def _wait(future: Future):
+        try:
+            return future.result(REQUEST_TIMEOUT)
+        except FutureTimeout:
+            raise PoolTimeout(f"모델 워커 응답이 {REQUEST_TIMEOUT:.0f}초 안에 오지 않았습니다.") from None
+
+    def complete(self, prompt: str, **kwargs) -> dict:
+        """model(prompt=...) 결과 딕셔너리."""
+        return self._wait(self.submit("complete", prompt, **kwargs))
+
+    def chat(self, messages: list, schema: dict = None, num_items: int = None, **kwargs) -> dict:
+        """model.create_chat_completion(...) 결과 딕셔너리 (schema는 워커에서 grammar로 변환)."""
+        return self._wait(self.submit("chat", messages, schema=schema, num_items=num_items, **kwargs))
+
+    # ------------------------------------------------------------
+    # 상태 / 종료
+    # ------------------------------------------------------------
+    def ping(self, timeout: float = 5.0) -> dict:
+        """워커마다 ping을 보내서 응답 시간(ms) 확인 (죽었거나 시간 초과면 None)."""
+        results = {}
+        for worker in self.workers:
+            if not worker.alive:
+                results[worker.index] = None
+                continue
+            future = Future()
+            request_id = next(self._ids)
+            with self._lock:
+                worker.in_flight[request_id] = (future, "ping", None, {}, MAX_RETRIES)
+            start = time.perf_counter()
+            try:
+                with worker.send_lock:
+                    worker.conn.send((request_id, "ping", None, {}))
+                future.result(timeout)
+                results[worker.index] = round((time.perf_counter() - start) * 1000, 1)
+            except Exception:
+                results[worker.index] = None
+        return results
+
+    def health(self) -> list:
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    "worker": w.index,
+                    "pid": w.pid,
+                    "alive": w.alive and w.process is not None and w.process.is_alive(),
+                    "cores": w.cores,
+                    "in_flight": len(w.in_flight),
+                    "served": w.served,
+                    "restarts": w.restarts,
+                    "uptime_s": round(now - w.started_at, 1) if w.alive else 0.0,
+                }
+                for w in self.workers
+            ]
+
+    def close(self):
+        self._closed = True
+        for worker in self.workers:
+            try:
+                with worker.send_lock:
+                    worker.conn.send(None)
+            except (OSError, ValueError, AttributeError):
+                pass
+        for worker in self.workers:
+            if worker.process is not None:
+                worker.process.join(5)
+                if worker.process.is_alive():
+                    worker.process.kill()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_model_pool(model_path: str, llama_kwargs: dict):
+    """LLM_POOL_WORKERS가 2 이상(또는 auto)이면 프로세스 전체에서 공유하는 풀, 아니면 None."""
+    global _pool
+    num_workers = planned_workers()
+    if num_workers < 2:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ModelPool(num_workers, model_path, llama_kwargs)
+    return _pool
@@ -0,0 +1,153 @@
+# streamlit_app/utils/model_profile.py
+"""
+CPU 추론 설정 프로필 (tools/tune_model.py가 만들고 llm.py가 시작할 때 읽음).
+
+프로필에는 어떤 하드웨어에서 측정했는지(fingerprint)가 같이 저장된다.
+fingerprint는 실제 하드웨어(CPU 모델, 논리 코어 수, 메모리)로만 만든다. 프로세스의 CPU affinity는
+넣지 않으므로 코어를 나눠 받은 워커(utils/model_pool.py)도 같은 프로필을 본다.
+CPU/메모리가 바뀌면 예전 프로필은 쓰지 않고 기본 설정으로 돌아간다.
+튜닝은 배포할 때 `python -m tools.tune_model --if-stale`로 돌리는 것이 기본이고,
+LLM_AUTOTUNE=1이면 import 시점이 아니라 모델을 처음 올릴 때(llm.py) autotune_if_stale()로 돌린다.
+"""
+
+import hashlib
+import json
+import os
+import platform
+import time
+
+from utils.storage import data_path
+
+PROFILE_PATH = os.getenv("LLM_PROFILE") or str(data_path("model_profile.json"))
+
+# llm.py 기본값 (프로필이 없을 때)
+DEFAULT_LLAMA_KWARGS = {
+    "n_ctx": 8192,
+    "n_gpu_layers": 0,
+    "n_batch": 512,
+}
+
+# 프로필에서 가져올 수 있는 Llama() 인자
+TUNABLE_KEYS = ("n_threads", "n_threads_batch", "n_batch", "n_ctx", "use_mmap", "use_mlock")
+
+# fingerprint에 넣는 하드웨어 정보 (usable_cpus는 affinity에 따라 프로세스마다 달라서 제외)
+FINGERPRINT_KEYS = ("cpu_model", "logical_cpus", "memory_gb", "machine", "system")
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def _total_memory_gb() -> float:
+    try:
+        return round(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024**3, 1)
+    except (AttributeError, ValueError, OSError):
+        return 0.0
+
+
+def _usable_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def hardware_info() -> dict:
+    return {
+        "cpu_model": _cpu_model(),
+        "logical_cpus": os.cpu_count() or 1,
+        "usable_cpus": _usable_cpus(),
+        "memory_gb": _total_memory_gb(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def hardware_fingerprint(info: dict = None) -> str:
+    info = info or hardware_info()
+    raw = json.dumps({k: info.get(k) for k in FINGERPRINT_KEYS}, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def read_profile(path: str = PROFILE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def is_stale(profile, fingerprint: str = None) -> bool:
+    """프로필이 없거나 다른 하드웨어에서 만들어졌으면 True."""
+    if not profile:
+        return True
+    return profile.get("fingerprint") != (fingerprint or hardware_fingerprint())
+
+
+def save_profile(model_path: str, llama_kwargs: dict, metrics: dict, path: str = PROFILE_PATH):
+    info = hardware_info()
+    profile = {
+        "version": 1,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "fingerprint": hardware_fingerprint(info),
+        "hardware": info,
+        "model_path": model_path,
+        "llama_kwargs": {k: v for k, v in llama_kwargs.items() if k in TUNABLE_KEYS},
+        "metrics": metrics,
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return profile
+
+
+def load_settings(default_model_path: str):
+    """
+    llm.py에서 사용할 (model_path, Llama kwargs) 결정.
+    우선순위: LLM_MODEL_PATH / LLM_N_THREADS 환경변수 > 현재 하드웨어용 프로필 > 기본값
+    """
+    kwargs = dict(DEFAULT_LLAMA_KWARGS)
+    model_path = default_model_path
+
+    profile = read_profile()
+    if profile and not is_stale(profile):
+        kwargs.update(profile.get("llama_kwargs", {}))
+        model_path = profile.get("model_path") or model_path
+    elif profile:
+        print("모델 설정 프로필이 다른 하드웨어용이라 기본 설정을 사용합니다. "
+              "(python -m tools.tune_model 로 다시 튜닝)")
+
+    # 여러 프로세스가 모델을 하나씩 올릴 때(tools/ingest_course.py) 코어를 나눠 쓰도록
+    if os.getenv("LLM_N_THREADS"):
+        kwargs["n_threads"] = kwargs["n_threads_batch"] = int(os.getenv("LLM_N_THREADS"))
+
+    model_path = os.getenv("LLM_MODEL_PATH") or model_path
+    return model_path, kwargs
+
+
+def autotune_if_stale() -> bool:
+    """
+    LLM_AUTOTUNE=1이고 현재 하드웨어용 프로필이 없으면 빠른 튜닝(tools/tune_model.py --quick) 실행.
+    모델을 처음 올리기 직전에 부르고 (import 시점 X), 여러 프로세스가 동시에 불러도
+    single-flight 파일 잠금으로 한 프로세스만 튜닝한다. 새 프로필이 생겼으면 True.
+    """
+    if os.getenv("LLM_AUTOTUNE") != "1" or not is_stale(read_profile()):
+        return False
+
+    from tools.tune_model import main as tune_main
+    from utils import singleflight
+
+    def tune():
+        print("현재 하드웨어용 모델 설정 프로필이 없어서 튜닝을 실행합니다...")
+        return tune_main(["--quick", "--if-stale"])
+
+    singleflight.do("autotune", hardware_fingerprint(), tune)
+    return not is_stale(read_profile())
@@ -0,0 +1,100 @@
+# streamlit_app/utils/quiz_board.py
+"""
+퀴즈 문제 전체를 컴포넌트 하나(HTML/JS, quiz_board_frontend/index.html)로 그리는 렌더러.
+
+예전 퀴즈 페이지는 문제마다 제목 markdown + 보기 버튼 4개 + 간격 div 4개 + expander를 만들고,
+답을 고르면 보기 박스 4개를 더 그린 뒤 st.rerun()으로 페이지 전체를 다시 실행했다.
+20문제면 클릭 한 번에 요소 100개 이상을 (그것도 두 번) 다시 보냄.
+
+여기서는
+  - 문제 목록을 컴포넌트 인자(JSON) 하나로 보내고, 보기 선택 / 정답 색 표시 / 해설 펼치기는 브라우저 안에서 처리
+    (보기를 누르면 그 문제 카드만 다시 칠함, 클릭 리스너는 문제 수와 관계없이 하나)
+  - 고른 답은 {"quiz_id", "answers": {문제 번호: 보기}} 값 하나로 돌려보냄 (클릭마다 지금까지 고른 답 전체)
+    → 서버는 QuizSession과 비교해서 새로 답한 문제만 기록 (이벤트 몇 개가 한 번에 합쳐져 와도 빠짐없음)
+  - 페이지에서는 st.fragment 안에서 부르므로 클릭하면 퀴즈 영역(진행률 + 컴포넌트)만 다시 실행
+  - 인자는 페이지 전체가 실행될 때 만든 값(board_args)을 fragment 재실행에서도 그대로 쓰므로
+    클릭해도 인자가 바뀌지 않음 (이미 화면에 있는 답은 브라우저 쪽 상태가 우선)
+
+환경변수:
+    APP_QUIZ_RENDERER=board    board / classic(문제마다 버튼 + 전체 rerun, 비교용)
+"""
+
+import os
+import threading
+from pathlib import Path
+
+RENDERER = os.getenv("APP_QUIZ_RENDERER", "board").lower()
+FRONTEND_DIR = Path(__file__).resolve().parent / "quiz_board_frontend"
+COMPONENT_NAME = "quiz_board"
+
+
+def board_args(quiz_session) -> dict:
+    """컴포넌트에 넘길 인자 (문제 목록 + 지금까지의 답). 화면에 필요한 필드만 남김."""
+    questions = []
+    for idx, quiz in enumerate(quiz_session.items):
+        options = quiz.get("options")
+        questions.append(
+            {
+                "question": str(quiz.get("question", "")),
+                "options": [str(o) for o in options] if isinstance(options, list) else [],
+                "answer": quiz_session.answer_key(idx),
+                "explanation": str(quiz.get("explanation") or ""),
+            }
+        )
+    return {
+        "quiz_id": quiz_session.quiz_id,
+        "questions": questions,
+        "answers": quiz_session.answers.tolist(),
+    }
+
+
+def new_answers(quiz_session, value) -> list:
+    """
+    컴포넌트가 돌려준 값에서 아직 기록하지 않은 (문제 번호, 보기) 목록 (문제 번호 순).
+    다른 퀴즈의 값이거나 범위를 벗어난 값은 무시한다.
+    """
+    if not isinstance(value, dict) or value.get("quiz_id") != quiz_session.quiz_id:
+        return []
+    answers = value.get("answers")
+    if not isinstance(answers, dict):
+        return []
+
+    fresh = []
+    for raw_idx, raw_choice in answers.items():
+        try:
+            idx, choice = int(raw_idx), int(raw_choice)
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= idx < quiz_session.num_questions or quiz_session.selected(idx) is not None:
+            continue
+        options = quiz_session.items[idx].get("options")
+        if isinstance(options, list) and 0 <= choice < len(options):
+            fresh.append((idx, choice))
+    fresh.sort()
+    return fresh
+
+
+# ============================================================
+# Streamlit 컴포넌트
+# ============================================================
+_component = None
+_component_lock = threading.Lock()
+
+
+def _get_component():
+    global _component
+    if _component is None:
+        with _component_lock:
+            if _component is None:
+                import streamlit.components.v1 as components
+
+                _component = components.declare_component(COMPONENT_NAME, path=str(FRONTEND_DIR))
+    return _component
+
+
+def quiz_board(args: dict, key: str):
+    """
+    퀴즈 컴포넌트를 그리고, 브라우저에서 돌려준 값(없으면 None)을 반환.
+    args는 board_args() 결과. 값은 new_answers()로 새로 답한 문제만 골라서 쓴다.
+    """
+    return _get_component()(quiz=args, key=key, default=None)
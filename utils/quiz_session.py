@@ -0,0 +1,246 @@
+# streamlit_app/utils/quiz_session.py
+"""
+퀴즈 풀이 상태 관리.
+
+예전에는 문제마다 `q{idx}_selected`, `q{idx}_is_correct` 키를 session_state에 흩어 두고,
+새 퀴즈가 만들어질 때마다 session_state 전체 키를 훑어서 지웠다.
+여기서는 퀴즈 1개 = QuizSession 1개로 묶어서
+  - 선택한 보기를 작은 배열(array)에 저장하고
+  - 정답 수를 답할 때마다 바로 갱신하고 (매 rerun마다 다시 세지 않음)
+  - 여러 퀴즈를 quiz_id별로 동시에 들고 있으면서 지난 기록(history)도 남긴다.
+초기화/채점은 모두 문제 수(O(questions))에만 비례한다.
+"""
+
+import hashlib
+import json
+import time
+from array import array
+from pathlib import Path
+
+UNANSWERED = -1  # 아직 고르지 않은 문제
+MAX_HISTORY = 20  # 최근 퀴즈 기록 보관 개수
+
+STORE_KEY = "quiz_store"  # st.session_state 안에서 사용하는 키
+
+
+def make_quiz_id(summary_text: str, num_questions: int = 5) -> str:
+    """요약 본문 + 문항 수로 퀴즈 ID 생성 (같은 요약이면 같은 ID)."""
+    raw = f"{num_questions}\n{summary_text}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def question_id(quiz: dict) -> str:
+    """문제 텍스트 + 보기로 문항 ID 생성 (퀴즈가 달라도 같은 문제면 같은 ID)."""
+    options = quiz.get("options") or []
+    raw = json.dumps(
+        [quiz.get("question", ""), [str(o) for o in options]],
+        ensure_ascii=False,
+    ).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+class QuizSession:
+    """퀴즈 1회분의 문제 목록 + 선택 상태 + 점수."""
+
+    def __init__(self, quiz_id: str, items: list, created_at: float = None):
+        self.quiz_id = quiz_id
+        self.items = list(items or [])
+        self.created_at = created_at or time.time()
+
+        n = len(self.items)
+        # 정답 인덱스 / 선택한 보기 인덱스를 1바이트 배열로 보관
+        self._answer_keys = array("b", (self._safe_answer(q) for q in self.items))
+        self.answers = array("b", [UNANSWERED] * n)
+        self.answered_at = [None] * n
+        self.correct_count = 0
+        self.answered_count = 0
+
+    @staticmethod
+    def _safe_answer(quiz: dict) -> int:
+        try:
+            idx = int(quiz.get("answer_index", 0))
+        except (TypeError, ValueError):
+            return 0
+        return idx if 0 <= idx < 127 else 0
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+    @property
+    def num_questions(self) -> int:
+        return len(self.items)
+
+    @property
+    def finished(self) -> bool:
+        return self.num_questions > 0 and self.answered_count == self.num_questions
+
+    @property
+    def score(self) -> float:
+        """정답률 (0.0 ~ 1.0)"""
+        if not self.items:
+            return 0.0
+        return self.correct_count / self.num_questions
+
+    def selected(self, idx: int):
+        """idx번(0부터) 문제에서 고른 보기. 아직 안 골랐으면 None."""
+        choice = self.answers[idx]
+        return None if choice == UNANSWERED else choice
+
+    def is_correct(self, idx: int) -> bool:
+        choice = self.answers[idx]
+        return choice != UNANSWERED and choice == self._answer_keys[idx]
+
+    def answer_key(self, idx: int) -> int:
+        """idx번 문제의 정답 보기 (채점에 쓰는 값)."""
+        return self._answer_keys[idx]
+
+    def question_ids(self) -> list:
+        return [question_id(q) for q in self.items]
+
+    # ------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------
+    def answer(self, idx: int, choice: int) -> bool:
+        """
+        idx번 문제에 choice 보기를 선택. 정답 여부를 반환.
+        이미 답한 문제는 첫 선택을 유지한다 (화면에서도 한 번만 고를 수 있음).
+        """
+        if self.answers[idx] != UNANSWERED:
+            return self.is_correct(idx)
+
+        self.answers[idx] = choice
+        self.answered_at[idx] = time.time()
+        self.answered_count += 1
+
+        correct = choice == self._answer_keys[idx]
+        if correct:
+            self.correct_count += 1
+        return correct
+
+    def reset(self):
+        """선택 상태만 초기화 (문제는 유지)."""
+        n = self.num_questions
+        self.answers = array("b", [UNANSWERED] * n)
+        self.answered_at = [None] * n
+        self.correct_count = 0
+        self.answered_count = 0
+
+    # ------------------------------------------------------------
+    # 저장 / 복원
+    # ------------------------------------------------------------
+    def to_dict(self) -> dict:
+        return {
+            "quiz_id": self.quiz_id,
+            "items": self.items,
+            "created_at": self.created_at,
+            "answers": self.answers.tolist(),
+            "answered_at": self.answered_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuizSession":
+        session = cls(data["quiz_id"], data.get("items", []), data.get("created_at"))
+        answered_at = data.get("answered_at") or []
+        for idx, choice in enumerate(data.get("answers", [])[: session.num_questions]):
+            if choice != UNANSWERED:
+                session.answer(idx, choice)
+                if idx < len(answered_at):
+                    session.answered_at[idx] = answered_at[idx]
+        return session
+
+    def summary(self) -> dict:
+        """기록(history) 목록에 보여줄 요약 정보."""
+        return {
+            "quiz_id": self.quiz_id,
+            "created_at": self.created_at,
+            "num_questions": self.num_questions,
+            "answered": self.answered_count,
+            "correct": self.correct_count,
+        }
+
+
+class QuizStore:
+    """한 사용자가 가진 퀴즈 세션들 (quiz_id → QuizSession) + 최근 기록."""
+
+    def __init__(self):
+        self.sessions = {}
+        self.active_id = None
+        self.history = []  # 오래된 것 → 최신 순서의 quiz_id
+
+    def start(self, quiz_id: str, items: list) -> QuizSession:
+        """새로 생성한 퀴즈로 세션 시작 (같은 ID가 있으면 교체)."""
+        session = QuizSession(quiz_id, items)
+        self.sessions[quiz_id] = session
+        self._touch(quiz_id)
+        return session
+
+    def get(self, quiz_id: str):
+        return self.sessions.get(quiz_id)
+
+    def activate(self, quiz_id: str):
+        session = self.sessions.get(quiz_id)
+        if session is not None:
+            self._touch(quiz_id)
+        return session
+
+    @property
+    def active(self):
+        if self.active_id is None:
+            return None
+        return self.sessions.get(self.active_id)
+
+    def recent(self) -> list:
+        """최근 퀴즈 기록 (최신 순)."""
+        return [self.sessions[qid].summary() for qid in reversed(self.history)]
+
+    def _touch(self, quiz_id: str):
+        self.active_id = quiz_id
+        if quiz_id in self.history:
+            self.history.remove(quiz_id)
+        self.history.append(quiz_id)
+
+        # 오래된 기록은 잘라냄
+        while len(self.history) > MAX_HISTORY:
+            old = self.history.pop(0)
+            self.sessions.pop(old, None)
+
+    # ------------------------------------------------------------
+    # 저장 / 복원
+    # ------------------------------------------------------------
+    def to_dict(self) -> dict:
+        return {
+            "active_id": self.active_id,
+            "history": list(self.history),
+            "sessions": [self.sessions[qid].to_dict() for qid in self.history],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuizStore":
+        store = cls()
+        for raw in data.get("sessions", []):
+            session = QuizSession.from_dict(raw)
+            store.sessions[session.quiz_id] = session
+        store.history = [qid for qid in data.get("history", []) if qid in store.sessions]
+        store.active_id = data.get("active_id")
+        return store
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path) -> "QuizStore":
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except FileNotFoundError:
+            return cls()
+
+
+def get_quiz_store(state) -> QuizStore:
+    """st.session_state(또는 dict)에서 QuizStore를 꺼내고, 없으면 새로 만든다."""
+    if STORE_KEY not in state:
+        state[STORE_KEY] = QuizStore()
+    return state[STORE_KEY]
@@ -0,0 +1,314 @@
+# streamlit_app/utils/quota_scheduler.py
+"""
+YouTube Data API 할당량(quota) 스케줄러.
+
+- 하루 할당량(기본 10,000 units)은 YouTube와 같이 태평양 시간 자정에 초기화되는 "할당량 날짜"별로
+  사용한 unit을 SQLite(DATA_DIR/youtube_quota.db)에 기록: 서버를 다시 띄워도, 워커 프로세스가 여러 개여도
+  같은 하루 사용량을 함께 봄 (확인 + 기록은 BEGIN IMMEDIATE 트랜잭션 하나로)
+- 사용자가 직접 누른 검색(INTERACTIVE)이 미리 불러오기(PREFETCH)보다 우선:
+  PREFETCH는 할당량에 여유(reserve)가 있을 때만 허용
+- 여러 세션이 동시에 요청한 videos().list 조회를 짧은 시간(window) 동안 모아서
+  한 번에 최대 50개 ID로 합쳐 보냄 (호출 1번 = 1 unit)
+- 기능(feature)별로 사용한 unit을 집계 (같은 테이블, 오늘 할당량 날짜 기준)
+
+환경변수:
+    YOUTUBE_DAILY_QUOTA=10000                  하루 할당량 (units)
+    YOUTUBE_QUOTA_TZ=America/Los_Angeles       할당량 날짜를 나누는 시간대 (UTC 등으로 변경 가능)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+
+from utils import telemetry
+from utils.cache import TTLCache
+from utils.content_cache import get_content_cache
+from utils.resilience import UpstreamError
+from utils.storage import connect
+
+DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+QUOTA_TZ = os.getenv("YOUTUBE_QUOTA_TZ", "America/Los_Angeles")
+PREFETCH_RESERVE = 0.3  # 할당량이 30% 이하로 남으면 PREFETCH 중단
+KEEP_DAYS = 35  # 이보다 오래된 날짜의 사용 기록은 정리
+DB_FILE = "youtube_quota.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_usage (
+    day     TEXT NOT NULL,
+    feature TEXT NOT NULL,
+    units   REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, feature)
+) WITHOUT ROWID;
+"""
+
+SEARCH_COST = 100  # search().list
+VIDEOS_COST = 1  # videos().list
+PLAYLIST_ITEMS_COST = 1  # playlistItems().list (페이지당)
+MAX_IDS_PER_CALL = 50  # videos().list id 파라미터 최대 개수
+BATCH_WINDOW = float(os.getenv("YOUTUBE_BATCH_WINDOW", "0.03"))  # 초
+
+INTERACTIVE = 0
+PREFETCH = 1
+
+
+class QuotaExceededError(RuntimeError):
+    """할당량이 부족해서 요청을 보내지 않음."""
+
+
+class TokenBucket:
+    """capacity만큼 담기고, 하루(86400초)에 capacity만큼 다시 채워지는 버킷."""
+
+    def __init__(self, capacity: float, refill_per_sec: float = None):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec if refill_per_sec is not None else capacity / 86400
+        self._level = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.refill_per_sec)
+        self._updated = now
+
+    @property
+    def level(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._level
+
+    def try_take(self, units: float, keep: float = 0.0) -> bool:
+        """units를 꺼냄. 꺼낸 뒤에도 keep 이상 남아야 성공."""
+        with self._lock:
+            self._refill()
+            if self._level - units < keep:
+                return False
+            self._level -= units
+            return True
+
+
+def _quota_zone():
+    try:
+        from zoneinfo import ZoneInfo
+
+        return ZoneInfo(QUOTA_TZ)
+    except Exception:
+        return timezone(timedelta(hours=-8))  # tzdata가 없는 Windows 등: 태평양 표준시
+
+
+class DailyQuota:
+    """
+    할당량 날짜별로 사용한 unit을 SQLite에 쌓는 하루 할당량.
+    같은 DB 파일을 쓰는 모든 프로세스가 한 할당량을 나눠 쓴다.
+    """
+
+    def __init__(self, capacity: float, filename: str = DB_FILE):
+        self.capacity = capacity
+        self._zone = _quota_zone()
+        self._lock = threading.Lock()
+        self._conn = connect(filename)
+        self._conn.executescript(SCHEMA)
+        self._pruned_day = None
+
+    def today(self) -> str:
+        return datetime.now(self._zone).date().isoformat()
+
+    def _spent_locked(self, day: str) -> float:
+        row = self._conn.execute("SELECT COALESCE(SUM(units), 0) FROM quota_usage WHERE day = ?", (day,)).fetchone()
+        return row[0]
+
+    @property
+    def level(self) -> float:
+        """오늘 남은 unit."""
+        with self._lock:
+            return self.capacity - self._spent_locked(self.today())
+
+    def try_take(self, units: float, keep: float = 0.0, feature: str = "") -> bool:
+        """units를 feature 몫으로 씀. 쓴 뒤에도 keep 이상 남아야 성공."""
+        day = self.today()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")  # 다른 프로세스와 확인 + 기록이 섞이지 않도록
+            try:
+                if self.capacity - self._spent_locked(day) - units < keep:
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._conn.execute(
+                    "INSERT INTO quota_usage (day, feature, units) VALUES (?, ?, ?) "
+                    "ON CONFLICT (day, feature) DO UPDATE SET units = units + excluded.units",
+                    (day, feature, units),
+                )
+                if self._pruned_day != day:
+                    cutoff = (datetime.fromisoformat(day) - timedelta(days=KEEP_DAYS)).date().isoformat()
+                    self._conn.execute("DELETE FROM quota_usage WHERE day < ?", (cutoff,))
+                    self._pruned_day = day
+                self._conn.execute("COMMIT")
+                return True
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def usage(self, day: str = None) -> dict:
+        """feature → 그날 사용한 unit (기본: 오늘)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT feature, units FROM quota_usage WHERE day = ?", (day or self.today(),)
+            ).fetchall()
+        return dict(rows)
+
+
+class QuotaScheduler:
+    def __init__(self, daily_quota: int = DAILY_QUOTA, window: float = BATCH_WINDOW):
+        self.quota = DailyQuota(daily_quota)
+        self.window = window
+
+        # videos().list 결과 캐시 (통계는 자주 안 바뀜)
+        self.video_cache = TTLCache("youtube_videos", ttl=3600, max_items=20000)
+
+        # 모아서 보낼 ID들
+        self._pending = {}  # video_id -> Future
+        self._pending_fetch = None  # 이번 묶음을 보낼 함수
+        self._pending_meta = {}  # video_id -> [(feature, priority), ...] → 묶음별 우선순위 / unit 배분용
+        self._timer = None
+        self._batch_lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # 할당량
+    # ------------------------------------------------------------
+    def try_acquire(
+        self, units: int, feature: str, priority: int = INTERACTIVE, method: str = ""
+    ) -> bool:
+        keep = self.quota.capacity * PREFETCH_RESERVE if priority == PREFETCH else 0.0
+        if not self.quota.try_take(units, keep=keep, feature=feature):
+            telemetry.incr("youtube_quota_denied", feature=feature)
+            return False
+        telemetry.incr("youtube_quota_units", units, feature=feature, method=method)
+        return True
+
+    def acquire(
+        self, units: int, feature: str, priority: int = INTERACTIVE, method: str = ""
+    ):
+        if not self.try_acquire(units, feature, priority, method):
+            raise QuotaExceededError(
+                f"YouTube API 할당량이 부족합니다 (필요 {units} units, 남은 {self.quota.level:.0f})."
+            )
+
+    def remaining(self) -> float:
+        return self.quota.level
+
+    def budget_ok(self, units: int, priority: int = PREFETCH) -> bool:
+        """실제로 쓰지 않고 여유만 확인 (미리 불러오기 여부 판단용)."""
+        keep = self.quota.capacity * PREFETCH_RESERVE if priority == PREFETCH else 0.0
+        return self.quota.level - units >= keep
+
+    def usage_report(self) -> dict:
+        """오늘(할당량 날짜) 기능별 사용 unit + 남은 할당량 (모든 프로세스 합계)."""
+        day = self.quota.today()
+        usage = self.quota.usage(day)
+        total = sum(usage.values())
+        return {
+            "day": day,
+            "by_feature": usage,
+            "total": total,
+            "remaining": round(self.quota.capacity - total, 1),
+            "capacity": self.quota.capacity,
+        }
+
+    # ------------------------------------------------------------
+    # videos().list 묶어서 보내기
+    # ------------------------------------------------------------
+    def fetch_videos(
+        self, video_ids: list, fetch_fn, feature: str, priority: int = INTERACTIVE
+    ) -> dict:
+        """
+        video_id → videos().list item 딕셔너리 반환.
+        fetch_fn(ids) 는 실제 API를 호출해서 item 목록을 돌려주는 함수.
+        캐시에 있는 ID는 바로 쓰고, 없는 ID만 다른 요청들과 합쳐서 조회한다.
+        할당량이 없으면 만료된 캐시 값이라도 사용한다.
+        """
+        result = {}
+        waits = {}
+        with self._batch_lock:
+            for vid in video_ids:
+                item = self.video_cache.get(vid)
+                if item is not None:
+                    result[vid] = item
+                    continue
+                fut = self._pending.get(vid)
+                if fut is None:
+                    fut = self._pending[vid] = Future()
+                waits[vid] = fut
+                self._pending_meta.setdefault(vid, []).append((feature, priority))
+
+            if waits:
+                self._pending_fetch = fetch_fn
+                if len(self._pending) >= MAX_IDS_PER_CALL:
+                    flush_now = True
+                else:
+                    flush_now = False
+                    if self._timer is None:
+                        self._timer = threading.Timer(self.window, self._flush)
+                        self._timer.daemon = True
+                        self._timer.start()
+            else:
+                flush_now = False
+
+        if flush_now:
+            self._flush()
+
+        for vid, fut in waits.items():
+            try:
+                item = fut.result()
+            except (QuotaExceededError, UpstreamError):
+                # 할당량 부족 / YouTube 장애 → 만료된 캐시 또는 미리 받아 둔 정보(tools/ingest_course.py)
+                item = self.video_cache.get(vid, allow_stale=True)
+                if item is None:
+                    item = get_content_cache().get_videos([vid]).get(vid)
+            if item is not None:
+                result[vid] = item
+        return result
+
+    def _flush(self):
+        while True:
+            with self._batch_lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._pending:
+                    return
+                ids = list(self._pending)[:MAX_IDS_PER_CALL]
+                futures = {vid: self._pending.pop(vid) for vid in ids}
+                fetch_fn = self._pending_fetch
+                meta = [m for vid in ids for m in self._pending_meta.pop(vid, ())]
+
+            # 이 묶음의 ID를 요청한 것 중 INTERACTIVE가 하나라도 있으면 INTERACTIVE로 취급하고,
+            # unit은 가장 급한 요청의 기능 몫으로 기록
+            feature, priority = min(meta, key=lambda m: m[1], default=("videos", INTERACTIVE))
+            try:
+                self.acquire(VIDEOS_COST, feature, priority, method="videos.list")
+                telemetry.incr("youtube_batched_ids", len(ids))
+                items = fetch_fn(ids)
+            except Exception as e:
+                for fut in futures.values():
+                    fut.set_exception(e)
+                continue
+
+            by_id = {item.get("id"): item for item in items}
+            for vid, fut in futures.items():
+                item = by_id.get(vid)
+                if item is not None:
+                    self.video_cache.set(vid, item)
+                fut.set_result(item)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_quota_scheduler() -> QuotaScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = QuotaScheduler()
+    return _scheduler
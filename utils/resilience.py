@@ -0,0 +1,307 @@
+# streamlit_app/utils/resilience.py
+"""
+외부 호출 정책 (YouTube Data API, 자막 API): 마감 시간, 재시도, 헤징, 서킷 브레이커.
+
+예전에는 라이브러리 기본 타임아웃(사실상 없음)으로 호출해서, YouTube 응답 하나가 느리면
+Streamlit 스크립트 스레드가 그대로 멈춰 있었다. 여기서는 서비스별 정책(POLICIES)에 따라:
+
+- 마감 시간: 호출은 별도 스레드(upstream-*)에서 실행하고, 호출한 쪽은 시도당 attempt_timeout,
+  전체 timeout까지만 기다린다 (넘으면 UpstreamTimeout, 늦게 끝난 호출 결과는 버림)
+- 재시도: 지수 백오프 + 전체 지터 (0 ~ min(max_backoff, backoff × 2^n) 사이 무작위 대기)
+  4xx 응답(408/429 제외), 자막 없음 같은 '다시 해도 같은' 오류는 재시도하지 않음
+- 헤징: hedge_after초 안에 응답이 없으면 같은 요청을 하나 더 보내고 먼저 온 응답 사용
+  (자막 다운로드처럼 가끔 한 번씩 아주 느린 호출의 꼬리 지연을 자름)
+- 서킷 브레이커: 연속 failure_threshold번 실패하면 reset_after초 동안 호출하지 않고 바로 실패
+  (호출한 쪽이 준 fallback이 있으면 캐시된 결과를 대신 반환), 그 뒤 1번 시험 호출로 복구 확인
+
+환경변수:
+    APP_NET_TIMEOUT_SCALE=1.0   모든 마감 시간 / 헤징 대기 시간에 곱하는 배율
+    APP_NET_SOCKET_TIMEOUT=15   HTTP 소켓 타임아웃 (초, 늦게 끝난 호출 스레드가 계속 남지 않도록)
+"""
+
+import contextvars
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils import telemetry, transport
+
+TIMEOUT_SCALE = float(os.getenv("APP_NET_TIMEOUT_SCALE", "1.0"))
+SOCKET_TIMEOUT = float(os.getenv("APP_NET_SOCKET_TIMEOUT", "15"))
+MAX_THREADS = 32
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class UpstreamError(RuntimeError):
+    """외부 서비스 호출 실패 (재시도까지 모두 실패)."""
+
+
+class UpstreamTimeout(UpstreamError, TimeoutError):
+    """마감 시간 안에 응답이 없음."""
+
+
+class CircuitOpen(UpstreamError):
+    """최근 실패가 많아서 잠시 호출을 멈춘 상태."""
+
+
+# 재시도해도 결과가 같은 오류 (카세트 재생 오류는 기록된 그대로 다시 나옴)
+FATAL_ERRORS = (transport.CassetteMiss, transport.ReplayedError, ValueError, KeyError, TypeError)
+
+
+class Policy:
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        attempt_timeout: float = 5.0,
+        attempts: int = 3,
+        backoff: float = 0.2,
+        max_backoff: float = 2.0,
+        hedge_after: float = None,
+        hedges: int = 1,
+        failure_threshold: int = 5,
+        reset_after: float = 30.0,
+        fatal=(),
+    ):
+        self.timeout = timeout
+        self.attempt_timeout = attempt_timeout
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_after = hedge_after
+        self.hedges = hedges
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.fatal = fatal  # 예외 타입 튜플 또는 exc → bool 함수
+
+
+POLICIES = {
+    # search.list는 시도마다 할당량 100 units를 쓰므로 재시도는 1번만
+    "youtube.search": Policy(timeout=10, attempt_timeout=5, attempts=2),
+    "youtube.videos": Policy(timeout=8, attempt_timeout=4, attempts=3),
+    # 일괄 처리(tools/ingest_course.py)용이라 조금 더 기다려도 됨
+    "youtube.playlistItems": Policy(timeout=30, attempt_timeout=10, attempts=4),
+    # 자막 없음(TranscriptUnavailable)은 LookupError → 재시도하지 않음
+    "transcript": Policy(
+        timeout=25, attempt_timeout=12, attempts=2, hedge_after=3.0, fatal=(LookupError,)
+    ),
+}
+DEFAULT_POLICY = Policy()
+
+
+def get_policy(service: str) -> Policy:
+    return POLICIES.get(service, DEFAULT_POLICY)
+
+
+# ================================================================
+# 서킷 브레이커
+# ================================================================
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_after: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.state = CLOSED
+        self.failures = 0  # 연속 실패 수
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_after:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                # 시험 호출은 하나만
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                telemetry.incr("upstream_circuit", service=self.name, state=CLOSED)
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                    telemetry.incr("upstream_circuit", service=self.name, state=OPEN)
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probing = False
+
+    def is_open(self) -> bool:
+        """지금 호출하면 바로 거절되는 상태 (reset_after가 지났으면 시험 호출 가능 → False)."""
+        return self.state == OPEN and time.monotonic() - self.opened_at < self.reset_after
+
+    def stats(self) -> dict:
+        return {"state": self.state, "failures": self.failures, "trips": self.trips}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(service: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(service)
+        if breaker is None:
+            policy = get_policy(service)
+            breaker = _breakers[service] = CircuitBreaker(
+                service, policy.failure_threshold, policy.reset_after
+            )
+        return breaker
+
+
+def breaker_stats() -> dict:
+    with _breakers_lock:
+        return {name: b.stats() for name, b in _breakers.items()}
+
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+
+# ================================================================
+# 호출
+# ================================================================
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_THREADS, thread_name_prefix="upstream")
+    return _executor
+
+
+def _http_status(exc) -> int:
+    """googleapiclient HttpError(resp.status) / requests 계열(response.status_code)의 HTTP 상태 코드."""
+    resp = getattr(exc, "resp", None)
+    status = getattr(resp, "status", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    try:
+        return int(status) if status is not None else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def is_retryable(exc: BaseException, policy: Policy) -> bool:
+    fatal = policy.fatal
+    if isinstance(fatal, tuple):
+        if fatal and isinstance(exc, fatal):
+            return False
+    elif fatal(exc):
+        return False
+    if isinstance(exc, FATAL_ERRORS):
+        return False
+    status = _http_status(exc)
+    return not (400 <= status < 500 and status not in (408, 429))
+
+
+def _attempt(service: str, fn, policy: Policy, deadline: float):
+    """fn을 1번 시도 (느리면 헤징). 시도 마감 시간을 넘기면 UpstreamTimeout."""
+    start = time.monotonic()
+    budget = min(policy.attempt_timeout * TIMEOUT_SCALE, deadline - start)
+    if budget <= 0:
+        raise UpstreamTimeout(f"{service}: 응답 대기 시간을 모두 썼습니다.")
+    end = start + budget
+    hedge_at = start + policy.hedge_after * TIMEOUT_SCALE if policy.hedge_after else None
+    executor = _get_executor()
+
+    pending = {executor.submit(contextvars.copy_context().run, fn)}
+    hedged = 0
+    error = None
+    while pending:
+        now = time.monotonic()
+        if now >= end:
+            telemetry.incr("upstream", service=service, result="timeout")
+            raise UpstreamTimeout(f"{service}: {budget:.1f}초 안에 응답이 없습니다.")
+        can_hedge = hedge_at is not None and hedged < policy.hedges
+        wait_until = min(end, hedge_at) if can_hedge else end
+        done, pending = wait(pending, timeout=max(0.0, wait_until - now), return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if hedged:
+                    telemetry.incr("upstream", service=service, result="hedged")
+                return future.result()
+            error = future.exception()
+        if can_hedge and pending and time.monotonic() >= hedge_at:
+            # 첫 요청이 아직 안 끝남 → 같은 요청을 하나 더 보내고 먼저 오는 쪽 사용
+            hedged += 1
+            hedge_at = time.monotonic() + policy.hedge_after * TIMEOUT_SCALE
+            pending.add(executor.submit(contextvars.copy_context().run, fn))
+            telemetry.incr("upstream", service=service, result="hedge")
+    raise error
+
+
+def call(service: str, fn, fallback=None, before_retry=None):
+    """
+    fn()을 service 정책대로 호출.
+    fallback(): 모두 실패했거나 서킷이 열려 있을 때 대신 돌려줄 값 (캐시 등, 없으면 None 반환)
+    before_retry(): 재시도 직전에 호출, False면 재시도하지 않음 (할당량 확인 등)
+    재시도할 수 없는 오류(is_retryable)는 그대로 다시 던지고, 나머지는 UpstreamError로 바꿔서 던진다.
+    """
+    policy = get_policy(service)
+    breaker = get_breaker(service)
+
+    def fail(exc: UpstreamError):
+        value = fallback() if fallback is not None else None
+        if value is not None:
+            telemetry.incr("upstream", service=service, result="fallback")
+            return value
+        raise exc
+
+    if not breaker.allow():
+        telemetry.incr("upstream", service=service, result="circuit_open")
+        return fail(CircuitOpen(f"{service}: 최근 오류가 많아 잠시 호출을 멈췄습니다. 잠시 후 다시 시도해 주세요."))
+
+    deadline = time.monotonic() + policy.timeout * TIMEOUT_SCALE
+    last = None
+    for attempt in range(policy.attempts):
+        try:
+            result = _attempt(service, fn, policy, deadline)
+        except Exception as e:
+            if not is_retryable(e, policy):
+                # 서비스는 정상적으로 응답함 (자막 없음, 잘못된 요청 ...)
+                breaker.record_success()
+                raise
+            last = e
+            breaker.record_failure()
+            remaining = deadline - time.monotonic()
+            if attempt + 1 >= policy.attempts or remaining <= 0 or breaker.is_open():
+                break
+            delay = random.uniform(0, min(policy.max_backoff, policy.backoff * 2**attempt))
+            if delay >= remaining or (before_retry is not None and not before_retry()):
+                break
+            telemetry.incr("upstream", service=service, result="retry")
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        telemetry.incr("upstream", service=service, result="ok")
+        return result
+
+    if isinstance(last, UpstreamError):
+        return fail(last)
+    error = UpstreamError(f"{service} 호출 실패: {type(last).__name__}: {last}")
+    error.__cause__ = last
+    return fail(error)
@@ -0,0 +1,242 @@
+# streamlit_app/utils/review_scheduler.py
+"""
+퀴즈 결과 기반 복습 스케줄러 (SM-2 간격 반복).
+
+- 문항마다 카드(review_cards) 하나: ease / interval / 다음 복습일(due)
+- 퀴즈를 풀 때마다 카드 갱신 → 틀리거나 오래 걸린 문제는 빨리 다시 나옴
+- 날짜별 복습 목록은 due 인덱스를 한 번 훑어서 학생 전체를 한꺼번에 계산
+- 시간표의 공강 교시에 맞춰 체크리스트 항목으로 만들어 준다
+"""
+
+import heapq
+import threading
+from datetime import date, timedelta
+
+from utils.storage import connect
+from utils.timetable_data import DAYS, semester_entries, free_periods
+
+DB_FILE = "reviews.db"
+
+MIN_EASE = 1.3
+DEFAULT_EASE = 2.5
+SLOW_ANSWER_MS = 30_000  # 이보다 오래 걸리면 '어렵게 맞힘'으로 취급
+DAILY_LIMIT = 5  # 하루 복습 문항 수
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS review_cards (
+    student_id    TEXT    NOT NULL,
+    question_id   TEXT    NOT NULL,
+    course        TEXT    NOT NULL DEFAULT '',
+    week          TEXT    NOT NULL DEFAULT '',
+    question      TEXT    NOT NULL DEFAULT '',
+    ease          REAL    NOT NULL,
+    interval_days INTEGER NOT NULL,
+    repetitions   INTEGER NOT NULL,
+    lapses        INTEGER NOT NULL DEFAULT 0,
+    due           TEXT    NOT NULL,
+    PRIMARY KEY (student_id, question_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_review_due ON review_cards (due, student_id);
+"""
+
+
+def answer_quality(correct: bool, latency_ms: int = 0) -> int:
+    """정답 여부 + 풀이 시간 → SM-2 품질 점수 (0~5)."""
+    if not correct:
+        return 2
+    return 4 if latency_ms > SLOW_ANSWER_MS else 5
+
+
+def sm2_next(ease: float, interval_days: int, repetitions: int, quality: int):
+    """SM-2 다음 상태 계산. (ease, interval_days, repetitions) 반환."""
+    if quality < 3:
+        # 틀림: 처음부터 다시, 내일 복습
+        return max(MIN_EASE, ease - 0.2), 1, 0
+
+    if repetitions == 0:
+        interval_days = 1
+    elif repetitions == 1:
+        interval_days = 6
+    else:
+        interval_days = round(interval_days * ease)
+
+    ease = ease + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return max(MIN_EASE, ease), interval_days, repetitions + 1
+
+
+def _priority(card: dict, day: date) -> tuple:
+    """복습 우선순위 (작을수록 먼저): 많이 밀린 카드 → 어려운(ease 낮은) 카드."""
+    overdue = (day - date.fromisoformat(card["due"])).days
+    return (-overdue, card["ease"], -card["lapses"])
+
+
+class ReviewScheduler:
+    def __init__(self, filename: str = DB_FILE):
+        self._lock = threading.Lock()
+        self._conn = connect(filename)
+        self._conn.executescript(SCHEMA)
+
+    # ------------------------------------------------------------
+    # 카드 갱신
+    # ------------------------------------------------------------
+    def record_result(
+        self,
+        student_id: str,
+        question_id: str,
+        correct: bool,
+        latency_ms: int = 0,
+        course: str = "",
+        week: str = "",
+        question: str = "",
+        today: date = None,
+    ) -> dict:
+        """퀴즈 풀이 결과로 카드 상태 갱신. 갱신된 카드를 반환."""
+        today = today or date.today()
+        quality = answer_quality(correct, latency_ms)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT ease, interval_days, repetitions, lapses FROM review_cards "
+                "WHERE student_id = ? AND question_id = ?",
+                (student_id, question_id),
+            ).fetchone()
+            ease, interval_days, repetitions, lapses = row or (DEFAULT_EASE, 0, 0, 0)
+
+            ease, interval_days, repetitions = sm2_next(
+                ease, interval_days, repetitions, quality
+            )
+            if quality < 3:
+                lapses += 1
+            due = (today + timedelta(days=interval_days)).isoformat()
+
+            self._conn.execute(
+                "INSERT INTO review_cards (student_id, question_id, course, week, "
+                "question, ease, interval_days, repetitions, lapses, due) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (student_id, question_id) DO UPDATE SET "
+                "ease = excluded.ease, interval_days = excluded.interval_days, "
+                "repetitions = excluded.repetitions, lapses = excluded.lapses, "
+                "due = excluded.due",
+                (
+                    student_id, question_id, course, week, question,
+                    ease, interval_days, repetitions, lapses, due,
+                ),
+            )
+
+        return {
+            "question_id": question_id,
+            "ease": ease,
+            "interval_days": interval_days,
+            "repetitions": repetitions,
+            "lapses": lapses,
+            "due": due,
+        }
+
+    # ------------------------------------------------------------
+    # 복습 목록
+    # ------------------------------------------------------------
+    def _rows(self, sql: str, params) -> list:
+        with self._lock:
+            cur = self._conn.execute(sql, params)
+            cols = [c[0] for c in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    def due_cards(self, student_id: str, day: date = None, limit: int = DAILY_LIMIT) -> list:
+        """학생 1명의 해당 날짜 복습 카드 (우선순위 순)."""
+        day = day or date.today()
+        cards = self._rows(
+            "SELECT * FROM review_cards WHERE student_id = ? AND due <= ?",
+            (student_id, day.isoformat()),
+        )
+        return heapq.nsmallest(limit, cards, key=lambda c: _priority(c, day))
+
+    def daily_review_sets(self, day: date = None, limit: int = DAILY_LIMIT) -> dict:
+        """
+        모든 학생의 해당 날짜 복습 목록을 한 번에 계산.
+        due 인덱스를 한 번만 훑고, 학생별 상위 limit개는 윈도 함수로 자른다.
+        반환: {student_id: [card, ...]}
+        """
+        day = day or date.today()
+        rows = self._rows(
+            "SELECT * FROM ("
+            "  SELECT *, ROW_NUMBER() OVER ("
+            "    PARTITION BY student_id ORDER BY due ASC, ease ASC, lapses DESC"
+            "  ) AS rn FROM review_cards WHERE due <= ?"
+            ") WHERE rn <= ? ORDER BY student_id, rn",
+            (day.isoformat(), limit),
+        )
+        sets = {}
+        for row in rows:
+            row.pop("rn", None)
+            sets.setdefault(row["student_id"], []).append(row)
+        return sets
+
+
+# ================================================================
+# 체크리스트 연동
+# ================================================================
+def plan_review_rows(cards: list, semester_key: str, day: date, owner: str = "") -> list:
+    """
+    복습 카드를 그날 공강 교시에 배치해서 체크리스트 행으로 만든다.
+    같은 과목 수업이 있는 날이면 그 수업 직후의 공강을 우선 사용.
+    owner: 가져온 시간표를 찾을 사용자 (student_id).
+    """
+    if not cards:
+        return []
+
+    weekday = day.weekday()
+    if weekday >= len(DAYS):
+        # 주말: 교시 구분 없이 목록만
+        return [_review_row(card, "주말") for card in cards]
+
+    day_name = DAYS[weekday]
+    free = free_periods(semester_key, day_name, owner)
+    if not free:
+        return [_review_row(card, "수업 후") for card in cards]
+
+    # 과목별 마지막 수업 교시
+    last_class = {}
+    for item in semester_entries(semester_key, owner):
+        if item["day"] == day_name:
+            last_class[item["subject"]] = max(
+                last_class.get(item["subject"], 0), item["period"]
+            )
+
+    rows = []
+    slot = 0
+    for card in cards:
+        after = last_class.get(card.get("course"))
+        period = None
+        if after is not None:
+            period = next((p for p in free if p > after), None)
+        if period is None:
+            period = free[slot % len(free)]
+            slot += 1
+        rows.append(_review_row(card, f"{period}교시 공강"))
+    return rows
+
+
+def _review_row(card: dict, when: str) -> dict:
+    course = card.get("course") or ""
+    week = card.get("week") or ""
+    where = " ".join(x for x in (course, week) if x)
+    question = (card.get("question") or "").strip()
+    if len(question) > 40:
+        question = question[:40] + "…"
+
+    text = f"🔁 복습({when}) {where}: {question}" if where else f"🔁 복습({when}) {question}"
+    return {"text": text, "done": False, "review_qid": card["question_id"]}
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_review_scheduler() -> ReviewScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = ReviewScheduler()
+    return _scheduler
@@ -0,0 +1,366 @@
+# streamlit_app/utils/search_index.py
+"""
+내 학습 자료 검색 (자막 / AI 요약 / 학습 메모 / 저장한 영상 제목).
+
+SQLite FTS5 역색인을 사용한다. 한국어는 띄어쓰기 단위가 '부분적분을' 처럼 조사까지 붙어 있어서
+단어 그대로 색인하면 '적분'으로 찾을 수 없으므로, 한글 어절은 글자 2-gram(bigram)으로 쪼개서 색인한다.
+  '부분적분을' → '부분 분적 적분 분을'
+검색어도 같은 방식으로 쪼갠 뒤 구(phrase) 검색을 하므로 글자가 이어져 있는 문서만 찾는다.
+
+- 자막은 CHUNK_SECONDS 단위로 나눠서 색인 → 검색 결과에 영상 시간(mm:ss) 표시
+- 저장할 때마다 해당 문서만 지우고 다시 넣음 (증분 갱신)
+- 자막/요약은 모든 사용자 공용, 메모/저장한 영상은 owner(student_id)별
+"""
+
+import queue
+import re
+import threading
+import time
+
+from utils import telemetry
+from utils.storage import connect
+
+DB_FILE = "search.db"
+CHUNK_SECONDS = 30.0
+# 너무 흔한 검색어('적분')는 일치 문서 전체에 점수를 매기면 느려지므로,
+# 조건에 맞는 최근 공용 문서 MAX_RANKED개 안에서만 순위를 매긴다 (rowid가 클수록 최근, 내 문서는 항상 포함)
+MAX_RANKED = 4000
+
+KIND_LABELS = {
+    "transcript": "자막",
+    "summary": "AI 요약",
+    "memo": "학습 메모",
+    "saved": "저장한 영상",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id          INTEGER PRIMARY KEY,
+    doc_key     TEXT    NOT NULL UNIQUE,
+    kind        TEXT    NOT NULL,
+    owner       TEXT    NOT NULL DEFAULT '',   -- '' = 공용
+    video_id    TEXT    NOT NULL DEFAULT '',
+    title       TEXT    NOT NULL DEFAULT '',
+    body        TEXT    NOT NULL DEFAULT '',
+    start       REAL,                          -- 자막 조각 시작 시간(초)
+    updated_at  REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_video ON docs (video_id, kind);
+CREATE INDEX IF NOT EXISTS docs_owner ON docs (owner, kind);
+
+-- rowid = docs.id, 글자 2-gram으로 바꾼 텍스트를 색인
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title_terms, body_terms, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_WORD = re.compile(r"\w+")
+_CJK = re.compile(r"[぀-ヿ㐀-鿿가-힣]")
+
+
+def to_terms(text: str) -> list:
+    """색인/검색용 토큰 목록. 한글(CJK) 어절은 글자 2-gram, 나머지는 단어 그대로."""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        if len(word) > 1 and _CJK.search(word):
+            terms.extend(word[i : i + 2] for i in range(len(word) - 1))
+        else:
+            terms.append(word)
+    return terms
+
+
+def build_match(query: str) -> str:
+    """검색어 → FTS5 MATCH 식. 어절마다 2-gram 구(phrase)를 만들고 모두 포함(AND)."""
+    phrases = []
+    for word in _WORD.findall(query.lower()):
+        terms = to_terms(word)
+        if len(word) == 1 and _CJK.search(word):
+            continue  # 한 글자 한글은 2-gram 색인으로 찾을 수 없음 (LIKE로 대체)
+        phrases.append('"' + " ".join(t.replace('"', '""') for t in terms) + '"')
+    return " ".join(phrases)
+
+
+def format_time(seconds: float) -> str:
+    seconds = int(seconds or 0)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+def make_snippet(body: str, query: str, width: int = 120) -> str:
+    """검색어가 처음 나오는 위치 주변 텍스트 (검색어는 **굵게**)."""
+    words = [w for w in _WORD.findall(query.lower()) if w]
+    lower = body.lower()
+    positions = [(lower.find(w), w) for w in words if lower.find(w) >= 0]
+    if not positions:
+        return body[:width] + ("…" if len(body) > width else "")
+    pos, word = min(positions)
+    start = max(0, pos - width // 3)
+    end = min(len(body), start + width)
+    snippet = body[start:end]
+    rel = pos - start
+    snippet = snippet[:rel] + "**" + snippet[rel : rel + len(word)] + "**" + snippet[rel + len(word) :]
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(body) else "")
+
+
+def _contains_any(text: str, query: str) -> bool:
+    lower = text.lower()
+    return any(w in lower for w in _WORD.findall(query.lower()))
+
+
+def chunk_segments(segments: list, seconds: float = CHUNK_SECONDS) -> list:
+    """[(start, text), ...] 자막 줄 → 약 seconds초 단위 [(start, text)] 묶음."""
+    chunks = []
+    cur_start, cur = None, []
+    for start, text in segments:
+        if cur and start - cur_start >= seconds:
+            chunks.append((cur_start, " ".join(cur)))
+            cur_start, cur = None, []
+        if cur_start is None:
+            cur_start = start
+        cur.append(text)
+    if cur:
+        chunks.append((cur_start, " ".join(cur)))
+    return chunks
+
+
+class SearchIndex:
+    def __init__(self, filename: str = DB_FILE):
+        self._lock = threading.Lock()
+        self._conn = connect(filename)
+        self._conn.executescript(SCHEMA)
+        # 자막 색인은 수십 개 문서를 쓰므로 요청 스레드를 막지 않게 백그라운드에서 처리
+        self._jobs = queue.Queue()
+        self._worker = None
+
+    def submit(self, fn, *args):
+        """색인 작업을 백그라운드 스레드에 맡김."""
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run_jobs, name="search-indexer", daemon=True
+                    )
+                    self._worker.start()
+        self._jobs.put((fn, args))
+
+    def _run_jobs(self):
+        while True:
+            fn, args = self._jobs.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                telemetry.incr("search_index_errors", error=type(e).__name__)
+            finally:
+                self._jobs.task_done()
+
+    def flush(self):
+        """대기 중인 색인 작업이 끝날 때까지 기다림 (일괄 처리 스크립트 종료 전)."""
+        self._jobs.join()
+
+    # ------------------------------------------------------------
+    # 색인 (증분)
+    # ------------------------------------------------------------
+    def _delete_ids(self, ids: list):
+        self._conn.executemany("DELETE FROM docs_fts WHERE rowid = ?", [(i,) for i in ids])
+        self._conn.executemany("DELETE FROM docs WHERE id = ?", [(i,) for i in ids])
+
+    def _insert(self, doc_key, kind, owner, video_id, title, body, start, now):
+        cur = self._conn.execute(
+            "INSERT INTO docs (doc_key, kind, owner, video_id, title, body, start, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (doc_key, kind, owner, video_id, title, body, start, now),
+        )
+        self._conn.execute(
+            "INSERT INTO docs_fts (rowid, title_terms, body_terms) VALUES (?, ?, ?)",
+            (cur.lastrowid, " ".join(to_terms(title)), " ".join(to_terms(body))),
+        )
+
+    def upsert(
+        self,
+        doc_key: str,
+        kind: str,
+        body: str,
+        title: str = "",
+        owner: str = "",
+        video_id: str = "",
+        start: float = None,
+    ):
+        """문서 1개 추가/교체. 내용이 비어 있으면 삭제."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM docs WHERE doc_key = ?", (doc_key,)
+                ).fetchone()
+                if row:
+                    self._delete_ids([row[0]])
+                if body.strip() or title.strip():
+                    self._insert(doc_key, kind, owner, video_id, title, body, start, time.time())
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        telemetry.incr("search_index_updates", kind=kind)
+
+    def delete(self, doc_key: str):
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM docs WHERE doc_key = ?", (doc_key,)).fetchone()
+            if row:
+                self._conn.execute("BEGIN")
+                self._delete_ids([row[0]])
+                self._conn.execute("COMMIT")
+
+    def index_transcript(self, video_id: str, segments: list, title: str = ""):
+        """자막 줄 [(start, text)]을 시간 구간별 문서로 색인 (이전 자막은 교체)."""
+        now = time.time()
+        chunks = chunk_segments(segments)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                old = self._conn.execute(
+                    "SELECT id FROM docs WHERE video_id = ? AND kind = 'transcript'", (video_id,)
+                ).fetchall()
+                self._delete_ids([r[0] for r in old])
+                for i, (start, text) in enumerate(chunks):
+                    self._insert(
+                        f"transcript:{video_id}:{i}", "transcript", "", video_id,
+                        title, text, start, now,
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        telemetry.incr("search_index_updates", len(chunks), kind="transcript")
+
+    def index_summary(self, video_id: str, summary: str, title: str = ""):
+        self.upsert(f"summary:{video_id}", "summary", summary, title=title, video_id=video_id)
+
+    def index_memo(self, owner: str, memo: str):
+        self.upsert(f"memo:{owner}", "memo", memo, title="학습 메모", owner=owner)
+
+    def index_saved_video(self, owner: str, video: dict):
+        self.upsert(
+            f"saved:{owner}:{video['video_id']}",
+            "saved",
+            video.get("channel_title") or "",
+            title=video.get("title") or "",
+            owner=owner,
+            video_id=video["video_id"],
+        )
+
+    def remove_saved_video(self, owner: str, video_id: str):
+        self.delete(f"saved:{owner}:{video_id}")
+
+    def set_video_title(self, video_id: str, title: str):
+        """제목 없이 색인된 자막/요약에 영상 제목 채우기."""
+        if not title:
+            return
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, body FROM docs WHERE video_id = ? AND title = '' AND owner = ''",
+                (video_id,),
+            ).fetchall()
+            if not rows:
+                return
+            terms = " ".join(to_terms(title))
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "UPDATE docs SET title = ? WHERE id = ?", [(title, r[0]) for r in rows]
+            )
+            self._conn.executemany(
+                "UPDATE docs_fts SET title_terms = ? WHERE rowid = ?", [(terms, r[0]) for r in rows]
+            )
+            self._conn.execute("COMMIT")
+
+    # ------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------
+    def search(self, query: str, owner: str = "", kinds: list = None, limit: int = 20) -> list:
+        """
+        순위가 매겨진 검색 결과 목록.
+        [{"kind", "video_id", "title", "snippet", "start", "time", "url", "score"}, ...]
+        """
+        query = (query or "").strip()
+        if not query:
+            return []
+
+        with telemetry.span("search.query", kinds=",".join(kinds or [])) as sp:
+            filters = ["d.owner IN ('', ?)"]
+            params = [owner]
+            if kinds:
+                filters.append(f"d.kind IN ({','.join('?' * len(kinds))})")
+                params.extend(kinds)
+
+            match = build_match(query)
+            with self._lock:
+                if match:
+                    # 순위 상한은 조건(kind)에 맞는 공용 문서에만 적용: 내 메모 / 저장한 영상은
+                    # 공용 자막이 아무리 많이 쌓여도 항상 순위 후보에 들어감
+                    public = ["d.owner = ''", *filters[1:]]
+                    bound = self._conn.execute(
+                        "SELECT docs_fts.rowid FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid "
+                        f"WHERE docs_fts MATCH ? AND {' AND '.join(public)} "
+                        "ORDER BY docs_fts.rowid DESC LIMIT 1 OFFSET ?",
+                        [match, *params[1:], MAX_RANKED - 1],
+                    ).fetchone()
+                    rows = self._conn.execute(
+                        "SELECT d.kind, d.video_id, d.title, d.body, d.start, "
+                        "bm25(docs_fts, 3.0, 1.0) AS score "
+                        "FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid "
+                        f"WHERE docs_fts MATCH ? AND {' AND '.join(filters)} "
+                        "AND (docs_fts.rowid >= ? OR d.owner <> '') "
+                        "ORDER BY score LIMIT ?",
+                        [match, *params, bound[0] if bound else 0, limit],
+                    ).fetchall()
+                else:
+                    # 한 글자 검색어: 색인 없이 LIKE (느리지만 드묾)
+                    like = f"%{query}%"
+                    rows = self._conn.execute(
+                        "SELECT d.kind, d.video_id, d.title, d.body, d.start, 0.0 AS score "
+                        "FROM docs d WHERE (d.title LIKE ? OR d.body LIKE ?) "
+                        f"AND {' AND '.join(filters)} ORDER BY d.updated_at DESC LIMIT ?",
+                        [like, like, *params, limit],
+                    ).fetchall()
+            sp.set(hits=len(rows))
+
+        hits = []
+        for kind, video_id, title, body, start, score in rows:
+            url = f"https://www.youtube.com/watch?v={video_id}" if video_id else ""
+            if url and start is not None:
+                url += f"&t={int(start)}s"
+            hits.append(
+                {
+                    "kind": kind,
+                    "video_id": video_id,
+                    "title": title,
+                    "snippet": make_snippet(body if _contains_any(body, query) else title, query),
+                    "start": start,
+                    "time": format_time(start) if start is not None else "",
+                    "url": url,
+                    "score": round(-score, 6),
+                }
+            )
+        return hits
+
+    def counts(self) -> dict:
+        with self._lock:
+            return dict(self._conn.execute("SELECT kind, COUNT(*) FROM docs GROUP BY kind").fetchall())
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SearchIndex()
+    return _index
+
+
+def search(query: str, owner: str = "", kinds: list = None, limit: int = 20) -> list:
+    """사이드바 등에서 바로 쓰는 검색 함수."""
+    return get_search_index().search(query, owner, kinds, limit)
@@ -0,0 +1,326 @@
+# streamlit_app/utils/singleflight.py
+"""
+같은 입력으로 동시에 들어온 작업을 한 번만 실행하고 결과를 나눠 갖는 single-flight.
+
+교수님이 영상 링크를 올리면 수십 명이 동시에 같은 영상을 열어서
+자막 추출 / 요약 / 퀴즈 생성이 같은 입력으로 N번 돌게 된다.
+- 같은 프로세스 안(Streamlit 세션들): 첫 호출만 실행, 나머지는 끝날 때까지 기다렸다가 같은 결과(또는 같은 예외)를 받음
+- 여러 워커 프로세스 사이: 키별 파일 잠금으로 한 프로세스만 실행하고,
+  결과를 잠깐(RESULT_TTL) 파일로 남겨서 기다리던 다른 프로세스가 가져감
+- unshared에 준 예외(속도 제한처럼 실행한 사용자에게만 해당하는 오류)는 리더에게만 올리고,
+  기다리던 쪽은 다시 시도한다 (결과 파일에도 남기지 않음)
+- 정리: 백그라운드 스레드가 SWEEP_INTERVAL마다 만료된 결과 파일을 지우고,
+  잠금 파일은 아무도 잡고 있지 않을 때(잠금을 바로 얻었을 때)만 잡은 채로 지운다.
+  잠금을 얻은 쪽은 파일이 그 사이 지워지지 않았는지(inode 비교) 확인하고 아니면 다시 열어서
+  지워진 파일을 잡고 있는 프로세스와 새 파일을 잡은 프로세스가 동시에 실행되는 일이 없음
+
+환경변수:
+    APP_SINGLEFLIGHT_PROCESSES=0   프로세스 간 조정 끄기 (기본: 켜짐)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+
+from utils import telemetry
+from utils.storage import data_path
+
+RESULT_TTL = 120.0  # 성공 결과를 다른 프로세스가 가져갈 수 있게 남겨 두는 시간 (초)
+ERROR_TTL = 5.0  # 실패 결과는 짧게만 공유 (일시적 오류가 계속 남지 않도록)
+SWEEP_INTERVAL = 300.0  # 결과/잠금 파일 정리 주기 (초)
+LOCK_IDLE = 600.0  # 이 시간 동안 쓰이지 않은 잠금 파일만 정리 대상
+
+CROSS_PROCESS = os.getenv("APP_SINGLEFLIGHT_PROCESSES", "1") == "1"
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK은 10초 정도 재시도 후 실패하므로 계속 기다림
+                continue
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _try_lock_file(f) -> bool:
+        # Windows는 열려 있는 파일을 지울 수 없어서 잠금 파일은 정리하지 않음
+        return False
+
+else:
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _try_lock_file(f) -> bool:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+
+def make_key(*parts) -> str:
+    """입력값들을 정규화해서 키 문자열(sha256)로 만든다."""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class Group:
+    """프로세스 안의 single-flight 그룹 (namespace 하나당 하나)."""
+
+    def __init__(self, namespace: str, cross_process: bool = CROSS_PROCESS):
+        self.namespace = namespace
+        self.cross_process = cross_process
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, key: str, fn, unshared: tuple = ()):
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is not None:
+                    call.waiters += 1
+                    self.followers += 1
+                    leader = False
+                else:
+                    call = self._calls[key] = _Call()
+                    self.leaders += 1
+                    leader = True
+
+            if leader:
+                break
+            telemetry.incr("singleflight_shared", namespace=self.namespace)
+            call.done.wait()
+            if call.error is None:
+                return call.result
+            if not isinstance(call.error, unshared):
+                raise call.error
+            # 리더 사정으로 실패 (속도 제한 등) → 직접 다시 시도
+            telemetry.incr("singleflight_retry", namespace=self.namespace)
+
+        try:
+            if self.cross_process:
+                call.result = _run_with_file_lock(self.namespace, key, fn, unshared)
+            else:
+                call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict:
+        return {"leaders": self.leaders, "followers": self.followers}
+
+
+# ================================================================
+# 프로세스 간 조정 (파일 잠금 + 결과 파일)
+# ================================================================
+def _paths(namespace: str, key: str):
+    base = data_path("singleflight", namespace, key[:2], key)
+    return base.with_suffix(".lock"), base.with_suffix(".result")
+
+
+def _read_result(path, now: float, remove_expired: bool = False):
+    """
+    남아 있는 결과 파일이 유효하면 ('ok'|'error', 값) 반환, 아니면 None.
+    remove_expired: 만료된 파일을 지움 (잠금을 잡고 읽을 때만. 잠금 없이 지우면 방금 쓴 결과를 지울 수 있음)
+    """
+    try:
+        with open(path, "rb") as f:
+            status, expires_at, value = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+    if expires_at < now:
+        if remove_expired:
+            _unlink(path)
+        return None
+    return status, value
+
+
+def _unlink(path):
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def _write_result(path, status: str, value, ttl: float):
+    tmp = path.with_suffix(f".tmp{os.getpid()}.{threading.get_ident()}")
+    try:
+        payload = pickle.dumps((status, time.time() + ttl, value))
+    except Exception:
+        # 피클할 수 없는 예외/결과 → 문자열로 대체
+        payload = pickle.dumps((status, time.time() + ttl, RuntimeError(str(value))))
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def _open_locked(lock_path):
+    """잠금 파일을 열고 잠금. 잠금을 기다리는 동안 정리(sweep)로 지워졌으면 새 파일로 다시."""
+    while True:
+        lock_file = open(lock_path, "a+b")
+        _lock_file(lock_file)
+        try:
+            if os.name == "nt" or os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino:
+                return lock_file
+        except FileNotFoundError:
+            pass
+        _unlock_file(lock_file)
+        lock_file.close()
+
+
+def _run_with_file_lock(namespace: str, key: str, fn, unshared: tuple = ()):
+    _start_sweeper()
+    lock_path, result_path = _paths(namespace, key)
+
+    cached = _read_result(result_path, time.time())
+    if cached is None:
+        with _open_locked(lock_path) as lock_file:
+            try:
+                # 잠금을 기다리는 동안 다른 프로세스가 끝냈을 수 있음
+                cached = _read_result(result_path, time.time(), remove_expired=True)
+                if cached is None:
+                    try:
+                        value = fn()
+                    except Exception as e:
+                        if not isinstance(e, unshared):
+                            _write_result(result_path, "error", e, ERROR_TTL)
+                        raise
+                    _write_result(result_path, "ok", value, RESULT_TTL)
+                    return value
+            finally:
+                _unlock_file(lock_file)
+
+    telemetry.incr("singleflight_shared_process", namespace=namespace)
+    status, value = cached
+    if status == "error":
+        raise value
+    return value
+
+
+def _remove_idle_lock(path) -> bool:
+    """아무도 잡고 있지 않은 잠금 파일만, 잠금을 잡은 채로 지움."""
+    try:
+        lock_file = open(path, "a+b")
+    except OSError:
+        return False
+    with lock_file:
+        if not _try_lock_file(lock_file):
+            return False
+        try:
+            # 잠금을 얻기 전에 다른 정리가 지우고 새 파일이 생겼으면 그 파일은 건드리지 않음
+            if os.stat(path).st_ino != os.fstat(lock_file.fileno()).st_ino:
+                return False
+            path.unlink()
+            return True
+        except OSError:
+            return False
+        finally:
+            _unlock_file(lock_file)
+
+
+def cleanup(now: float = None) -> dict:
+    """
+    만료된 결과 파일 / 남은 임시 파일 / 쓰이지 않는 잠금 파일 정리.
+    결과 파일의 만료 시각은 쓴 시각 + RESULT_TTL을 넘지 않으므로 mtime으로 판단.
+    """
+    now = time.time() if now is None else now
+    root = data_path("singleflight", "_").parent
+    removed = {"results": 0, "locks": 0}
+    for path in root.rglob("*"):
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            continue
+        if not path.is_file():
+            continue
+        if path.suffix == ".result" or ".tmp" in path.suffix:
+            if mtime + RESULT_TTL < now:
+                _unlink(path)
+                removed["results"] += 1
+        elif path.suffix == ".lock" and mtime + LOCK_IDLE < now:
+            removed["locks"] += _remove_idle_lock(path)
+    if removed["results"] or removed["locks"]:
+        telemetry.incr("singleflight_files_removed", removed["results"], kind="result")
+        telemetry.incr("singleflight_files_removed", removed["locks"], kind="lock")
+    return removed
+
+
+_sweeper = None
+_sweeper_lock = threading.Lock()
+
+
+def _sweep_loop():
+    while True:
+        try:
+            cleanup()
+        except Exception:
+            # 정리 실패로 작업이 막히면 안 됨 (다음 주기에 다시)
+            pass
+        time.sleep(SWEEP_INTERVAL)
+
+
+def _start_sweeper():
+    """프로세스 간 조정을 처음 쓸 때 정리 스레드 시작 (프로세스당 하나)."""
+    global _sweeper
+    if _sweeper is None:
+        with _sweeper_lock:
+            if _sweeper is None:
+                _sweeper = threading.Thread(target=_sweep_loop, name="singleflight-sweep", daemon=True)
+                _sweeper.start()
+
+
+# ================================================================
+# 그룹 레지스트리
+# ================================================================
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def group(namespace: str) -> Group:
+    with _groups_lock:
+        g = _groups.get(namespace)
+        if g is None:
+            g = _groups[namespace] = Group(namespace)
+        return g
+
+
+def do(namespace: str, key: str, fn, unshared: tuple = ()):
+    """singleflight.do("summary", make_key(prompt), lambda: ...)"""
+    return group(namespace).do(key, fn, unshared)
+
+
+def stats() -> dict:
+    with _groups_lock:
+        return {name: g.stats() for name, g in _groups.items()}
@@ -0,0 +1,124 @@
+# streamlit_app/utils/speculative.py
+"""
+추측 디코딩(speculative decoding)용 초안(draft) 모델.
+
+CPU에서는 2.1B 모델이 토큰을 하나씩 만드는 decode 단계가 가장 오래 걸린다.
+초안 모델이 다음 토큰 몇 개를 먼저 제안하면, 본 모델은 그 토큰들을 한 번의 배치로
+평가해서 맞는 앞부분만 받아들인다. 출력은 본 모델 혼자 만든 것과 같다.
+JSON Schema(grammar) 제약도 본 모델 샘플링 단계에서 그대로 적용되므로 generate_quiz에도 쓸 수 있다.
+
+초안 방식 (환경변수 LLM_SPECULATIVE):
+    lookup   프롬프트(자막/요약) 안의 n-gram을 찾아 이어지는 토큰을 제안 (추가 모델 없음)
+    draft    작은 GGUF 모델(LLM_DRAFT_MODEL)로 제안. 본 모델과 토크나이저(어휘)가 같아야 함
+    (비어 있음) 사용 안 함
+
+기타 환경변수:
+    LLM_DRAFT_TOKENS   한 번에 제안할 토큰 수 (기본 10)
+    LLM_DRAFT_NGRAM    lookup 방식의 최대 n-gram 크기 (기본 2)
+"""
+
+import os
+import threading
+
+from utils import telemetry
+
+MODE = os.getenv("LLM_SPECULATIVE", "").strip().lower()
+DRAFT_MODEL_PATH = os.getenv("LLM_DRAFT_MODEL", "")
+NUM_PRED_TOKENS = int(os.getenv("LLM_DRAFT_TOKENS", "10"))
+MAX_NGRAM_SIZE = int(os.getenv("LLM_DRAFT_NGRAM", "2"))
+
+
+class GGUFDraftModel:
+    """작은 GGUF 모델로 greedy하게 num_pred_tokens개를 제안."""
+
+    def __init__(self, model_path: str, num_pred_tokens: int = NUM_PRED_TOKENS, **llama_kwargs):
+        from llama_cpp import Llama
+
+        self.num_pred_tokens = num_pred_tokens
+        self.model = Llama(model_path=model_path, verbose=False, **llama_kwargs)
+
+    def __call__(self, input_ids, /, **kwargs):
+        import numpy as np
+
+        draft = []
+        # generate()는 이전 호출과 겹치는 앞부분의 KV 캐시를 재사용함
+        for token in self.model.generate(input_ids.tolist(), temp=0.0):
+            draft.append(token)
+            if len(draft) >= self.num_pred_tokens:
+                break
+        return np.array(draft, dtype=np.intc)
+
+
+class TrackingDraftModel:
+    """
+    초안 모델을 감싸서 수락률(acceptance rate)을 잰다.
+
+    다음 호출 때 들어오는 input_ids는 본 모델이 실제로 받아들인 토큰까지 포함하므로,
+    지난번 제안과 새로 붙은 토큰의 공통 앞부분 길이 = 수락된 토큰 수.
+    """
+
+    def __init__(self, inner, name: str):
+        self.inner = inner
+        self.name = name
+        self.proposed = 0
+        self.accepted = 0
+        self._prev_len = 0
+        self._prev_draft = None
+        self._prev_last = None
+        self._lock = threading.Lock()
+
+    def __call__(self, input_ids, /, **kwargs):
+        with self._lock:
+            self._settle(input_ids)
+            draft = self.inner(input_ids, **kwargs)
+            self._prev_len = len(input_ids)
+            self._prev_last = int(input_ids[-1]) if len(input_ids) else None
+            self._prev_draft = draft.tolist()
+            self.proposed += len(draft)
+        telemetry.incr("llm_draft_proposed", len(draft), mode=self.name)
+        return draft
+
+    def _settle(self, input_ids):
+        draft = self._prev_draft
+        self._prev_draft = None
+        if not draft or len(input_ids) <= self._prev_len:
+            return
+        # 다른 요청(새 프롬프트)으로 넘어갔으면 지난 제안은 집계하지 않음
+        if int(input_ids[self._prev_len - 1]) != self._prev_last:
+            return
+        new_tokens = input_ids[self._prev_len : self._prev_len + len(draft)].tolist()
+        n = 0
+        for proposed, actual in zip(draft, new_tokens):
+            if proposed != actual:
+                break
+            n += 1
+        self.accepted += n
+        telemetry.incr("llm_draft_accepted", n, mode=self.name)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.name,
+                "proposed": self.proposed,
+                "accepted": self.accepted,
+                "acceptance_rate": round(self.accepted / self.proposed, 4) if self.proposed else 0.0,
+            }
+
+
+def make_draft_model(mode: str = MODE, draft_model_path: str = DRAFT_MODEL_PATH, **llama_kwargs):
+    """설정에 맞는 draft_model 객체 (사용 안 하면 None)."""
+    if not mode:
+        return None
+    if mode == "lookup":
+        from llama_cpp.llama_speculative import LlamaPromptLookupDecoding
+
+        inner = LlamaPromptLookupDecoding(
+            max_ngram_size=MAX_NGRAM_SIZE, num_pred_tokens=NUM_PRED_TOKENS
+        )
+    elif mode == "draft":
+        if not draft_model_path:
+            raise ValueError("LLM_SPECULATIVE=draft 에는 LLM_DRAFT_MODEL 경로가 필요합니다.")
+        inner = GGUFDraftModel(draft_model_path, **llama_kwargs)
+    else:
+        raise ValueError(f"알 수 없는 LLM_SPECULATIVE 값: {mode}")
+    return TrackingDraftModel(inner, mode)
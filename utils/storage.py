@@ -0,0 +1,99 @@
+# streamlit_app/utils/storage.py
+"""
+로컬 저장소 공통 설정 (SQLite 파일 위치, 사용자 식별자).
+
+로그인이 없으므로 사용자는 주소의 ?sid= 토큰(무작위 32자리)으로 구분한다.
+처음 열면 토큰을 발급해서 주소에 붙이고, 같은 주소(새로고침 / 북마크)로 다시 열면 같은 사용자로 본다.
+토큰 없이 기본 주소로 열면 새 사용자가 된다.
+- 저장에 쓰는 사용자 ID는 토큰의 해시 (student_id_for): DB나 화면에 ID가 보여도 토큰은 알 수 없음
+- 화면(진단 페이지 등)에는 사용자 ID도 그대로 보이지 않고 public_id()로 한 번 더 해시한 값만 보여 줌
+토큰이 든 주소는 비밀 링크와 같으므로 다른 사람과 공유하지 않는다.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import uuid
+from pathlib import Path
+
+# 앱 데이터 폴더 (기본: 프로젝트 루트/data, APP_DATA_DIR로 변경 가능)
+DATA_DIR = Path(
+    os.getenv("APP_DATA_DIR", Path(__file__).resolve().parent.parent / "data")
+)
+
+
+def data_path(*parts) -> Path:
+    """DATA_DIR 아래 경로를 돌려주고, 상위 폴더가 없으면 만든다."""
+    path = DATA_DIR.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def connect(filename: str) -> sqlite3.Connection:
+    """
+    DATA_DIR 아래 SQLite DB 연결.
+    Streamlit은 여러 스레드에서 스크립트를 돌리므로 check_same_thread=False로 열고,
+    호출하는 쪽에서 Lock으로 감싸서 사용한다.
+    """
+    conn = sqlite3.connect(
+        data_path(filename) if filename != ":memory:" else filename,
+        check_same_thread=False,
+        isolation_level=None,  # 트랜잭션은 BEGIN/COMMIT으로 직접 관리
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+# ================================================================
+# 사용자 / 세션 식별자
+# ================================================================
+STUDENT_PARAM = "sid"  # 사용자 토큰을 담는 주소 쿼리 파라미터
+_TOKEN_RE = re.compile(r"[0-9a-f]{32}")
+
+
+def _query_params():
+    """지금 실행 중인 Streamlit 스크립트의 st.query_params (스크립트 밖이면 None)."""
+    try:
+        import streamlit as st
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    return st.query_params if get_script_run_ctx() is not None else None
+
+
+def student_id_for(token: str) -> str:
+    """주소 토큰 → 저장용 사용자 ID (단방향 해시)."""
+    return hashlib.sha256(f"student:{token}".encode("utf-8")).hexdigest()[:16]
+
+
+def public_id(user_id: str) -> str:
+    """화면에 보여 줄 사용자 구분 값 (사용자 ID를 다시 해시한 8자리)."""
+    return hashlib.sha256(f"public:{user_id}".encode("utf-8")).hexdigest()[:8]
+
+
+def get_student_id(state) -> str:
+    """
+    사용자 ID. 메모 / 체크리스트 / 풀이 기록 / 복습 카드는 이 ID로 저장한다.
+    세션에 없으면 주소의 ?sid= 토큰에서 만들고, 토큰이 없거나 형식이 틀리면 새 토큰을 발급한다.
+    페이지를 옮기면 쿼리 파라미터가 지워지므로 부를 때마다 주소에 다시 붙여 둔다.
+    """
+    token = state.get("student_token")
+    params = _query_params()
+    if token is None:
+        token = params.get(STUDENT_PARAM) if params is not None else None
+        if not token or not _TOKEN_RE.fullmatch(token):
+            token = uuid.uuid4().hex
+        state["student_token"] = token
+        state["student_id"] = student_id_for(token)
+    if params is not None and params.get(STUDENT_PARAM) != token:
+        params[STUDENT_PARAM] = token
+    return state["student_id"]
+
+
+def get_session_id(state) -> str:
+    """브라우저 탭(세션)마다 다른 ID. 같은 사용자가 탭을 여러 개 열어도 서로 구분된다."""
+    if "session_id" not in state:
+        state["session_id"] = uuid.uuid4().hex[:16]
+    return state["session_id"]
@@ -0,0 +1,285 @@
+# streamlit_app/utils/suggest.py
+"""
+검색어 추천 (입력한 앞부분으로 이어질 검색어 제안) + 추천 1순위 검색 결과 미리 불러오기.
+
+사이드바 검색은 '검색'을 누를 때마다 search().list 100 units를 쓴다.
+자주 찾는 검색어 / 강의계획서 주차 / 저장한 영상 제목을 미리 정렬해 두고 입력한 앞부분으로 추천하면
+사용자들이 같은 검색어를 고르게 되어 검색 캐시(utils/youtube_api2.SEARCH_CACHE)에서 바로 결과가 나온다.
+
+- 색인: (단어 시작 위치부터의 접미 문자열, 항목 번호)를 정렬한 배열 두 개 → bisect로 접두어 범위를 찾음.
+  트라이 대신 정렬 배열을 쓴 이유: 파이썬에서는 노드 객체 수십만 개보다 리스트 두 개가 훨씬 작고 빠름.
+  '편도함수'처럼 검색어 중간 단어부터 입력해도 찾을 수 있게 단어마다 접미 문자열을 넣는다.
+- 입력 중인 마지막 글자가 자음뿐이면(예: '미ㅂ') 다음 글자의 초성으로 비교
+- 순위: 검색 횟수 + 기본 가중치(강의계획서, 저장한 영상), 검색어 맨 앞부터 맞으면 PREFIX_BONUS배
+- 검색 기록은 SQLite(data/suggest.db)에 검색어별 횟수만 저장, 새 기록은 REBUILD_INTERVAL 안에
+  백그라운드에서 색인을 다시 만들어 반영 (추천 요청은 그동안 이전 색인 사용)
+- 미리 불러오기: 추천 1순위가 캐시에 없고 할당량 여유가 있으면(PREFETCH 우선순위, budget_ok)
+  백그라운드에서 검색해서 캐시를 채워 둠
+
+환경변수:
+    APP_SUGGEST_PREFETCH=1   0이면 미리 불러오기 끔
+"""
+
+import bisect
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import telemetry
+from utils.storage import connect
+from utils.timetable_data import SYLLABUS_MAP, syllabus_weeks, week_query
+
+PREFETCH_ENABLED = os.getenv("APP_SUGGEST_PREFETCH", "1") == "1"
+SEARCH_MAX_RESULTS = 10  # 사이드바 검색과 같은 값이어야 같은 캐시 키가 됨
+REBUILD_INTERVAL = 2.0  # 초
+MAX_LOGGED = 20000  # 불러올 검색 기록 수 (횟수 많은 순)
+SCAN_LIMIT = 20000  # 접두어 범위가 아주 넓을 때(한두 글자) 살펴볼 최대 개수
+SYLLABUS_WEIGHT = 2.0
+SAVED_WEIGHT = 3.0
+PREFIX_BONUS = 2.0
+PREFETCH_MIN_SCORE = 2.0  # 이보다 약한 1순위는 미리 불러오지 않음 (한 번 검색된 검색어 등)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_log (
+    query      TEXT PRIMARY KEY,     -- 정규화한 검색어 (소문자, 공백 하나)
+    display    TEXT NOT NULL,        -- 마지막으로 입력한 원래 모양
+    count      INTEGER NOT NULL,
+    last_used  REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+
+
+def normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def _initial(ch: str) -> str:
+    """한글 음절의 초성 (음절이 아니면 글자 그대로)."""
+    code = ord(ch) - 0xAC00
+    if 0 <= code < 11172:
+        return _CHOSEONG[code // 588]
+    return ch
+
+
+def _word_starts(norm: str) -> list:
+    return [0] + [i + 1 for i, ch in enumerate(norm) if ch == " "]
+
+
+def _matches(norm: str, prefix: str, initial: str, starts=None) -> bool:
+    """norm의 어느 단어부터든(starts) prefix(+ 초성)로 시작하면 True."""
+    for start in starts if starts is not None else _word_starts(norm):
+        if norm.startswith(prefix, start):
+            if not initial:
+                return True
+            nxt = norm[start + len(prefix) : start + len(prefix) + 1]
+            if nxt and _initial(nxt) == initial:
+                return True
+    return False
+
+
+class Suggester:
+    def __init__(self, filename: str = "suggest.db"):
+        self._lock = threading.Lock()
+        self._conn = connect(filename)
+        self._conn.executescript(SCHEMA)
+
+        self._log = {}  # normalized -> [display, count]
+        for query, display, count in self._conn.execute(
+            "SELECT query, display, count FROM query_log ORDER BY count DESC LIMIT ?", (MAX_LOGGED,)
+        ):
+            self._log[query] = [display, count]
+
+        # 강의계획서 주차 검색어 (시간표 페이지 버튼과 같은 검색어) + 과목명
+        self._static = {}  # normalized -> (display, weight, source)
+        for subject in SYLLABUS_MAP:
+            self._static[normalize(subject)] = (subject, SYLLABUS_WEIGHT, "syllabus")
+            for wk, goal, content in syllabus_weeks(subject):
+                query = week_query(subject, wk, goal, content)
+                self._static[normalize(query)] = (query, SYLLABUS_WEIGHT, "syllabus")
+
+        self._index = ([], [], [])  # (정렬된 접미 문자열, 항목 번호, 항목 목록)
+        self._dirty = False
+        self._rebuilding = False
+        self._built_at = 0.0
+        self.build_ms = 0.0
+
+        self._prefetching = set()
+        self._executor = None
+        self.prefetched = 0
+        self._rebuild()
+
+    # ------------------------------------------------------------
+    # 색인
+    # ------------------------------------------------------------
+    def _rebuild(self):
+        start = time.perf_counter()
+        with self._lock:
+            self._dirty = False
+            log = {norm: tuple(v) for norm, v in self._log.items()}
+
+        merged = {norm: list(v) for norm, v in self._static.items()}
+        for norm, (display, count) in log.items():
+            entry = merged.get(norm)
+            if entry is None:
+                merged[norm] = [display, count, "history"]
+            else:
+                entry[1] += count
+
+        entries = [(norm, display, weight, source) for norm, (display, weight, source) in merged.items()]
+        pairs = sorted(
+            (norm[s:], i) for i, (norm, _, _, _) in enumerate(entries) for s in _word_starts(norm)
+        )
+        index = ([key for key, _ in pairs], [i for _, i in pairs], entries)
+
+        with self._lock:
+            self._index = index
+            self._built_at = time.monotonic()
+            self._rebuilding = False
+        self.build_ms = (time.perf_counter() - start) * 1000
+        telemetry.observe("suggest_rebuild_seconds", self.build_ms / 1000)
+
+    def _maybe_rebuild(self):
+        with self._lock:
+            if not self._dirty or self._rebuilding:
+                return
+            if time.monotonic() - self._built_at < REBUILD_INTERVAL:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild, name="suggest-rebuild", daemon=True).start()
+
+    def record(self, query: str):
+        """실제로 검색한 검색어 기록 (사이드바 검색, 시간표 주차 버튼)."""
+        display = " ".join((query or "").split())
+        norm = normalize(display)
+        if len(norm) < 2:
+            return
+        with self._lock:
+            entry = self._log.get(norm)
+            if entry is None:
+                self._log[norm] = [display, 1]
+            else:
+                entry[0] = display
+                entry[1] += 1
+            self._dirty = True
+            self._conn.execute(
+                "INSERT INTO query_log (query, display, count, last_used) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT(query) DO UPDATE SET count = count + 1, "
+                "display = excluded.display, last_used = excluded.last_used",
+                (norm, display, time.time()),
+            )
+
+    # ------------------------------------------------------------
+    # 추천
+    # ------------------------------------------------------------
+    def suggest(self, text: str, limit: int = 5, extra=(), prefetch: bool = False) -> list:
+        """
+        text로 이어지는 검색어 limit개: [{"query", "source", "score"}]
+        extra: 이 세션에만 있는 후보 (저장한 영상 제목 등, SAVED_WEIGHT로 순위 계산)
+        prefetch=True면 1순위 검색 결과를 백그라운드에서 미리 불러옴
+        """
+        start = time.perf_counter()
+        prefix = normalize(text)
+        initial = ""
+        if prefix and prefix[-1] in _CHOSEONG:
+            # 입력 중인 글자 (자음만 친 상태)
+            initial, prefix = prefix[-1], prefix[:-1]
+        if not prefix:
+            return []
+
+        self._maybe_rebuild()
+        keys, ids, entries = self._index
+
+        best = {}  # normalized -> (score, display, source)
+        lo = bisect.bisect_left(keys, prefix)
+        hi = min(bisect.bisect_left(keys, prefix + "\uffff"), lo + SCAN_LIMIT)
+        n = len(prefix)
+        for j in range(lo, hi):
+            key = keys[j]
+            if initial and (len(key) == n or _initial(key[n]) != initial):
+                continue
+            norm, display, weight, source = entries[ids[j]]
+            score = weight * PREFIX_BONUS if len(key) == len(norm) else weight
+            if score > best.get(norm, (0.0,))[0]:
+                best[norm] = (score, display, source)
+
+        for title in extra:
+            norm = normalize(title)
+            if norm and norm not in best and _matches(norm, prefix, initial):
+                head = _matches(norm, prefix, initial, starts=(0,))
+                score = SAVED_WEIGHT * PREFIX_BONUS if head else SAVED_WEIGHT
+                best[norm] = (score, title, "saved")
+
+        top = heapq.nlargest(limit, best.values(), key=lambda v: (v[0], -len(v[1])))
+        telemetry.observe("suggest_seconds", time.perf_counter() - start)
+        results = [{"query": display, "source": source, "score": round(score, 2)} for score, display, source in top]
+
+        if prefetch and results and results[0]["score"] >= PREFETCH_MIN_SCORE:
+            self.prefetch(results[0]["query"])
+        return results
+
+    # ------------------------------------------------------------
+    # 미리 불러오기
+    # ------------------------------------------------------------
+    def prefetch(self, query: str) -> bool:
+        """query 검색 결과가 캐시에 없고 할당량 여유가 있으면 백그라운드 검색. 시작했으면 True."""
+        if not PREFETCH_ENABLED:
+            return False
+        from utils import youtube_api2
+        from utils.quota_scheduler import PREFETCH, SEARCH_COST, get_quota_scheduler
+
+        if youtube_api2.is_search_cached(query, SEARCH_MAX_RESULTS):
+            return False
+        if not get_quota_scheduler().budget_ok(SEARCH_COST, PREFETCH):
+            telemetry.incr("suggest_prefetch", result="no_budget")
+            return False
+
+        norm = normalize(query)
+        with self._lock:
+            if norm in self._prefetching:
+                return False
+            self._prefetching.add(norm)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="suggest-prefetch")
+
+        def run():
+            try:
+                youtube_api2.search_youtube_videos(
+                    query, max_results=SEARCH_MAX_RESULTS, feature="prefetch", priority=PREFETCH
+                )
+                self.prefetched += 1
+                telemetry.incr("suggest_prefetch", result="ok")
+            except Exception as e:
+                telemetry.incr("suggest_prefetch", result=type(e).__name__)
+            finally:
+                with self._lock:
+                    self._prefetching.discard(norm)
+
+        self._executor.submit(run)
+        return True
+
+    def stats(self) -> dict:
+        keys, _, entries = self._index
+        return {
+            "entries": len(entries),
+            "keys": len(keys),
+            "logged_queries": len(self._log),
+            "build_ms": round(self.build_ms, 1),
+            "prefetched": self.prefetched,
+        }
+
+
+_suggester = None
+_suggester_lock = threading.Lock()
+
+
+def get_suggester() -> Suggester:
+    global _suggester
+    if _suggester is None:
+        with _suggester_lock:
+            if _suggester is None:
+                _suggester = Suggester()
+    return _suggester
@@ -0,0 +1,309 @@
+# streamlit_app/utils/telemetry.py
+"""
+시간 측정(span) + 카운터 수집.
+
+켜는 법 (환경변수):
+    APP_TELEMETRY=1            수집 켜기 (기본: 꺼짐)
+    APP_TRACE_FILE=path.jsonl  span 기록 파일 (기본: data/trace.jsonl, 빈 값이면 기록 안 함)
+    APP_METRICS_PORT=9464      Prometheus 형식 /metrics 엔드포인트 포트 (없으면 안 띄움)
+
+꺼져 있을 때는 span()이 아무것도 하지 않는 공용 객체를 돌려주고,
+traced()는 함수를 그대로 돌려주므로 운영 환경에 계속 넣어 둬도 비용이 거의 없다.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from functools import wraps
+
+from utils.storage import data_path
+
+ENABLED = os.getenv("APP_TELEMETRY", "0") == "1"
+
+# 히스토그램 버킷 (초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_lock = threading.Lock()
+_counters = {}  # (name, labels) -> float
+_histograms = {}  # (name, labels) -> [bucket_counts..., sum, count]
+
+
+def _labels_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+# ================================================================
+# 카운터 / 히스토그램
+# ================================================================
+def incr(name: str, value: float = 1, **labels):
+    """카운터 증가. 예: incr("youtube_quota_units", 100, method="search.list")"""
+    if not ENABLED:
+        return
+    key = (name, _labels_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, seconds: float, **labels):
+    """히스토그램에 소요 시간(초) 기록."""
+    if not ENABLED:
+        return
+    key = (name, _labels_key(labels))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[i] += 1
+        hist[-2] += seconds
+        hist[-1] += 1
+
+
+def snapshot() -> dict:
+    """현재까지 수집된 값 (벤치마크 / 진단 화면용)."""
+    with _lock:
+        counters = {
+            _format_name(name, labels): value for (name, labels), value in _counters.items()
+        }
+        histograms = {
+            _format_name(name, labels): {
+                "count": hist[-1],
+                "sum_s": round(hist[-2], 6),
+                "mean_ms": round(hist[-2] / hist[-1] * 1000, 3) if hist[-1] else 0.0,
+            }
+            for (name, labels), hist in _histograms.items()
+        }
+    return {"counters": counters, "histograms": histograms}
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+# ================================================================
+# Span
+# ================================================================
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+    def end(self):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("name", "attrs", "start", "wall_start", "_ended")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        self._ended = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.end()
+        return False
+
+    def set(self, **attrs):
+        """span 진행 중에 속성 추가 (토큰 수 등)."""
+        self.attrs.update(attrs)
+
+    def end(self):
+        if self._ended:
+            return
+        self._ended = True
+        elapsed = time.perf_counter() - self.start
+        observe("span_seconds", elapsed, span=self.name)
+        _write_trace(
+            {
+                "ts": self.wall_start,
+                "span": self.name,
+                "duration_ms": round(elapsed * 1000, 3),
+                "thread": threading.current_thread().name,
+                **self.attrs,
+            }
+        )
+
+
+def span(name: str, **attrs):
+    """with telemetry.span("llm.decode", tokens=n): ..."""
+    if not ENABLED:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def start_span(name: str, **attrs):
+    """with 블록으로 감싸기 어려운 곳(페이지 전체 렌더링 등)에서 사용. 끝에서 .end() 호출."""
+    return span(name, **attrs)
+
+
+def traced(name: str):
+    """함수 전체를 span으로 감싸는 데코레이터. 꺼져 있으면 원래 함수를 그대로 반환."""
+
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ================================================================
+# JSONL trace 파일 (별도 스레드에서 기록)
+# ================================================================
+_trace_queue = queue.Queue(maxsize=10000)
+_writer_started = False
+
+
+def _trace_file():
+    path = os.getenv("APP_TRACE_FILE")
+    if path is None:
+        return data_path("trace.jsonl")
+    return path or None
+
+
+def _write_trace(event: dict):
+    global _writer_started
+    if not _writer_started:
+        if _trace_file() is None:
+            return
+        with _lock:
+            if not _writer_started:
+                threading.Thread(target=_trace_writer, name="trace-writer", daemon=True).start()
+                _writer_started = True
+    try:
+        _trace_queue.put_nowait(event)
+    except queue.Full:
+        incr("trace_events_dropped")
+
+
+def _trace_writer():
+    path = _trace_file()
+    with open(path, "a", encoding="utf-8") as f:
+        while True:
+            event = _trace_queue.get()
+            batch = [event]
+            # 쌓여 있는 것까지 한 번에 기록
+            while len(batch) < 500:
+                try:
+                    batch.append(_trace_queue.get_nowait())
+                except queue.Empty:
+                    break
+            f.write(
+                "".join(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in batch)
+            )
+            f.flush()
+
+
+# ================================================================
+# Prometheus 텍스트 형식 엔드포인트
+# ================================================================
+def _format_name(name: str, labels: tuple) -> str:
+    if not labels:
+        return name
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return f"{name}{{{inner}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus() -> str:
+    lines = []
+    with _lock:
+        for name in sorted({n for n, _ in _counters}):
+            lines.append(f"# TYPE {name} counter")
+            for (n, labels), value in _counters.items():
+                if n == name:
+                    lines.append(f"{_format_name(name, labels)} {value}")
+
+        for name in sorted({n for n, _ in _histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for (n, labels), hist in _histograms.items():
+                if n != name:
+                    continue
+                for i, bound in enumerate(BUCKETS):
+                    lines.append(f"{_format_name(name + '_bucket', labels + (('le', str(bound)),))} {hist[i]}")
+                lines.append(f"{_format_name(name + '_bucket', labels + (('le', '+Inf'),))} {hist[-1]}")
+                lines.append(f"{_format_name(name + '_sum', labels)} {hist[-2]}")
+                lines.append(f"{_format_name(name + '_count', labels)} {hist[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def _metrics_handler():
+    # http.server는 ssl/email까지 끌고 와서 무거우므로 exporter를 켤 때만 불러옴
+    from http.server import BaseHTTPRequestHandler
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return _MetricsHandler
+
+
+_server = None
+
+
+def start_exporter(port: int = None):
+    """/metrics 엔드포인트 시작 (프로세스당 한 번만)."""
+    global _server
+    if _server is not None:
+        return _server
+    port = port or int(os.getenv("APP_METRICS_PORT", "9464"))
+    with _lock:
+        if _server is None:
+            from http.server import ThreadingHTTPServer
+
+            try:
+                _server = ThreadingHTTPServer(("127.0.0.1", port), _metrics_handler())
+            except OSError:
+                # 다른 워커 프로세스가 이미 포트를 쓰고 있음
+                return None
+            threading.Thread(
+                target=_server.serve_forever, name="metrics-exporter", daemon=True
+            ).start()
+    return _server
+
+
+if ENABLED and os.getenv("APP_METRICS_PORT"):
+    start_exporter()
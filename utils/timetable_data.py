@@ -0,0 +1,208 @@
+# streamlit_app/utils/timetable_data.py
+"""
+시간표 기본 데이터 (시간표 페이지, 복습 스케줄러, 검색어 추천이 같이 사용).
+
+가져온 시간표(CSV/ICS/JSON)는 utils/timetable_import.py에 저장되고,
+semester_entries()는 기본 시간표에 없는 이름이면 거기서 교시 단위로 바꿔서 돌려준다.
+"""
+
+import json
+import re
+from pathlib import Path
+
+# ---------------- 시간표 기본 데이터 ----------------
+DAYS = ["월", "화", "수", "목", "금"]
+PERIODS = [1, 2, 3, 4, 5, 6, 7]
+
+# 교시 ↔ 시각 (분 단위, 1교시 09:00부터 1시간 간격, 수업 50분)
+FIRST_PERIOD_START = 9 * 60
+PERIOD_STEP = 60
+PERIOD_MINUTES = 50
+
+
+def period_range(period: int) -> tuple:
+    """교시 → (시작 분, 끝 분)."""
+    start = FIRST_PERIOD_START + (period - 1) * PERIOD_STEP
+    return start, start + PERIOD_MINUTES
+
+
+def periods_between(start: int, end: int) -> list:
+    """[start, end) 분 구간과 겹치는 교시 목록 (1교시 이전은 빼고, 7교시 이후는 번호를 이어서 매김)."""
+    first = max(1, (start - FIRST_PERIOD_START) // PERIOD_STEP + 1)
+    return [p for p in range(first, first + (end - start) // PERIOD_STEP + 2) if period_range(p)[0] < end]
+
+# 과목별 이모지 (같은 과목 = 같은 색 이모지)
+SUBJECT_EMOJI = {
+    "대학수학": "🟦",
+    "물리 및 실험": "🟧",
+    "정보검색": "🟨",
+    "지식재산개론": "🟥",
+    "자기이해와봉사": "🟩",
+    "실증적AI개발프로젝트I": "🟪",
+    "뉴럴네트워크": "🟫",
+    "임베디드시스템": "⬛",
+    "자연언어처리": "⬜",
+    "빅데이터분석": "🟩",
+    "실증적AI개발프로젝트II": "🟪",
+}
+
+# 각 학기별 시간표 (예시는 너가 쓰던 것 그대로 유지)
+TIMETABLES = {
+    "2025년 1학기": [
+        {"subject": "대학수학", "day": "화", "period": 2, "room": "S06-0603"},
+        {"subject": "대학수학", "day": "화", "period": 3, "room": "S06-0603"},
+        {"subject": "정보검색", "day": "목", "period": 3, "room": "S06-0602"},
+        {"subject": "지식재산개론", "day": "금", "period": 3, "room": "S06-0604"},
+        {"subject": "물리 및 실험", "day": "월", "period": 5, "room": "S06-0606"},
+        {"subject": "물리 및 실험", "day": "수", "period": 5, "room": "S06-0606"},
+        {"subject": "정보검색", "day": "월", "period": 6, "room": "S06-0602"},
+        {"subject": "자기이해와봉사", "day": "목", "period": 6, "room": "S01-0603"},
+        {"subject": "실증적AI개발프로젝트I", "day": "금", "period": 7, "room": "S06-0602"},
+    ],
+    "2025년 2학기": [
+        {"subject": "뉴럴네트워크", "day": "목", "period": 2, "room": "S06-0606"},
+        {"subject": "임베디드시스템", "day": "금", "period": 2, "room": "S06-0603"},
+        {"subject": "임베디드시스템", "day": "금", "period": 3, "room": "S06-0603"},
+        {"subject": "자연언어처리", "day": "수", "period": 3, "room": "S06-0603"},
+        {"subject": "자연언어처리", "day": "목", "period": 4, "room": "S06-0603"},
+        {"subject": "빅데이터분석", "day": "수", "period": 5, "room": "S06-0609"},
+        {"subject": "빅데이터분석", "day": "목", "period": 5, "room": "S06-0609"},
+        {"subject": "뉴럴네트워크", "day": "월", "period": 5, "room": "S06-0606"},
+        {"subject": "실증적AI개발프로젝트II", "day": "금", "period": 7, "room": "S06-0602"},
+    ],
+}
+
+DEFAULT_SEMESTER = "2025년 1학기"
+
+# 기본 목록에 없는 과목의 이모지 (과목명으로 골라서 항상 같은 색)
+EMOJI_PALETTE = ["🟦", "🟧", "🟨", "🟥", "🟩", "🟪", "🟫", "⬛", "⬜"]
+
+
+def subject_emoji(subject: str) -> str:
+    if subject in SUBJECT_EMOJI:
+        return SUBJECT_EMOJI[subject]
+    return EMOJI_PALETTE[sum(map(ord, subject)) % len(EMOJI_PALETTE)]
+
+
+def semester_names(owner: str = "") -> list:
+    """기본 시간표 + owner가 볼 수 있는 가져온 시간표(공용 + 내 것) 이름."""
+    from utils.timetable_import import get_timetable_store
+
+    return list(TIMETABLES) + [n for n in get_timetable_store().names(owner) if n not in TIMETABLES]
+
+
+def semester_entries(semester_key: str, owner: str = "") -> list:
+    """학기 시간표 항목 목록 [{"subject", "day", "period", "room", ...}] (없으면 빈 리스트)."""
+    if semester_key in TIMETABLES:
+        return TIMETABLES[semester_key]
+    from utils.timetable_import import get_timetable_store
+
+    return get_timetable_store().period_entries(semester_key, owner)
+
+
+def free_periods(semester_key: str, day: str, owner: str = "") -> list:
+    """해당 요일에 수업이 없는 교시 목록."""
+    busy = {
+        item["period"] for item in semester_entries(semester_key, owner) if item["day"] == day
+    }
+    return [p for p in PERIODS if p not in busy]
+
+
+# ---------------- 강의계획서(json) ----------------
+SYLLABUS_DIR = Path(__file__).resolve().parent.parent / "pages"
+# 과목 이름으로 된 강의계획서 파일을 찾는 폴더 (가져온 시간표의 과목 자동 연결용, 예: data/syllabi/정보검색.json)
+SYLLABUS_SEARCH_DIRS = [SYLLABUS_DIR, SYLLABUS_DIR.parent / "data" / "syllabi"]
+WEEK_LABEL = re.compile(r"\s*(\d+)\s*주(?:차)?\s*")  # '1주', '01주', '3 주차' 등
+
+
+def load_syllabus(filename) -> dict:
+    try:
+        with open(SYLLABUS_DIR / filename, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+# math = 대학수학, money = 지식재산개론, mooli = 물리 및 실험
+SYLLABUS_MAP = {
+    "대학수학": load_syllabus("math.json"),
+    "지식재산개론": load_syllabus("money.json"),
+    "물리 및 실험": load_syllabus("mooli.json"),
+}
+
+
+def normalize_subject(subject: str) -> str:
+    """과목명 비교용: 괄호 안(분반 등), 공백, 기호를 빼고 소문자로. "물리 및 실험(01)" → "물리및실험"."""
+    subject = re.sub(r"\(.*?\)|\[.*?\]", "", subject or "")
+    return re.sub(r"[\W_]+", "", subject).lower()
+
+
+def find_syllabus(subject: str):
+    """
+    과목의 강의계획서 (출처, 내용). 없으면 (None, {}).
+    1) 기본 과목 목록(SYLLABUS_MAP)에 이름이 같은 과목 (공백/분반 표기 무시)
+    2) SYLLABUS_SEARCH_DIRS 안의 <과목명>.json
+    """
+    key = normalize_subject(subject)
+    if not key:
+        return None, {}
+    for name, data in SYLLABUS_MAP.items():
+        if data and normalize_subject(name) == key:
+            return name, data
+    for folder in SYLLABUS_SEARCH_DIRS:
+        if not folder.is_dir():
+            continue
+        for path in sorted(folder.glob("*.json")):
+            if normalize_subject(path.stem) == key:
+                try:
+                    data = json.loads(path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    continue
+                if isinstance(data, dict) and any(WEEK_LABEL.fullmatch(str(k)) for k in data):
+                    return str(path), data
+    return None, {}
+
+
+# 가져온 과목 → 연결된 강의계획서 출처 (기본 과목 이름 또는 파일 경로)
+SYLLABUS_SOURCES = {}
+
+
+def link_syllabus(subject: str):
+    """가져온 과목을 강의계획서와 연결 (SYLLABUS_MAP에 등록). 연결된 출처 또는 None."""
+    if subject in SYLLABUS_SOURCES:
+        return SYLLABUS_SOURCES[subject]
+    if SYLLABUS_MAP.get(subject):
+        return subject
+    source, data = find_syllabus(subject)
+    if data:
+        SYLLABUS_MAP[subject] = data
+        SYLLABUS_SOURCES[subject] = source
+    return source
+
+
+def syllabus_weeks(subject: str) -> list:
+    """
+    과목의 주차별 계획 [(주차, 학습목표, 학습내용)] (주차 번호 순, 둘 다 비어 있는 주차는 제외).
+    '중간고사주'처럼 번호가 없는 라벨이나 내용이 딕셔너리가 아닌 항목은 건너뜀.
+    """
+    syllabus = SYLLABUS_MAP.get(subject) or {}
+    numbered = []
+    for key, week_data in syllabus.items():
+        match = WEEK_LABEL.fullmatch(str(key))
+        if match and isinstance(week_data, dict):
+            numbered.append((int(match.group(1)), key))
+    numbered.sort()
+
+    weeks = []
+    for _, wk in numbered:
+        week_data = syllabus[wk]
+        goal = (week_data.get("학습목표") or "").replace("\n", " ")
+        content = (week_data.get("학습내용") or "").replace("\n", " ")
+        if goal or content:
+            weeks.append((wk, goal, content))
+    return weeks
+
+
+def week_query(subject: str, week: str, goal: str, content: str) -> str:
+    """주차 버튼을 눌렀을 때의 검색어: 과목명 + 주차 + 학습내용(없으면 목표)."""
+    return f"{subject} {week} {content or goal}"
@@ -0,0 +1,744 @@
+# streamlit_app/utils/timetable_import.py
+"""
+시간표 가져오기 (CSV / ICS / JSON) + 구간 색인 (충돌, 빈 시간, 화면 칸 조회).
+
+기본 시간표(utils/timetable_data.TIMETABLES)는 학기 두 개, 월~금 × 1~7교시 칸에 과목 하나씩만 들어간다.
+가져온 시간표는 수업마다 (요일, 시작 분, 끝 분)으로 저장해서 75분 수업, 3시간 실험, 주말 수업,
+같은 시간에 겹치는 분반(학과 전체 시간표)도 그대로 다룬다.
+
+- 형식
+  CSV   열 이름은 한글/영문 모두 (과목, 요일, 시작, 종료 또는 교시, 강의실, 교수, 분반, 학기).
+        요일은 "월" / "월요일" / "Mon" / "월,수", 교시는 "2" / "2-3". UTF-8이 아니면 CP949(엑셀 저장)로 읽음
+  ICS   VEVENT의 DTSTART / DTEND(또는 DURATION) / SUMMARY / LOCATION / RRULE(BYDAY).
+        학교 포털처럼 수업마다 일정이 따로 있어도 (과목, 요일, 시각, 강의실)이 같으면 하나로 합침
+  JSON  수업 목록, {"name", "sessions": [...]}, 또는 기본 시간표와 같은 {학기: [...]} 모양
+  학기 열(semester)이 있으면 학기별로 나눠서 시간표 여러 개로 저장. 읽을 수 없는 행은 건너뛰고 경고로 알려 줌
+- 구간 색인 (IntervalIndex): 주 단위 분(요일 × 1440 + 분)으로 시작 시각 정렬 + 가장 긴 수업 길이.
+  [a, b)와 겹치는 수업은 시작이 (a - 최장 길이, b) 안에 있는 것뿐이라 이분 탐색 두 번 + 그 사이만 확인
+  → 충돌 목록, 빈 시간("이번 주 다음 빈 2시간"), 화면 칸 조회가 학과 전체(수천 개) 시간표에서도 빠름
+- 강의계획서 자동 연결: 가져온 과목마다 utils/timetable_data.link_syllabus
+  (기본 과목과 이름이 같거나 data/syllabi/<과목명>.json이 있으면 주차별 검색 버튼이 그대로 동작)
+- 저장: data/timetables.db, 사용자(owner = student_id)별로 (같은 이름으로 다시 가져오면 교체).
+  owner가 빈 문자열인 시간표(CLI / 벤치마크, 예전 버전에서 가져온 것)는 모두에게 보이는 공용이고 화면에서 지울 수 없음.
+  같은 이름이면 내 시간표가 공용보다 우선. 기본 시간표와 이름이 같으면 "<이름> (가져옴)"으로 저장
+"""
+
+import bisect
+import csv
+import io
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from utils import telemetry
+from utils.storage import connect
+from utils.timetable_data import (
+    FIRST_PERIOD_START,
+    PERIOD_STEP,
+    TIMETABLES,
+    link_syllabus,
+    period_range,
+    periods_between,
+)
+
+DB_FILE = "timetables.db"
+TIMEZONE = os.getenv("APP_TIMEZONE", "Asia/Seoul")  # ICS의 UTC 시각(…Z)을 바꿀 시간대
+WEEK_DAYS = ["월", "화", "수", "목", "금", "토", "일"]
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+FREE_DAY_START = 9 * 60  # 빈 시간 찾기 기본 범위 (하루 중)
+FREE_DAY_END = 22 * 60
+
+IMPORTED_SUFFIX = " (가져옴)"  # 기본 시간표와 이름이 같을 때 붙임
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS timetables (
+    owner       TEXT    NOT NULL DEFAULT '',   -- '' = 공용
+    name        TEXT    NOT NULL,
+    source      TEXT    NOT NULL DEFAULT '',
+    imported_at REAL    NOT NULL,
+    sessions    INTEGER NOT NULL,
+    PRIMARY KEY (owner, name)
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    owner      TEXT    NOT NULL DEFAULT '',
+    timetable  TEXT    NOT NULL,
+    seq        INTEGER NOT NULL,
+    subject    TEXT    NOT NULL,
+    day        INTEGER NOT NULL,
+    start      INTEGER NOT NULL,
+    end        INTEGER NOT NULL,
+    room       TEXT    NOT NULL DEFAULT '',
+    instructor TEXT    NOT NULL DEFAULT '',
+    section    TEXT    NOT NULL DEFAULT '',
+    PRIMARY KEY (owner, timetable, seq)
+) WITHOUT ROWID;
+"""
+
+
+def _migrate(conn):
+    """owner 열이 없던 예전 DB: 기존 시간표는 공용('')으로 옮김."""
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(timetables)").fetchall()]
+    if not cols or "owner" in cols:
+        return
+    conn.execute("BEGIN")
+    try:
+        conn.execute("ALTER TABLE timetables RENAME TO timetables_old")
+        conn.execute("ALTER TABLE sessions RENAME TO sessions_old")
+        # executescript는 먼저 COMMIT을 하므로 트랜잭션 안에서는 문장마다 실행
+        for statement in SCHEMA.split(";"):
+            if statement.strip():
+                conn.execute(statement)
+        conn.execute(
+            "INSERT INTO timetables (owner, name, source, imported_at, sessions) "
+            "SELECT '', name, source, imported_at, sessions FROM timetables_old"
+        )
+        conn.execute("INSERT INTO sessions SELECT '', * FROM sessions_old")
+        conn.execute("DROP TABLE timetables_old")
+        conn.execute("DROP TABLE sessions_old")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+class TimetableImportError(RuntimeError):
+    """시간표 파일에서 수업을 하나도 읽지 못함 (형식을 모르거나 모든 행이 잘못됨)."""
+
+
+def format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_slot(start: int, end: int) -> str:
+    """주 단위 분 구간 → "화 13:00–15:00"."""
+    end_label = "24:00" if end % DAY_MINUTES == 0 and end > start else format_minutes(end % DAY_MINUTES)
+    return f"{WEEK_DAYS[start // DAY_MINUTES]} {format_minutes(start % DAY_MINUTES)}–{end_label}"
+
+
+# ================================================================
+# 값 해석 (CSV / JSON 공통)
+# ================================================================
+_DAY_NAMES = {
+    **{d: i for i, d in enumerate(WEEK_DAYS)},
+    **{d + "요일": i for i, d in enumerate(WEEK_DAYS)},
+    **{d: i for i, d in enumerate(["mon", "tue", "wed", "thu", "fri", "sat", "sun"])},
+    **{d: i for i, d in enumerate(["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"])},
+    **{d: i for i, d in enumerate(["mo", "tu", "we", "th", "fr", "sa", "su"])},
+}
+_TIME = re.compile(r"^(\d{1,2})(?::|시\s*|\.)?(\d{2})?(?:분)?$")
+_PERIODS = re.compile(r"^(\d{1,2})(?:\s*[-~–]\s*(\d{1,2}))?(?:교시)?$")
+
+# 열 이름 → 필드 (소문자, 공백 제거 후 비교)
+COLUMN_ALIASES = {
+    "subject": ["subject", "course", "title", "name", "과목", "과목명", "교과목", "교과목명", "강좌명"],
+    "day": ["day", "weekday", "요일"],
+    "start": ["start", "starttime", "begin", "시작", "시작시간", "시작시각"],
+    "end": ["end", "endtime", "finish", "종료", "종료시간", "종료시각", "끝"],
+    "period": ["period", "periods", "교시"],
+    "room": ["room", "location", "place", "강의실", "장소"],
+    "instructor": ["instructor", "professor", "teacher", "교수", "교수명", "담당교수"],
+    "section": ["section", "class", "분반"],
+    "semester": ["semester", "term", "학기"],
+}
+_ALIAS_FIELD = {alias: field for field, aliases in COLUMN_ALIASES.items() for alias in aliases}
+
+
+def parse_days(value) -> list:
+    """"월" / "월요일" / "Mon" / "월,수" / "월수" / 0~6 → 요일 번호 목록."""
+    if isinstance(value, int):
+        return [value] if 0 <= value < 7 else []
+    text = str(value or "").strip().lower()
+    if not text:
+        return []
+    if text in _DAY_NAMES:
+        return [_DAY_NAMES[text]]
+    parts = [p for p in re.split(r"[\s,/·]+", text) if p]
+    if len(parts) == 1 and all(ch in WEEK_DAYS for ch in text):
+        parts = list(text)  # "월수금"
+    days = [_DAY_NAMES.get(p) for p in parts]
+    return [] if None in days else days
+
+
+def parse_time(value) -> int:
+    """"9:00" / "09:00" / "0900" / "9시 30분" / 540(분) → 하루 중 분. 해석할 수 없으면 None."""
+    if isinstance(value, int):
+        return value if 0 <= value <= DAY_MINUTES else None
+    text = str(value or "").strip().replace(" ", "")
+    if re.fullmatch(r"\d{3,4}", text):
+        text = text[:-2] + ":" + text[-2:]
+    match = _TIME.match(text)
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    if hour > 24 or minute >= 60 or (hour == 24 and minute):
+        return None
+    return hour * 60 + minute
+
+
+def parse_periods(value):
+    """"2" / "2-3" / "2교시" → (시작 분, 끝 분). 해석할 수 없으면 None."""
+    match = _PERIODS.match(str(value or "").strip().replace(" ", ""))
+    if not match:
+        return None
+    first = int(match.group(1))
+    last = int(match.group(2) or first)
+    if first < 1 or last < first:
+        return None
+    return period_range(first)[0], period_range(last)[1]
+
+
+def make_sessions(record: dict) -> tuple:
+    """필드 dict 하나 → (수업 목록, 오류 메시지 또는 None). 요일이 여러 개면 요일마다 하나씩."""
+    subject = str(record.get("subject") or "").strip()
+    if not subject:
+        return [], "과목명이 없습니다"
+    days = parse_days(record.get("day"))
+    if not days:
+        return [], f"요일을 알 수 없습니다 ({record.get('day')!r})"
+
+    start = parse_time(record.get("start")) if record.get("start") not in (None, "") else None
+    end = parse_time(record.get("end")) if record.get("end") not in (None, "") else None
+    if start is None and end is None and record.get("period") not in (None, ""):
+        span = parse_periods(record.get("period"))
+        if span is None:
+            return [], f"교시를 알 수 없습니다 ({record.get('period')!r})"
+        start, end = span
+    if start is None or end is None:
+        return [], "시작/종료 시각 또는 교시가 없습니다"
+    if end <= start:
+        return [], f"종료 시각이 시작보다 빠릅니다 ({format_minutes(start)}–{format_minutes(end)})"
+
+    base = {
+        "subject": subject,
+        "start": start,
+        "end": end,
+        "room": str(record.get("room") or "").strip(),
+        "instructor": str(record.get("instructor") or "").strip(),
+        "section": str(record.get("section") or "").strip(),
+        "semester": str(record.get("semester") or "").strip(),
+    }
+    return [dict(base, day=day) for day in days], None
+
+
+# ================================================================
+# 형식별 읽기 → (수업 목록, 경고 목록)
+# ================================================================
+def _decode(data: bytes) -> str:
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp949")  # 한글 엑셀에서 저장한 CSV
+
+
+def parse_csv(text: str) -> tuple:
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(io.StringIO(text), dialect)
+    header = next(reader, None)
+    if not header:
+        raise TimetableImportError("CSV가 비어 있습니다.")
+    fields = [_ALIAS_FIELD.get(re.sub(r"\s+", "", h).lower()) for h in header]
+    if "subject" not in fields or "day" not in fields:
+        raise TimetableImportError(f"CSV에 과목 / 요일 열이 필요합니다 (찾은 열: {', '.join(header)})")
+
+    sessions, warnings = [], []
+    for line_no, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        record = {f: cell for f, cell in zip(fields, row) if f}
+        made, error = make_sessions(record)
+        if error:
+            warnings.append(f"{line_no}행: {error}")
+        sessions.extend(made)
+    return sessions, warnings
+
+
+def parse_json(text: str) -> tuple:
+    data = json.loads(text)
+    if isinstance(data, dict) and isinstance(data.get("sessions"), list):
+        items = [dict(item, semester=item.get("semester") or data.get("name") or "") for item in data["sessions"]]
+    elif isinstance(data, dict) and all(isinstance(v, list) for v in data.values()):
+        # 기본 시간표와 같은 모양: {학기: [{"subject", "day", "period", "room"}]}
+        items = [dict(item, semester=item.get("semester") or name) for name, rows in data.items() for item in rows]
+    elif isinstance(data, list):
+        items = data
+    else:
+        raise TimetableImportError("JSON은 수업 목록, {\"sessions\": [...]}, {학기: [...]} 중 하나여야 합니다.")
+
+    sessions, warnings = [], []
+    for i, item in enumerate(items, start=1):
+        if not isinstance(item, dict):
+            warnings.append(f"{i}번째 항목: 객체가 아닙니다")
+            continue
+        record = {_ALIAS_FIELD.get(re.sub(r"\s+", "", str(k)).lower(), k): v for k, v in item.items()}
+        made, error = make_sessions(record)
+        if error:
+            warnings.append(f"{i}번째 항목: {error}")
+        sessions.extend(made)
+    return sessions, warnings
+
+
+def _unfold(text: str) -> list:
+    """ICS 줄 이어붙이기 (공백/탭으로 시작하는 줄은 앞 줄의 계속)."""
+    lines = []
+    for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        if line[:1] in (" ", "\t") and lines:
+            lines[-1] += line[1:]
+        elif line:
+            lines.append(line)
+    return lines
+
+
+def _ics_value(value: str) -> str:
+    return value.replace("\\n", " ").replace("\\N", " ").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\").strip()
+
+
+def _local_zone():
+    try:
+        from zoneinfo import ZoneInfo
+
+        return ZoneInfo(TIMEZONE)
+    except Exception:
+        return timezone(timedelta(hours=9))  # tzdata가 없는 Windows 등: KST
+
+
+def _ics_datetime(params: str, value: str):
+    """DTSTART 값 → 현지 datetime (UTC면 TIMEZONE으로 변환, TZID는 그 시각 그대로). 하루 종일 일정이면 None."""
+    if "VALUE=DATE" in params.upper() and "VALUE=DATE-TIME" not in params.upper():
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+    except ValueError:
+        parsed = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M")
+    if value.endswith("Z"):
+        parsed = parsed.replace(tzinfo=timezone.utc).astimezone(_local_zone()).replace(tzinfo=None)
+    return parsed
+
+
+_DURATION = re.compile(r"^P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+def _ics_duration(value: str):
+    match = _DURATION.match(value.strip())
+    if not match:
+        return None
+    w, d, h, m, s = (int(x or 0) for x in match.groups())
+    return timedelta(weeks=w, days=d, hours=h, minutes=m, seconds=s)
+
+
+def parse_ics(text: str) -> tuple:
+    sessions, warnings = [], []
+    event = None
+    for line in _unfold(text):
+        upper = line.upper()
+        if upper == "BEGIN:VEVENT":
+            event = {}
+            continue
+        if upper == "END:VEVENT":
+            if event is not None:
+                made, error = _ics_event(event)
+                if error:
+                    warnings.append(f"일정 '{_ics_value(event.get('SUMMARY', ('', '?'))[1])}': {error}")
+                sessions.extend(made)
+            event = None
+            continue
+        if event is None or ":" not in line:
+            continue
+        head, value = line.split(":", 1)
+        name, _, params = head.partition(";")
+        event[name.upper()] = (params, value)
+    if not sessions and not warnings:
+        raise TimetableImportError("ICS에 일정(VEVENT)이 없습니다.")
+    return sessions, warnings
+
+
+def _ics_event(event: dict) -> tuple:
+    if "DTSTART" not in event:
+        return [], "DTSTART가 없습니다"
+    start = _ics_datetime(*event["DTSTART"])
+    if start is None:
+        return [], "하루 종일 일정은 건너뜁니다"
+    if "DTEND" in event:
+        end = _ics_datetime(*event["DTEND"])
+    elif "DURATION" in event and _ics_duration(event["DURATION"][1]) is not None:
+        end = start + _ics_duration(event["DURATION"][1])
+    else:
+        return [], "DTEND / DURATION이 없습니다"
+    if end is None or end <= start or end - start > timedelta(hours=24):
+        return [], "종료 시각이 올바르지 않습니다"
+
+    days = [start.weekday()]
+    rule = dict(
+        part.split("=", 1) for part in event.get("RRULE", ("", ""))[1].upper().split(";") if "=" in part
+    )
+    if rule.get("FREQ") == "WEEKLY" and rule.get("BYDAY"):
+        by_day = parse_days(re.sub(r"[+-]?\d", "", rule["BYDAY"]).replace(",", " "))
+        days = by_day or days
+    start_min = start.hour * 60 + start.minute
+    end_min = start_min + int((end - start).total_seconds() // 60)
+    if end_min > DAY_MINUTES:
+        return [], "자정을 넘기는 일정은 지원하지 않습니다"
+    return make_sessions(
+        {
+            "subject": _ics_value(event.get("SUMMARY", ("", ""))[1]),
+            "day": ",".join(WEEK_DAYS[d] for d in days),
+            "start": start_min,
+            "end": end_min,
+            "room": _ics_value(event.get("LOCATION", ("", ""))[1]),
+        }
+    )
+
+
+def parse_timetable(filename: str, data: bytes) -> tuple:
+    """파일 이름(확장자) + 내용 → (수업 목록, 경고 목록). 같은 수업(과목, 요일, 시각, 강의실, 분반)은 하나로."""
+    suffix = Path(filename).suffix.lower()
+    text = _decode(data)
+    if suffix == ".ics" or text.lstrip().upper().startswith("BEGIN:VCALENDAR"):
+        sessions, warnings = parse_ics(text)
+    elif suffix == ".json" or text.lstrip()[:1] in ("[", "{"):
+        sessions, warnings = parse_json(text)
+    else:
+        sessions, warnings = parse_csv(text)
+
+    unique = {}
+    for s in sessions:
+        unique.setdefault((s["semester"], s["subject"], s["day"], s["start"], s["end"], s["room"], s["section"]), s)
+    if not unique:
+        raise TimetableImportError("읽을 수 있는 수업이 없습니다. " + " / ".join(warnings[:3]))
+    return list(unique.values()), warnings
+
+
+# ================================================================
+# 구간 색인
+# ================================================================
+class IntervalIndex:
+    """
+    주 단위 [시작, 끝) 구간 색인 (읽기 전용, 바뀌면 새로 만듦).
+    시작 시각으로 정렬해 두고 가장 긴 구간 길이를 기억: 끝 > a인 구간은 시작 > a - 최장 길이이므로
+    [a, b)와 겹치는 구간은 starts의 (a - 최장, b) 범위 안에서만 찾으면 된다.
+    """
+
+    def __init__(self, sessions: list):
+        self.sessions = sorted(sessions, key=lambda s: (s["day"] * DAY_MINUTES + s["start"], s["end"]))
+        self._starts = [s["day"] * DAY_MINUTES + s["start"] for s in self.sessions]
+        self._ends = [s["day"] * DAY_MINUTES + s["end"] for s in self.sessions]
+        self._max_len = max((e - b for b, e in zip(self._starts, self._ends)), default=0)
+        self._conflicts = {}  # key → 충돌 목록 (색인은 바뀌지 않으므로 페이지를 다시 그릴 때 재사용)
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def _range(self, start: int, end: int) -> range:
+        lo = bisect.bisect_right(self._starts, start - self._max_len)
+        hi = bisect.bisect_left(self._starts, end)
+        return range(lo, hi)
+
+    def overlapping(self, start: int, end: int) -> list:
+        """주 단위 분 [start, end)와 겹치는 수업 (시작 순)."""
+        return [self.sessions[i] for i in self._range(start, end) if self._ends[i] > start]
+
+    def at(self, day: int, start: int, end: int) -> list:
+        """요일 day의 하루 중 [start, end)와 겹치는 수업 (화면 칸 하나)."""
+        base = day * DAY_MINUTES
+        return self.overlapping(base + start, base + end)
+
+    def conflicts(self, key: str = None) -> list:
+        """
+        겹치는 수업 쌍 [(앞 수업, 뒤 수업)]. key를 주면 그 값이 같은 것끼리만 (예: "room" → 강의실 중복 배정).
+        각 수업마다 자기 끝 전에 시작하는 뒤 수업만 보므로 O(n + 충돌 수).
+        key가 있으면 값별로 나눈 뒤 훑음 (학과 전체에서 같은 시간대 수업끼리 전부 비교하지 않게)
+        """
+        if key in self._conflicts:
+            return self._conflicts[key]
+        if key is None:
+            groups = [range(len(self.sessions))]
+        else:
+            by_key = {}
+            for i, s in enumerate(self.sessions):
+                if s.get(key):
+                    by_key.setdefault(s[key], []).append(i)
+            groups = by_key.values()
+
+        pairs = []
+        for group in groups:
+            for pos, i in enumerate(group):
+                end = self._ends[i]
+                for j in group[pos + 1 :]:
+                    if self._starts[j] >= end:
+                        break
+                    pairs.append((self.sessions[i], self.sessions[j]))
+        self._conflicts[key] = pairs
+        return pairs
+
+    def busy(self, start: int = 0, end: int = WEEK_MINUTES) -> list:
+        """[start, end) 안의 수업 시간을 합친 구간 목록 [(시작, 끝)]."""
+        merged = []
+        for i in self._range(start, end):
+            s, e = max(self._starts[i], start), min(self._ends[i], end)
+            if e <= s:
+                continue
+            if merged and s <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], e)
+            else:
+                merged.append([s, e])
+        return [tuple(m) for m in merged]
+
+    def free_slots(
+        self,
+        minutes: int,
+        after: int = 0,
+        days: range = range(7),
+        day_start: int = FREE_DAY_START,
+        day_end: int = FREE_DAY_END,
+    ) -> list:
+        """
+        after(주 단위 분) 이후, days 요일의 [day_start, day_end) 안에서 minutes분 이상 비는 구간 [(시작, 끝)].
+        """
+        slots = []
+        for day in days:
+            lo = max(day * DAY_MINUTES + day_start, after)
+            hi = day * DAY_MINUTES + day_end
+            if hi - lo < minutes:
+                continue
+            cursor = lo
+            for s, e in self.busy(lo, hi) + [(hi, hi)]:
+                if s - cursor >= minutes:
+                    slots.append((cursor, s))
+                cursor = max(cursor, e)
+        return slots
+
+    def next_free(self, minutes: int, after: int = 0, **kwargs):
+        """after 이후 처음으로 minutes분 비는 구간 (시작, 끝) 또는 None."""
+        slots = self.free_slots(minutes, after, **kwargs)
+        return slots[0] if slots else None
+
+
+def overlap_slot(a: dict, b: dict) -> tuple:
+    """두 수업이 겹치는 주 단위 분 구간 (시작, 끝)."""
+    start = max(a["day"] * DAY_MINUTES + a["start"], b["day"] * DAY_MINUTES + b["start"])
+    end = min(a["day"] * DAY_MINUTES + a["end"], b["day"] * DAY_MINUTES + b["end"])
+    return start, end
+
+
+def week_minute(moment: datetime = None) -> int:
+    """지금(또는 moment)의 주 단위 분 (월요일 0시 = 0)."""
+    moment = moment or datetime.now()
+    return moment.weekday() * DAY_MINUTES + moment.hour * 60 + moment.minute
+
+
+def builtin_sessions(semester_key: str) -> list:
+    """기본 시간표(교시 단위)를 수업 목록으로 (같은 과목의 연속 교시는 한 수업으로 합침)."""
+    rows = sorted(
+        TIMETABLES.get(semester_key, []),
+        key=lambda r: (WEEK_DAYS.index(r["day"]), r["subject"], r["period"]),
+    )
+    sessions = []
+    for row in rows:
+        start, end = period_range(row["period"])
+        day = WEEK_DAYS.index(row["day"])
+        last = sessions[-1] if sessions else None
+        if last and (last["day"], last["subject"], last["room"]) == (day, row["subject"], row["room"]) and (
+            start - last["end"] <= PERIOD_STEP - (end - start)
+        ):
+            last["end"] = end
+            continue
+        sessions.append(
+            {"subject": row["subject"], "day": day, "start": start, "end": end, "room": row["room"],
+             "instructor": "", "section": "", "semester": semester_key}
+        )
+    return sessions
+
+
+# ================================================================
+# 저장소
+# ================================================================
+class TimetableStore:
+    def __init__(self, filename: str = DB_FILE):
+        self._lock = threading.Lock()
+        self._conn = connect(filename)
+        _migrate(self._conn)
+        self._conn.executescript(SCHEMA)
+        self._indexes = {}  # (owner, 이름) → IntervalIndex (가져오기 / 삭제 때 비움)
+        self._linked = set()
+
+    def names(self, owner: str = "") -> list:
+        """owner가 볼 수 있는 시간표 이름 (공용 + 내 것, 가져온 순서)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM timetables WHERE owner IN ('', ?) GROUP BY name ORDER BY MIN(imported_at)",
+                (owner,),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def owned(self, name: str, owner: str) -> bool:
+        """owner가 직접 가져온 시간표인지 (공용이나 남의 것은 지울 수 없음)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM timetables WHERE owner = ? AND name = ?", (owner, name)
+            ).fetchone()
+        return row is not None
+
+    def _resolve(self, name: str, owner: str) -> str:
+        """name 시간표를 어느 owner 것으로 읽을지 (내 것이 있으면 내 것, 아니면 공용)."""
+        return owner if owner and self.owned(name, owner) else ""
+
+    def info(self, name: str, owner: str = ""):
+        owner = self._resolve(name, owner)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source, imported_at, sessions FROM timetables WHERE owner = ? AND name = ?", (owner, name)
+            ).fetchone()
+        return None if row is None else {"name": name, "source": row[0], "imported_at": row[1], "sessions": row[2]}
+
+    def import_bytes(self, filename: str, data: bytes, name: str = "", owner: str = "") -> list:
+        """
+        파일을 읽어서 owner의 시간표로 저장. 학기 열이 있으면 학기별로, 없으면 name(기본: 파일 이름)으로.
+        시간표마다 보고 [{"name", "renamed_from", "sessions", "conflicts", "linked": {과목: 출처}, "unlinked", "warnings"}].
+        renamed_from: 기본 시간표와 이름이 같아서 이름을 바꿨으면 원래 이름 (아니면 "").
+        """
+        start = time.perf_counter()
+        sessions, warnings = parse_timetable(filename, data)
+        groups = {}
+        for s in sessions:
+            groups.setdefault(s["semester"] or name or Path(filename).stem, []).append(s)
+
+        reports = []
+        for group_name, rows in groups.items():
+            renamed_from = ""
+            if group_name in TIMETABLES:
+                # 기본 시간표 이름은 그대로 쓰면 기본 시간표에 가려서 보이지 않음
+                renamed_from, group_name = group_name, group_name + IMPORTED_SUFFIX
+            self.save(group_name, rows, source=filename, owner=owner)
+            index = self.index(group_name, owner)
+            subjects = sorted({s["subject"] for s in rows})
+            linked = {subject: link_syllabus(subject) for subject in subjects}
+            reports.append(
+                {
+                    "name": group_name,
+                    "renamed_from": renamed_from,
+                    "sessions": len(rows),
+                    "conflicts": len(index.conflicts()),
+                    "linked": {k: v for k, v in linked.items() if v},
+                    "unlinked": [k for k, v in linked.items() if not v],
+                    "warnings": warnings,
+                }
+            )
+        telemetry.observe("timetable_import", time.perf_counter() - start, format=Path(filename).suffix.lower())
+        return reports
+
+    def _forget_locked(self, name: str):
+        # 공용 시간표가 바뀌면 그것을 보던 모든 사용자의 색인도 다시 만들어야 함
+        for key in [k for k in self._indexes if k[1] == name]:
+            del self._indexes[key]
+
+    def save(self, name: str, sessions: list, source: str = "", owner: str = ""):
+        """owner의 시간표 name을 sessions로 교체."""
+        rows = [
+            (owner, name, seq, s["subject"], s["day"], s["start"], s["end"], s.get("room", ""),
+             s.get("instructor", ""), s.get("section", ""))
+            for seq, s in enumerate(sessions)
+        ]
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                cur.execute("DELETE FROM sessions WHERE owner = ? AND timetable = ?", (owner, name))
+                cur.executemany("INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                cur.execute(
+                    "INSERT OR REPLACE INTO timetables (owner, name, source, imported_at, sessions) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (owner, name, source, time.time(), len(rows)),
+                )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            self._forget_locked(name)
+
+    def delete(self, name: str, owner: str = ""):
+        """owner의 시간표 name 삭제 (다른 사용자 / 공용 시간표는 그대로)."""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                cur.execute("DELETE FROM sessions WHERE owner = ? AND timetable = ?", (owner, name))
+                cur.execute("DELETE FROM timetables WHERE owner = ? AND name = ?", (owner, name))
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            self._forget_locked(name)
+
+    def sessions(self, name: str, owner: str = "") -> list:
+        """시간표의 수업 목록 (기본 시간표 이름이면 교시를 시각으로 바꿔서)."""
+        if name in TIMETABLES:
+            return builtin_sessions(name)
+        owner = self._resolve(name, owner)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT subject, day, start, end, room, instructor, section FROM sessions "
+                "WHERE owner = ? AND timetable = ? ORDER BY seq",
+                (owner, name),
+            ).fetchall()
+        cols = ("subject", "day", "start", "end", "room", "instructor", "section")
+        return [dict(zip(cols, r), semester=name) for r in rows]
+
+    def index(self, name: str, owner: str = "") -> IntervalIndex:
+        key = (owner, name)
+        index = self._indexes.get(key)
+        if index is None:
+            sessions = self.sessions(name, owner)
+            if key not in self._linked:
+                # 다시 시작한 뒤에도 가져온 과목의 강의계획서 연결이 유지되도록
+                for subject in {s["subject"] for s in sessions}:
+                    link_syllabus(subject)
+                self._linked.add(key)
+            index = IntervalIndex(sessions)
+            with self._lock:
+                self._indexes[key] = index
+        return index
+
+    def period_entries(self, name: str, owner: str = "") -> list:
+        """교시 단위 항목 [{"subject", "day", "period", "room", "start", "end"}] (복습 스케줄러 / 공강 교시용)."""
+        entries = []
+        for s in self.index(name, owner).sessions:
+            if s["day"] >= 5:
+                continue  # 교시표는 월~금
+            for period in periods_between(s["start"], s["end"]):
+                entries.append(
+                    {"subject": s["subject"], "day": WEEK_DAYS[s["day"]], "period": period,
+                     "room": s["room"], "start": s["start"], "end": s["end"]}
+                )
+        return entries
+
+
+def grid_rows(index: IntervalIndex) -> tuple:
+    """
+    화면용 (요일 목록, 교시 목록): 월~금 + 수업이 있는 주말, 7교시 + 그 뒤까지 이어지는 수업의 교시.
+    """
+    days = list(range(5)) + [d for d in (5, 6) if index.at(d, 0, DAY_MINUTES)]
+    last_end = max((s["end"] for s in index.sessions), default=0)
+    last_period = max(7, (last_end - FIRST_PERIOD_START - 1) // PERIOD_STEP + 1)
+    return days, list(range(1, last_period + 1))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_timetable_store() -> TimetableStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TimetableStore()
+    return _store
@@ -0,0 +1,146 @@
+# streamlit_app/utils/transcript.py
+"""
+유튜브 자막 추출 (메인 페이지, 벤치마크, 일괄 처리 스크립트에서 공통 사용).
+"""
+
+from urllib.parse import urlparse, parse_qs
+
+from utils import resilience, singleflight, telemetry, transport
+from utils.content_cache import get_content_cache
+from utils.search_index import get_search_index
+
+ERROR_PREFIX = "자막을 가져오는 중 오류 발생"
+
+# youtube_transcript_api에서 '이 영상은 자막을 받을 수 없음'을 뜻하는 예외 (다시 시도해도 같음)
+UNAVAILABLE_ERRORS = {
+    "TranscriptsDisabled",
+    "NoTranscriptFound",
+    "VideoUnavailable",
+    "VideoUnplayable",
+    "InvalidVideoId",
+    "AgeRestricted",
+}
+
+
+class TranscriptError(RuntimeError):
+    """자막을 가져오지 못함 (메시지는 화면에 그대로 보여줄 수 있는 문장)."""
+
+
+class TranscriptUnavailable(TranscriptError, LookupError):
+    """자막이 없거나 볼 수 없는 영상. LookupError라서 utils/resilience.py가 재시도하지 않는다."""
+
+
+class TranscriptFetchFailed(TranscriptError):
+    """네트워크/서비스 오류로 실패 (시간 초과, 서킷 열림 ...). 잠시 후 다시 시도하면 될 수 있음."""
+
+
+def extract_video_id(video_id_or_url: str) -> str:
+    """
+    유튜브 풀 URL이 오든, 순수 video_id가 오든
+    항상 video_id만 뽑아서 반환.
+    """
+    s = video_id_or_url.strip()
+
+    # youtu.be 단축 URL
+    if "youtu.be" in s:
+        parsed = urlparse(s)
+        return parsed.path.lstrip("/")
+
+    # youtube.com/watch?v= 형태
+    if "youtube.com" in s:
+        parsed = urlparse(s)
+        qs = parse_qs(parsed.query)
+        v = qs.get("v")
+        if v and len(v) > 0:
+            return v[0]
+
+    # 그 외에는 이미 video_id라고 가정
+    return s
+
+
+def fetch_transcript(video_id_or_url: str, language: str = "ko") -> str:
+    """
+    유튜브 video_id 또는 URL + 언어코드로 자막 텍스트를 반환.
+    같은 영상을 여러 세션이 동시에 열면 실제 다운로드는 한 번만 한다.
+    실패하면 TranscriptError (TranscriptUnavailable / TranscriptFetchFailed)를 던진다.
+    """
+    video_id = extract_video_id(video_id_or_url)
+
+    # 미리 받아 둔 자막 (tools/ingest_course.py 또는 이전 사용자)
+    cached = get_content_cache().get_transcript(video_id, language)
+    if cached is not None:
+        return cached
+
+    key = singleflight.make_key(video_id, language)
+    return singleflight.do(
+        "transcript", key, lambda: _fetch_transcript(video_id, language)
+    )
+
+
+def _download(video_id: str, language: str) -> dict:
+    """자막 목록 조회 + 본문 다운로드 → {"language": 코드, "segments": [[시작 초, 텍스트], ...]}"""
+    # 자막 라이브러리는 캐시에 없는 영상을 처음 받을 때만 불러옴 (앱 시작 시간 단축)
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    api = YouTubeTranscriptApi()
+
+    try:
+        with telemetry.span("transcript.list", video_id=video_id):
+            transcript_list = api.list(video_id)
+        transcript = None
+
+        # 지정 언어 우선
+        try:
+            transcript = transcript_list.find_transcript([language])
+        except Exception:
+            # 없으면 사용 가능한 첫 번째 자막
+            transcript = next(iter(transcript_list), None)
+        if transcript is None:
+            raise TranscriptUnavailable("이 영상에는 자막이 없습니다.")
+
+        with telemetry.span("transcript.fetch", video_id=video_id) as sp:
+            transcript_data = transcript.fetch()
+            sp.set(language=transcript.language_code)
+    except Exception as e:
+        if type(e).__name__ in UNAVAILABLE_ERRORS:
+            raise TranscriptUnavailable(f"자막을 볼 수 없는 영상입니다 ({type(e).__name__}).") from e
+        raise
+    return {
+        "language": transcript.language_code,
+        "segments": [[entry.start, entry.text] for entry in transcript_data],
+    }
+
+
+def _fetch_transcript(video_id: str, language: str) -> str:
+    request = {"video_id": video_id, "language": language}
+    try:
+        # 마감 시간 / 재시도 / 헤징 (utils/resilience.py), 기록/재생 모드면 카세트를 거침 (utils/transport.py)
+        data = resilience.call(
+            "transcript",
+            lambda: transport.call("transcript", request, lambda: _download(video_id, language)),
+        )
+    except TranscriptUnavailable:
+        telemetry.incr("transcript_errors", error="TranscriptUnavailable")
+        raise
+    except Exception as e:
+        name = e.type_name if isinstance(e, transport.ReplayedError) else type(e).__name__
+        telemetry.incr("transcript_errors", error=name)
+        if name == TranscriptUnavailable.__name__:
+            raise TranscriptUnavailable(str(e)) from e
+        raise TranscriptFetchFailed(f"{ERROR_PREFIX}: {e}") from e
+
+    segments = data["segments"]
+    result = f"[{data['language']}] " + " ".join(text for _, text in segments)
+
+    cache = get_content_cache()
+    cache.put_transcript(video_id, language, result, segments)
+
+    # 내 자료 검색용 (시간 정보가 있는 자막 줄 단위로 색인, 백그라운드)
+    index = get_search_index()
+    index.submit(
+        index.index_transcript,
+        video_id,
+        segments,
+        cache.video_title(video_id),
+    )
+    return result
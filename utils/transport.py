@@ -0,0 +1,227 @@
+# streamlit_app/utils/transport.py
+"""
+외부 API 호출 기록 / 재생 (YouTube Data API, 자막 API).
+
+벤치마크, 오프라인 데모, CI 성능 측정에서 API 키와 네트워크 없이
+실제 앱 코드 경로(utils/youtube_api2.py, utils/transcript.py)를 그대로 돌리기 위한 층.
+
+환경변수:
+    APP_TRANSPORT_MODE=passthrough   기본. 그대로 호출
+                      record         호출하고 요청/응답을 카세트에 저장
+                      replay         카세트에서만 응답 (네트워크/API 키 불필요, 없으면 CassetteMiss)
+    APP_CASSETTE=cassette.db         카세트 파일 (상대 경로면 DATA_DIR 아래)
+    APP_REPLAY_LATENCY=recorded      재생 시 대기: recorded(기록된 소요 시간) 또는 ms 숫자 (0이면 대기 없음)
+    APP_REPLAY_LATENCY_SCALE=1.0     recorded일 때 곱하는 배율
+
+카세트는 SQLite 한 파일: (서비스, 요청 해시) → zlib 압축한 JSON 응답 + 소요 시간 + 에러.
+같은 요청은 항상 같은 응답이 나오므로 재생 결과가 결정적이다.
+videos().list처럼 여러 세션의 ID를 묶어서 보내는 호출은 묶음 구성이 실행마다 달라지므로
+call_batched()로 ID 하나씩 따로 저장한다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+from utils import telemetry
+from utils.storage import connect
+
+PASSTHROUGH = "passthrough"
+RECORD = "record"
+REPLAY = "replay"
+
+MODE = os.getenv("APP_TRANSPORT_MODE", PASSTHROUGH).strip().lower() or PASSTHROUGH
+CASSETTE_FILE = os.getenv("APP_CASSETTE", "cassette.db")
+REPLAY_LATENCY = os.getenv("APP_REPLAY_LATENCY", "recorded")
+REPLAY_LATENCY_SCALE = float(os.getenv("APP_REPLAY_LATENCY_SCALE", "1.0"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS interactions (
+    service      TEXT NOT NULL,
+    key          TEXT NOT NULL,          -- 요청 JSON의 sha1
+    request      TEXT NOT NULL,          -- 요청 JSON (확인용)
+    response     BLOB,                   -- zlib(JSON), 에러면 NULL
+    error        TEXT,                   -- "예외이름: 메시지"
+    duration_ms  REAL NOT NULL,
+    recorded_at  REAL NOT NULL,
+    PRIMARY KEY (service, key)
+) WITHOUT ROWID;
+"""
+
+
+class CassetteMiss(LookupError):
+    """replay 모드에서 카세트에 없는 요청."""
+
+
+class ReplayedError(Exception):
+    """기록할 때 났던 예외를 재생 (원래 예외 이름은 type_name)."""
+
+    def __init__(self, type_name: str, message: str):
+        super().__init__(message)
+        self.type_name = type_name
+
+
+def request_key(request) -> str:
+    raw = json.dumps(request, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _encode(value) -> bytes:
+    return zlib.compress(
+        json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    )
+
+
+def _decode(blob: bytes):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class Cassette:
+    def __init__(self, filename: str = CASSETTE_FILE):
+        self._lock = threading.Lock()
+        self._conn = connect(filename)
+        self._conn.executescript(SCHEMA)
+
+    def get(self, service: str, key: str):
+        """(response, error, duration_ms) 또는 없으면 None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, error, duration_ms FROM interactions WHERE service = ? AND key = ?",
+                (service, key),
+            ).fetchone()
+        if row is None:
+            return None
+        response, error, duration_ms = row
+        return (_decode(response) if response is not None else None), error, duration_ms
+
+    def put(self, service: str, key: str, request, response=None, error: str = None, duration_ms: float = 0.0):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO interactions "
+                "(service, key, request, response, error, duration_ms, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    service,
+                    key,
+                    json.dumps(request, ensure_ascii=False, sort_keys=True),
+                    _encode(response) if error is None else None,
+                    error,
+                    duration_ms,
+                    time.time(),
+                ),
+            )
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT service, COUNT(*), SUM(LENGTH(response)) FROM interactions GROUP BY service"
+            ).fetchall()
+        return {service: {"requests": n, "bytes": size or 0} for service, n, size in rows}
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Cassette:
+    global _cassette
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                _cassette = Cassette()
+    return _cassette
+
+
+# ================================================================
+# 호출 감싸기
+# ================================================================
+def _replay_sleep(duration_ms: float):
+    if REPLAY_LATENCY == "recorded":
+        delay = duration_ms / 1000 * REPLAY_LATENCY_SCALE
+    else:
+        delay = float(REPLAY_LATENCY) / 1000
+    if delay > 0:
+        time.sleep(delay)
+
+
+def _raise_recorded(error: str):
+    type_name, _, message = error.partition(": ")
+    raise ReplayedError(type_name, message)
+
+
+def call(service: str, request: dict, fn):
+    """
+    fn()을 현재 모드에 맞게 실행.
+    request: 응답을 결정하는 요청 내용 (JSON으로 바꿀 수 있어야 함, API 키 같은 비밀값은 넣지 않음)
+    fn의 반환값도 JSON으로 바꿀 수 있어야 한다.
+    """
+    if MODE == PASSTHROUGH:
+        return fn()
+
+    key = request_key(request)
+    cassette = get_cassette()
+
+    if MODE == REPLAY:
+        found = cassette.get(service, key)
+        if found is None:
+            telemetry.incr("transport", mode=MODE, service=service, result="miss")
+            raise CassetteMiss(f"카세트에 없는 요청: {service} {json.dumps(request, ensure_ascii=False)}")
+        response, error, duration_ms = found
+        telemetry.incr("transport", mode=MODE, service=service, result="hit")
+        _replay_sleep(duration_ms)
+        if error is not None:
+            _raise_recorded(error)
+        return response
+
+    start = time.perf_counter()
+    try:
+        response = fn()
+    except Exception as e:
+        duration_ms = (time.perf_counter() - start) * 1000
+        cassette.put(service, key, request, error=f"{type(e).__name__}: {e}", duration_ms=duration_ms)
+        telemetry.incr("transport", mode=MODE, service=service, result="error")
+        raise
+    cassette.put(service, key, request, response, duration_ms=(time.perf_counter() - start) * 1000)
+    telemetry.incr("transport", mode=MODE, service=service, result="recorded")
+    return response
+
+
+def call_batched(service: str, ids: list, fn, item_id) -> list:
+    """
+    ID 목록을 한 번에 조회하는 호출 (fn(ids) → item 목록).
+    기록은 ID 하나씩 (응답에 없던 ID는 null로 저장 → 재생 때도 빠짐).
+    재생 대기 시간은 묶음 중 가장 오래 걸렸던 기록 기준.
+    """
+    if MODE == PASSTHROUGH:
+        return fn(ids)
+
+    cassette = get_cassette()
+
+    if MODE == REPLAY:
+        items, slowest = [], 0.0
+        for vid in ids:
+            found = cassette.get(service, vid)
+            if found is None:
+                telemetry.incr("transport", mode=MODE, service=service, result="miss")
+                raise CassetteMiss(f"카세트에 없는 요청: {service} {vid}")
+            item, error, duration_ms = found
+            if error is not None:
+                _raise_recorded(error)
+            slowest = max(slowest, duration_ms)
+            if item is not None:
+                items.append(item)
+        telemetry.incr("transport", len(ids), mode=MODE, service=service, result="hit")
+        _replay_sleep(slowest)
+        return items
+
+    start = time.perf_counter()
+    items = fn(ids)
+    duration_ms = (time.perf_counter() - start) * 1000
+    by_id = {item_id(item): item for item in items}
+    for vid in ids:
+        cassette.put(service, vid, {"id": vid}, by_id.get(vid), duration_ms=duration_ms)
+    telemetry.incr("transport", len(ids), mode=MODE, service=service, result="recorded")
+    return items
@@ -1,13 +1,28 @@
 # streamlit_app/utils/youtube_api.py
 import os
 import math
-from googleapiclient.discovery import build
+import time
 from dotenv import load_dotenv
 
+from utils import course_pack, resilience, telemetry, transport
+from utils.cache import TTLCache
+from utils.content_cache import get_content_cache
+from utils.quota_scheduler import (
+    INTERACTIVE,
+    MAX_IDS_PER_CALL,
+    PLAYLIST_ITEMS_COST,
+    SEARCH_COST,
+    QuotaExceededError,
+    get_quota_scheduler,
+)
+
 load_dotenv()  # .env 읽기
 
 API_KEY = os.getenv("YOUTUBE_API_KEY")
 
+# 검색 결과 캐시: 6시간 동안은 fresh, 할당량 부족 시에는 3일 지난 결과까지 사용
+SEARCH_CACHE = TTLCache("youtube_search", ttl=6 * 3600, max_items=5000, stale_ttl=3 * 86400)
+
 
 def _compute_score(snippet: dict, stats: dict, query: str) -> float:
     """
@@ -51,9 +66,76 @@ def _compute_score(snippet: dict, stats: dict, query: str) -> float:
     return score
 
 
-def search_youtube_videos(query: str, max_results: int = 10):
+def _require_api_key():
+    # 카세트 재생(utils/transport.py)은 API 키 없이 동작
+    if not API_KEY and transport.MODE != transport.REPLAY:
+        raise ValueError("YOUTUBE_API_KEY가 .env에 설정되어 있지 않습니다.")
+
+
+def _client():
+    """YouTube Data API 클라이언트.
+    googleapiclient는 import만 해도 수백 ms가 걸려서, 첫 화면이 아니라 실제 호출할 때 불러온다.
+    소켓 타임아웃을 줘서 마감 시간(utils/resilience.py)을 넘긴 호출 스레드도 결국 끝나게 한다."""
+    import httplib2
+    from googleapiclient.discovery import build
+
+    http = httplib2.Http(timeout=resilience.SOCKET_TIMEOUT)
+    return build("youtube", "v3", developerKey=API_KEY, http=http)
+
+
+def _execute(resource: str, before_retry=None, **params) -> dict:
+    """
+    youtube.<resource>().list(**params).execute()
+    마감 시간/재시도/서킷 브레이커는 utils/resilience.py, 기록/재생은 utils/transport.py.
+    """
+    return resilience.call(
+        f"youtube.{resource}",
+        lambda: transport.call(
+            f"youtube.{resource}.list",
+            params,
+            lambda: getattr(_client(), resource)().list(**params).execute(),
+        ),
+        before_retry=before_retry,
+    )
+
+
+def _fetch_video_items(ids: list) -> list:
+    """videos().list 호출 1번 (id 최대 50개). 할당량은 QuotaScheduler가 관리."""
+
+    def fetch(batch):
+        # 묶음 구성은 실행마다 달라지므로 카세트에는 영상 하나씩 저장 (call_batched)
+        response = _client().videos().list(part="snippet,statistics", id=",".join(batch)).execute()
+        return response.get("items", [])
+
+    with telemetry.span("youtube.videos.list", ids=len(ids)):
+        return resilience.call(
+            "youtube.videos",
+            lambda: transport.call_batched("youtube.videos.item", ids, fetch, lambda item: item["id"]),
+        )
+
+
+def _search_cache_key(query: str, max_results: int) -> tuple:
+    return (" ".join((query or "").lower().split()), max_results)
+
+
+def is_search_cached(query: str, max_results: int = 10) -> bool:
+    """만료되지 않은 검색 결과가 캐시에 있는지 (캐시 통계에는 반영 안 함)."""
+    entry = SEARCH_CACHE.peek(_search_cache_key(query, max_results))
+    return entry is not None and time.time() - entry[0] <= SEARCH_CACHE.ttl
+
+
+def search_youtube_videos(
+    query: str,
+    max_results: int = 10,
+    feature: str = "search",
+    priority: int = INTERACTIVE,
+):
     """키워드로 유튜브 영상 검색 후 '커스텀 점수' 순으로 정렬해서 리턴.
 
+    feature: 할당량 사용량 집계용 이름 (search, timetable, prefetch ...)
+    priority: INTERACTIVE(사용자가 직접 검색) / PREFETCH(미리 불러오기)
+    코스팩 / 캐시에 있는 검색어는 바로 반환하고, 할당량이 부족하면 예전(stale) 결과를 반환.
+
     반환 형식: [
         {
             "video_id": "...",
@@ -69,32 +151,71 @@ def search_youtube_videos(query: str, max_results: int = 10):
         ...
     ]
     """
-    if not API_KEY:
-        raise ValueError("YOUTUBE_API_KEY가 .env에 설정되어 있지 않습니다.")
+    # 오프라인 코스팩(utils/course_pack.py)에 있는 검색어 (시간표 주차 검색어)는 네트워크 없이
+    packed = course_pack.find_json(course_pack.search_name(query))
+    if packed is not None:
+        return packed[:max_results]
+
+    _require_api_key()
 
-    youtube = build("youtube", "v3", developerKey=API_KEY)
+    cache_key = _search_cache_key(query, max_results)
+    cached = SEARCH_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # YouTube 장애로 서킷이 열려 있으면 할당량을 쓰지 않고 예전 결과로
+    if resilience.get_breaker("youtube.search").is_open():
+        stale = SEARCH_CACHE.get(cache_key, allow_stale=True)
+        if stale is not None:
+            telemetry.incr("youtube_search_stale", reason="circuit_open")
+            return stale
+
+    scheduler = get_quota_scheduler()
+    if not scheduler.try_acquire(SEARCH_COST, feature, priority, method="search.list"):
+        # 할당량 부족 → 예전 결과라도 보여줌
+        stale = SEARCH_CACHE.get(cache_key, allow_stale=True)
+        if stale is not None:
+            return stale
+        raise QuotaExceededError(
+            "오늘 사용할 수 있는 YouTube 검색 할당량을 모두 사용했습니다. 잠시 후 다시 시도해 주세요."
+        )
 
     # 1) 검색으로 videoId 리스트 가져오기
-    search_response = youtube.search().list(
-        q=query,
-        part="snippet",
-        type="video",
-        maxResults=max_results,
-        order="relevance",  # 1차 필터는 유튜브 기본 관련도
-    ).execute()
+    try:
+        with telemetry.span("youtube.search.list", max_results=max_results):
+            search_response = _execute(
+                "search",
+                # 재시도도 search.list 1번 → 할당량을 다시 확인
+                before_retry=lambda: scheduler.try_acquire(
+                    SEARCH_COST, feature, priority, method="search.list"
+                ),
+                q=query,
+                part="snippet",
+                type="video",
+                maxResults=max_results,
+                order="relevance",  # 1차 필터는 유튜브 기본 관련도
+            )
+    except resilience.UpstreamError:
+        # 시간 초과 / 재시도 실패 / 서킷 열림 → 예전 결과라도 보여줌
+        stale = SEARCH_CACHE.get(cache_key, allow_stale=True)
+        if stale is not None:
+            telemetry.incr("youtube_search_stale", reason="upstream_error")
+            return stale
+        raise
 
     video_ids = [item["id"]["videoId"] for item in search_response.get("items", [])]
     if not video_ids:
         return []
 
     # 2) statistics 호출해서 조회수/좋아요/댓글 가져오기
-    videos_response = youtube.videos().list(
-        part="snippet,statistics",
-        id=",".join(video_ids),
-    ).execute()
+    #    (다른 세션의 조회와 합쳐서 최대 50개씩 한 번에 요청)
+    items_by_id = scheduler.fetch_videos(video_ids, _fetch_video_items, feature, priority)
 
     results = []
-    for item in videos_response.get("items", []):
+    for vid in dict.fromkeys(video_ids):  # 중복 ID 제거 (순서 유지)
+        item = items_by_id.get(vid)
+        if item is None:
+            continue
         stats = item.get("statistics", {})
         snippet = item.get("snippet", {})
 
@@ -118,4 +239,53 @@ def search_youtube_videos(query: str, max_results: int = 10):
 
     # 커스텀 점수 내림차순 정렬
     results.sort(key=lambda x: x["score"], reverse=True)
+    SEARCH_CACHE.set(cache_key, results)
     return results
+
+
+def quota_report() -> dict:
+    """기능별 YouTube 할당량 사용량."""
+    return get_quota_scheduler().usage_report()
+
+
+def get_video_details(video_ids: list, feature: str = "ingest", priority: int = INTERACTIVE) -> dict:
+    """
+    video_id 목록 → videos().list item 딕셔너리.
+    가져온 정보는 영구 캐시(utils/content_cache.py)에도 저장 (일괄 처리용).
+    """
+    _require_api_key()
+
+    items_by_id = {}
+    ids = list(dict.fromkeys(video_ids))
+    scheduler = get_quota_scheduler()
+    for i in range(0, len(ids), MAX_IDS_PER_CALL):
+        items_by_id.update(
+            scheduler.fetch_videos(ids[i : i + MAX_IDS_PER_CALL], _fetch_video_items, feature, priority)
+        )
+    get_content_cache().put_videos(list(items_by_id.values()))
+    return items_by_id
+
+
+def fetch_playlist_video_ids(playlist_id: str, feature: str = "ingest") -> list:
+    """재생목록의 모든 video_id (playlistItems().list, 페이지당 1 unit)."""
+    _require_api_key()
+
+    scheduler = get_quota_scheduler()
+    video_ids = []
+    page_token = None
+    while True:
+        scheduler.acquire(PLAYLIST_ITEMS_COST, feature, method="playlistItems.list")
+        with telemetry.span("youtube.playlistItems.list", playlist_id=playlist_id):
+            response = _execute(
+                "playlistItems",
+                part="contentDetails",
+                playlistId=playlist_id,
+                maxResults=MAX_IDS_PER_CALL,
+                pageToken=page_token,
+            )
+        video_ids.extend(
+            item["contentDetails"]["videoId"] for item in response.get("items", [])
+        )
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return video_ids
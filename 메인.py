@@ -4,15 +4,31 @@ import streamlit as st
 from datetime import date
 from io import BytesIO
 
-from docx import Document
+from utils import telemetry
 from utils.youtube_api2 import search_youtube_videos
 
-# 🔥 유튜브 자막 추출용 라이브러리 & URL 파싱
-from youtube_transcript_api import YouTubeTranscriptApi
-from urllib.parse import urlparse, parse_qs
+# 🔥 유튜브 자막 추출 (utils/transcript.py)
+from utils.transcript import TranscriptError, fetch_transcript
 
-# LLM 요약 모듈 (퀴즈는 퀴즈 페이지에서)
-from llm import summarize_text
+# LLM 요약 모듈 (퀴즈는 퀴즈 페이지에서). 모델은 처음 요약할 때 로딩됨
+from llm import preload_model, should_shed, summarize_text
+
+# LLM 요약 전에 바로 보여줄 추출 요약
+from utils.extractive import extractive_summary
+
+# 긴 강의를 주제별 챕터로 나눠서 챕터마다 요약 / 퀴즈
+from utils.chapters import cached_summary, get_chapters, summarize_chapter, summarize_chapters
+
+# 퀴즈 결과 기반 복습 항목 (체크리스트 자동 추가)
+from utils.review_scheduler import get_review_scheduler, plan_review_rows
+from utils.search_index import KIND_LABELS, get_search_index, search as search_my_notes
+# 자막/요약/검색 결과는 세션 간 공유 저장소에 두고 session_state에는 Handle만
+from utils import admission, content_store, course_pack
+from utils.storage import get_student_id
+# 메모 / 체크리스트 자동 저장 + 버전 기록
+from utils.autosave import dump_rows, get_autosaver, load_rows
+from utils.suggest import get_suggester, normalize as normalize_query
+from utils.timetable_data import DEFAULT_SEMESTER
 
 
 # -----------------------------------------------------------
@@ -20,6 +36,9 @@ from llm import summarize_text
 # -----------------------------------------------------------
 st.set_page_config(page_title="졸해 해커톤", page_icon="🎓", layout="wide")
 
+# 페이지 렌더링 시간 측정 (파일 끝에서 end)
+_render_span = telemetry.start_span("page.render", page="메인")
+
 if "saved_videos" not in st.session_state:
     st.session_state.saved_videos = []
 
@@ -57,63 +76,6 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# -----------------------------------------------------------
-# 유튜브 자막 추출용 함수들
-# -----------------------------------------------------------
-
-def extract_video_id(video_id_or_url: str) -> str:
-    """
-    유튜브 풀 URL이 오든, 순수 video_id가 오든
-    항상 video_id만 뽑아서 반환.
-    """
-    s = video_id_or_url.strip()
-
-    # youtu.be 단축 URL
-    if "youtu.be" in s:
-        parsed = urlparse(s)
-        return parsed.path.lstrip("/")
-
-    # youtube.com/watch?v= 형태
-    if "youtube.com" in s:
-        parsed = urlparse(s)
-        qs = parse_qs(parsed.query)
-        v = qs.get("v")
-        if v and len(v) > 0:
-            return v[0]
-
-    # 그 외에는 이미 video_id라고 가정
-    return s
-
-
-def fetch_transcript(video_id_or_url: str, language: str = "ko") -> str:
-    """
-    유튜브 video_id 또는 URL + 언어코드로 자막 텍스트를 반환.
-    """
-    try:
-        video_id = extract_video_id(video_id_or_url)
-
-        api = YouTubeTranscriptApi()
-
-        transcript_list = api.list(video_id)
-        transcript = None
-
-        # 지정 언어 우선
-        try:
-            transcript = transcript_list.find_transcript([language])
-        except Exception:
-            # 없으면 사용 가능한 첫 번째 자막
-            transcript = next(iter(transcript_list))
-
-        transcript_data = transcript.fetch()
-        text_list = [entry.text for entry in transcript_data]
-
-        full_text = " ".join(text_list)
-        return f"[{transcript.language_code}] {full_text}"
-
-    except Exception as e:
-        return f"자막을 가져오는 중 오류 발생: {e}"
-
-
 # -----------------------------------------------------------
 # Session State 초기값 설정
 # -----------------------------------------------------------
@@ -137,14 +99,20 @@ if "ai_summary" not in st.session_state:
 if "checklists" not in st.session_state:
     st.session_state.checklists = {}
 
-# 학습 메모
+# 학습 메모 (자동 저장된 내용이 있으면 이어서)
 if "study_memo" not in st.session_state:
-    st.session_state.study_memo = ""
+    st.session_state.study_memo = (
+        get_autosaver().load(get_student_id(st.session_state), "memo", "memo") or ""
+    )
 
 # 현재 선택한 영상의 자막 텍스트
 if "video_transcript" not in st.session_state:
     st.session_state.video_transcript = None
 
+# 자막을 가져오지 못했을 때의 오류 메시지 (요약 단계는 건너뜀)
+if "transcript_error" not in st.session_state:
+    st.session_state.transcript_error = None
+
 # 퀴즈 페이지에 넘길 요약 텍스트
 if "quiz_source_summary" not in st.session_state:
     st.session_state.quiz_source_summary = ""
@@ -160,6 +128,44 @@ if "selected_video_title" not in st.session_state:
 DEFAULT_ROWS = 3  # 체크리스트 기본 행 수
 
 
+def render_history(kind: str, name: str, on_restore):
+    """자동 저장된 이전 버전 목록 + 되돌리기 버튼 (utils/autosave.py)."""
+    from datetime import datetime
+
+    autosaver = get_autosaver()
+    student_id = get_student_id(st.session_state)
+    versions = autosaver.history(student_id, kind, name)
+    if len(versions) < 2:
+        return
+    with st.expander(f"🕘 이전 버전 ({len(versions)}개)"):
+        labels = {
+            v["version"]: f"v{v['version']} · {datetime.fromtimestamp(v['ts']):%m-%d %H:%M:%S} · {v['size']}자"
+            for v in versions[1:]  # 맨 앞은 지금 내용
+        }
+        version = st.selectbox(
+            "버전",
+            list(labels),
+            format_func=labels.get,
+            key=f"history_{kind}_{name}",
+            label_visibility="collapsed",
+        )
+        preview = autosaver.text_at(student_id, kind, name, version)
+        if kind == "checklist":
+            preview = "\n".join(
+                f"{'☑' if r['done'] else '☐'} {r['text']}" for r in load_rows(preview) if r["text"]
+            )
+        st.text(preview[:1000] or "(비어 있음)")
+        st.button(
+            "이 버전으로 되돌리기",
+            key=f"restore_{kind}_{name}",
+            on_click=on_restore,
+            args=(version,),
+        )
+
+
+SUGGESTION_ICONS = {"history": "🕘", "syllabus": "📘", "saved": "🔖"}
+
+
 # ===========================================================
 # 1. 사이드바: 검색 & 결과 목록
 # ===========================================================
@@ -176,26 +182,63 @@ with st.sidebar:
     with button_col:
         search_button = st.button("검색", use_container_width=True)
 
+    # 추천 검색어를 누르면 그 검색어로 바로 검색
+    if st.session_state.pop("suggestion_clicked", False):
+        search_button = True
+
+    # 추천 검색어: 검색 기록 / 강의계획서 주차 / 저장한 영상 제목 (utils/suggest.py)
+    # 1순위는 할당량 여유가 있으면 백그라운드에서 검색 결과를 미리 불러옴
+    if search_query.strip() and not search_button:
+        suggestions = get_suggester().suggest(
+            search_query,
+            limit=5,
+            extra=[v.get("title") or "" for v in st.session_state.saved_videos],
+            prefetch=True,
+        )
+        suggestions = [s for s in suggestions if normalize_query(s["query"]) != normalize_query(search_query)]
+        if suggestions:
+            st.caption("추천 검색어")
+
+            def use_suggestion(query):
+                st.session_state.search_query = query
+                st.session_state.suggestion_clicked = True
+
+            for i, s in enumerate(suggestions):
+                st.button(
+                    f"{SUGGESTION_ICONS.get(s['source'], '🔎')} {s['query']}",
+                    key=f"suggestion_{i}",
+                    on_click=use_suggestion,
+                    args=(s["query"],),
+                    use_container_width=True,
+                )
+
     # 검색 실행
     if search_button and search_query.strip():
+        get_suggester().record(search_query)
         with st.spinner("YouTube에서 영상을 불러오는 중..."):
             try:
                 results = search_youtube_videos(search_query, max_results=10)
-                st.session_state.search_results = results
+                content_store.put(st.session_state, "search_results", results)
                 st.session_state.search_performed = True
                 # 새 검색을 하면 선택 초기화
                 st.session_state.selected_video = None
                 st.session_state.selected_video_id = None
-                st.session_state.video_transcript = None
-                st.session_state.ai_summary = ""
-                st.session_state.quiz_source_summary = ""
+                content_store.reset(
+                    st.session_state,
+                    video_transcript=None,
+                    ai_summary="",
+                    quiz_source_summary="",
+                )
                 st.session_state.selected_video_title = None
+                st.session_state.transcript_error = None
+                # 직접 검색한 영상은 특정 과목/주차와 연결하지 않음
+                st.session_state.study_context = None
             except Exception as e:
                 st.error(f"영상 검색 중 오류가 발생했습니다: {e}")
-                st.session_state.search_results = []
+                content_store.put(st.session_state, "search_results", [])
                 st.session_state.search_performed = True
 
-    video_list = st.session_state.search_results
+    video_list = content_store.get(st.session_state, "search_results", [])
 
     st.markdown("---")
     st.subheader("검색 결과 (추천 순)")
@@ -211,12 +254,21 @@ with st.sidebar:
                 st.session_state.selected_video_title = vid["title"]
 
                 # 새 영상 선택 시 상태 초기화
-                st.session_state.video_transcript = None
-                st.session_state.ai_summary = ""
-                st.session_state.quiz_source_summary = ""
+                st.session_state.video_start = None
+                st.session_state.transcript_error = None
+                # 이전 영상의 요약/퀴즈 작업이 LLM 대기열에 남아 있으면 취소
+                admission.get_admission().cancel_user(
+                    get_student_id(st.session_state), keep_tag=vid["video_id"]
+                )
+                content_store.reset(
+                    st.session_state,
+                    video_transcript=None,
+                    ai_summary="",
+                    quiz_source_summary="",
+                )
 
                 # 다른 체크박스는 모두 False로 초기화
-                for j in range(len(st.session_state.search_results)):
+                for j in range(len(video_list)):
                     if j != i:
                         key = f"video_cb_{j}"
                         if key in st.session_state:
@@ -244,7 +296,7 @@ with st.sidebar:
                 with thumb_col:
                     if video.get("thumbnail"):
                         st.image(
-                            video["thumbnail"],
+                            course_pack.thumbnail(video),
                             width=50,
                         )
 
@@ -258,6 +310,25 @@ with st.sidebar:
         else:
             st.write("검색어를 입력하고 검색 버튼을 눌러 주세요.")
 
+    # ------------------ 내 자료 검색 (자막/요약/메모/저장한 영상) ------------------
+    st.markdown("---")
+    with st.expander("🔎 내 자료 검색"):
+        note_query = st.text_input(
+            "내 자료 검색",
+            key="note_search_query",
+            label_visibility="collapsed",
+            placeholder="예: 부분적분",
+        )
+        if note_query.strip():
+            hits = search_my_notes(note_query, get_student_id(st.session_state), limit=5)
+            for hit in hits:
+                label = KIND_LABELS.get(hit["kind"], hit["kind"])
+                where = f" · {hit['time']}" if hit["time"] else ""
+                st.markdown(f"**{hit['title'] or label}** ({label}{where})  \n{hit['snippet']}")
+            if not hits:
+                st.caption("검색 결과가 없습니다.")
+        st.page_link("pages/검색.py", label="검색 페이지에서 자세히 보기", icon="🔎")
+
 
 # ===========================================================
 # 2. 메인 레이아웃: 왼쪽(영상/요약/퀴즈 버튼) + 오른쪽(메모/캘린더)
@@ -275,14 +346,27 @@ with col_main:
     if video:
         video_url = f"https://www.youtube.com/watch?v={video['video_id']}"
 
-        # (1) 영상 플레이어
-        st.video(video_url)
+        # (1) 영상 플레이어 (검색 페이지에서 특정 시간으로 들어온 경우 그 위치부터)
+        start = st.session_state.get("video_start")
+        start_time = int(start[1]) if start and start[0] == video["video_id"] else 0
+        st.video(video_url, start_time=start_time)
 
         # 자막 가져와서 세션에 저장
-        if st.session_state.video_transcript is None:
+        video_transcript = content_store.get(st.session_state, "video_transcript")
+        if video_transcript is None:
+            # 자막을 받는 동안 백그라운드에서 모델 로딩
+            preload_model()
             with st.spinner("자막 가져오는 중..."):
-                transcript_text = fetch_transcript(video_url, language="ko")
-                st.session_state.video_transcript = transcript_text
+                try:
+                    video_transcript = fetch_transcript(video_url, language="ko")
+                except TranscriptError as e:
+                    # 오류 메시지가 요약/퀴즈 입력으로 들어가지 않도록 자막은 빈 값으로 둠
+                    st.session_state.transcript_error = str(e)
+                    video_transcript = ""
+                content_store.put(st.session_state, "video_transcript", video_transcript)
+            if video_transcript:
+                # 내 자료 검색 결과에 영상 제목이 보이도록
+                get_search_index().set_video_title(video["video_id"], video["title"])
 
         # 제목 + 나중에 보기 버튼
         title_col, save_btn_col = st.columns([5, 1])
@@ -296,6 +380,9 @@ with col_main:
             if st.button("🔖저장", key="save_for_later"):
                 if video not in st.session_state.saved_videos:
                     st.session_state.saved_videos.append(video)
+                    get_search_index().index_saved_video(
+                        get_student_id(st.session_state), video
+                    )
                     st.toast("저장되었습니다", icon="ℹ️")
                 else:
                     st.toast("이미 저장된 영상입니다.", icon="⚠️")
@@ -303,21 +390,131 @@ with col_main:
         st.markdown("---")
 
         # (3) AI 내용 요약 공간
-        if st.session_state.video_transcript is None:
-            with st.spinner("자막 다시 가져오는 중..."):
-                transcript = fetch_transcript(video_url)
-                st.session_state.video_transcript = transcript
-
-        if st.session_state.ai_summary == "" and st.session_state.video_transcript:
-            with st.spinner("AI 요약 생성 중..."):
-                summary = summarize_text(st.session_state.video_transcript)
-                st.session_state.ai_summary = summary
-
-        st.text_area(
-            "AI 요약 결과",
-            value=st.session_state.ai_summary,
-            height=200
-        )
+        if not video_transcript and st.session_state.transcript_error:
+            st.error(st.session_state.transcript_error)
+            if st.button("자막 다시 가져오기", key="retry_transcript"):
+                st.session_state.transcript_error = None
+                content_store.put(st.session_state, "video_transcript", None)
+                st.rerun()
+
+        # 추출 요약(수 ms)을 먼저 보여주고, LLM 요약이 끝나면 같은 자리에 바꿔 끼움
+        quick_summary = extractive_summary(video_transcript or "")
+        summary_box = st.empty()
+        queue_note = st.empty()
+        ai_summary = content_store.get(st.session_state, "ai_summary", "")
+
+        def show_queue_position(position):
+            """LLM 대기열에서 기다리는 동안 대기 순서 표시 (utils/admission.py)."""
+            if position > 0:
+                queue_note.caption(f"⏳ AI 요약 대기 중 · 내 앞에 {position - 1}개의 요청이 있어요.")
+
+        def run_queued(task, fn, batch=False):
+            """
+            LLM 작업 (사용자별 공정 대기열을 거침). 한도 초과면 빈 문자열.
+            batch=True: fn 안의 여러 LLM 호출을 요청 하나로 셈 (챕터 일괄 요약)
+            """
+            try:
+                with admission.user_context(
+                    get_student_id(st.session_state),
+                    tag=video["video_id"],
+                    on_wait=show_queue_position,
+                    batch=batch,
+                ):
+                    return fn()
+            except admission.AdmissionError as e:
+                # 속도 제한(RateLimited) 또는 다른 영상을 골라서 취소됨(JobCancelled)
+                telemetry.incr("llm_admission_refused", task=task, reason=type(e).__name__)
+                st.warning(str(e))
+                return ""
+            finally:
+                queue_note.empty()
+
+        def run_summary():
+            return run_queued("summary", lambda: summarize_text(video_transcript, video["video_id"]))
+
+        if ai_summary == "" and video_transcript:
+            if should_shed():
+                # LLM 작업이 밀려 있으면 추출 요약만 제공 (다음 실행 때 다시 시도)
+                telemetry.incr("llm_shed", task="summary")
+            else:
+                summary_box.text_area(
+                    "AI 요약 결과 (빠른 요약 · AI 요약 생성 중...)",
+                    value=quick_summary,
+                    height=200,
+                )
+                with st.spinner("AI 요약 생성 중..."):
+                    ai_summary = run_summary()
+                    content_store.put(st.session_state, "ai_summary", ai_summary)
+
+        if ai_summary:
+            summary_box.text_area(
+                "AI 요약 결과",
+                value=ai_summary,
+                height=200
+            )
+        else:
+            summary_box.text_area(
+                "AI 요약 결과 (빠른 요약)",
+                value=quick_summary,
+                height=200
+            )
+            if quick_summary:
+                st.caption("요청이 많아 핵심 문장만 뽑은 빠른 요약을 먼저 보여드려요. AI 요약은 잠시 후 다시 시도합니다.")
+
+        # (3-1) 챕터: 주제가 바뀌는 곳에서 나눈 구간 (utils/chapters.py)
+        # 챕터 요약은 챕터 텍스트 기준으로 캐시되므로 이미 요약한 챕터는 다시 만들지 않음
+        chapters = get_chapters(video["video_id"], video_transcript) if video_transcript else []
+        if len(chapters) > 1:
+            with st.expander(f"📑 챕터 ({len(chapters)}개)"):
+                pending = [c for c in chapters if cached_summary(c) is None]
+                summarize_all = False
+                if pending and not should_shed():
+                    summarize_all = st.button(f"남은 챕터 {len(pending)}개 AI 요약", key="summarize_chapters")
+                    progress_note = st.empty()
+
+                def seek(seconds):
+                    st.session_state.video_start = (video["video_id"], seconds)
+
+                summary_slots = {}  # 챕터 key → 요약 자리 (일괄 요약이 끝나는 대로 바꿔 끼움)
+                for chapter in chapters:
+                    chapter_summary = cached_summary(chapter)
+                    head_col, go_col = st.columns([5, 1])
+                    head_col.markdown(f"**{chapter['label']}** · {chapter['title']}")
+                    if chapter["start"] is not None:
+                        go_col.button(
+                            "▶", key=f"chapter_go_{chapter['key']}", on_click=seek, args=(chapter["start"],)
+                        )
+                    summary_slots[chapter["key"]] = st.empty()
+                    if chapter_summary:
+                        summary_slots[chapter["key"]].caption(chapter_summary)
+                    else:
+                        summary_slots[chapter["key"]].caption(f"(빠른 요약) {extractive_summary(chapter['text'], 2)}")
+
+                    if st.button("이 챕터로 퀴즈 풀기", key=f"chapter_quiz_{chapter['key']}"):
+                        if not chapter_summary and not should_shed():
+                            with st.spinner("챕터 요약 생성 중..."):
+                                chapter_summary = run_queued(
+                                    "chapter_summary", lambda: summarize_chapter(chapter)
+                                )
+                        chapter_summary = chapter_summary or extractive_summary(chapter["text"])
+                        content_store.put(st.session_state, "quiz_source_summary", chapter_summary)
+                        st.switch_page("pages/퀴즈.py")
+
+                if summarize_all:
+                    # 목록을 먼저 그린 뒤, 챕터 하나가 끝날 때마다 그 자리만 바꿈
+                    done = []
+
+                    def show_chapter(chapter, chapter_summary):
+                        done.append(chapter["key"])
+                        summary_slots[chapter["key"]].caption(chapter_summary)
+                        progress_note.caption(f"챕터 요약 중... ({len(done)}/{len(pending)})")
+
+                    run_queued(
+                        "chapter_summary",
+                        lambda: summarize_chapters(pending, on_done=show_chapter),
+                        batch=True,
+                    )
+                    progress_note.empty()
 
         # (4) 퀴즈 풀기 버튼: 퀴즈 페이지로 이동
         quiz_btn_container = st.container()
@@ -327,17 +524,21 @@ with col_main:
                 unsafe_allow_html=True,
             )
             if st.button("퀴즈 풀기", key="quiz_button"):
-                # 요약이 비어있으면 먼저 생성 시도
-                if not st.session_state.ai_summary.strip():
-                    if st.session_state.video_transcript:
-                        with st.spinner("AI 요약 생성 중..."):
-                            summary = summarize_text(st.session_state.video_transcript)
-                            st.session_state.ai_summary = summary
-                    else:
+                # 요약이 비어있으면 먼저 생성 시도 (LLM이 밀려 있으면 추출 요약으로 퀴즈 시작)
+                quiz_summary = ai_summary
+                if not quiz_summary.strip():
+                    if not video_transcript:
                         st.warning("자막을 먼저 불러온 뒤 요약을 생성해야 합니다.")
+                    elif should_shed():
+                        telemetry.incr("llm_shed", task="quiz_source")
+                        quiz_summary = quick_summary
+                    else:
+                        with st.spinner("AI 요약 생성 중..."):
+                            quiz_summary = run_summary()
+                            content_store.put(st.session_state, "ai_summary", quiz_summary)
                 # 퀴즈 페이지에 넘길 요약 저장
-                if st.session_state.ai_summary.strip():
-                    st.session_state.quiz_source_summary = st.session_state.ai_summary
+                if quiz_summary.strip():
+                    content_store.put(st.session_state, "quiz_source_summary", quiz_summary)
                     # 페이지 이동
                     st.switch_page("pages/퀴즈.py")
                 else:
@@ -357,13 +558,27 @@ with col_right:
     st.markdown('<div class="right-panel-box">', unsafe_allow_html=True)
     st.markdown("### 📝학습 메모")
 
+    def on_memo_change():
+        student_id = get_student_id(st.session_state)
+        get_search_index().index_memo(student_id, st.session_state.study_memo)
+        # DB에는 디바운스 후 백그라운드에서 바뀐 부분만 저장
+        get_autosaver().update(student_id, "memo", "memo", st.session_state.study_memo)
+
     memo_text = st.text_area(
         "메모를 입력하세요",
         height=250,
         key="study_memo",
         placeholder="공부하면서 떠오르는 내용을 자유롭게 적어보세요.",
+        on_change=on_memo_change,
     )
 
+    def restore_memo(version):
+        student_id = get_student_id(st.session_state)
+        st.session_state.study_memo = get_autosaver().restore(student_id, "memo", "memo", version)
+        get_search_index().index_memo(student_id, st.session_state.study_memo)
+
+    render_history("memo", "memo", restore_memo)
+
     if memo_text.strip():
         # txt 저장
         txt_bytes = memo_text.encode("utf-8")
@@ -375,7 +590,9 @@ with col_right:
             key="download_txt",
         )
 
-        # docx 저장
+        # docx 저장 (python-docx는 메모를 쓸 때만 불러옴)
+        from docx import Document
+
         doc = Document()
         doc.add_paragraph(memo_text)
         doc_buffer = BytesIO()
@@ -413,9 +630,32 @@ with col_right:
     selected_date_str = selected_date.isoformat()
     st.write(f"선택한 날짜: **{selected_date_str}**")
 
-    # 날짜별 체크리스트 초기화
+    autosaver = get_autosaver()
+    student_id = get_student_id(st.session_state)
+
+    # 날짜별 체크리스트 초기화 (자동 저장된 내용이 있으면 그대로)
     if selected_date_str not in st.session_state.checklists:
-        st.session_state.checklists[selected_date_str] = [
+        saved_rows = autosaver.load(student_id, "checklist", selected_date_str)
+        if saved_rows is not None:
+            st.session_state.checklists[selected_date_str] = load_rows(saved_rows)
+    if selected_date_str not in st.session_state.checklists:
+        # 오늘/앞으로의 날짜면 그날 복습할 퀴즈 문항을 공강 시간에 맞춰 먼저 넣어줌
+        review_rows = []
+        if selected_date >= date.today():
+            try:
+                cards = get_review_scheduler().due_cards(
+                    get_student_id(st.session_state), selected_date
+                )
+                review_rows = plan_review_rows(
+                    cards,
+                    st.session_state.get("tt_semester", DEFAULT_SEMESTER),
+                    selected_date,
+                    owner=get_student_id(st.session_state),
+                )
+            except Exception:
+                review_rows = []
+
+        st.session_state.checklists[selected_date_str] = review_rows + [
             {"text": "", "done": False} for _ in range(DEFAULT_ROWS)
         ]
 
@@ -456,8 +696,26 @@ with col_right:
         if st.button("+ 행 추가하기", key="add_row"):
             rows.append({"text": "", "done": False})
 
+    # 빈 기본 행만 있는 날짜는 저장하지 않음 (한 번이라도 저장된 날짜는 비운 것도 저장)
+    was_saved = autosaver.load(student_id, "checklist", selected_date_str) is not None
+    if was_saved or any(r["text"].strip() or r["done"] for r in rows):
+        autosaver.update(student_id, "checklist", selected_date_str, dump_rows(rows))
+
     if st.button("저장", key="save_checklist"):
+        autosaver.flush(student_id, "checklist", selected_date_str)
         st.success(
             f"{selected_date_str}의 체크리스트가 저장되었습니다. "
-            "다른 날짜를 눌렀다가 다시 돌아와도 내용은 유지됩니다."
+            "입력하는 동안에도 자동으로 저장되고, 아래 '이전 버전'에서 되돌릴 수 있습니다. "
+            "지금 주소를 북마크해 두면 다음에도 이어서 볼 수 있습니다."
         )
+
+    def restore_checklist(version, day=selected_date_str):
+        text = autosaver.restore(get_student_id(st.session_state), "checklist", day, version)
+        st.session_state.checklists[day] = load_rows(text)
+        # 행 위젯 값은 새 내용으로 다시 채우도록 비움
+        for key in [k for k in st.session_state if k.startswith((f"{day}_task_", f"{day}_done_"))]:
+            del st.session_state[key]
+
+    render_history("checklist", selected_date_str, restore_checklist)
+
+_render_span.end()